@@ -5,13 +5,17 @@ Generates personalized cold emails from company URLs
 """
 
 import os
-import re
+import sys
+import threading
+import uuid
 from flask import Flask, render_template, request, jsonify
 from flask_cors import CORS
 import openai
-import requests
-from urllib.parse import urlparse
-from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+from local_llm import get_client
+from research_pipeline import (ResearchCache, ResearchPipeline, extract_domain, fetch_company_info,
+                               make_session, normalize_url)
 
 app = Flask(__name__)
 CORS(app)
@@ -19,53 +23,34 @@ CORS(app)
 # OpenAI API key from environment
 openai.api_key = os.getenv('OPENAI_API_KEY')
 
-def extract_domain(url):
-    """Extract clean domain from URL"""
-    parsed = urlparse(url)
-    domain = parsed.netloc or parsed.path
-    return domain.replace('www.', '')
+# 'openai' or 'local' (shared local LLM client); defaults to local without a key
+LLM_BACKEND = os.getenv('COLD_EMAIL_BACKEND', 'openai' if openai.api_key else 'local')
+LOCAL_MODEL = os.getenv('COLD_EMAIL_LOCAL_MODEL', 'qwen2.5:14b')
+SYSTEM_PROMPT = "You are an expert cold email copywriter who writes highly personalized, effective outreach emails."
+
+# Shared by single and batch requests
+research_cache = ResearchCache()
+http_session = make_session()
+
+# Batch jobs run in the background; progress is polled by id
+batch_jobs = {}
+batch_jobs_lock = threading.Lock()
+MAX_BATCH_SIZE = 500
 
 def scrape_company_info(url):
-    """Scrape basic company information from URL"""
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Extract title
-        title = soup.find('title')
-        title_text = title.get_text() if title else ''
-        
-        # Extract meta description
-        meta_desc = soup.find('meta', attrs={'name': 'description'})
-        description = meta_desc.get('content', '') if meta_desc else ''
-        
-        # Extract first few paragraphs of text
-        paragraphs = soup.find_all('p')
-        text_content = ' '.join([p.get_text() for p in paragraphs[:5]])
-        
-        # Clean up text
-        text_content = re.sub(r'\s+', ' ', text_content).strip()[:1000]
-        
-        return {
-            'domain': extract_domain(url),
-            'title': title_text,
-            'description': description,
-            'content': text_content
-        }
-    except Exception as e:
-        return {
-            'domain': extract_domain(url),
-            'title': '',
-            'description': '',
-            'content': '',
-            'error': str(e)
-        }
+    """Scrape basic company information from URL (cached by domain)"""
+    domain = extract_domain(url)
+    cached = research_cache.get(domain)
+    if cached:
+        return cached
+    
+    info = fetch_company_info(url, session=http_session)
+    if 'error' not in info:
+        research_cache.set(domain, info)
+    return info
 
-def generate_cold_email(company_info, user_context=''):
-    """Generate personalized cold email using OpenAI"""
+def write_cold_email(company_info, user_context=''):
+    """Generate personalized cold email using OpenAI or the local model (raises on failure)"""
     
     prompt = f"""You are an expert cold email writer. Generate a personalized, compelling cold email based on the company information below.
 
@@ -91,20 +76,35 @@ Subject: [subject line]
 
 Generate ONLY the email. Be specific to this company."""
 
-    try:
-        response = openai.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": "You are an expert cold email copywriter who writes highly personalized, effective outreach emails."},
-                {"role": "user", "content": prompt}
-            ],
+    if LLM_BACKEND == 'local':
+        response = get_client().generate(
+            prompt,
+            model=LOCAL_MODEL,
+            system=SYSTEM_PROMPT,
             temperature=0.7,
-            max_tokens=500
+            max_tokens=500,
+            caller='cold_email_ai',
+            timeout=120
         )
-        
-        email_content = response.choices[0].message.content
-        return email_content
+        return response['response'].strip()
+    
+    response = openai.chat.completions.create(
+        model="gpt-4",
+        messages=[
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.7,
+        max_tokens=500
+    )
     
+    email_content = response.choices[0].message.content
+    return email_content
+
+def generate_cold_email(company_info, user_context=''):
+    """Generate personalized cold email; errors come back as the email text"""
+    try:
+        return write_cold_email(company_info, user_context)
     except Exception as e:
         return f"Error generating email: {str(e)}"
 
@@ -129,8 +129,7 @@ def generate():
         return jsonify({'error': 'URL is required'}), 400
     
     # Add protocol if missing
-    if not url.startswith(('http://', 'https://')):
-        url = 'https://' + url
+    url = normalize_url(url)
     
     # Scrape company info
     company_info = scrape_company_info(url)
@@ -143,6 +142,46 @@ def generate():
         'company_info': company_info
     })
 
+@app.route('/api/generate/batch', methods=['POST'])
+def generate_batch():
+    """Start a batch job: {"companies": [{"url", "context"}] | ["url", ...], "context": "..."}"""
+    data = request.json or {}
+    companies = [{'url': c} if isinstance(c, str) else c for c in data.get('companies', [])]
+    companies = [c for c in companies if (c.get('url') or '').strip()]
+    
+    if not companies:
+        return jsonify({'error': 'companies is required'}), 400
+    if len(companies) > MAX_BATCH_SIZE:
+        return jsonify({'error': f'At most {MAX_BATCH_SIZE} companies per batch'}), 400
+    
+    job_id = uuid.uuid4().hex[:12]
+    job = {'id': job_id, 'status': 'running', 'progress': {'total': len(companies), 'completed': 0}}
+    with batch_jobs_lock:
+        batch_jobs[job_id] = job
+    
+    def on_progress(stats):
+        job['progress'] = stats
+    
+    def run():
+        pipeline = ResearchPipeline(generate=write_cold_email, cache=research_cache,
+                                    session=http_session, on_progress=on_progress)
+        try:
+            batch = pipeline.run(companies, data.get('context', ''))
+            job.update(status='done', progress=batch['stats'], results=batch['results'])
+        except Exception as e:
+            job.update(status='failed', error=str(e))
+    
+    threading.Thread(target=run, daemon=True).start()
+    return jsonify({'job_id': job_id, 'status': 'running', 'total': len(companies)}), 202
+
+@app.route('/api/generate/batch/<job_id>')
+def batch_status(job_id):
+    """Batch progress and throughput; results once done"""
+    job = batch_jobs.get(job_id)
+    if not job:
+        return jsonify({'error': 'Unknown job'}), 404
+    return jsonify(job)
+
 @app.route('/health')
 def health():
     """Health check endpoint"""
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Batch company research pipeline for Cold Email AI
+- asyncio fan-out over one pooled requests.Session, with a global
+  concurrency cap and per-domain politeness (one request at a time per
+  domain, spaced by a minimum delay)
+- Streaming extractor: feeds the page to html.parser chunk by chunk and
+  hangs up once it has the title, meta description and first paragraphs
+- Scraped summaries cached on disk by domain with a TTL
+- Each company goes to a bounded generation worker pool as soon as its
+  research lands, so scraping and email writing overlap
+
+Usage:
+    python research_pipeline.py companies.json [--context "..."] [--out results.json]
+"""
+
+import argparse
+import asyncio
+import codecs
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+CACHE_DIR = Path(__file__).parent / 'cache' / 'research'
+CACHE_TTL = int(os.getenv('COLD_EMAIL_CACHE_TTL', 7 * 86400))
+FETCH_CONCURRENCY = 16
+DOMAIN_DELAY = 1.0          # Seconds between requests to the same domain
+GENERATE_WORKERS = int(os.getenv('COLD_EMAIL_WORKERS', 4))
+FETCH_TIMEOUT = 10
+MAX_PAGE_BYTES = 512 * 1024
+MAX_PARAGRAPHS = 5
+MAX_CONTENT = 1000
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+
+
+def extract_domain(url: str) -> str:
+    """Extract clean domain from URL"""
+    parsed = urlparse(url)
+    domain = parsed.netloc or parsed.path
+    return domain.replace('www.', '')
+
+
+def normalize_url(url: str) -> str:
+    url = url.strip()
+    if not url.startswith(('http://', 'https://')):
+        url = 'https://' + url
+    return url
+
+
+class CompanyExtractor(HTMLParser):
+    """Incremental title / meta description / first-paragraphs extractor
+
+    `done` flips once enough paragraph text is collected, so the caller
+    can stop reading the page.
+    """
+
+    SKIP = {'script', 'style', 'noscript', 'svg', 'template'}
+
+    def __init__(self, max_paragraphs: int = MAX_PARAGRAPHS, max_content: int = MAX_CONTENT):
+        super().__init__(convert_charrefs=True)
+        self.max_paragraphs = max_paragraphs
+        self.max_content = max_content
+        self.title = ''
+        self.description = ''
+        self.paragraphs: List[str] = []
+        self._in_title = False
+        self._in_p = False
+        self._skip_depth = 0
+        self._current: List[str] = []
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag in self.SKIP:
+            self._skip_depth += 1
+        elif tag == 'title':
+            self._in_title = True
+        elif tag == 'p':
+            self._close_paragraph()
+            self._in_p = True
+        elif tag == 'meta' and not self.description:
+            attrs = dict(attrs)
+            name = (attrs.get('name') or attrs.get('property') or '').lower()
+            if name in ('description', 'og:description'):
+                self.description = (attrs.get('content') or '').strip()
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag == 'title':
+            self._in_title = False
+        elif tag == 'p':
+            self._close_paragraph()
+
+    def handle_data(self, data):
+        if self.done or self._skip_depth:
+            return
+        if self._in_title:
+            self.title += data
+        elif self._in_p:
+            self._current.append(data)
+
+    def _close_paragraph(self):
+        if self._in_p:
+            self.paragraphs.append(''.join(self._current))
+        self._in_p = False
+        self._current = []
+        if len(self.paragraphs) >= self.max_paragraphs or len(self.content) >= self.max_content:
+            self.done = True
+
+    @property
+    def content(self) -> str:
+        return re.sub(r'\s+', ' ', ' '.join(self.paragraphs)).strip()
+
+    def summary(self, url: str) -> Dict:
+        self._close_paragraph()
+        return {
+            'domain': extract_domain(url),
+            'title': self.title.strip(),
+            'description': self.description,
+            'content': self.content[:self.max_content]
+        }
+
+
+class ResearchCache:
+    """Scraped company summaries on disk, one JSON file per domain"""
+
+    def __init__(self, cache_dir: Path = CACHE_DIR, ttl: int = CACHE_TTL):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, domain: str) -> Path:
+        return self.cache_dir / (re.sub(r'[^A-Za-z0-9.-]', '_', domain.lower()) + '.json')
+
+    def get(self, domain: str) -> Optional[Dict]:
+        path = self._path(domain)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl:
+                path.unlink()
+                return None
+            return json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def set(self, domain: str, info: Dict):
+        path = self._path(domain)
+        tmp = path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(info))
+        tmp.replace(path)
+
+
+def make_session(pool_size: int = FETCH_CONCURRENCY) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['User-Agent'] = USER_AGENT
+    return session
+
+
+def fetch_company_info(url: str, session: Optional[requests.Session] = None,
+                       timeout: int = FETCH_TIMEOUT) -> Dict:
+    """Stream the page through CompanyExtractor, stopping as soon as it has enough"""
+    session = session or requests
+    extractor = CompanyExtractor()
+    try:
+        response = session.get(url, headers={'User-Agent': USER_AGENT}, timeout=timeout, stream=True)
+        try:
+            response.raise_for_status()
+            # requests guesses latin-1 for text/html without a charset; pages are utf-8 in practice
+            has_charset = 'charset=' in response.headers.get('Content-Type', '').lower()
+            encoding = response.encoding if has_charset and response.encoding else 'utf-8'
+            decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+            read = 0
+            for chunk in response.iter_content(chunk_size=8192):
+                read += len(chunk)
+                extractor.feed(decoder.decode(chunk))
+                if extractor.done or read >= MAX_PAGE_BYTES:
+                    break
+        finally:
+            response.close()
+        return extractor.summary(url)
+    except Exception as e:
+        info = extractor.summary(url)
+        info['error'] = str(e)
+        return info
+
+
+class ResearchPipeline:
+    """
+    Research + generate for a batch of companies
+
+    Args:
+        generate: fn(company_info, context) -> email text; raises on failure
+        fetch_concurrency: Pages fetched at once across all domains
+        domain_delay: Minimum seconds between requests to one domain
+        generate_workers: Size of the generation worker pool
+        cache: ResearchCache (None disables caching)
+        on_progress: fn(stats) called after every company finishes
+    """
+
+    def __init__(self, generate: Optional[Callable[[Dict, str], str]] = None,
+                 fetch_concurrency: int = FETCH_CONCURRENCY, domain_delay: float = DOMAIN_DELAY,
+                 generate_workers: int = GENERATE_WORKERS, cache: Optional[ResearchCache] = None,
+                 session: Optional[requests.Session] = None, on_progress: Optional[Callable[[Dict], None]] = None):
+        self.generate = generate
+        self.fetch_concurrency = fetch_concurrency
+        self.domain_delay = domain_delay
+        self.generate_workers = generate_workers
+        self.cache = cache
+        self.session = session or make_session(fetch_concurrency)
+        self.on_progress = on_progress
+
+    def run(self, companies: List[Dict], context: str = '') -> Dict:
+        """companies: [{'url': ..., 'context': ..., 'name': ...}] -> {'results': [...], 'stats': {...}}"""
+        return asyncio.run(self.run_async(companies, context))
+
+    async def run_async(self, companies: List[Dict], context: str = '') -> Dict:
+        started = time.time()
+        stats = {
+            'total': len(companies), 'researched': 0, 'cache_hits': 0, 'fetch_errors': 0,
+            'generated': 0, 'generate_errors': 0, 'completed': 0, 'fetch_seconds': 0.0,
+            'elapsed': 0.0, 'companies_per_min': 0.0
+        }
+        results: List[Optional[Dict]] = [None] * len(companies)
+        fetch_slots = asyncio.Semaphore(self.fetch_concurrency)
+        domain_locks: Dict[str, asyncio.Lock] = {}
+        last_hit: Dict[str, float] = {}
+        loop = asyncio.get_running_loop()
+
+        def progress():
+            stats['elapsed'] = round(time.time() - started, 2)
+            stats['companies_per_min'] = round(stats['completed'] / stats['elapsed'] * 60, 1) if stats['elapsed'] else 0.0
+            if self.on_progress:
+                self.on_progress(dict(stats))
+
+        async def research(url: str) -> Dict:
+            domain = extract_domain(url)
+            if self.cache:
+                cached = self.cache.get(domain)
+                if cached:
+                    stats['cache_hits'] += 1
+                    return dict(cached, cached=True)
+
+            lock = domain_locks.setdefault(domain, asyncio.Lock())
+            async with lock:
+                # Another company on this domain may have filled the cache while we waited
+                cached = self.cache.get(domain) if self.cache else None
+                if cached:
+                    stats['cache_hits'] += 1
+                    return dict(cached, cached=True)
+                wait = last_hit.get(domain, 0) + self.domain_delay - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                async with fetch_slots:
+                    fetch_start = time.time()
+                    info = await loop.run_in_executor(fetch_pool, fetch_company_info, url, self.session)
+                    stats['fetch_seconds'] += time.time() - fetch_start
+                last_hit[domain] = time.monotonic()
+
+            if 'error' in info:
+                stats['fetch_errors'] += 1
+            elif self.cache:
+                self.cache.set(domain, info)
+            return info
+
+        async def process(index: int, company: Dict):
+            url = normalize_url(company['url'])
+            info = await research(url)
+            stats['researched'] += 1
+            result = {'company': company, 'company_info': info}
+
+            if self.generate:
+                try:
+                    result['email'] = await loop.run_in_executor(
+                        generate_pool, self.generate, info, company.get('context') or context)
+                    stats['generated'] += 1
+                except Exception as e:
+                    result['error'] = str(e)
+                    stats['generate_errors'] += 1
+
+            results[index] = result
+            stats['completed'] += 1
+            progress()
+
+        with ThreadPoolExecutor(max_workers=self.fetch_concurrency, thread_name_prefix='fetch') as fetch_pool, \
+                ThreadPoolExecutor(max_workers=self.generate_workers, thread_name_prefix='generate') as generate_pool:
+            await asyncio.gather(*(process(i, c) for i, c in enumerate(companies)))
+
+        progress()
+        stats['fetch_seconds'] = round(stats['fetch_seconds'], 2)
+        return {'results': results, 'stats': stats}
+
+
+def load_companies(path: str) -> List[Dict]:
+    """JSON list of {'url', 'context', 'name'} (or bare URLs), or one URL per line"""
+    text = Path(path).read_text()
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        data = [line.strip() for line in text.splitlines() if line.strip() and not line.startswith('#')]
+    return [{'url': c} if isinstance(c, str) else c for c in data]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Batch cold email generation')
+    parser.add_argument('companies', help='JSON list of companies (like test_companies.json) or a file of URLs')
+    parser.add_argument('--context', default='', help='Offering used when a company has no context')
+    parser.add_argument('--out', help='Write results JSON here (default examples/batch_<timestamp>.json)')
+    parser.add_argument('--workers', type=int, default=GENERATE_WORKERS, help='Generation workers')
+    parser.add_argument('--concurrency', type=int, default=FETCH_CONCURRENCY, help='Pages fetched at once')
+    parser.add_argument('--research-only', action='store_true', help='Scrape and cache, skip email generation')
+    args = parser.parse_args()
+
+    companies = load_companies(args.companies)
+    generate = None
+    if not args.research_only:
+        from app import write_cold_email
+        generate = write_cold_email
+
+    def report(stats):
+        print(f"\r   [{stats['completed']}/{stats['total']}] researched {stats['researched']} "
+              f"(cache {stats['cache_hits']}, errors {stats['fetch_errors']}) · generated {stats['generated']} "
+              f"· {stats['companies_per_min']}/min", end='', flush=True)
+
+    print(f"🚀 Processing {len(companies)} companies "
+          f"({args.concurrency} fetches, {args.workers} writers)...")
+    pipeline = ResearchPipeline(generate=generate, fetch_concurrency=args.concurrency,
+                                generate_workers=args.workers, cache=ResearchCache(), on_progress=report)
+    batch = pipeline.run(companies, args.context)
+    stats = batch['stats']
+    print()
+
+    out = args.out or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'examples',
+                                   f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(out, 'w') as f:
+        json.dump(batch, f, indent=2)
+
+    print("=" * 60)
+    print(f"✅ {stats['completed']} companies in {stats['elapsed']}s ({stats['companies_per_min']}/min)")
+    print(f"🔎 Scraped {stats['researched'] - stats['cache_hits']}, cached {stats['cache_hits']}, "
+          f"fetch errors {stats['fetch_errors']}")
+    if generate:
+        print(f"✉️  Generated {stats['generated']}, failed {stats['generate_errors']}")
+    print(f"📁 Saved to {out}")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
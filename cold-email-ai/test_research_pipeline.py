@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Tests for the batch research pipeline
+Runs against a local HTTP server; generation is a stand-in function
+"""
+
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from research_pipeline import CompanyExtractor, ResearchCache, ResearchPipeline, fetch_company_info, load_companies
+
+PAGE = ("<html><head><title> Acme Robotics </title>"
+        "<meta name='description' content='Robots for warehouses'>"
+        "<script>var p = '<p>not text</p>';</script></head><body>"
+        + ''.join(f"<p>Paragraph {i} about   robots &amp; automation.</p>" for i in range(8))
+        + "<div>" + "x" * 200000 + "</div></body></html>").encode()
+
+HITS = []
+HITS_LOCK = threading.Lock()
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        with HITS_LOCK:
+            HITS.append((self.path, time.monotonic()))
+        if self.path.startswith('/missing'):
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        time.sleep(0.05)
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(PAGE)))
+        self.end_headers()
+        try:
+            self.wfile.write(PAGE)
+        except (BrokenPipeError, ConnectionResetError):
+            pass    # The extractor hangs up early
+
+    def log_message(self, *args):
+        pass
+
+
+class QuietServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        pass    # Clients hanging up mid-page is the point
+
+
+def start_server():
+    server = QuietServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, server.server_address[1]
+
+
+def test_extractor_stops_after_first_paragraphs():
+    extractor = CompanyExtractor()
+    for i in range(0, len(PAGE), 100):
+        extractor.feed(PAGE[i:i + 100].decode())
+        if extractor.done:
+            break
+    assert extractor.done and i < 1000
+    info = extractor.summary('https://www.acme.test/about')
+    assert info['domain'] == 'acme.test' and info['title'] == 'Acme Robotics'
+    assert info['description'] == 'Robots for warehouses'
+    assert info['content'].startswith('Paragraph 0 about robots & automation. Paragraph 1')
+    assert 'not text' not in info['content'] and info['content'].count('Paragraph') == 5
+
+
+def test_fetch_streams_and_reports_errors():
+    server, port = start_server()
+    try:
+        info = fetch_company_info(f"http://127.0.0.1:{port}/")
+        assert info['title'] == 'Acme Robotics' and 'error' not in info
+        missing = fetch_company_info(f"http://127.0.0.1:{port}/missing")
+        assert '404' in missing['error'] and missing['content'] == ''
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_batch_pipeline(tmp_path):
+    server, port = start_server()
+    try:
+        # 127.0.0.1 and localhost are separate domains; failed scrapes aren't cached
+        companies = [{'url': f"http://127.0.0.1:{port}/a", 'context': 'robots'},
+                     {'url': f"http://127.0.0.1:{port}/b"},
+                     {'url': f"http://localhost:{port}/missing"},
+                     {'url': f"http://localhost:{port}/c"}]
+        in_flight = {'now': 0, 'max': 0}
+        lock = threading.Lock()
+
+        def generate(info, context):
+            with lock:
+                in_flight['now'] += 1
+                in_flight['max'] = max(in_flight['max'], in_flight['now'])
+            time.sleep(0.05)
+            with lock:
+                in_flight['now'] -= 1
+            if not info['title']:
+                raise RuntimeError('nothing to personalize')
+            return f"Subject: {info['title']} x {context}"
+
+        progress = []
+        HITS.clear()
+        pipeline = ResearchPipeline(generate=generate, domain_delay=0.2, generate_workers=2,
+                                    cache=ResearchCache(tmp_path), on_progress=progress.append)
+        batch = pipeline.run(companies, context='default offer')
+        results, stats = batch['results'], batch['stats']
+
+        assert results[0]['email'] == 'Subject: Acme Robotics x robots'
+        assert results[1]['email'] == 'Subject: Acme Robotics x default offer'
+        assert results[1]['company_info'].get('cached')
+        assert 'error' in results[2]['company_info'] and results[2]['error'] == 'nothing to personalize'
+        assert results[3]['email'] == 'Subject: Acme Robotics x default offer'
+        # Second 127.0.0.1 company came from cache; localhost was fetched twice, politely spaced
+        assert sorted(path for path, _ in HITS) == ['/a', '/c', '/missing']
+        localhost = dict(HITS)
+        assert localhost['/c'] - localhost['/missing'] >= 0.2
+        assert stats['total'] == stats['completed'] == 4 and stats['cache_hits'] == 1
+        assert stats['fetch_errors'] == 1 and stats['generated'] == 3 and stats['generate_errors'] == 1
+        assert stats['companies_per_min'] > 0 and in_flight['max'] <= 2
+        assert [p['completed'] for p in progress][:4] == [1, 2, 3, 4]
+
+        # A fresh run over the same domains is all cache
+        HITS.clear()
+        again = ResearchPipeline(cache=ResearchCache(tmp_path), domain_delay=0).run(companies[:2] + companies[3:])
+        assert HITS == [] and again['stats']['cache_hits'] == 3 and 'email' not in again['results'][0]
+        assert ResearchCache(tmp_path, ttl=0).get(f"localhost:{port}") is None
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_load_companies(tmp_path):
+    listing = tmp_path / 'urls.txt'
+    listing.write_text("# prospects\nstripe.com\n\nlinear.app\n")
+    assert load_companies(str(listing)) == [{'url': 'stripe.com'}, {'url': 'linear.app'}]
+    companies = load_companies(str(Path(__file__).parent / 'test_companies.json'))
+    assert companies[0]['name'] == 'Stripe' and len(companies) == 5
+
+
+if __name__ == '__main__':
+    test_extractor_stops_after_first_paragraphs()
+    test_fetch_streams_and_reports_errors()
+    for test in [test_batch_pipeline, test_load_companies]:
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ Research pipeline tests passed")
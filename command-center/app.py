@@ -13,6 +13,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 import glob
 
+from workspace_index import WorkspaceIndex
+
 app = Flask(__name__)
 
 # Base paths
@@ -20,6 +22,9 @@ CLAWD_PATH = Path.home() / 'clawd'
 MEMORY_PATH = CLAWD_PATH / 'memory'
 REPORTS_PATH = CLAWD_PATH / 'reports'
 
+# Full-text index of the workspace, kept current by a background refresh
+workspace_index = WorkspaceIndex(CLAWD_PATH)
+
 # Service configurations
 SERVICES = [
     {'name': 'Fitness Tracker', 'port': 3001, 'url': 'http://localhost:3001'},
@@ -218,9 +223,12 @@ def api_activity():
 
 @app.route('/api/search')
 def api_search():
-    """Search for files and services"""
-    query = request.args.get('q', '').lower()
+    """Search services, key files, then file contents across the workspace"""
+    query = request.args.get('q', '').lower().strip()
+    limit = request.args.get('limit', 20, type=int)
     results = []
+    if not query:
+        return jsonify(results)
     
     # Search services
     for service in SERVICES + FILE_SERVICES:
@@ -240,9 +248,25 @@ def api_search():
                 'path': str(file_info['path'])
             })
     
+    # Search file contents (ranked, with highlighted snippets)
+    seen = {r.get('path') for r in results}
+    for hit in workspace_index.search(query, limit=limit):
+        if hit['path'] not in seen:
+            results.append(hit)
+    
     return jsonify(results)
 
+@app.route('/api/search/status')
+def api_search_status():
+    """Search index size and last refresh"""
+    return jsonify(workspace_index.stats())
+
 if __name__ == '__main__':
     print("🚀 Master Command Center starting on http://localhost:5000")
     print("📊 Dashboard ready - your central hub for everything!")
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    debug = os.environ.get('FLASK_DEBUG', '1') != '0'
+    # The debug reloader runs this block in a watcher parent and a serving
+    # child; index in the child, or in the only process without the reloader
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        workspace_index.start_background_refresh()
+    app.run(host='127.0.0.1', port=5000, debug=debug)
@@ -292,7 +292,17 @@ function createSearchResultItem(result) {
     div.className = 'search-result-item';
     
     const icon = result.type === 'service' ? '🖥️' : '📄';
-    div.textContent = `${icon} ${result.name}`;
+    const name = document.createElement('div');
+    name.textContent = `${icon} ${result.name}`;
+    div.appendChild(name);
+    
+    // Content matches carry a snippet; the server escapes it and adds only <mark> tags
+    if (result.snippet) {
+        const snippet = document.createElement('div');
+        snippet.className = 'search-snippet';
+        snippet.innerHTML = result.snippet;
+        div.appendChild(snippet);
+    }
     
     div.onclick = () => {
         if (result.type === 'service' && result.url.startsWith('http')) {
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Tests for the workspace search index
+Indexes a small temporary workspace; no Flask needed
+"""
+
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from workspace_index import WorkspaceIndex, make_snippet
+
+
+def make_workspace(root: Path):
+    (root / 'memory').mkdir()
+    (root / 'reports').mkdir()
+    (root / 'node_modules' / 'pkg').mkdir(parents=True)
+    (root / 'memory' / '2026-02-10.md').write_text(
+        "# Daily notes\nShipped the NBA rankings report and fixed the fitness tracker.\n")
+    (root / 'memory' / '2026-02-11.md').write_text("Call the dentist. Review Stripe webhooks.\n")
+    (root / 'reports' / 'nba_rankings.json').write_text('{"team": "Celtics", "rank": 1}')
+    (root / 'notes.txt').write_text("Ideas: <script>alert(1)</script> rankings widget\n")
+    (root / 'node_modules' / 'pkg' / 'index.js').write_text("rankings rankings rankings")
+    (root / 'photo.png').write_bytes(b'\x89PNG rankings')
+
+
+def test_index_and_rank():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / 'clawd'
+        root.mkdir()
+        make_workspace(root)
+        index = WorkspaceIndex(root, Path(tmp) / 'index.db')
+
+        stats = index.refresh()
+        assert (stats['files'], stats['updated'], stats['removed']) == (4, 4, 0)
+        results = index.search('rankings')
+        names = [r['name'] for r in results]
+        # node_modules and non-text files are skipped; a file-name match ranks first
+        assert set(names) == {os.path.join('reports', 'nba_rankings.json'),
+                              os.path.join('memory', '2026-02-10.md'), 'notes.txt'}
+        assert names[0] == os.path.join('reports', 'nba_rankings.json')
+        assert results[0]['path'] == str(root / 'reports' / 'nba_rankings.json')
+
+        # Every word must match, anywhere inside a word
+        assert [r['name'] for r in index.search('nba fitness')] == [os.path.join('memory', '2026-02-10.md')]
+        assert [r['name'] for r in index.search('WEBHOO')] == [os.path.join('memory', '2026-02-11.md')]
+        assert index.search('basketball') == [] and index.search('   ') == []
+
+        # Too short for trigrams: file names only
+        assert [r['name'] for r in index.search('nb')] == [os.path.join('reports', 'nba_rankings.json')]
+
+
+def test_incremental_refresh():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / 'clawd'
+        root.mkdir()
+        make_workspace(root)
+        index = WorkspaceIndex(root, Path(tmp) / 'index.db')
+        index.refresh()
+        assert index.refresh()['updated'] == 0
+
+        note = root / 'memory' / '2026-02-11.md'
+        note.write_text("Call the dentist. Book flights to Denver.\n")
+        os.utime(note, (time.time() + 5, time.time() + 5))
+        (root / 'notes.txt').unlink()
+        (root / 'memory' / '2026-02-12.md').write_text("Denver trip packing list\n")
+
+        stats = index.refresh()
+        assert (stats['files'], stats['updated'], stats['removed']) == (4, 2, 1)
+        assert index.search('stripe') == [] and index.search('widget') == []
+        assert len(index.search('denver')) == 2
+
+        # A second process (app restart) reuses the index on disk without re-reading anything
+        reopened = WorkspaceIndex(root, Path(tmp) / 'index.db')
+        assert reopened.stats()['indexed_files'] == 4
+        assert reopened.refresh()['updated'] == 0
+
+
+def test_secrets_and_binaries():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / 'clawd'
+        root.mkdir()
+        make_workspace(root)
+        (root / 'credentials').mkdir()
+        (root / 'credentials' / 'twitter-api.json').write_text('{"api_secret": "hunter2hunter2"}')
+        (root / '.env').write_text('API_SECRET=hunter2hunter2\n')
+        (root / '.env.example').write_text('API_SECRET=hunter2hunter2\n')
+        (root / 'gmail_token.json').write_text('{"token": "hunter2hunter2"}')
+        (root / 'api_keys.txt').write_text('hunter2hunter2\n')
+        (root / 'data').mkdir()
+        (root / 'data' / 'security_scan_cache.json').write_text('{"match": "hunter2hunter2"}')
+        (root / 'data' / 'export.json').write_bytes(b'\x00\x01 hunter2hunter2')
+        index = WorkspaceIndex(root, Path(tmp) / 'index.db')
+
+        stats = index.refresh()
+        assert (stats['files'], stats['updated']) == (5, 5)
+        assert index.search('hunter2') == [] and index.search('api_secret') == []
+        assert index.stats()['indexed_files'] == 4
+
+        # The binary is remembered, so an unchanged one is not opened again
+        assert index.refresh()['updated'] == 0
+
+
+def test_snippets_are_escaped_and_highlighted():
+    body = "x" * 300 + " Ideas: <script>alert(1)</script> Rankings widget\n\n  next line"
+    snippet = make_snippet(body, ['rankings', 'widget'])
+    assert snippet.startswith('…') and not snippet.endswith('…')
+    assert '&lt;script&gt;' in snippet and '<script>' not in snippet
+    assert '<mark>Rankings</mark> <mark>widget</mark> next line' in snippet
+    assert make_snippet("short note", ['missing']) == "short note"
+
+
+if __name__ == '__main__':
+    test_index_and_rank()
+    test_incremental_refresh()
+    test_secrets_and_binaries()
+    test_snippets_are_escaped_and_highlighted()
+    print("✅ Workspace index tests passed")
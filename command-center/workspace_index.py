@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Workspace Search Index
+Full-text index over ~/clawd (markdown, memory, JSON data, scripts) for the
+Command Center search bar.
+
+- SQLite FTS5 with the trigram tokenizer: substring matches anywhere in a
+  word, ranked with BM25 (file names weigh more than contents)
+- Stored on disk; refresh() only re-reads files whose mtime/size changed
+  and drops deleted ones, so keeping it current costs one directory walk
+- Snippets are cut around the first match and highlighted with <mark>
+- Credentials are never indexed: dotfiles (.env*), credentials/ and
+  secrets/ directories, and any file whose name mentions a token, key,
+  secret, credential or password
+
+Usage:
+    python workspace_index.py refresh
+    python workspace_index.py search "query words"
+"""
+
+import html
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+CLAWD_PATH = Path.home() / 'clawd'
+INDEX_PATH = CLAWD_PATH / 'cache' / 'workspace_search.db'
+
+INDEXED_EXTENSIONS = {
+    '.md', '.txt', '.json', '.py', '.sh', '.js', '.ts', '.html', '.css',
+    '.yaml', '.yml', '.toml', '.ini', '.cfg', '.csv', '.sql', '.plist',
+}
+SKIP_DIRS = {
+    '.git', 'node_modules', 'venv', '.venv', 'env', '__pycache__', '.pytest_cache', '.mypy_cache',
+    'site-packages', 'dist', 'build', 'cache', '.cache', '.next', 'target',
+    'credentials', 'secrets', 'keys',
+}
+# Never index anything that may hold a secret: search results are served with snippets
+SENSITIVE_NAME_PARTS = ('token', 'key', 'secret', 'credential', 'password', 'passwd')
+SKIP_FILES = {'security_scan_cache.json'}
+MAX_FILE_BYTES = 512 * 1024
+REFRESH_INTERVAL = 60
+SNIPPET_CHARS = 160
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE,
+    mtime REAL,
+    size INTEGER
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS docs USING fts5(
+    name, body, tokenize='trigram'
+);
+"""
+
+
+def is_sensitive(name: str) -> bool:
+    """File names that may hold credentials (api_keys.json, gmail_token.pickle, .env, ...)"""
+    lower = name.lower()
+    return lower in SKIP_FILES or lower.startswith('.env') or any(part in lower for part in SENSITIVE_NAME_PARTS)
+
+
+class WorkspaceIndex:
+    """
+    On-disk trigram index of a directory tree
+
+    Args:
+        root: Directory to index
+        index_path: SQLite file holding the index
+    """
+
+    def __init__(self, root: Path = CLAWD_PATH, index_path: Path = INDEX_PATH):
+        self.root = Path(root)
+        self.index_path = Path(index_path)
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._refresh_lock = threading.Lock()
+        self.last_refresh: Optional[float] = None
+        self.last_stats: Dict = {}
+        with self._conn() as conn:
+            conn.executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        """One connection per thread; WAL lets searches run while a refresh writes"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.index_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ------------------------------------------------------------------
+    # Indexing
+    # ------------------------------------------------------------------
+
+    def walk(self) -> Dict[str, os.stat_result]:
+        """Indexable files under root -> stat"""
+        found = {}
+        stack = [str(self.root)]
+        while stack:
+            try:
+                entries = list(os.scandir(stack.pop()))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS:
+                            stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        if os.path.splitext(entry.name)[1].lower() in INDEXED_EXTENSIONS \
+                                and not is_sensitive(entry.name):
+                            stat = entry.stat()
+                            if stat.st_size <= MAX_FILE_BYTES:
+                                found[entry.path] = stat
+                except OSError:
+                    continue
+        return found
+
+    def refresh(self) -> Dict:
+        """Bring the index up to date; only new/changed/deleted files are touched"""
+        with self._refresh_lock:
+            started = time.time()
+            conn = self._conn()
+            on_disk = self.walk()
+            indexed = {path: (file_id, mtime, size)
+                       for file_id, path, mtime, size in conn.execute("SELECT id, path, mtime, size FROM files")}
+
+            changed = [path for path, stat in on_disk.items()
+                       if path not in indexed or indexed[path][1:] != (stat.st_mtime, stat.st_size)]
+            removed = [indexed[path][0] for path in indexed if path not in on_disk]
+
+            with conn:
+                for file_id in removed:
+                    conn.execute("DELETE FROM docs WHERE rowid = ?", (file_id,))
+                    conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+                for path in changed:
+                    stat = on_disk[path]
+                    try:
+                        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                            body = f.read()
+                    except OSError:
+                        continue
+                    if path in indexed:
+                        file_id = indexed[path][0]
+                        conn.execute("UPDATE files SET mtime = ?, size = ? WHERE id = ?",
+                                     (stat.st_mtime, stat.st_size, file_id))
+                        conn.execute("DELETE FROM docs WHERE rowid = ?", (file_id,))
+                    else:
+                        file_id = conn.execute("INSERT INTO files (path, mtime, size) VALUES (?, ?, ?)",
+                                               (path, stat.st_mtime, stat.st_size)).lastrowid
+                    # Binary despite the extension: remembered in files (so it isn't
+                    # re-read until it changes) but given no searchable body
+                    if '\x00' not in body[:1024]:
+                        conn.execute("INSERT INTO docs (rowid, name, body) VALUES (?, ?, ?)",
+                                     (file_id, os.path.relpath(path, self.root), body))
+
+            self.last_refresh = time.time()
+            self.last_stats = {
+                'files': len(on_disk),
+                'updated': len(changed),
+                'removed': len(removed),
+                'seconds': round(time.time() - started, 3)
+            }
+            return self.last_stats
+
+    def start_background_refresh(self, interval: int = REFRESH_INTERVAL) -> threading.Thread:
+        """Refresh now and then every `interval` seconds on a daemon thread"""
+        def loop():
+            while True:
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"⚠️  Search index refresh failed: {e}")
+                time.sleep(interval)
+
+        thread = threading.Thread(target=loop, name='workspace-index', daemon=True)
+        thread.start()
+        return thread
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def search(self, query: str, limit: int = 20) -> List[Dict]:
+        """Ranked file matches for every word in `query`, with highlighted snippets"""
+        terms = [t for t in re.findall(r'[^\s"]+', query.lower()) if t]
+        if not terms:
+            return []
+        conn = self._conn()
+
+        if all(len(t) >= 3 for t in terms):
+            match = ' AND '.join('"' + t.replace('"', '""') + '"' for t in terms)
+            rows = conn.execute(
+                "SELECT files.path, files.mtime, docs.body, bm25(docs, 8.0, 1.0) AS rank "
+                "FROM docs JOIN files ON files.id = docs.rowid "
+                "WHERE docs MATCH ? ORDER BY rank LIMIT ?",
+                (match, limit)
+            ).fetchall()
+        else:
+            # Trigrams need 3+ characters; short queries match file names only
+            like = ' AND '.join(['docs.name LIKE ?'] * len(terms))
+            rows = conn.execute(
+                f"SELECT files.path, files.mtime, docs.body, 0 AS rank "
+                f"FROM docs JOIN files ON files.id = docs.rowid WHERE {like} "
+                f"ORDER BY files.mtime DESC LIMIT ?",
+                [f"%{t}%" for t in terms] + [limit]
+            ).fetchall()
+
+        return [{
+            'type': 'file',
+            'name': os.path.relpath(path, self.root),
+            'path': path,
+            'snippet': make_snippet(body, terms),
+            'score': round(-rank, 3),
+            'modified': time.strftime('%Y-%m-%d %H:%M', time.localtime(mtime))
+        } for path, mtime, body, rank in rows]
+
+    def stats(self) -> Dict:
+        count = self._conn().execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+        return {'indexed_files': count, 'last_refresh': self.last_refresh, **self.last_stats}
+
+
+def make_snippet(body: str, terms: List[str], width: int = SNIPPET_CHARS) -> str:
+    """HTML-escaped window around the first match, matches wrapped in <mark>"""
+    lower = body.lower()
+    hits = [lower.find(t) for t in terms]
+    hits = [h for h in hits if h >= 0]
+    start = max(0, min(hits) - width // 3) if hits else 0
+    window = body[start:start + width]
+    window = re.sub(r'\s+', ' ', window).strip()
+    prefix = '…' if start > 0 else ''
+    suffix = '…' if start + width < len(body) else ''
+
+    pattern = re.compile('|'.join(re.escape(t) for t in sorted(terms, key=len, reverse=True)), re.IGNORECASE)
+    parts = []
+    last = 0
+    for m in pattern.finditer(window):
+        parts.append(html.escape(window[last:m.start()]))
+        parts.append(f"<mark>{html.escape(m.group())}</mark>")
+        last = m.end()
+    parts.append(html.escape(window[last:]))
+    return prefix + ''.join(parts) + suffix
+
+
+if __name__ == '__main__':
+    index = WorkspaceIndex()
+    command = sys.argv[1] if len(sys.argv) > 1 else 'refresh'
+
+    if command == 'refresh':
+        print(f"🔎 Indexing {index.root}...")
+        stats = index.refresh()
+        print(f"✅ {stats['files']} files ({stats['updated']} updated, {stats['removed']} removed) "
+              f"in {stats['seconds']}s")
+    elif command == 'search':
+        query = ' '.join(sys.argv[2:])
+        started = time.time()
+        results = index.search(query)
+        elapsed = (time.time() - started) * 1000
+        for result in results:
+            snippet = re.sub(r'</?mark>', '**', html.unescape(result['snippet']))
+            print(f"📄 {result['name']}  ({result['score']})\n   {snippet}")
+        print(f"\n{len(results)} results in {elapsed:.1f}ms")
+    else:
+        print(__doc__)
@@ -96,6 +96,24 @@ def add_template(recipient_type: str, email_type: str, variation: str,
     
     return template_id
 
+def add_templates(templates: List[Dict]) -> List[int]:
+    """Add several generated templates in one transaction, returns their ids"""
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    template_ids = []
+    with conn:
+        for t in templates:
+            cursor.execute('''
+                INSERT INTO templates (recipient_type, email_type, variation, subject, body, context)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (t['recipient_type'], t['email_type'], t['variation'],
+                  t['subject'], t['body'], t.get('context')))
+            template_ids.append(cursor.lastrowid)
+    conn.close()
+    
+    return template_ids
+
 def add_successful_email(recipient_type: str, email_type: str, subject: str,
                         body: str, context: str = None, outcome: str = None,
                         conversion_rate: float = None):
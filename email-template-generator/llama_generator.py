@@ -3,24 +3,29 @@ Email Template Generator - Llama LLM Integration
 Uses local Ollama/Llama to generate personalized email templates
 """
 
-import ollama
 import json
-from typing import List, Dict, Tuple
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterator, List, Dict, Tuple
 import database as db
 from pattern_learner import PatternLearner
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+from local_llm import get_client
+
+TONES = ['formal', 'casual', 'urgent']
+
 class LlamaEmailGenerator:
     """Generate emails using local Llama LLM"""
     
-    def __init__(self, model: str = "llama3.1:8b"):
+    def __init__(self, model: str = "llama3.1:8b", llm=None):
         self.model = model
         self.pattern_learner = PatternLearner()
+        self.llm = llm or get_client()
         
-        # Verify Ollama is running
-        try:
-            ollama.list()
-        except Exception as e:
-            raise RuntimeError(f"Ollama not available: {e}")
+        # Verify Ollama is running (LLMError is a RuntimeError)
+        self.llm.models()
     
     def generate_email_variations(self, 
                                   recipient_type: str,
@@ -37,46 +42,64 @@ class LlamaEmailGenerator:
         Returns:
             List of 3 email dictionaries (formal, casual, urgent)
         """
+        by_tone = {
+            email['variation']: email
+            for email in self.iter_email_variations(recipient_type, email_type, context)
+        }
+        return [by_tone[tone] for tone in TONES]
+    
+    def iter_email_variations(self,
+                              recipient_type: str,
+                              email_type: str,
+                              context: str = None) -> Iterator[Dict]:
+        """
+        Yield each variation as soon as its model call finishes
         
-        # Get pattern-based recommendations
-        recommendations = self.pattern_learner.get_recommendations(recipient_type, email_type)
-        
-        # Get past successful emails for reference
-        past_emails = db.get_successful_emails(recipient_type, email_type)
+        All tones are generated concurrently (the shared local LLM client
+        caps how many reach the model at once). Once every tone is done they
+        are stored in one transaction and each yielded dict gets its
+        'template_id'. Closing the iterator early stores nothing.
+        """
         
-        # Generate each variation
-        variations = []
+        # Pattern-based recommendations and top 2 past successful emails (cached per type)
+        recommendations = self.pattern_learner.get_recommendations(recipient_type, email_type)
+        past_emails = self.pattern_learner.get_successful_examples(recipient_type, email_type, limit=2)
         
-        for tone in ['formal', 'casual', 'urgent']:
-            email = self._generate_single_email(
+        pool = ThreadPoolExecutor(max_workers=len(TONES))
+        futures = {
+            pool.submit(
+                self._generate_single_email,
                 recipient_type=recipient_type,
                 email_type=email_type,
                 tone=tone,
                 context=context,
                 recommendations=recommendations,
-                past_emails=past_emails[:2]  # Use top 2 examples
-            )
-            
-            variations.append({
-                'variation': tone,
-                'subject': email['subject'],
-                'body': email['body'],
-                'recipient_type': recipient_type,
-                'email_type': email_type,
-                'context': context
-            })
-            
-            # Store in database
-            db.add_template(
-                recipient_type=recipient_type,
-                email_type=email_type,
-                variation=tone,
-                subject=email['subject'],
-                body=email['body'],
-                context=context
-            )
+                past_emails=past_emails
+            ): tone
+            for tone in TONES
+        }
+        
+        variations = []
+        try:
+            for future in as_completed(futures):
+                email = future.result()
+                variation = {
+                    'variation': futures[future],
+                    'subject': email['subject'],
+                    'body': email['body'],
+                    'recipient_type': recipient_type,
+                    'email_type': email_type,
+                    'context': context
+                }
+                variations.append(variation)
+                yield variation
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
         
-        return variations
+        # Store in database
+        template_ids = db.add_templates(variations)
+        for variation, template_id in zip(variations, template_ids):
+            variation['template_id'] = template_id
     
     def _generate_single_email(self,
                                recipient_type: str,
@@ -99,14 +122,16 @@ class LlamaEmailGenerator:
         
         # Call Llama
         try:
-            response = ollama.generate(
+            response = self.llm.generate(
+                prompt,
                 model=self.model,
-                prompt=prompt,
                 options={
                     'temperature': 0.7 if tone == 'casual' else 0.5,
                     'top_p': 0.9,
                     'num_predict': 500
-                }
+                },
+                caller='email_template_generator',
+                cache=False  # Each request stores new templates
             )
             
             # Parse response
@@ -4,7 +4,8 @@ Analyzes successful emails and extracts reusable patterns
 """
 
 import re
-from typing import List, Dict, Tuple
+import threading
+from typing import List, Dict, Optional, Tuple
 from collections import Counter
 import database as db
 
@@ -12,7 +13,31 @@ class PatternLearner:
     """Learns from successful emails and extracts patterns"""
     
     def __init__(self):
-        pass
+        # (recipient_type, email_type) -> {'recommendations': ..., 'examples': ...}
+        self._cache: Dict[Tuple[str, str], Dict] = {}
+        self._cache_lock = threading.Lock()
+        self._generation = 0  # Bumped on invalidate so in-flight loads aren't cached
+    
+    def invalidate(self, recipient_type: Optional[str] = None, email_type: Optional[str] = None):
+        """Drop cached recommendations/examples (None matches any type)"""
+        with self._cache_lock:
+            self._generation += 1
+            for key in list(self._cache):
+                if recipient_type in (None, key[0]) and email_type in (None, key[1]):
+                    del self._cache[key]
+    
+    def _cached(self, recipient_type: str, email_type: str, name: str, load):
+        key = (recipient_type, email_type)
+        with self._cache_lock:
+            entry = self._cache.get(key, {})
+            if name in entry:
+                return entry[name]
+            generation = self._generation
+        value = load()
+        with self._cache_lock:
+            if generation == self._generation:
+                self._cache.setdefault(key, {})[name] = value
+        return value
     
     def analyze_successful_emails(self, recipient_type: str = None, email_type: str = None):
         """Analyze successful emails and extract patterns"""
@@ -42,6 +67,7 @@ class PatternLearner:
                 pattern_data=pattern['data'],
                 effectiveness_score=pattern['score']
             )
+        self.invalidate()
         
         return patterns
     
@@ -185,7 +211,23 @@ class PatternLearner:
         return patterns
     
     def get_recommendations(self, recipient_type: str, email_type: str) -> Dict:
-        """Get pattern-based recommendations for generating new emails"""
+        """
+        Get pattern-based recommendations for generating new emails
+        
+        Cached per (recipient_type, email_type) until invalidate(); feedback
+        and pattern analysis through this learner invalidate automatically.
+        """
+        return self._cached(recipient_type, email_type, 'recommendations',
+                            lambda: self._load_recommendations(recipient_type, email_type))
+    
+    def get_successful_examples(self, recipient_type: str, email_type: str, limit: int = 2) -> List[Dict]:
+        """Top past successful emails for prompting, cached like get_recommendations"""
+        examples = self._cached(recipient_type, email_type, 'examples',
+                                lambda: db.get_successful_emails(recipient_type, email_type))
+        return examples[:limit]
+    
+    def _load_recommendations(self, recipient_type: str, email_type: str) -> Dict:
+        """Uncached get_recommendations"""
         # Get relevant patterns
         structure = db.get_patterns('structure', min_effectiveness=0.5)
         phrases = db.get_patterns('phrases', min_effectiveness=0.5)
@@ -221,6 +263,7 @@ class PatternLearner:
         patterns = db.get_patterns()
         for pattern in patterns:
             db.update_pattern_effectiveness(pattern['id'], delta)
+        self.invalidate()
 
 def seed_sample_emails():
     """Add sample successful emails for testing"""
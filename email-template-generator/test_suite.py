@@ -6,6 +6,9 @@ Tests all components: database, pattern learning, LLM generation, CLI
 
 import sys
 import os
+import tempfile
+import threading
+import time
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 import database as db
@@ -176,10 +179,94 @@ def test_full_workflow():
         traceback.print_exc()
         return False
 
+class SlowLLM:
+    """Stand-in for the shared local LLM client; each tone takes a different time"""
+    
+    DELAYS = {'formal': 0.3, 'casual': 0.1, 'urgent': 0.2}
+    
+    def __init__(self):
+        self.prompts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+    
+    def models(self):
+        return ['llama3.1:8b']
+    
+    def generate(self, prompt, **kwargs):
+        tone = next(t for t in self.DELAYS if f"Generate a {t} email" in prompt)
+        with self.lock:
+            self.prompts.append(prompt)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.DELAYS[tone])
+        with self.lock:
+            self.in_flight -= 1
+        return {'response': f"Subject: {tone} hello\n\nHi there,\n\nA {tone} note.\n\nRoss"}
+
+def test_concurrent_variations():
+    """Test variations are generated concurrently, streamed in finish order and stored together"""
+    print("\n" + "="*70)
+    print("TEST 5: CONCURRENT VARIATIONS")
+    print("="*70)
+    
+    original_db = db.DB_PATH
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            db.DB_PATH = os.path.join(tmp, 'templates.db')
+            db.init_db()
+            db.add_successful_email('golf_student', 'inquiry_response', 'First example',
+                                    'Happy to help with your swing.', conversion_rate=0.5)
+            
+            llm = SlowLLM()
+            generator = LlamaEmailGenerator(llm=llm)
+            
+            start = time.time()
+            streamed = [v['variation'] for v in generator.iter_email_variations(
+                'golf_student', 'inquiry_response', 'Slices off the tee')]
+            elapsed = time.time() - start
+            assert streamed == ['casual', 'urgent', 'formal'], streamed
+            assert llm.max_in_flight == 3 and elapsed < 0.5, elapsed
+            print(f"✅ 3 variations in {elapsed:.2f}s, streamed as they finished: {streamed}")
+            
+            stored = db.get_templates(recipient_type='golf_student')
+            assert sorted(t['variation'] for t in stored) == sorted(streamed)
+            print(f"✅ Stored {len(stored)} templates in one transaction")
+            
+            # Recommendations/examples are cached until invalidated
+            db.add_successful_email('golf_student', 'inquiry_response', 'Second example',
+                                    'Let us fix that slice.', conversion_rate=0.9)
+            variations = generator.generate_email_variations('golf_student', 'inquiry_response')
+            assert [v['variation'] for v in variations] == ['formal', 'casual', 'urgent']
+            assert all(v['template_id'] for v in variations)
+            assert 'Second example' not in llm.prompts[-1]
+            generator.pattern_learner.invalidate('golf_student', 'inquiry_response')
+            generator.generate_email_variations('golf_student', 'inquiry_response')
+            assert 'Second example' in llm.prompts[-1]
+            print("✅ Pattern cache serves repeats and refreshes on invalidation")
+            
+            # Abandoned stream stores nothing
+            stream = generator.iter_email_variations('partner', 'collaboration')
+            next(stream)
+            stream.close()
+            assert db.get_templates(recipient_type='partner') == []
+            print("✅ Closed stream stored nothing")
+        
+        print("\n✅ CONCURRENT VARIATION TESTS PASSED")
+        return True
+        
+    except Exception as e:
+        print(f"\n❌ CONCURRENT VARIATION TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        db.DB_PATH = original_db
+
 def test_cli_interface():
     """Test CLI can be imported and initialized"""
     print("\n" + "="*70)
-    print("TEST 5: CLI INTERFACE")
+    print("TEST 6: CLI INTERFACE")
     print("="*70)
     
     try:
@@ -216,6 +303,7 @@ def run_all_tests():
         'Pattern Learning': test_pattern_learning(),
         'Llama Generation': test_llama_generation(),
         'Full Workflow': test_full_workflow(),
+        'Concurrent Variations': test_concurrent_variations(),
         'CLI Interface': test_cli_interface()
     }
     
@@ -3,23 +3,24 @@ Email Template Generator - Web Dashboard
 Browse, edit, copy, and manage email templates
 """
 
-from flask import Flask, render_template, request, jsonify, send_from_directory
+from flask import Flask, Response, render_template, request, jsonify, send_from_directory, stream_with_context
 from flask_cors import CORS
+import json
 import sys
 import os
+import time
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import database as db
 from llama_generator import LlamaEmailGenerator
-from pattern_learner import PatternLearner
 
 app = Flask(__name__)
 CORS(app)
 
 generator = LlamaEmailGenerator()
-learner = PatternLearner()
+learner = generator.pattern_learner  # Shared, so feedback invalidates the generator's cache
 
 @app.route('/')
 def index():
@@ -53,6 +54,38 @@ def api_generate():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/generate/stream', methods=['GET'])
+def api_generate_stream():
+    """Generate new email templates, streaming each variation as it finishes (SSE)"""
+    recipient_type = request.args.get('recipient_type')
+    email_type = request.args.get('email_type')
+    context = request.args.get('context') or None
+    
+    if not recipient_type or not email_type:
+        return jsonify({'error': 'recipient_type and email_type required'}), 400
+    
+    def events():
+        start = time.time()
+        try:
+            variations = []
+            for variation in generator.iter_email_variations(recipient_type, email_type, context):
+                variations.append(variation)
+                payload = {**variation, 'elapsed': round(time.time() - start, 2)}
+                yield f"event: variation\ndata: {json.dumps(payload)}\n\n"
+            done = {
+                'template_ids': {v['variation']: v['template_id'] for v in variations},
+                'elapsed': round(time.time() - start, 2)
+            }
+            yield f"event: done\ndata: {json.dumps(done)}\n\n"
+        except Exception as e:
+            yield f"event: failed\ndata: {json.dumps({'error': str(e)})}\n\n"
+    
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/api/templates', methods=['GET'])
 def api_templates():
     """Get templates with filters"""
@@ -131,6 +164,8 @@ def api_feedback(template_id):
     # Update patterns if converted
     if converted:
         learner.update_from_feedback(template_id, converted=True)
+    else:
+        learner.invalidate()  # Usage counts still change the best templates
     
     return jsonify({
         'success': True,
@@ -165,6 +200,7 @@ def api_add_successful_email():
         outcome=data.get('outcome'),
         conversion_rate=data.get('conversion_rate')
     )
+    learner.invalidate(data.get('recipient_type'), data.get('email_type'))
     
     return jsonify({
         'success': True,
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Transaction Categorizer
+
+Categorizes transactions in three tiers, cheapest first:
+1. Merchant memo - normalized merchant -> category, learned from past model answers
+2. Compiled keyword rules
+3. Local model, only for merchants neither tier knows, many merchants per prompt
+
+The memo lives in ~/clawd/finance/merchant_categories.json. Edit it to fix a
+merchant for good: entries with "source": "manual" are never overwritten.
+"""
+
+import json
+import re
+import sys
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+from local_llm import get_client
+
+FINANCE_DIR = Path.home() / "clawd" / "finance"
+MEMO_FILE = FINANCE_DIR / "merchant_categories.json"
+MODEL = "qwen2.5:14b"
+BATCH_SIZE = 25
+
+CATEGORIES = ['Housing', 'Food', 'Transportation', 'Entertainment',
+              'Shopping', 'Health', 'Income', 'Transfer', 'Other']
+
+CATEGORY_HINTS = """- Housing (rent, mortgage, utilities)
+- Food (groceries, restaurants, delivery)
+- Transportation (gas, uber, car payment)
+- Entertainment (movies, games, subscriptions)
+- Shopping (clothes, amazon, etc)
+- Health (gym, medical, insurance)
+- Income (salary, freelance, refunds)
+- Transfer (between accounts, venmo friends)
+- Other"""
+
+# Checked in order; first match wins ("uber eats" is Food before "uber" is Transportation)
+RULES = [(category, re.compile(r'\b(?:' + '|'.join(keywords) + r')', re.IGNORECASE)) for category, keywords in [
+    ('Housing', [r'rent\b', r'mortgage', r'utilit', r'electric', r'water\b', r'internet', r'comcast', r'xfinity',
+                 r'verizon fios', r'duquesne light', r'peoples gas']),
+    ('Food', [r'restaurant', r'food', r'grocer', r'chipotle', r'doordash', r'uber\s*eats', r'grubhub',
+              r'starbucks', r'mcdonald', r'giant eagle', r'whole foods', r'trader joe', r'aldi\b', r'wegmans',
+              r'pizza', r'cafe\b', r'coffee']),
+    ('Transportation', [r'gas\b', r'fuel', r'uber\b', r'lyft', r'car\b', r'auto\b', r'sheetz', r'shell\b',
+                        r'exxon', r'sunoco', r'getgo', r'parking', r'toll']),
+    ('Entertainment', [r'netflix', r'spotify', r'movie', r'game', r'steam', r'hulu', r'disney\s*plus',
+                       r'hbo', r'youtube', r'twitch', r'cinema', r'amc\b']),
+    ('Shopping', [r'amazon', r'amzn', r'target\b', r'walmart', r'store\b', r'best\s*buy', r'costco', r'ebay',
+                  r'etsy']),
+    ('Health', [r'gym\b', r'fitness', r'doctor', r'pharmacy', r'insurance', r'cvs\b', r'walgreens',
+                r'planet fitness', r'dental', r'medical']),
+    ('Income', [r'payroll', r'direct dep', r'salary', r'stripe transfer', r'interest paid']),
+]]
+
+# Processor prefixes, card/reference numbers, dates and locations carry no merchant signal
+_NOISE = [
+    r'^(?:pos|debit card|debit|purchase|recurring|ach|checkcard|check card|card)\s+(?:purchase\s+)?',
+    r'^(?:sq|tst|sp|pp|paypal|dd|ic|pos)\s*\*\s*',
+    r'\b\d{2}/\d{2}(?:/\d{2,4})?\b',
+    r'(?:#|x{2,}|\*{2,})\s*\w*',
+    r'\b[a-z]*\d[\w-]*\b',
+    r'\b(?:www\.|\.com\b|\.net\b|\.org\b)',
+    r'\s+(?:al|ak|az|ar|ca|co|ct|de|fl|ga|hi|id|il|in|ia|ks|ky|la|me|md|ma|mi|mn|ms|mo|mt|ne|nv|nh|nj|nm|'
+    r'ny|nc|nd|oh|ok|or|pa|ri|sc|sd|tn|tx|ut|vt|va|wa|wv|wi|wy|dc)$',
+]
+_NOISE = [re.compile(pattern) for pattern in _NOISE]
+_SEPARATORS = re.compile(r'[^a-z&\' ]+')
+
+
+def normalize_merchant(description: str) -> str:
+    """'SQ *BLUE BOTTLE 1234 PITTSBURGH PA' -> 'blue bottle pittsburgh'"""
+    text = description.lower().strip()
+    text = re.sub(r'^(?:venmo|cash app):\s*', '', text)
+    for pattern in _NOISE:
+        text = pattern.sub(' ', text).strip()
+    text = _SEPARATORS.sub(' ', text)
+    words = text.split()
+    if words[:1] == ['the']:
+        words = words[1:]
+    return ' '.join(words[:3])
+
+
+def match_rules(description: str) -> Optional[str]:
+    for category, pattern in RULES:
+        if pattern.search(description):
+            return category
+    return None
+
+
+def fallback_category(amount: float) -> str:
+    """Last resort when nothing else knows the merchant"""
+    if amount > 1000:  # Likely salary/large transfer
+        return 'Income'
+    return 'Other'
+
+
+class MerchantMemo:
+    """Persistent merchant -> category map, safe to share between import threads"""
+
+    def __init__(self, path: Path = MEMO_FILE):
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        self.entries: Dict[str, Dict] = {}
+        self.dirty = False
+        if self.path.exists():
+            try:
+                self.entries = json.loads(self.path.read_text())
+            except json.JSONDecodeError:
+                print(f"  ⚠️  Ignoring unreadable merchant memo: {self.path}")
+
+    def get(self, merchant: str) -> Optional[str]:
+        with self.lock:
+            entry = self.entries.get(merchant)
+            if entry:
+                entry['hits'] = entry.get('hits', 0) + 1
+                self.dirty = True
+                return entry['category']
+        return None
+
+    def learn(self, merchant: str, category: str, source: str = 'model'):
+        with self.lock:
+            existing = self.entries.get(merchant)
+            if existing and existing.get('source') == 'manual':
+                return
+            self.entries[merchant] = {'category': category, 'source': source,
+                                      'hits': existing.get('hits', 0) if existing else 0}
+            self.dirty = True
+
+    def save(self):
+        with self.lock:
+            if not self.dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix('.tmp')
+            tmp.write_text(json.dumps(self.entries, indent=2, sort_keys=True))
+            tmp.replace(self.path)
+            self.dirty = False
+
+
+class Categorizer:
+    """
+    Memo -> rules -> batched model
+
+    Args:
+        memo: MerchantMemo (shared by every source in an import run)
+        llm: Object with generate(prompt, **kw) -> {'response': ...}; defaults to the shared local client
+        batch_size: Unknown merchants per model prompt
+    """
+
+    def __init__(self, memo: Optional[MerchantMemo] = None, llm=None, batch_size: int = BATCH_SIZE):
+        self.memo = memo if memo is not None else MerchantMemo()
+        self.llm = llm
+        self.batch_size = batch_size
+        self.lock = threading.Lock()
+        self._pending: Dict[str, Future] = {}
+        self.stats = {'rows': 0, 'memo_hits': 0, 'rule_hits': 0, 'model_calls': 0,
+                      'model_merchants': 0, 'fallbacks': 0}
+
+    def _count(self, key: str, n: int = 1):
+        with self.lock:
+            self.stats[key] += n
+
+    def categorize(self, description: str, amount: float) -> str:
+        return self.categorize_many([(description, amount)])[0]
+
+    def categorize_many(self, rows: List[Tuple[str, float]]) -> List[str]:
+        """Categories for [(description, amount)], in order"""
+        self._count('rows', len(rows))
+        merchants = [normalize_merchant(description) or description.lower().strip() for description, _ in rows]
+        resolved: Dict[str, Optional[str]] = {}
+        unknown: Dict[str, Tuple[str, float]] = {}
+
+        for (description, amount), merchant in zip(rows, merchants):
+            if merchant in resolved or merchant in unknown:
+                continue
+            category = self.memo.get(merchant)
+            if category:
+                self._count('memo_hits')
+            else:
+                category = match_rules(description)
+                if category:
+                    self._count('rule_hits')
+            if category:
+                resolved[merchant] = category
+            else:
+                unknown[merchant] = (description, amount)
+
+        # Another import thread may already be asking the model about a merchant
+        mine: Dict[str, Future] = {}
+        theirs: Dict[str, Future] = {}
+        with self.lock:
+            for merchant in unknown:
+                if merchant in self._pending:
+                    theirs[merchant] = self._pending[merchant]
+                else:
+                    mine[merchant] = self._pending[merchant] = Future()
+
+        try:
+            answers = self._ask_model([(m, *unknown[m]) for m in mine])
+        except Exception:
+            answers = {}
+        for merchant, future in mine.items():
+            category = answers.get(merchant)
+            if category:
+                self.memo.learn(merchant, category)
+            future.set_result(category)
+        with self.lock:
+            for merchant in mine:
+                self._pending.pop(merchant, None)
+
+        for merchant, future in {**mine, **theirs}.items():
+            resolved[merchant] = future.result()
+
+        categories = []
+        for (description, amount), merchant in zip(rows, merchants):
+            category = resolved.get(merchant)
+            if not category:
+                self._count('fallbacks')
+                category = fallback_category(amount)
+            categories.append(category)
+        return categories
+
+    def _ask_model(self, unknown: List[Tuple[str, str, float]]) -> Dict[str, str]:
+        """One prompt per batch of unknown merchants -> {merchant: category}"""
+        answers = {}
+        llm = self.llm or get_client()
+        for start in range(0, len(unknown), self.batch_size):
+            batch = unknown[start:start + self.batch_size]
+            lines = '\n'.join(f"{i}. {description} (${amount:,.2f})"
+                              for i, (_, description, amount) in enumerate(batch, 1))
+            prompt = f"""Categorize each financial transaction into ONE category.
+
+Transactions:
+{lines}
+
+Categories:
+{CATEGORY_HINTS}
+
+Respond with one line per transaction, in order, formatted as "<number>. <Category>".
+Use ONLY the category names above, nothing else."""
+
+            self._count('model_calls')
+            try:
+                response = llm.generate(prompt, model=MODEL, temperature=0.2, max_tokens=12 * len(batch) + 20,
+                                        caller="csv_importer", timeout=120)['response']
+            except Exception as e:
+                print(f"  ⚠️  Model batch failed ({len(batch)} merchants): {e}")
+                continue
+
+            for number, category in parse_numbered_categories(response).items():
+                if 1 <= number <= len(batch):
+                    answers[batch[number - 1][0]] = category
+            self._count('model_merchants', len(batch))
+        return answers
+
+
+def parse_numbered_categories(response: str) -> Dict[int, str]:
+    """'1. Food\\n2) Shopping' -> {1: 'Food', 2: 'Shopping'}; unknown category names are dropped"""
+    valid = {c.lower(): c for c in CATEGORIES}
+    parsed = {}
+    for match in re.finditer(r'^\s*(\d+)\s*[.):\-]\s*\**([A-Za-z]+)', response, re.MULTILINE):
+        category = valid.get(match.group(2).lower())
+        if category:
+            parsed[int(match.group(1))] = category
+    return parsed
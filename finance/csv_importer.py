@@ -14,97 +14,46 @@ Usage:
 
 import csv
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-import urllib.request
+
+from categorizer import Categorizer
 
 FINANCE_DIR = Path.home() / "clawd" / "finance"
 DATA_DIR = FINANCE_DIR / "data"
 TRANSACTIONS_FILE = FINANCE_DIR / "transactions.json"
-OLLAMA_URL = "http://localhost:11434/api/generate"
 
 # Ensure directories exist
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 
-def call_local_ai(prompt, temperature=0.3):
-    """Use local AI for categorization"""
-    try:
-        data = json.dumps({
-            "model": "qwen2.5:14b",
-            "prompt": prompt,
-            "temperature": temperature,
-            "stream": False
-        }).encode('utf-8')
-        
-        req = urllib.request.Request(
-            OLLAMA_URL,
-            data=data,
-            headers={'Content-Type': 'application/json'}
-        )
-        
-        with urllib.request.urlopen(req, timeout=30) as response:
-            result = json.loads(response.read().decode('utf-8'))
-            return result.get("response")
-    except:
-        return None
+_categorizer = None
+
+def get_categorizer():
+    """Shared memo -> rules -> batched model categorizer"""
+    global _categorizer
+    if _categorizer is None:
+        _categorizer = Categorizer()
+    return _categorizer
 
 def categorize_transaction(description, amount):
     """
-    Use local AI to categorize transaction
+    Categorize one transaction (merchant memo, then rules, then local AI)
     
     Returns category like: Housing, Food, Transportation, Entertainment, etc.
     """
-    
-    prompt = f"""Categorize this financial transaction into ONE category.
-
-Transaction: {description}
-Amount: ${amount}
-
-Categories:
-- Housing (rent, mortgage, utilities)
-- Food (groceries, restaurants, delivery)
-- Transportation (gas, uber, car payment)
-- Entertainment (movies, games, subscriptions)
-- Shopping (clothes, amazon, etc)
-- Health (gym, medical, insurance)
-- Income (salary, freelance, refunds)
-- Transfer (between accounts, venmo friends)
-- Other
+    return get_categorizer().categorize(description, amount)
 
-Respond with ONLY the category name, nothing else."""
-
-    response = call_local_ai(prompt, temperature=0.2)
-    
-    if response:
-        # Clean response
-        category = response.strip().split('\n')[0].strip()
-        # Validate it's one of our categories
-        valid_categories = ['Housing', 'Food', 'Transportation', 'Entertainment', 
-                           'Shopping', 'Health', 'Income', 'Transfer', 'Other']
-        if category in valid_categories:
-            return category
-    
-    # Fallback: simple keyword matching
-    desc_lower = description.lower()
-    
-    if any(kw in desc_lower for kw in ['rent', 'mortgage', 'utility', 'electric', 'water', 'internet']):
-        return 'Housing'
-    elif any(kw in desc_lower for kw in ['restaurant', 'food', 'grocery', 'chipotle', 'doordash', 'uber eats']):
-        return 'Food'
-    elif any(kw in desc_lower for kw in ['gas', 'fuel', 'uber', 'lyft', 'car', 'auto']):
-        return 'Transportation'
-    elif any(kw in desc_lower for kw in ['netflix', 'spotify', 'movie', 'game', 'steam']):
-        return 'Entertainment'
-    elif any(kw in desc_lower for kw in ['amazon', 'target', 'walmart', 'store']):
-        return 'Shopping'
-    elif any(kw in desc_lower for kw in ['gym', 'fitness', 'doctor', 'pharmacy', 'insurance']):
-        return 'Health'
-    elif amount > 1000:  # Likely salary/large transfer
-        return 'Income' if amount > 0 else 'Transfer'
-    else:
-        return 'Other'
+def categorize_all(transactions, categorizer=None):
+    """Fill in 'category' for every transaction with one batched pass"""
+    categorizer = categorizer or get_categorizer()
+    categories = categorizer.categorize_many([(t['description'], t['amount']) for t in transactions])
+    for transaction, category in zip(transactions, categories):
+        transaction['category'] = category
+    return transactions
 
-def import_pnc(file_path):
+def import_pnc(file_path, categorizer=None):
     """Import PNC Bank CSV"""
     transactions = []
     
@@ -128,10 +77,10 @@ def import_pnc(file_path):
                         'date': date_str,
                         'description': description,
                         'amount': amount,
-                        'account': 'PNC Bank',
-                        'category': categorize_transaction(description, amount)
+                        'account': 'PNC Bank'
                     })
         
+        categorize_all(transactions, categorizer)
         print(f"  ✅ Imported {len(transactions)} transactions from PNC")
         return transactions
     
@@ -139,7 +88,7 @@ def import_pnc(file_path):
         print(f"  ❌ Error importing PNC: {e}")
         return []
 
-def import_chase(file_path):
+def import_chase(file_path, categorizer=None):
     """Import Chase CSV"""
     transactions = []
     
@@ -159,10 +108,10 @@ def import_chase(file_path):
                         'date': date_str,
                         'description': description,
                         'amount': amount,
-                        'account': 'Chase Card',
-                        'category': categorize_transaction(description, amount)
+                        'account': 'Chase Card'
                     })
         
+        categorize_all(transactions, categorizer)
         print(f"  ✅ Imported {len(transactions)} transactions from Chase")
         return transactions
     
@@ -170,7 +119,7 @@ def import_chase(file_path):
         print(f"  ❌ Error importing Chase: {e}")
         return []
 
-def import_venmo(file_path):
+def import_venmo(file_path, categorizer=None):
     """Import Venmo CSV"""
     transactions = []
     
@@ -204,7 +153,7 @@ def import_venmo(file_path):
         print(f"  ❌ Error importing Venmo: {e}")
         return []
 
-def import_cashapp(file_path):
+def import_cashapp(file_path, categorizer=None):
     """Import Cash App CSV"""
     transactions = []
     
@@ -237,30 +186,42 @@ def import_cashapp(file_path):
         print(f"  ❌ Error importing Cash App: {e}")
         return []
 
-def import_all():
-    """Import from all available CSV files"""
+def find_sources(data_dir=None):
+    """(name, importer, file) for each source with a CSV in data_dir"""
+    data_dir = Path(data_dir or DATA_DIR)
+    patterns = [
+        ('PNC', import_pnc, ["pnc*.csv", "PNC*.csv"]),
+        ('Chase', import_chase, ["chase*.csv", "Chase*.csv"]),
+        ('Venmo', import_venmo, ["venmo*.csv", "Venmo*.csv"]),
+        ('Cash App', import_cashapp, ["cashapp*.csv", "*cash*app*.csv"]),
+    ]
+    sources = []
+    for name, importer, globs in patterns:
+        files = [f for pattern in globs for f in data_dir.glob(pattern)]
+        if files:
+            sources.append((name, importer, files[0]))
+    return sources
+
+def import_all(data_dir=None, categorizer=None, output_file=None):
+    """Import from all available CSV files, one thread per source"""
     print("\n💰 IMPORTING TRANSACTIONS FROM CSVs")
     print("=" * 60)
-    print(f"📂 Looking in: {DATA_DIR}\n")
-    
-    all_transactions = []
+    print(f"📂 Looking in: {data_dir or DATA_DIR}\n")
     
-    # Try to import from each source
-    pnc_files = list(DATA_DIR.glob("pnc*.csv")) + list(DATA_DIR.glob("PNC*.csv"))
-    if pnc_files:
-        all_transactions.extend(import_pnc(pnc_files[0]))
+    categorizer = categorizer or get_categorizer()
+    started = time.time()
     
-    chase_files = list(DATA_DIR.glob("chase*.csv")) + list(DATA_DIR.glob("Chase*.csv"))
-    if chase_files:
-        all_transactions.extend(import_chase(chase_files[0]))
-    
-    venmo_files = list(DATA_DIR.glob("venmo*.csv")) + list(DATA_DIR.glob("Venmo*.csv"))
-    if venmo_files:
-        all_transactions.extend(import_venmo(venmo_files[0]))
-    
-    cashapp_files = list(DATA_DIR.glob("cashapp*.csv")) + list(DATA_DIR.glob("*cash*app*.csv"))
-    if cashapp_files:
-        all_transactions.extend(import_cashapp(cashapp_files[0]))
+    # Sources share the categorizer: one memo, and a merchant seen in two
+    # exports is only sent to the model once
+    sources = find_sources(data_dir)
+    all_transactions = []
+    if sources:
+        with ThreadPoolExecutor(max_workers=len(sources)) as pool:
+            futures = [pool.submit(importer, path, categorizer) for _, importer, path in sources]
+            for future in futures:
+                all_transactions.extend(future.result())
+    categorizer.memo.save()
+    elapsed = time.time() - started
     
     if not all_transactions:
         print("\n❌ No CSV files found in ~/clawd/finance/data/")
@@ -272,12 +233,21 @@ def import_all():
         return
     
     # Save all transactions
-    with open(TRANSACTIONS_FILE, 'w') as f:
+    output_file = output_file or TRANSACTIONS_FILE
+    with open(output_file, 'w') as f:
         json.dump(all_transactions, f, indent=2)
     
     print(f"\n✅ IMPORT COMPLETE")
     print(f"   Total transactions: {len(all_transactions)}")
-    print(f"   Saved to: {TRANSACTIONS_FILE}")
+    print(f"   Saved to: {output_file}")
+    
+    stats = categorizer.stats
+    print(f"\n🏷️  CATEGORIZATION ({elapsed:.1f}s wall time)")
+    print(f"   Rows:          {stats['rows']}")
+    print(f"   Memo hits:     {stats['memo_hits']} merchants")
+    print(f"   Rule hits:     {stats['rule_hits']} merchants")
+    print(f"   Model calls:   {stats['model_calls']} ({stats['model_merchants']} merchants)")
+    print(f"   Fallbacks:     {stats['fallbacks']} rows")
     
     # Generate quick stats
     income = sum(t['amount'] for t in all_transactions if t['amount'] > 0)
@@ -287,6 +257,8 @@ def import_all():
     print(f"   Income:   ${income:,.2f}")
     print(f"   Expenses: ${expenses:,.2f}")
     print(f"   Net:      ${income - expenses:,.2f}")
+    
+    return all_transactions
 
 if __name__ == "__main__":
     import_all()
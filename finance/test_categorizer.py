@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Tests for the memo -> rules -> batched model categorizer
+A stand-in model answers from a lookup table; no Ollama needed
+"""
+
+import csv
+import json
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from categorizer import Categorizer, MerchantMemo, normalize_merchant, parse_numbered_categories
+import csv_importer
+
+ANSWERS = {'blue bottle': 'Food', 'primanti bros': 'Food', 'home depot': 'Shopping', 'geico': 'Transportation'}
+
+
+class FakeLLM:
+    """Answers numbered batches; slow enough for parallel imports to overlap"""
+
+    def __init__(self):
+        self.prompts = []
+        self.lock = threading.Lock()
+
+    def generate(self, prompt, **kwargs):
+        with self.lock:
+            self.prompts.append(prompt)
+        time.sleep(0.05)
+        lines = []
+        for number, description in re.findall(r'^(\d+)\. (.+) \(\$', prompt, re.MULTILINE):
+            merchant = normalize_merchant(description)
+            category = next((c for name, c in ANSWERS.items() if merchant.startswith(name)), 'Mystery')
+            lines.append(f"{number}. {category}")
+        return {'response': '\n'.join(lines)}
+
+
+def test_normalize_merchant():
+    assert normalize_merchant('SQ *BLUE BOTTLE 1234 PITTSBURGH PA') == 'blue bottle pittsburgh'
+    assert normalize_merchant('POS PURCHASE CHIPOTLE 0456 PITTSBURGH PA') == 'chipotle pittsburgh'
+    assert normalize_merchant('DEBIT CARD PURCHASE XXXX1234 SHEETZ 0412') == 'sheetz'
+    assert normalize_merchant('NETFLIX.COM 866-579-7172 CA') == 'netflix'
+    assert normalize_merchant('Venmo: Rent split') == 'rent split'
+    assert parse_numbered_categories("1. Food\n2) **Shopping**\n3. Snacks\n4 - income") == {
+        1: 'Food', 2: 'Shopping', 4: 'Income'}
+
+
+def test_memo_rules_then_batched_model(tmp_path):
+    memo = MerchantMemo(tmp_path / 'memo.json')
+    memo.learn('geico', 'Health', source='manual')
+    llm = FakeLLM()
+    categorizer = Categorizer(memo=memo, llm=llm, batch_size=2)
+    rows = [
+        ('SQ *BLUE BOTTLE 1234', -6.5),
+        ('SQ *BLUE BOTTLE 5678', -7.0),       # Same merchant, different store number
+        ('CHIPOTLE 0456 PITTSBURGH PA', -12.0),
+        ('TST* PRIMANTI BROS', -18.0),
+        ('THE HOME DEPOT #4410', -80.0),
+        ('GEICO', -120.0),
+        ('ZELLE FROM ACME LLC', 2500.0),
+        ('MYSTERY MERCHANT', -5.0),
+    ]
+    assert categorizer.categorize_many(rows) == [
+        'Food', 'Food', 'Food', 'Food', 'Shopping', 'Health', 'Income', 'Other']
+    # blue bottle, primanti, home depot, zelle, mystery go to the model in batches of 2
+    stats = categorizer.stats
+    assert stats['memo_hits'] == 1 and stats['rule_hits'] == 1
+    assert stats['model_merchants'] == 5 and stats['model_calls'] == len(llm.prompts) == 3
+    assert stats['fallbacks'] == 2
+    memo.save()
+
+    # Next run: the memo answers what the model learned; the manual entry stayed put
+    learned = json.loads((tmp_path / 'memo.json').read_text())
+    assert learned['blue bottle']['category'] == 'Food' and learned['geico']['source'] == 'manual'
+    assert 'mystery merchant' not in learned
+    again = Categorizer(memo=MerchantMemo(tmp_path / 'memo.json'), llm=FakeLLM())
+    assert again.categorize('SQ *BLUE BOTTLE 9999', -5.0) == 'Food'
+    assert again.stats['model_calls'] == 0 and again.stats['memo_hits'] == 1
+
+
+def write_csv(path, header, rows):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def test_import_all_in_parallel(tmp_path):
+    data = tmp_path / 'data'
+    data.mkdir()
+    write_csv(data / 'pnc.csv', ['Date', 'Description', 'Debit', 'Credit'],
+              [['01/02/2026', 'SQ *BLUE BOTTLE 1234', '6.50', ''],
+               ['01/03/2026', 'PAYROLL ACME', '', '3000'],
+               ['01/04/2026', 'THE HOME DEPOT #4410', '80', '']])
+    write_csv(data / 'chase.csv', ['Transaction Date', 'Description', 'Amount'],
+              [['01/05/2026', 'SQ *BLUE BOTTLE 5678', '-7.00'],
+               ['01/06/2026', 'NETFLIX.COM', '-15.49']])
+    write_csv(data / 'venmo.csv', ['Datetime', 'Note', 'Amount (total)', 'Type'],
+              [['2026-01-07', 'pizza', '- $20.00', 'Payment']])
+
+    llm = FakeLLM()
+    categorizer = Categorizer(memo=MerchantMemo(tmp_path / 'memo.json'), llm=llm)
+    out = tmp_path / 'transactions.json'
+    transactions = csv_importer.import_all(data_dir=data, categorizer=categorizer, output_file=out)
+
+    by_description = {t['description']: t['category'] for t in json.loads(out.read_text())}
+    assert len(transactions) == 6
+    assert by_description == {'SQ *BLUE BOTTLE 1234': 'Food', 'PAYROLL ACME': 'Income',
+                              'THE HOME DEPOT #4410': 'Shopping', 'SQ *BLUE BOTTLE 5678': 'Food',
+                              'NETFLIX.COM': 'Entertainment', 'Venmo: pizza': 'Transfer'}
+    # blue bottle appears in PNC and Chase but is only asked about once
+    assert sum(p.count('BLUE BOTTLE') for p in llm.prompts) == 1
+    assert categorizer.stats['model_merchants'] == 2
+    assert (tmp_path / 'memo.json').exists()
+
+
+if __name__ == '__main__':
+    test_normalize_merchant()
+    for test in [test_memo_rules_then_batched_model, test_import_all_in_parallel]:
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ Categorizer tests passed")
@@ -6,58 +6,76 @@ Tracks calories, workouts, weight, and macros for Ross
 
 from flask import Flask, render_template, request, jsonify
 from datetime import datetime, timedelta
-import json
 import os
 
+from store import FitnessStore, day_range
+
 app = Flask(__name__)
 
-# Data file paths
+# Data directory: one append-only partition per log per day (see store.py)
 DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
-CALORIES_FILE = os.path.join(DATA_DIR, 'calories.json')
-WORKOUTS_FILE = os.path.join(DATA_DIR, 'workouts.json')
-WEIGHT_FILE = os.path.join(DATA_DIR, 'weight.json')
-MACROS_FILE = os.path.join(DATA_DIR, 'macros.json')
+DEFAULT_DAYS = 30
+MAX_LIMIT = 5000
+
+fresh_install = not os.path.exists(DATA_DIR)
+store = FitnessStore(DATA_DIR)
 
-# Initialize data files if they don't exist
+# Initialize data: import legacy JSON files, or seed a fresh install
 def init_data_files():
-    os.makedirs(DATA_DIR, exist_ok=True)
+    imported = store.import_legacy()
+    for kind, count in imported.items():
+        print(f"📦 Imported {count} {kind} entries into {os.path.join(DATA_DIR, kind)}/")
     
-    if not os.path.exists(CALORIES_FILE):
-        with open(CALORIES_FILE, 'w') as f:
-            json.dump([], f)
+    if not fresh_install:
+        return
     
-    if not os.path.exists(WORKOUTS_FILE):
-        # Pre-populate with initial workouts
-        workouts = [
-            {"date": "2025-02-08", "type": "Legs", "notes": "Previous week"},
-            {"date": "2025-02-10", "type": "Legs", "notes": ""},
-            {"date": "2025-02-11", "type": "Chest", "notes": ""}
-        ]
-        with open(WORKOUTS_FILE, 'w') as f:
-            json.dump(workouts, f, indent=2)
+    # Pre-populate with initial workouts
+    for workout in [
+        {"date": "2025-02-08", "type": "Legs", "notes": "Previous week"},
+        {"date": "2025-02-10", "type": "Legs", "notes": ""},
+        {"date": "2025-02-11", "type": "Chest", "notes": ""}
+    ]:
+        store.append('workouts', workout)
     
-    if not os.path.exists(WEIGHT_FILE):
-        # Pre-populate with initial weight
-        weights = [
-            {"date": "2025-02-08", "weight": 225}
-        ]
-        with open(WEIGHT_FILE, 'w') as f:
-            json.dump(weights, f, indent=2)
-    
-    if not os.path.exists(MACROS_FILE):
-        with open(MACROS_FILE, 'w') as f:
-            json.dump([], f)
+    # Pre-populate with initial weight
+    store.append('weight', {"date": "2025-02-08", "weight": 225})
 
 init_data_files()
 
 # Helper functions
-def load_json(filepath):
-    with open(filepath, 'r') as f:
-        return json.load(f)
+def parse_range():
+    """start/end (YYYY-MM-DD) or days from the query string; defaults to the last 30 days"""
+    end = request.args.get('end') or datetime.now().date().isoformat()
+    days = request.args.get('days', default=DEFAULT_DAYS, type=int)
+    start = request.args.get('start') or day_range(max(days, 1), end)[0]
+    for value in (start, end):
+        datetime.strptime(value, '%Y-%m-%d')
+    return start, end
+
+def list_entries(kind):
+    """GET handler: one page of a log, oldest first; X-Next-End points at the next (older) page"""
+    try:
+        start, end = parse_range()
+    except ValueError:
+        return jsonify({"status": "error", "message": "Dates must be YYYY-MM-DD"}), 400
+    limit = min(request.args.get('limit', default=500, type=int), MAX_LIMIT)
+    if limit < 1:
+        # An empty page would point X-Next-End back at the same range forever
+        return jsonify({"status": "error", "message": "limit must be at least 1"}), 400
+    
+    entries, next_end = store.query(kind, start, end, limit=limit)
+    response = jsonify(entries)
+    if next_end:
+        response.headers['X-Next-End'] = next_end
+    return response
 
-def save_json(filepath, data):
-    with open(filepath, 'w') as f:
-        json.dump(data, f, indent=2)
+def add_entry(kind, stamp=False):
+    """POST handler: append one entry"""
+    new_entry = request.json
+    if stamp:
+        new_entry['timestamp'] = datetime.now().isoformat()
+    store.append(kind, new_entry)
+    return jsonify({"status": "success", "entry": new_entry})
 
 # Routes
 @app.route('/')
@@ -67,92 +85,81 @@ def index():
 @app.route('/api/calories', methods=['GET', 'POST'])
 def calories():
     if request.method == 'GET':
-        data = load_json(CALORIES_FILE)
-        return jsonify(data)
+        return list_entries('calories')
     
     if request.method == 'POST':
-        data = load_json(CALORIES_FILE)
-        new_entry = request.json
-        new_entry['timestamp'] = datetime.now().isoformat()
-        data.append(new_entry)
-        save_json(CALORIES_FILE, data)
-        return jsonify({"status": "success", "entry": new_entry})
+        return add_entry('calories', stamp=True)
 
 @app.route('/api/workouts', methods=['GET', 'POST'])
 def workouts():
     if request.method == 'GET':
-        data = load_json(WORKOUTS_FILE)
-        return jsonify(data)
+        return list_entries('workouts')
     
     if request.method == 'POST':
-        data = load_json(WORKOUTS_FILE)
-        new_entry = request.json
-        data.append(new_entry)
-        save_json(WORKOUTS_FILE, data)
-        return jsonify({"status": "success", "entry": new_entry})
+        return add_entry('workouts')
 
 @app.route('/api/weight', methods=['GET', 'POST'])
 def weight():
     if request.method == 'GET':
-        data = load_json(WEIGHT_FILE)
-        return jsonify(data)
+        return list_entries('weight')
     
     if request.method == 'POST':
-        data = load_json(WEIGHT_FILE)
-        new_entry = request.json
-        data.append(new_entry)
-        save_json(WEIGHT_FILE, data)
-        return jsonify({"status": "success", "entry": new_entry})
+        return add_entry('weight')
 
 @app.route('/api/macros', methods=['GET', 'POST'])
 def macros():
     if request.method == 'GET':
-        data = load_json(MACROS_FILE)
-        return jsonify(data)
+        return list_entries('macros')
     
     if request.method == 'POST':
-        data = load_json(MACROS_FILE)
-        new_entry = request.json
-        new_entry['timestamp'] = datetime.now().isoformat()
-        data.append(new_entry)
-        save_json(MACROS_FILE, data)
-        return jsonify({"status": "success", "entry": new_entry})
+        return add_entry('macros', stamp=True)
+
+@app.route('/api/daily')
+def daily():
+    """Per-day totals (calories, protein, workout count, last weight) for a date range"""
+    try:
+        start, end = parse_range()
+    except ValueError:
+        return jsonify({"status": "error", "message": "Dates must be YYYY-MM-DD"}), 400
+    
+    days = {}
+    for kind, fields in [('calories', ['calories']), ('macros', ['protein', 'carbs', 'fat'])]:
+        for day, totals in store.daily(kind, start, end).items():
+            for field in fields:
+                if field in totals['sums']:
+                    days.setdefault(day, {})[field] = totals['sums'][field]
+    for day, totals in store.daily('workouts', start, end).items():
+        days.setdefault(day, {})['workouts'] = totals['count']
+    for day, totals in store.daily('weight', start, end).items():
+        days.setdefault(day, {})['weight'] = totals['last'].get('weight')
+    
+    return jsonify({"start": start, "end": end, "days": dict(sorted(days.items()))})
 
 @app.route('/api/summary')
 def summary():
-    """Get summary stats for the dashboard"""
-    calories = load_json(CALORIES_FILE)
-    workouts = load_json(WORKOUTS_FILE)
-    weights = load_json(WEIGHT_FILE)
-    macros = load_json(MACROS_FILE)
-    
-    today = datetime.now().date().isoformat()
+    """Get summary stats for the dashboard (running daily aggregates, no history scan)"""
+    today = datetime.now().date()
     
     # Today's calories
-    today_calories = sum(
-        entry.get('calories', 0) 
-        for entry in calories 
-        if entry.get('date', '').startswith(today)
-    )
+    today_calories = store.day_totals('calories', today.isoformat())['sums'].get('calories', 0)
     
-    # This week's workouts
-    week_ago = (datetime.now() - timedelta(days=7)).date().isoformat()
-    week_workouts = [w for w in workouts if w.get('date', '') >= week_ago]
+    # This week's workouts (last 7 days + today)
+    week_workouts = sum(
+        store.day_totals('workouts', (today - timedelta(days=i)).isoformat())['count']
+        for i in range(8)
+    )
     
     # Latest weight
-    latest_weight = weights[-1].get('weight') if weights else None
+    latest = store.latest('weight')
+    latest_weight = latest.get('weight') if latest else None
     
     # Today's protein
-    today_protein = sum(
-        entry.get('protein', 0)
-        for entry in macros
-        if entry.get('date', '').startswith(today)
-    )
+    today_protein = store.day_totals('macros', today.isoformat())['sums'].get('protein', 0)
     
     return jsonify({
         "today_calories": today_calories,
         "calorie_goal": 2200,
-        "week_workouts": len(week_workouts),
+        "week_workouts": week_workouts,
         "latest_weight": latest_weight,
         "today_protein": today_protein,
         "protein_goal": 200
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Append-only fitness log storage
+Each log kind (calories, workouts, weight, macros) is a directory of
+per-day JSONL partitions: data/<kind>/YYYY-MM-DD.jsonl. Writes append one
+line; nothing is ever rewritten. Daily aggregates (entry count, sums of
+numeric fields, last entry) are kept in memory and advanced by reading
+only the bytes appended since the last look, so summaries stay O(1)
+no matter how much history there is.
+
+Usage:
+    python store.py import [data_dir]    # Move legacy <kind>.json files into partitions
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+KINDS = ('calories', 'workouts', 'weight', 'macros')
+DAY_FILE = re.compile(r'^(\d{4}-\d{2}-\d{2})\.jsonl$')
+
+
+def entry_day(entry: Dict) -> str:
+    """Partition key: the entry's date (first 10 chars), else its timestamp, else today"""
+    for field in ('date', 'timestamp'):
+        value = str(entry.get(field) or '')[:10]
+        if re.match(r'^\d{4}-\d{2}-\d{2}$', value):
+            return value
+    return date.today().isoformat()
+
+
+class FitnessStore:
+    def __init__(self, data_dir: str):
+        self.data_dir = data_dir
+        self.lock = threading.Lock()
+        self._aggregates: Dict[Tuple[str, str], Dict] = {}
+        self._newest: Dict[str, Optional[str]] = {}
+        for kind in KINDS:
+            os.makedirs(os.path.join(data_dir, kind), exist_ok=True)
+
+    def _path(self, kind: str, day: str) -> str:
+        if kind not in KINDS:
+            raise ValueError(f"Unknown log: {kind}")
+        return os.path.join(self.data_dir, kind, f"{day}.jsonl")
+
+    def append(self, kind: str, entry: Dict) -> Dict:
+        """Append one entry to its day's partition and advance that day's aggregate"""
+        day = entry_day(entry)
+        line = json.dumps(entry) + '\n'
+        with self.lock:
+            with open(self._path(kind, day), 'a') as f:
+                f.write(line)
+            self._refresh(kind, day)
+            if kind in self._newest and day >= (self._newest[kind] or ''):
+                self._newest[kind] = day
+        return entry
+
+    def days(self, kind: str) -> List[str]:
+        """Days that have a partition, oldest first"""
+        names = os.listdir(os.path.join(self.data_dir, kind))
+        return sorted(m.group(1) for m in map(DAY_FILE.match, names) if m)
+
+    def read_day(self, kind: str, day: str) -> List[Dict]:
+        try:
+            with open(self._path(kind, day)) as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def query(self, kind: str, start: str, end: str, limit: int = 500) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Entries dated start..end (inclusive), oldest first
+
+        Walks back from `end` a whole day at a time until `limit` entries
+        are collected. Returns (entries, next_end): pass next_end as the
+        next page's `end` to keep paging back, None once the range is done.
+        """
+        in_range = [d for d in self.days(kind) if start <= d <= end]
+        pages: List[List[Dict]] = []
+        count = 0
+        next_end = None
+        for day in reversed(in_range):
+            if count >= limit:
+                next_end = day
+                break
+            entries = self.read_day(kind, day)
+            pages.append(entries)
+            count += len(entries)
+        return [e for page in reversed(pages) for e in page], next_end
+
+    def _refresh(self, kind: str, day: str) -> Dict:
+        """Fold any newly appended lines into the day's aggregate (caller holds the lock)"""
+        key = (kind, day)
+        agg = self._aggregates.get(key)
+        path = self._path(kind, day)
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            size = 0
+        if agg is None or size < agg['offset']:
+            agg = {'offset': 0, 'count': 0, 'sums': {}, 'last': None}
+            self._aggregates[key] = agg
+        if size == agg['offset']:
+            return agg
+
+        with open(path, 'rb') as f:
+            f.seek(agg['offset'])
+            chunk = f.read(size - agg['offset'])
+        complete = chunk[:chunk.rfind(b'\n') + 1]    # Leave a half-written line for next time
+        for line in complete.splitlines():
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            agg['count'] += 1
+            agg['last'] = entry
+            for field, value in entry.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    agg['sums'][field] = agg['sums'].get(field, 0) + value
+        agg['offset'] += len(complete)
+        return agg
+
+    def day_totals(self, kind: str, day: str) -> Dict:
+        """{'count', 'sums', 'last'} for one day; reads only bytes appended since the last call"""
+        with self.lock:
+            agg = self._refresh(kind, day)
+            return {'count': agg['count'], 'sums': dict(agg['sums']), 'last': agg['last']}
+
+    def daily(self, kind: str, start: str, end: str) -> Dict[str, Dict]:
+        """Per-day totals for start..end, only days with entries"""
+        return {d: self.day_totals(kind, d) for d in self.days(kind) if start <= d <= end}
+
+    def latest(self, kind: str) -> Optional[Dict]:
+        """Last entry on the newest day (the directory is listed once, then tracked on append)"""
+        if kind not in self._newest:
+            days = self.days(kind)
+            self._newest[kind] = days[-1] if days else None
+        newest = self._newest[kind]
+        return self.day_totals(kind, newest)['last'] if newest else None
+
+    def import_json(self, kind: str, path: str) -> int:
+        """Append a legacy JSON list file into partitions; renames it to <file>.imported"""
+        with open(path) as f:
+            entries = json.load(f)
+        for entry in entries:
+            self.append(kind, entry)
+        os.replace(path, path + '.imported')
+        return len(entries)
+
+    def import_legacy(self) -> Dict[str, int]:
+        """Import data/<kind>.json for every kind that still has one"""
+        imported = {}
+        for kind in KINDS:
+            legacy = os.path.join(self.data_dir, f"{kind}.json")
+            if os.path.exists(legacy):
+                imported[kind] = self.import_json(kind, legacy)
+        return imported
+
+
+def day_range(days: int, end: Optional[str] = None) -> Tuple[str, str]:
+    """(start, end) covering `days` days ending on `end` (default today)"""
+    end_day = datetime.strptime(end, '%Y-%m-%d').date() if end else date.today()
+    return (end_day - timedelta(days=days - 1)).isoformat(), end_day.isoformat()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] != 'import':
+        print(__doc__)
+        sys.exit(1)
+    data_dir = sys.argv[2] if len(sys.argv) > 2 else os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+    counts = FitnessStore(data_dir).import_legacy()
+    if not counts:
+        print("✅ Nothing to import")
+    for kind, count in counts.items():
+        print(f"✅ Imported {count} {kind} entries")
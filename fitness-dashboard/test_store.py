@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Tests for the append-only fitness log store
+No server needed - runs against a temporary data directory
+"""
+
+import json
+import os
+import tempfile
+from datetime import date, timedelta
+
+from store import FitnessStore, day_range, entry_day
+
+
+def test_append_partitions_and_aggregates():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = FitnessStore(tmp)
+        store.append('calories', {'date': '2026-03-01', 'calories': 650, 'meal': 'Chicken and rice'})
+        store.append('calories', {'date': '2026-03-01T19:30', 'calories': 800})
+        store.append('calories', {'date': '2026-03-02', 'calories': 500})
+        store.append('macros', {'date': '2026-03-01', 'protein': 45, 'carbs': 60.5})
+
+        assert sorted(os.listdir(os.path.join(tmp, 'calories'))) == ['2026-03-01.jsonl', '2026-03-02.jsonl']
+        day = store.day_totals('calories', '2026-03-01')
+        assert day['count'] == 2 and day['sums'] == {'calories': 1450} and day['last']['calories'] == 800
+        assert store.day_totals('macros', '2026-03-01')['sums'] == {'protein': 45, 'carbs': 60.5}
+        assert store.day_totals('calories', '2026-03-09') == {'count': 0, 'sums': {}, 'last': None}
+
+        # Another process appending to the partition is picked up incrementally,
+        # and a half-written line waits until it is complete
+        path = os.path.join(tmp, 'calories', '2026-03-01.jsonl')
+        with open(path, 'a') as f:
+            f.write(json.dumps({'date': '2026-03-01', 'calories': 50}) + '\n{"date": "2026-03-01", "calo')
+        assert store.day_totals('calories', '2026-03-01')['sums']['calories'] == 1500
+        with open(path, 'a') as f:
+            f.write('ries": 25}\n')
+        assert store.day_totals('calories', '2026-03-01')['count'] == 4
+        assert store.day_totals('calories', '2026-03-01')['sums']['calories'] == 1525
+
+        # A fresh store (app restart) rebuilds the same totals from disk
+        assert FitnessStore(tmp).day_totals('calories', '2026-03-01')['sums']['calories'] == 1525
+
+
+def test_query_pages_back_by_day():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = FitnessStore(tmp)
+        for d in range(1, 11):
+            for meal in range(3):
+                store.append('calories', {'date': f"2026-03-{d:02d}", 'calories': 100 * meal})
+
+        entries, next_end = store.query('calories', '2026-03-01', '2026-03-31', limit=500)
+        assert len(entries) == 30 and next_end is None
+        assert entries[0]['date'] == '2026-03-01' and entries[-1]['date'] == '2026-03-10'
+
+        # Whole days per page, newest first
+        seen, sizes, ends = [], [], []
+        end = '2026-03-10'
+        while end:
+            page, end = store.query('calories', '2026-03-03', end, limit=7)
+            seen, sizes, ends = page + seen, sizes + [len(page)], ends + [end]
+        assert sizes == [9, 9, 6] and ends == ['2026-03-07', '2026-03-04', None]
+        assert [e['date'] for e in seen] == [f"2026-03-{d:02d}" for d in range(3, 11) for _ in range(3)]
+
+        assert store.query('calories', '2026-04-01', '2026-04-30') == ([], None)
+
+
+def test_summary_helpers():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = FitnessStore(tmp)
+        assert store.latest('weight') is None
+        store.append('weight', {'date': '2026-03-05', 'weight': 224})
+        store.append('weight', {'date': '2026-03-01', 'weight': 226})     # Backfilled older reading
+        assert store.latest('weight')['weight'] == 224
+        store.append('weight', {'date': '2026-03-06', 'weight': 223.5})
+        assert store.latest('weight')['weight'] == 223.5
+
+        store.append('workouts', {'date': '2026-03-05', 'type': 'Legs'})
+        daily = store.daily('workouts', '2026-03-01', '2026-03-07')
+        assert list(daily) == ['2026-03-05'] and daily['2026-03-05']['count'] == 1
+
+        assert day_range(7, '2026-03-07') == ('2026-03-01', '2026-03-07')
+        assert day_range(1)[0] == date.today().isoformat()
+        assert entry_day({'timestamp': '2026-03-02T08:00:00'}) == '2026-03-02'
+        assert entry_day({'meal': 'no date'}) == date.today().isoformat()
+        try:
+            store.append('steps', {'steps': 1000})
+            assert False, 'unknown log accepted'
+        except ValueError:
+            pass
+
+
+def test_import_legacy_json():
+    with tempfile.TemporaryDirectory() as tmp:
+        yesterday = (date.today() - timedelta(days=1)).isoformat()
+        legacy = {
+            'calories': [{'date': yesterday, 'calories': 650, 'timestamp': f"{yesterday}T12:30:00"}],
+            'workouts': [{'date': '2025-02-10', 'type': 'Legs', 'notes': ''},
+                         {'date': '2025-02-11', 'type': 'Chest', 'notes': ''}],
+            'weight': [{'date': '2025-02-08', 'weight': 225}],
+            'macros': [],
+        }
+        for kind, entries in legacy.items():
+            with open(os.path.join(tmp, f"{kind}.json"), 'w') as f:
+                json.dump(entries, f)
+
+        store = FitnessStore(tmp)
+        assert store.import_legacy() == {'calories': 1, 'workouts': 2, 'weight': 1, 'macros': 0}
+        assert os.path.exists(os.path.join(tmp, 'workouts.json.imported'))
+        assert store.import_legacy() == {}
+
+        assert store.query('workouts', '2025-01-01', '2025-12-31')[0] == legacy['workouts']
+        assert store.day_totals('calories', yesterday)['sums']['calories'] == 650
+        assert store.latest('weight')['weight'] == 225
+
+
+if __name__ == '__main__':
+    test_append_partitions_and_aggregates()
+    test_query_pages_back_by_day()
+    test_summary_helpers()
+    test_import_legacy_json()
+    print("✅ Store tests passed")
@@ -6,6 +6,7 @@ Flask API for revenue dashboard
 from flask import Flask, jsonify, request
 from flask_cors import CORS
 from stripe_integration import StripeIntegration
+from stripe_mirror import StripeMirror
 from datetime import datetime, timedelta
 import os
 
@@ -13,6 +14,11 @@ app = Flask(__name__)
 CORS(app)
 
 stripe_integration = StripeIntegration()
+mirror = StripeMirror()
+
+def revenue_source():
+    """Local mirror once bootstrapped, live Stripe API until then"""
+    return mirror if mirror.is_bootstrapped() else stripe_integration
 
 @app.route('/api/health', methods=['GET'])
 def health():
@@ -20,48 +26,50 @@ def health():
     return jsonify({
         "status": "healthy",
         "stripe_configured": stripe_integration.is_configured(),
+        "mirror": mirror.status(),
         "timestamp": datetime.now().isoformat()
     })
 
 @app.route('/api/revenue/mrr', methods=['GET'])
 def get_mrr():
     """Get current MRR and ARR"""
-    data = stripe_integration.get_mrr()
+    data = revenue_source().get_mrr()
     return jsonify(data)
 
 @app.route('/api/revenue/customers', methods=['GET'])
 def get_customers():
     """Get customer count"""
-    data = stripe_integration.get_customer_count()
+    data = revenue_source().get_customer_count()
     return jsonify(data)
 
 @app.route('/api/revenue/growth', methods=['GET'])
 def get_growth():
     """Get revenue growth data"""
     days = request.args.get('days', default=30, type=int)
-    data = stripe_integration.get_growth_data(days=days)
+    data = revenue_source().get_growth_data(days=days)
     return jsonify(data)
 
 @app.route('/api/revenue/events', methods=['GET'])
 def get_events():
     """Get recent subscription events"""
     hours = request.args.get('hours', default=24, type=int)
-    events = stripe_integration.get_recent_events(hours=hours)
+    events = revenue_source().get_recent_events(hours=hours)
     return jsonify({"events": events})
 
 @app.route('/api/revenue/failed-payments', methods=['GET'])
 def get_failed_payments():
     """Get recent failed payments"""
     days = request.args.get('days', default=7, type=int)
-    failed = stripe_integration.get_failed_payments(days=days)
+    failed = revenue_source().get_failed_payments(days=days)
     return jsonify({"failed_payments": failed})
 
 @app.route('/api/revenue/projections', methods=['GET'])
 def get_projections():
     """Calculate revenue projections"""
     # Get growth data
-    growth_data = stripe_integration.get_growth_data(days=30)
-    mrr_data = stripe_integration.get_mrr()
+    source = revenue_source()
+    growth_data = source.get_growth_data(days=30)
+    mrr_data = source.get_mrr()
     
     current_mrr = mrr_data.get('mrr', 0)
     growth_pct = growth_data.get('growth_percentage', 0)
@@ -95,16 +103,32 @@ def get_projections():
 @app.route('/api/revenue/dashboard', methods=['GET'])
 def get_dashboard_data():
     """Get all dashboard data in one call"""
+    source = revenue_source()
     return jsonify({
-        "mrr": stripe_integration.get_mrr(),
-        "customers": stripe_integration.get_customer_count(),
-        "growth": stripe_integration.get_growth_data(days=30),
-        "recent_events": stripe_integration.get_recent_events(hours=168),
-        "failed_payments": stripe_integration.get_failed_payments(days=7)
+        "mrr": source.get_mrr(),
+        "customers": source.get_customer_count(),
+        "growth": source.get_growth_data(days=30),
+        "recent_events": source.get_recent_events(hours=168),
+        "failed_payments": source.get_failed_payments(days=7)
     })
 
+@app.route('/webhook', methods=['POST'])
+def webhook():
+    """Stripe webhook: verify, then apply to the local mirror"""
+    try:
+        event = stripe_integration.verify_webhook(request.get_data(), request.headers.get('Stripe-Signature', ''))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    if event is None:
+        return jsonify({"error": "Invalid signature"}), 400
+    
+    applied = mirror.apply_event(event)
+    return jsonify({"received": True, "applied": applied})
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5001))
     print(f"🚀 Revenue API starting on http://localhost:{port}")
     print(f"📊 Dashboard data: http://localhost:{port}/api/revenue/dashboard")
+    if not mirror.is_bootstrapped():
+        print("⚠️  Stripe mirror not bootstrapped - serving live API reads (run: python stripe_mirror.py bootstrap)")
     app.run(host='0.0.0.0', port=port, debug=True)
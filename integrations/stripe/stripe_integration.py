@@ -41,8 +41,9 @@ class StripeIntegration:
             for sub in subscriptions.auto_paging_iter():
                 # Calculate MRR from subscription items
                 for item in sub['items']['data']:
-                    amount = item['price']['unit_amount'] / 100  # Convert from cents
-                    interval = item['price']['recurring']['interval']
+                    amount = (item['price']['unit_amount'] or 0) / 100  # Convert from cents
+                    recurring = item['price']['recurring']
+                    interval = recurring['interval']
                     
                     # Normalize to monthly
                     if interval == 'month':
@@ -56,6 +57,8 @@ class StripeIntegration:
                     else:
                         monthly_amount = amount
                     
+                    # Seats and multi-period billing (e.g. every 3 months), as the mirror counts them
+                    monthly_amount *= (item.get('quantity') or 1) / (recurring.get('interval_count') or 1)
                     total_mrr += monthly_amount
                 
                 subscription_count += 1
@@ -0,0 +1,521 @@
+"""
+Stripe Local Mirror
+SQLite copy of subscriptions, prices and charges kept current from webhooks,
+so revenue queries are local reads instead of paging the Stripe API
+"""
+
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+MIRROR_DB = os.getenv('STRIPE_MIRROR_DB', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'stripe_mirror.db'))
+BOOTSTRAP_CHARGE_DAYS = 400
+BOOTSTRAP_EVENT_DAYS = 30   # All Stripe keeps; seeds the recent-events feed
+RECONCILE_DAYS = 35
+
+# Same monthly normalization as StripeIntegration.get_mrr
+MONTHLY_FACTORS = {'month': 1, 'year': 1 / 12, 'week': 4.33, 'day': 30}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS prices (
+    id TEXT PRIMARY KEY,
+    product TEXT,
+    unit_amount INTEGER,
+    currency TEXT,
+    interval TEXT,
+    interval_count INTEGER,
+    active INTEGER,
+    as_of INTEGER
+);
+CREATE TABLE IF NOT EXISTS subscriptions (
+    id TEXT PRIMARY KEY,
+    customer TEXT,
+    status TEXT,
+    created INTEGER,
+    canceled_at INTEGER,
+    items TEXT,
+    mrr_cents REAL,
+    as_of INTEGER
+);
+CREATE TABLE IF NOT EXISTS customers (
+    id TEXT PRIMARY KEY,
+    email TEXT,
+    created INTEGER,
+    deleted INTEGER DEFAULT 0,
+    as_of INTEGER
+);
+CREATE TABLE IF NOT EXISTS charges (
+    id TEXT PRIMARY KEY,
+    customer TEXT,
+    amount INTEGER,
+    amount_refunded INTEGER,
+    currency TEXT,
+    paid INTEGER,
+    status TEXT,
+    failure_message TEXT,
+    created INTEGER,
+    day TEXT,
+    as_of INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_charges_created ON charges(created);
+CREATE TABLE IF NOT EXISTS daily_revenue (
+    day TEXT PRIMARY KEY,
+    paid_cents INTEGER DEFAULT 0,
+    paid_count INTEGER DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value REAL
+);
+CREATE TABLE IF NOT EXISTS events (
+    id TEXT PRIMARY KEY,
+    type TEXT,
+    created INTEGER,
+    object_id TEXT,
+    customer TEXT,
+    status TEXT,
+    received_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_created ON events(created);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _plain(obj):
+    """Stripe objects -> plain dicts (webhook events arrive as StripeObject)"""
+    if hasattr(obj, 'to_dict_recursive'):
+        return obj.to_dict_recursive()
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    return obj
+
+
+def _day(timestamp: int) -> str:
+    return datetime.fromtimestamp(timestamp).date().isoformat()
+
+
+class StripeAPISource:
+    """Live Stripe API, used only for bootstrap and reconciliation"""
+
+    def __init__(self):
+        import stripe
+        from stripe_integration import StripeIntegration
+
+        integration = StripeIntegration()
+        if not integration.is_configured():
+            raise RuntimeError("Stripe not configured. Add STRIPE_SECRET_KEY to .env")
+        self.stripe = stripe
+
+    def prices(self) -> Iterable[Dict]:
+        return self.stripe.Price.list(limit=100).auto_paging_iter()
+
+    def customers(self) -> Iterable[Dict]:
+        return self.stripe.Customer.list(limit=100).auto_paging_iter()
+
+    def subscriptions(self) -> Iterable[Dict]:
+        return self.stripe.Subscription.list(status='all', limit=100).auto_paging_iter()
+
+    def charges(self, since: int) -> Iterable[Dict]:
+        return self.stripe.Charge.list(created={'gte': since}, limit=100).auto_paging_iter()
+
+    def events(self, since: int) -> Iterable[Dict]:
+        return self.stripe.Event.list(created={'gte': since}, limit=100).auto_paging_iter()
+
+
+class StripeMirror:
+    """Local revenue store fed by bootstrap + webhook events
+
+    Read methods return the same shapes as StripeIntegration so the
+    revenue API can serve either one.
+    """
+
+    def __init__(self, db_path: str = MIRROR_DB):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.lock = threading.Lock()
+        with self.lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(SCHEMA)
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def apply_event(self, event) -> bool:
+        """Apply one verified webhook event; False if already seen or ignored"""
+        event = _plain(event)
+        obj = event['data']['object']
+        kind = event['type']
+        created = event.get('created') or int(datetime.now().timestamp())
+
+        with self.lock, self.conn:
+            if not self._record_event(event, created):
+                return False
+            self._set_meta('last_event_created', max(created, int(self._get_meta('last_event_created') or 0)))
+
+            if kind.startswith('customer.subscription.'):
+                self._upsert_subscription(obj, created)
+            elif kind.startswith('price.'):
+                self._upsert_price(obj, created, deleted=kind == 'price.deleted')
+            elif kind.startswith('charge.') and obj.get('object', 'charge') == 'charge':
+                self._upsert_charge(obj, created)
+            elif kind in ('customer.created', 'customer.updated', 'customer.deleted'):
+                self._upsert_customer(obj, created, deleted=kind == 'customer.deleted')
+            else:
+                return False
+        return True
+
+    def apply_events(self, events: Iterable) -> int:
+        """Apply a feed of events oldest-first; returns how many changed the mirror"""
+        ordered = sorted((_plain(e) for e in events), key=lambda e: e.get('created', 0))
+        return sum(1 for event in ordered if self.apply_event(event))
+
+    def bootstrap(self, source=None, charge_days: int = BOOTSTRAP_CHARGE_DAYS,
+                  event_days: int = BOOTSTRAP_EVENT_DAYS) -> Dict:
+        """Load the mirror from scratch; the only full walk of the Stripe API
+
+        Recent events are only recorded (the objects above are already
+        current), so the events feed covers the time before the webhooks.
+        """
+        source = source or StripeAPISource()
+        now = int(datetime.now().timestamp())
+        since = int((datetime.now() - timedelta(days=charge_days)).timestamp())
+        events_since = int((datetime.now() - timedelta(days=event_days)).timestamp())
+
+        prices = [_plain(p) for p in source.prices()]
+        customers = [_plain(c) for c in source.customers()]
+        subscriptions = [_plain(s) for s in source.subscriptions()]
+        charges = [_plain(c) for c in source.charges(since)]
+        events = [_plain(e) for e in source.events(events_since)]
+
+        with self.lock, self.conn:
+            for table in ('prices', 'subscriptions', 'customers', 'charges', 'daily_revenue', 'counters'):
+                self.conn.execute(f"DELETE FROM {table}")
+            for price in prices:
+                self._upsert_price(price, now)
+            for customer in customers:
+                self._upsert_customer(customer, now)
+            for subscription in subscriptions:
+                self._upsert_subscription(subscription, now)
+            for charge in charges:
+                self._upsert_charge(charge, now)
+            for event in events:
+                self._record_event(event, event.get('created') or now)
+            self._set_meta('bootstrapped_at', datetime.now().isoformat())
+            self._set_meta('last_event_created', max(now, int(self._get_meta('last_event_created') or 0)))
+
+        return {
+            "prices": len(prices),
+            "customers": len(customers),
+            "subscriptions": len(subscriptions),
+            "charges": len(charges),
+            "events": len(events),
+            "mrr": self.get_mrr()['mrr']
+        }
+
+    def reconcile(self, source=None, days: int = RECONCILE_DAYS) -> Dict:
+        """Catch missed webhooks: replay the event log, refresh objects, fix counter drift"""
+        source = source or StripeAPISource()
+        now = int(datetime.now().timestamp())
+        last_seen = int(self._get_meta('last_event_created') or 0)
+        since = int((datetime.now() - timedelta(days=days)).timestamp())
+
+        # Stripe keeps 30 days of events; replay everything since an hour
+        # before the newest one we saw (already-applied ids are skipped)
+        replayed = self.apply_events(source.events(max(since, last_seen - 3600)))
+
+        subscriptions = [_plain(s) for s in source.subscriptions()]
+        charges = [_plain(c) for c in source.charges(since)]
+        with self.lock, self.conn:
+            before = self._snapshot()
+            for subscription in subscriptions:
+                self._upsert_subscription(subscription, now)
+            for charge in charges:
+                self._upsert_charge(charge, now)
+            refreshed = self._snapshot()
+            drift = self._rebuild_counters()
+            self._set_meta('last_reconciled', datetime.now().isoformat())
+
+        return {
+            "events_replayed": replayed,
+            "objects_changed": sum(1 for k, v in refreshed.items() if before.get(k) != v),
+            "counter_drift": drift,
+            "mrr": self.get_mrr()['mrr']
+        }
+
+    def _snapshot(self) -> Dict:
+        rows = self.conn.execute("SELECT id, status, mrr_cents FROM subscriptions").fetchall()
+        charges = self.conn.execute("SELECT id, paid, amount FROM charges").fetchall()
+        snapshot = {r['id']: (r['status'], r['mrr_cents']) for r in rows}
+        snapshot.update({r['id']: (r['paid'], r['amount']) for r in charges})
+        return snapshot
+
+    def _rebuild_counters(self) -> Dict:
+        """Recompute counters and rollups from rows; returns what the incremental values were off by"""
+        old = {name: self._counter(name) for name in ('mrr_cents', 'active_subscriptions')}
+        totals = self.conn.execute(
+            "SELECT COALESCE(SUM(mrr_cents), 0) AS mrr, COUNT(*) AS active "
+            "FROM subscriptions WHERE status = 'active'"
+        ).fetchone()
+        self.conn.execute("INSERT OR REPLACE INTO counters VALUES ('mrr_cents', ?)", (totals['mrr'],))
+        self.conn.execute("INSERT OR REPLACE INTO counters VALUES ('active_subscriptions', ?)", (totals['active'],))
+
+        old_days = {r['day']: r['paid_cents'] for r in self.conn.execute("SELECT * FROM daily_revenue")}
+        self.conn.execute("DELETE FROM daily_revenue")
+        self.conn.execute(
+            "INSERT INTO daily_revenue (day, paid_cents, paid_count) "
+            "SELECT day, SUM(amount), COUNT(*) FROM charges WHERE paid = 1 GROUP BY day"
+        )
+        new_days = {r['day']: r['paid_cents'] for r in self.conn.execute("SELECT * FROM daily_revenue")}
+
+        return {
+            "mrr": round((totals['mrr'] - old['mrr_cents']) / 100, 2),
+            "active_subscriptions": int(totals['active'] - old['active_subscriptions']),
+            "days": sorted(d for d in set(old_days) | set(new_days) if old_days.get(d) != new_days.get(d))
+        }
+
+    def _upsert_price(self, price: Dict, as_of: int, deleted: bool = False):
+        row = self.conn.execute("SELECT as_of FROM prices WHERE id = ?", (price['id'],)).fetchone()
+        if row and row['as_of'] > as_of:
+            return
+        recurring = price.get('recurring') or {}
+        self.conn.execute(
+            "INSERT OR REPLACE INTO prices VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (price['id'], price.get('product'), price.get('unit_amount'), price.get('currency'),
+             recurring.get('interval'), recurring.get('interval_count') or 1,
+             0 if deleted else int(price.get('active', True)), as_of)
+        )
+
+    def _upsert_customer(self, customer: Dict, as_of: int, deleted: bool = False):
+        row = self.conn.execute("SELECT as_of FROM customers WHERE id = ?", (customer['id'],)).fetchone()
+        if row and row['as_of'] > as_of:
+            return
+        self.conn.execute(
+            "INSERT OR REPLACE INTO customers VALUES (?, ?, ?, ?, ?)",
+            (customer['id'], customer.get('email'), customer.get('created'),
+             int(deleted or customer.get('deleted', False)), as_of)
+        )
+
+    def _item_mrr_cents(self, item: Dict) -> float:
+        price = item.get('price') or item.get('plan') or {}
+        if isinstance(price, str):
+            row = self.conn.execute("SELECT * FROM prices WHERE id = ?", (price,)).fetchone()
+            if not row:
+                return 0.0
+            amount, interval, count = row['unit_amount'], row['interval'], row['interval_count']
+        else:
+            self._upsert_price(price, 0)
+            recurring = price.get('recurring') or {}
+            amount = price.get('unit_amount', price.get('amount'))
+            interval = recurring.get('interval', price.get('interval'))
+            count = recurring.get('interval_count', price.get('interval_count'))
+        factor = MONTHLY_FACTORS.get(interval, 1) / (count or 1)
+        return (amount or 0) * (item.get('quantity') or 1) * factor
+
+    def _upsert_subscription(self, sub: Dict, as_of: int):
+        row = self.conn.execute("SELECT * FROM subscriptions WHERE id = ?", (sub['id'],)).fetchone()
+        if row and row['as_of'] > as_of:
+            return  # Stripe doesn't guarantee delivery order; keep the newer state
+
+        items = (sub.get('items') or {}).get('data', [])
+        mrr_cents = sum(self._item_mrr_cents(item) for item in items)
+        status = sub.get('status')
+        self.conn.execute(
+            "INSERT OR REPLACE INTO subscriptions VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (sub['id'], sub.get('customer'), status, sub.get('created'), sub.get('canceled_at'),
+             json.dumps([{'id': i.get('id'), 'quantity': i.get('quantity')} for i in items]),
+             mrr_cents, as_of)
+        )
+
+        old_active = row is not None and row['status'] == 'active'
+        new_active = status == 'active'
+        delta = (mrr_cents if new_active else 0) - (row['mrr_cents'] if old_active else 0)
+        self._bump('mrr_cents', delta)
+        self._bump('active_subscriptions', int(new_active) - int(old_active))
+
+    def _upsert_charge(self, charge: Dict, as_of: int):
+        row = self.conn.execute("SELECT * FROM charges WHERE id = ?", (charge['id'],)).fetchone()
+        if row and row['as_of'] > as_of:
+            return
+
+        day = _day(charge['created'])
+        paid = int(bool(charge.get('paid')))
+        self.conn.execute(
+            "INSERT OR REPLACE INTO charges VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (charge['id'], charge.get('customer'), charge['amount'], charge.get('amount_refunded', 0),
+             charge.get('currency'), paid, charge.get('status'), charge.get('failure_message'),
+             charge['created'], day, as_of)
+        )
+
+        if row and row['paid']:
+            self._bump_day(row['day'], -row['amount'], -1)
+        if paid:
+            self._bump_day(day, charge['amount'], 1)
+
+    def _record_event(self, event: Dict, created: int) -> bool:
+        """Add an event to the log; False if its id was already seen"""
+        obj = event['data']['object']
+        return self.conn.execute(
+            "INSERT OR IGNORE INTO events (id, type, created, object_id, customer, status, received_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (event['id'], event['type'], created, obj.get('id'), obj.get('customer'), obj.get('status'),
+             datetime.now().isoformat())
+        ).rowcount == 1
+
+    def _bump(self, name: str, delta: float):
+        if delta:
+            self.conn.execute(
+                "INSERT INTO counters VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                (name, delta)
+            )
+
+    def _bump_day(self, day: str, cents: int, count: int):
+        self.conn.execute(
+            "INSERT INTO daily_revenue VALUES (?, ?, ?) ON CONFLICT(day) DO UPDATE SET "
+            "paid_cents = paid_cents + excluded.paid_cents, paid_count = paid_count + excluded.paid_count",
+            (day, cents, count)
+        )
+
+    def _counter(self, name: str) -> float:
+        row = self.conn.execute("SELECT value FROM counters WHERE name = ?", (name,)).fetchone()
+        return row['value'] if row else 0
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row['value'] if row else None
+
+    def _set_meta(self, key: str, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, str(value)))
+
+    # ------------------------------------------------------------------
+    # Reads (same shapes as StripeIntegration)
+    # ------------------------------------------------------------------
+
+    def is_bootstrapped(self) -> bool:
+        with self.lock:
+            return self._get_meta('bootstrapped_at') is not None
+
+    def status(self) -> Dict:
+        with self.lock:
+            events = self.conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+            last_event = self._get_meta('last_event_created')
+            return {
+                "bootstrapped_at": self._get_meta('bootstrapped_at'),
+                "last_reconciled": self._get_meta('last_reconciled'),
+                "last_event": datetime.fromtimestamp(int(last_event)).isoformat() if last_event else None,
+                "events_applied": events
+            }
+
+    def get_mrr(self) -> Dict:
+        with self.lock:
+            mrr = self._counter('mrr_cents') / 100
+            active = int(self._counter('active_subscriptions'))
+            updated = self._get_meta('last_event_created')
+        return {
+            "mrr": round(mrr, 2),
+            "arr": round(mrr * 12, 2),
+            "active_subscriptions": active,
+            "currency": "usd",
+            "last_updated": datetime.fromtimestamp(int(updated)).isoformat() if updated else None
+        }
+
+    def get_customer_count(self) -> Dict:
+        with self.lock:
+            total = self.conn.execute("SELECT COUNT(*) FROM customers WHERE deleted = 0").fetchone()[0]
+            active = int(self._counter('active_subscriptions'))
+        return {
+            "total_customers": total,
+            "active_customers": active,
+            "last_updated": datetime.now().isoformat()
+        }
+
+    def get_recent_events(self, hours: int = 24) -> List[Dict]:
+        since = int((datetime.now() - timedelta(hours=hours)).timestamp())
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT * FROM events WHERE type LIKE 'customer.subscription.%' AND created >= ? "
+                "ORDER BY created DESC", (since,)
+            ).fetchall()
+        return [{
+            "type": r['type'],
+            "created": datetime.fromtimestamp(r['created']).isoformat(),
+            "customer_id": r['customer'],
+            "subscription_id": r['object_id'],
+            "status": r['status']
+        } for r in rows]
+
+    def get_failed_payments(self, days: int = 7) -> List[Dict]:
+        since = int((datetime.now() - timedelta(days=days)).timestamp())
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT * FROM charges WHERE paid = 0 AND created >= ? ORDER BY created DESC", (since,)
+            ).fetchall()
+        return [{
+            "customer_id": r['customer'],
+            "amount": r['amount'] / 100,
+            "currency": r['currency'],
+            "failure_message": r['failure_message'],
+            "created": datetime.fromtimestamp(r['created']).isoformat()
+        } for r in rows]
+
+    def get_growth_data(self, days: int = 30) -> Dict:
+        since = (datetime.now() - timedelta(days=days)).date().isoformat()
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT day, paid_cents FROM daily_revenue WHERE day >= ? AND paid_count > 0 ORDER BY day",
+                (since,)
+            ).fetchall()
+        daily_revenue = {r['day']: r['paid_cents'] / 100 for r in rows}
+
+        sorted_dates = list(daily_revenue)
+        growth_pct = 0
+        if len(sorted_dates) >= 2:
+            first_week = sum(daily_revenue[d] for d in sorted_dates[:7])
+            last_week = sum(daily_revenue[d] for d in sorted_dates[-7:])
+            if first_week > 0:
+                growth_pct = ((last_week - first_week) / first_week) * 100
+
+        return {
+            "daily_revenue": daily_revenue,
+            "growth_percentage": round(growth_pct, 2),
+            "period_days": days
+        }
+
+
+if __name__ == "__main__":
+    import sys
+
+    command = sys.argv[1] if len(sys.argv) > 1 else 'status'
+    mirror = StripeMirror()
+
+    if command == 'bootstrap':
+        print("📥 Bootstrapping Stripe mirror...")
+        result = mirror.bootstrap()
+        print(f"✅ {result['subscriptions']} subscriptions, {result['charges']} charges, "
+              f"{result['customers']} customers — MRR ${result['mrr']}")
+    elif command == 'reconcile':
+        print("🔄 Reconciling Stripe mirror...")
+        result = mirror.reconcile()
+        print(f"✅ Replayed {result['events_replayed']} missed events, "
+              f"{result['objects_changed']} objects refreshed")
+        if result['counter_drift']['mrr'] or result['counter_drift']['days']:
+            print(f"⚠️  Fixed drift: {result['counter_drift']}")
+    else:
+        status = mirror.status()
+        mrr = mirror.get_mrr()
+        print(f"🗄️  Mirror: {mirror.db_path}")
+        print(f"   Bootstrapped: {status['bootstrapped_at'] or 'never (run: python stripe_mirror.py bootstrap)'}")
+        print(f"   Last event:   {status['last_event']}")
+        print(f"   Reconciled:   {status['last_reconciled']}")
+        print(f"💰 MRR: ${mrr['mrr']}  📈 ARR: ${mrr['arr']}")
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Tests for the Stripe local mirror
+Feeds it stand-in webhook events and a fake API source - no Stripe account needed
+"""
+
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+from stripe_mirror import StripeMirror
+
+NOW = int(datetime.now().timestamp())
+DAY = 86400
+
+
+def price(price_id, cents, interval='month', interval_count=1):
+    return {'id': price_id, 'object': 'price', 'unit_amount': cents, 'currency': 'usd', 'active': True,
+            'recurring': {'interval': interval, 'interval_count': interval_count}}
+
+
+MONTHLY = price('price_monthly', 2900)
+YEARLY = price('price_yearly', 24000, 'year')
+
+
+def subscription(sub_id, customer, status='active', prices=(MONTHLY,), quantity=1):
+    return {'id': sub_id, 'object': 'subscription', 'customer': customer, 'status': status, 'created': NOW - 40 * DAY,
+            'items': {'data': [{'id': f"si_{sub_id}_{i}", 'price': p, 'quantity': quantity}
+                               for i, p in enumerate(prices)]}}
+
+
+def charge(charge_id, cents, created, paid=True, failure=None):
+    return {'id': charge_id, 'object': 'charge', 'customer': 'cus_1', 'amount': cents, 'amount_refunded': 0,
+            'currency': 'usd', 'paid': paid, 'status': 'succeeded' if paid else 'failed',
+            'failure_message': failure, 'created': created}
+
+
+def event(event_id, kind, obj, created):
+    return {'id': event_id, 'type': kind, 'created': created, 'data': {'object': obj}}
+
+
+class FakeSource:
+    """Stand-in for StripeAPISource"""
+
+    def __init__(self, subscriptions=(), charges=(), events=(), customers=(), prices=()):
+        self._subscriptions = list(subscriptions)
+        self._charges = list(charges)
+        self._events = list(events)
+        self._customers = list(customers)
+        self._prices = list(prices)
+
+    def prices(self):
+        return iter(self._prices)
+
+    def customers(self):
+        return iter(self._customers)
+
+    def subscriptions(self):
+        return iter(self._subscriptions)
+
+    def charges(self, since):
+        return (c for c in self._charges if c['created'] >= since)
+
+    def events(self, since):
+        # Stripe lists newest first
+        return iter(sorted((e for e in self._events if e['created'] >= since), key=lambda e: -e['created']))
+
+
+def make_mirror(tmp):
+    return StripeMirror(os.path.join(tmp, 'mirror.db'))
+
+
+def test_webhook_feed_updates_counters():
+    with tempfile.TemporaryDirectory() as tmp:
+        mirror = make_mirror(tmp)
+        feed = [
+            event('evt_1', 'customer.created', {'id': 'cus_1', 'object': 'customer', 'created': NOW - 60}, NOW - 60),
+            event('evt_2', 'customer.subscription.created', subscription('sub_1', 'cus_1'), NOW - 50),
+            event('evt_3', 'customer.subscription.created',
+                  subscription('sub_2', 'cus_2', prices=(YEARLY,), quantity=2), NOW - 40),
+            event('evt_4', 'charge.succeeded', charge('ch_1', 2900, NOW - 30), NOW - 30),
+            event('evt_5', 'charge.failed', charge('ch_2', 2900, NOW - 20, paid=False, failure='card_declined'),
+                  NOW - 20),
+            event('evt_6', 'invoice.created', {'id': 'in_1', 'object': 'invoice'}, NOW - 10),
+        ]
+        assert mirror.apply_events(feed) == 5
+
+        mrr = mirror.get_mrr()
+        assert mrr['mrr'] == 29 + 2 * 240 / 12 and mrr['arr'] == round(mrr['mrr'] * 12, 2)
+        assert mrr['active_subscriptions'] == 2
+        assert mirror.get_customer_count()['total_customers'] == 1
+
+        # Redelivered events are skipped
+        assert not mirror.apply_event(feed[1])
+        assert mirror.get_mrr()['mrr'] == 69
+
+        # Upgrade, then a late-arriving older update that must not win
+        upgraded = subscription('sub_1', 'cus_1', prices=(price('price_pro', 9900),))
+        assert mirror.apply_event(event('evt_7', 'customer.subscription.updated', upgraded, NOW - 5))
+        assert mirror.apply_event(event('evt_8', 'customer.subscription.updated', subscription('sub_1', 'cus_1'),
+                                        NOW - 45))
+        assert mirror.get_mrr()['mrr'] == 99 + 40
+
+        cancelled = subscription('sub_2', 'cus_2', status='canceled', prices=(YEARLY,), quantity=2)
+        mirror.apply_event(event('evt_9', 'customer.subscription.deleted', cancelled, NOW - 4))
+        assert mirror.get_mrr() | {'last_updated': None} == {
+            'mrr': 99, 'arr': 1188, 'active_subscriptions': 1, 'currency': 'usd', 'last_updated': None}
+
+        today = datetime.fromtimestamp(NOW).date().isoformat()
+        growth = mirror.get_growth_data(days=30)
+        assert growth['daily_revenue'] == {today: 29.0} and growth['growth_percentage'] == 0
+
+        failed = mirror.get_failed_payments(days=7)
+        assert len(failed) == 1 and failed[0]['failure_message'] == 'card_declined' and failed[0]['amount'] == 29
+
+        events = mirror.get_recent_events(hours=24)
+        assert [e['subscription_id'] for e in events][:2] == ['sub_2', 'sub_1']
+        assert {e['type'] for e in events} <= {'customer.subscription.created', 'customer.subscription.updated',
+                                               'customer.subscription.deleted'}
+        mirror.close()
+
+
+def test_charge_state_changes_move_rollups():
+    with tempfile.TemporaryDirectory() as tmp:
+        mirror = make_mirror(tmp)
+        week_ago = NOW - 8 * DAY
+        mirror.apply_events([
+            event('evt_a', 'charge.succeeded', charge('ch_old', 1000, week_ago), week_ago),
+            event('evt_b', 'charge.succeeded', charge('ch_new', 3000, NOW - 60), NOW - 60),
+            event('evt_c', 'charge.failed', charge('ch_pending', 5000, NOW - 50, paid=False), NOW - 50),
+        ])
+        growth = mirror.get_growth_data(days=30)
+        assert sorted(growth['daily_revenue'].values()) == [10.0, 30.0]
+        assert growth['growth_percentage'] == 0  # fewer than 7 days: both "weeks" overlap
+
+        # A retried charge that later succeeds counts once, on its own day
+        mirror.apply_event(event('evt_d', 'charge.succeeded', charge('ch_pending', 5000, NOW - 50), NOW - 40))
+        today = datetime.fromtimestamp(NOW).date().isoformat()
+        assert mirror.get_growth_data(days=30)['daily_revenue'][today] == 80.0
+        assert mirror.get_failed_payments(days=7) == []
+        assert mirror.get_growth_data(days=3)['daily_revenue'] == {today: 80.0}
+        mirror.close()
+
+
+def test_bootstrap_and_reconcile_catch_missed_events():
+    with tempfile.TemporaryDirectory() as tmp:
+        mirror = make_mirror(tmp)
+        assert not mirror.is_bootstrapped()
+        source = FakeSource(
+            prices=[MONTHLY, YEARLY],
+            customers=[{'id': 'cus_1', 'created': NOW - DAY}, {'id': 'cus_2', 'created': NOW - DAY}],
+            subscriptions=[subscription('sub_1', 'cus_1'), subscription('sub_2', 'cus_2', status='canceled')],
+            charges=[charge('ch_1', 2900, NOW - 2 * DAY), charge('ch_ancient', 100, NOW - 500 * DAY)],
+            events=[
+                event('evt_b1', 'customer.subscription.created', subscription('sub_1', 'cus_1'), NOW - 3 * DAY),
+                event('evt_b2', 'customer.subscription.deleted',
+                      subscription('sub_2', 'cus_2', status='canceled'), NOW - DAY),
+                event('evt_b3', 'charge.succeeded', charge('ch_1', 2900, NOW - 2 * DAY), NOW - 2 * DAY),
+                event('evt_b0', 'customer.subscription.created', subscription('sub_0', 'cus_0'), NOW - 40 * DAY),
+            ],
+        )
+        result = mirror.bootstrap(source)
+        assert mirror.is_bootstrapped()
+        assert result['subscriptions'] == 2 and result['charges'] == 1 and result['mrr'] == 29
+        assert result['events'] == 3
+        assert mirror.get_customer_count()['active_customers'] == 1
+
+        # The feed covers the week before the switch; recorded events don't touch the objects
+        feed = mirror.get_recent_events(hours=168)
+        assert [(e['subscription_id'], e['status']) for e in feed] == [('sub_2', 'canceled'), ('sub_1', 'active')]
+        assert mirror.get_mrr()['mrr'] == 29
+
+        # A webhook for sub_3 never arrives; Stripe's event log and object lists have it
+        later = NOW + 60
+        missed_sub = subscription('sub_3', 'cus_2', prices=(price('price_weekly', 1000, 'week'),))
+        missed_charge = charge('ch_2', 4300, later)
+        source._subscriptions.append(missed_sub)
+        source._charges.append(missed_charge)
+        source._events = [
+            event('evt_m1', 'customer.subscription.created', missed_sub, later),
+            event('evt_m2', 'charge.succeeded', missed_charge, later),
+        ]
+        # Something also knocked the counter off
+        with mirror.lock, mirror.conn:
+            mirror._bump('mrr_cents', 500)
+
+        report = mirror.reconcile(source)
+        assert report['events_replayed'] == 2
+        assert report['counter_drift']['mrr'] == -5 and report['counter_drift']['days'] == []
+        assert report['mrr'] == 29 + 43.3
+        assert mirror.status()['last_reconciled'] is not None
+
+        # Reconciling again finds nothing new
+        again = mirror.reconcile(source)
+        assert again['events_replayed'] == 0 and again['objects_changed'] == 0
+        assert again['counter_drift'] == {'mrr': 0, 'active_subscriptions': 0, 'days': []}
+        mirror.close()
+
+
+def test_mirror_persists_across_restarts():
+    with tempfile.TemporaryDirectory() as tmp:
+        mirror = make_mirror(tmp)
+        mirror.bootstrap(FakeSource(subscriptions=[subscription('sub_1', 'cus_1', prices=(YEARLY,))]))
+        mirror.close()
+
+        reopened = make_mirror(tmp)
+        assert reopened.is_bootstrapped() and reopened.get_mrr()['mrr'] == 20
+        quarterly = subscription('sub_q', 'cus_9', prices=(price('price_q', 9000, 'month', 3),))
+        reopened.apply_event(event('evt_q', 'customer.subscription.created', quarterly, NOW + 120))
+        assert reopened.get_mrr()['mrr'] == 50
+        reopened.close()
+
+
+if __name__ == '__main__':
+    test_webhook_feed_updates_counters()
+    test_charge_state_changes_move_rollups()
+    test_bootstrap_and_reconcile_catch_missed_events()
+    test_mirror_persists_across_restarts()
+    print("✅ Stripe mirror tests passed")
@@ -2,7 +2,7 @@
 NBA Slate Rankings Dashboard
 Flask app with live updates and scheduled tasks
 """
-from flask import Flask, render_template, jsonify, send_file
+from flask import Flask, render_template, jsonify, send_file, request, Response, stream_with_context
 from flask_cors import CORS
 import pandas as pd
 import io
@@ -19,6 +19,9 @@ from scrapers.underdog_scraper import UnderdogScraper
 from ranking_engine import RankingEngine
 from real_projections_engine import RealProjectionsEngine
 from real_data_integration import RealDataIntegrator
+from lineup_optimizer import LineupOptimizer, RosterRules
+from slate_simulator import SlateSimulator
+from slate_updates import IncrementalSlate, SlateEventBus, changed_rows
 
 # Custom JSON encoder for numpy types
 class NumpyEncoder(json.JSONEncoder):
@@ -48,16 +51,33 @@ current_data = {
 DATA_FILE = '/Users/clawdbot/clawd/data/nba-slate-2026-02-09.json'
 BRIEF_FILE = '/Users/clawdbot/clawd/data/nba-morning-brief-2026-02-09.md'
 
+# Lineup requests run on the request thread: cap the portfolio size and the
+# optimizer's wall-clock time so one request can't tie up a worker
+MAX_LINEUPS = 150
+LINEUP_TIME_LIMIT = 10.0  # seconds
+
 # Initialize components
 injury_scraper = InjuryScraper()
 underdog_scraper = UnderdogScraper()
-ranking_engine = RankingEngine()
+ranking_engine = RankingEngine(simulator=SlateSimulator(n_sims=10000))
 
 # NEW: Real data integration (Feb 9, 2026)
 real_projections_engine = RealProjectionsEngine()
 real_data_integrator = RealDataIntegrator()
 USE_REAL_DATA = True  # Toggle between real and mock data
 
+# Incremental updates: after the first full build only players whose injury
+# status or game line changed (or who joined the slate) are re-projected,
+# players who left the slate are dropped, and the changed rows are pushed to
+# dashboards over /api/stream
+incremental_slate = IncrementalSlate(
+    ranking_engine,
+    reproject=lambda player, status, game_total: real_projections_engine.generate_full_projection(
+        player['name'], player['team'], player['position'], game_total, status
+    )
+)
+slate_events = SlateEventBus(encoder=NumpyEncoder)
+
 def update_slate_data():
     """Fetch and update all slate data"""
     global current_data
@@ -75,59 +95,73 @@ def update_slate_data():
             
             # Get real injuries
             injuries = real_projections_engine.data_integrator.injury_fetcher.get_injury_report()
-            current_data['injuries'] = injuries
             
             # Get real Vegas lines
             vegas = real_projections_engine.data_integrator.vegas_fetcher.get_vegas_lines()
-            current_data['vegas_lines'] = vegas
             
-            # Generate real projections with Underdog scoring
-            players = real_projections_engine.generate_slate_projections()
-            
-            # Run ranking algorithm on real data
-            ranked_df = ranking_engine.rank_players(players)
-            ranked_df = ranking_engine.assign_tiers(ranked_df)
+            if incremental_slate.ready:
+                # Re-project and re-rank only players whose status, game line, team or slate membership moved
+                integrator = real_projections_engine.data_integrator
+                slate = {
+                    'players': integrator.nba_fetcher.get_all_active_players_for_date(integrator.contest_date),
+                    'injuries': injuries,
+                    'vegas_lines': vegas
+                }
+                # An empty fetch (API down) keeps the loaded roster instead of dropping everyone
+                roster = real_projections_engine.slate_roster(slate) or None
+                ranked_df, changed, affected = incremental_slate.update(injuries, vegas, roster)
+                print(f"🔁 Incremental update: {len(affected)} players re-projected, {len(changed)} rows changed")
+            else:
+                # First run: full slate with Underdog scoring, simulated against the Vegas lines
+                players = real_projections_engine.generate_slate_projections()
+                ranked_df = incremental_slate.load(players, injuries, vegas)
+                changed = changed_rows(None, ranked_df)
             
-            # Generate recommendations
-            recommendations = ranking_engine.generate_recommendations(ranked_df)
-            
-            # Update global state
-            current_data['players'] = ranked_df.to_dict('records')
-            current_data['recommendations'] = recommendations
-            current_data['last_update'] = datetime.now().isoformat()
-            current_data['data_source'] = 'REAL (ESPN + Vegas APIs)'
-            
-            print(f"✅ Real data update complete. {len(players)} players ranked.")
+            publish_update(ranked_df, changed, injuries, vegas, 'REAL (ESPN + Vegas APIs)')
+            print(f"✅ Real data update complete. {len(ranked_df)} players ranked.")
             
         else:
             # LEGACY: Use mock data (for testing only)
             print("⚠️  Using mock data (testing mode)...")
             injuries = injury_scraper.get_all_injuries()
-            current_data['injuries'] = injuries
             
             players = underdog_scraper.fetch_slate_players()
             vegas = underdog_scraper.fetch_vegas_lines()
-            current_data['vegas_lines'] = vegas
             
-            ranked_df = ranking_engine.rank_players(players)
+            ranked_df = ranking_engine.rank_players(players, vegas)
             ranked_df = ranking_engine.assign_tiers(ranked_df)
-            recommendations = ranking_engine.generate_recommendations(ranked_df)
-            
-            current_data['players'] = ranked_df.to_dict('records')
-            current_data['recommendations'] = recommendations
-            current_data['last_update'] = datetime.now().isoformat()
-            current_data['data_source'] = 'MOCK (testing)'
+            changed = changed_rows(pd.DataFrame(current_data['players']), ranked_df)
             
+            publish_update(ranked_df, changed, injuries, vegas, 'MOCK (testing)')
             print(f"Update complete. {len(players)} players ranked.")
         
-        # Save to JSON
-        save_data_to_file()
-        
     except Exception as e:
         print(f"Error updating slate data: {e}")
         import traceback
         traceback.print_exc()
 
+def publish_update(ranked_df, changed, injuries, vegas, data_source):
+    """Apply an update to current_data and push what changed to stream clients"""
+    # Both report formats carry a fetch timestamp, so compare the reports themselves
+    injuries_changed = injuries.get('injuries') != current_data['injuries'].get('injuries')
+    current_data['injuries'] = injuries
+    current_data['vegas_lines'] = vegas
+    current_data['last_update'] = datetime.now().isoformat()
+    current_data['data_source'] = data_source
+    
+    if changed:
+        current_data['players'] = ranked_df.to_dict('records')
+        current_data['recommendations'] = ranking_engine.generate_recommendations(ranked_df)
+        slate_events.publish('players', {'players': changed, 'last_update': current_data['last_update']})
+        slate_events.publish('recommendations', current_data['recommendations'])
+    if injuries_changed:
+        slate_events.publish('injuries', injuries)
+    slate_events.publish('status', status_payload())
+    
+    # Only rewrite the JSON snapshot when something actually changed
+    if changed or injuries_changed:
+        save_data_to_file()
+
 def save_data_to_file():
     """Save current analysis to JSON file"""
     os.makedirs(os.path.dirname(DATA_FILE), exist_ok=True)
@@ -195,6 +229,7 @@ def lock_final_rankings():
     current_data['locked'] = True
     current_data['locked_at'] = datetime.now().isoformat()
     save_data_to_file()
+    slate_events.publish('status', status_payload())
     print(f"[{datetime.now()}] Final rankings LOCKED. No more updates.")
 
 # Routes
@@ -227,16 +262,29 @@ def get_vegas():
     """Get Vegas betting lines"""
     return jsonify(current_data['vegas_lines'])
 
-@app.route('/api/status')
-def get_status():
-    """Get system status"""
-    return jsonify({
+def status_payload():
+    return {
         'last_update': current_data['last_update'],
         'player_count': len(current_data['players']),
         'injury_count': current_data['injuries'].get('count', 0),
         'locked': current_data['locked'],
+        'stream_clients': slate_events.client_count,
         'uptime': 'running'
-    })
+    }
+
+@app.route('/api/status')
+def get_status():
+    """Get system status"""
+    return jsonify(status_payload())
+
+@app.route('/api/stream')
+def stream_updates():
+    """Server-sent events: changed player rows, recommendations, injuries and status"""
+    return Response(
+        stream_with_context(slate_events.stream(request.headers.get('Last-Event-ID'))),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
 @app.route('/api/refresh')
 def manual_refresh():
@@ -246,9 +294,80 @@ def manual_refresh():
         return jsonify({'status': 'refreshed', 'timestamp': current_data['last_update']})
     return jsonify({'status': 'locked', 'message': 'Rankings are locked'})
 
+def build_lineups():
+    """
+    Optimize lineups from the current rankings using query parameters:
+    lineups=N (capped at MAX_LINEUPS), objective, salary_cap, max_exposure,
+    min_unique, stack=3 or 3,2, max_per_team, lock=name,name, exclude=name,name
+    """
+    args = request.args
+
+    def split(key):
+        return [v.strip() for v in args.get(key, '').split(',') if v.strip()]
+
+    rules = RosterRules(
+        salary_cap=args.get('salary_cap', 50000, type=int),
+        max_per_team=args.get('max_per_team', 4, type=int),
+        max_exposure=args.get('max_exposure', 1.0, type=float),
+        min_unique=args.get('min_unique', 1, type=int),
+        stack_sizes=[int(v) for v in split('stack')],
+        locks=split('lock'),
+        excludes=split('exclude'),
+        time_limit=LINEUP_TIME_LIMIT
+    )
+    optimizer = LineupOptimizer(
+        pd.DataFrame(current_data['players']),
+        objective=args.get('objective', 'projected_points')
+    )
+    requested = max(1, min(args.get('lineups', 20, type=int), MAX_LINEUPS))
+    lineups = optimizer.generate(requested, rules)
+    if optimizer.timed_out:
+        print(f"⚠️  Lineup optimizer hit its {LINEUP_TIME_LIMIT:.0f}s limit: "
+              f"{len(lineups)} of {requested} lineups built")
+    suboptimal = sum(1 for lineup in lineups if not lineup.optimal)
+    if suboptimal:
+        print(f"⚠️  {suboptimal} lineups hit the search budget (best found, not proven optimal)")
+    return optimizer, lineups, requested
+
+@app.route('/api/lineups')
+def get_lineups():
+    """Generate optimized lineups (see build_lineups for parameters)"""
+    if not current_data['players']:
+        return jsonify({'lineups': [], 'exposure': []})
+    optimizer, lineups, requested = build_lineups()
+    rows = []
+    for lineup in lineups:
+        row = lineup.to_row()
+        row['optimal'] = lineup.optimal
+        rows.append(row)
+    if ranking_engine.last_simulation is not None:
+        # Chance each lineup beats the rest of the set in the slate simulation
+        for row, win in zip(rows, ranking_engine.last_simulation.lineup_win_probabilities(lineups)):
+            row['win_pct'] = round(float(win) * 100, 2)
+    return jsonify({
+        'lineups': rows,
+        'exposure': optimizer.exposure(lineups),
+        'requested': requested,
+        'returned': len(lineups),
+        'optimal': all(lineup.optimal for lineup in lineups),
+        'timed_out': optimizer.timed_out,
+        'last_update': current_data['last_update']
+    })
+
 @app.route('/api/export/csv')
 def export_csv():
-    """Export player rankings to CSV with Underdog scoring"""
+    """Export player rankings to CSV with Underdog scoring (?lineups=N exports optimized lineups)"""
+    if 'lineups' in request.args and current_data['players']:
+        _, lineups, _ = build_lineups()
+        output = io.StringIO()
+        LineupOptimizer.to_dataframe(lineups).to_csv(output, index=False)
+        return send_file(
+            io.BytesIO(output.getvalue().encode()),
+            mimetype='text/csv',
+            as_attachment=True,
+            download_name=f'nba-slate-lineups-{datetime.now().strftime("%Y%m%d")}.csv'
+        )
+
     df = pd.DataFrame(current_data['players'])
     
     # Select key columns for export
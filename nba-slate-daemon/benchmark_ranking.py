@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Ranking Benchmark
+Times RankingEngine's columnar ranking/tiering/stacks on synthetic pools and
+checks the output matches the original per-player implementation
+
+Usage:
+    python3 benchmark_ranking.py                # 1k and 10k player pools
+    python3 benchmark_ranking.py 50000          # custom pool sizes
+"""
+
+import random
+import sys
+import time
+
+import pandas as pd
+
+from ranking_engine import RankingEngine
+
+POSITIONS = ['PG', 'SG', 'SF', 'PF', 'C']
+
+
+def build_pool(size: int, seed: int = 11) -> list:
+    """Synthetic multi-slate pool: ~15 players per team, realistic salaries"""
+    rng = random.Random(seed)
+    teams = [f"T{i:03d}" for i in range(max(size // 15, 2))]
+    players = []
+    for i in range(size):
+        salary = rng.randrange(3000, 11100, 100)
+        players.append({
+            'name': f"Player {i}",
+            'team': rng.choice(teams),
+            'position': rng.choice(POSITIONS),
+            'salary': salary,
+            'projected_points': round(salary / 1000 * rng.uniform(3.5, 6.5), 2),
+            'ownership_pct': round(rng.uniform(0.5, 40), 1),
+        })
+    return players
+
+
+# ---- original per-player implementation, kept as the reference ------------
+
+def legacy_rank(engine: RankingEngine, players: list) -> pd.DataFrame:
+    df = pd.DataFrame([engine.calculate_player_metrics(p) for p in players])
+    df['value_rank'] = df['value'].rank(ascending=False)
+    df['ceiling_rank'] = df['ceiling'].rank(ascending=False)
+    df['floor_rank'] = df['floor'].rank(ascending=False)
+    df['ppd_rank'] = df['ppd'].rank(ascending=False)
+    df['composite_score'] = (
+        df['value_rank'] * 0.35 + df['ceiling_rank'] * 0.25 +
+        df['ppd_rank'] * 0.25 + df['floor_rank'] * 0.15
+    )
+    df['overall_rank'] = df['composite_score'].rank()
+    return df.sort_values('overall_rank')
+
+
+def legacy_tiers(df: pd.DataFrame) -> pd.DataFrame:
+    def determine_tier(row):
+        if row['salary'] >= 9000 and row['ceiling'] >= 42:
+            return 'Tier 1: Stars'
+        elif row['value'] >= 4.5 and row['ceiling'] >= 28:
+            return 'Tier 2: Value'
+        elif row['salary'] <= 5500 and row['floor'] >= 15:
+            return 'Tier 3: Punts'
+        elif row['value'] < 3.5 or (row['ownership_pct'] > 25 and row['floor'] < 25):
+            return 'Tier 4: Fades'
+        return 'Tier 2: Value'
+
+    df['tier'] = df.apply(determine_tier, axis=1)
+    return df
+
+
+def legacy_stacks(df: pd.DataFrame) -> list:
+    team_groups = df.groupby('team').agg({
+        'upside': 'sum', 'ceiling': 'sum', 'value': 'mean', 'name': lambda x: list(x)
+    }).reset_index().sort_values('upside', ascending=False)
+    stacks = []
+    for _, row in team_groups.head(5).iterrows():
+        players = df[df['team'] == row['team']].nlargest(3, 'ceiling')
+        stacks.append({
+            'team': str(row['team']),
+            'players': players['name'].tolist(),
+            'combined_ceiling': round(float(players['ceiling'].sum()), 2),
+            'combined_upside': round(float(players['upside'].sum()), 2),
+            'avg_value': round(float(players['value'].mean()), 2),
+            'total_salary': int(players['salary'].sum())
+        })
+    return stacks[:3]
+
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"  {label:<28} {elapsed:9.1f}ms")
+    return result, elapsed
+
+
+def run(size: int):
+    engine = RankingEngine()
+    players = build_pool(size)
+    print(f"\n🏀 Ranking benchmark: {size} players, {len({p['team'] for p in players})} teams")
+
+    print("Legacy (per player):")
+    old_df, t1 = timed("rank_players", lambda: legacy_rank(engine, players))
+    old_df, t2 = timed("assign_tiers", lambda: legacy_tiers(old_df))
+    old_stacks, t3 = timed("find_stacks", lambda: legacy_stacks(old_df))
+
+    print("Columnar (RankingEngine):")
+    new_df, n1 = timed("rank_players", lambda: engine.rank_players(players))
+    new_df, n2 = timed("assign_tiers", lambda: engine.assign_tiers(new_df))
+    new_stacks, n3 = timed("find_stacks", lambda: engine.find_stacks(new_df))
+
+    pd.testing.assert_frame_equal(old_df, new_df)
+    assert old_stacks == new_stacks
+    print(f"  identical output, speedup {(t1 + t2 + t3) / (n1 + n2 + n3):.1f}x")
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000]
+    for size in sizes:
+        run(size)
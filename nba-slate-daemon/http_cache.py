@@ -0,0 +1,227 @@
+"""
+Cached HTTP client for the NBA data fetchers
+One pooled requests.Session shared by every fetcher, with:
+- Token-bucket rate limiting (shared across threads) instead of sleeps
+- Bounded concurrency for fan-out fetches (rosters, player stats)
+- On-disk response cache honoring ETag/Last-Modified with per-endpoint TTLs:
+  fresh entries are served without a request, stale ones are revalidated
+  with a conditional GET (304 = reuse the cached body), and the last good
+  body is served if the API is down
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+CACHE_DIR = '/Users/clawdbot/clawd/data/http-cache'
+
+# Seconds a cached response is used without asking the server, matched by
+# URL substring (first match wins). During the slate window most refreshes
+# land past these TTLs and revalidate as 304s.
+DEFAULT_TTLS = [
+    ('/injuries', 120),
+    ('/scoreboard', 300),
+    ('/roster', 6 * 3600),
+    ('the-odds-api.com', 600),     # Free tier is 500 requests/month
+]
+DEFAULT_TTL = 300
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` requests/second with bursts of `capacity`"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+@dataclass
+class CachedResponse:
+    """Just enough of requests.Response for the fetchers (status_code, json())"""
+    status_code: int
+    body: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    source: str = 'network'        # network | cache | revalidated | stale
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+class CachedHTTPClient:
+    """
+    Pooled, rate-limited, disk-cached GETs
+
+    Args:
+        cache_dir: Directory for cached responses (one JSON file per URL)
+        rate: Sustained requests per second across all threads
+        burst: Requests allowed back to back before rate limiting kicks in
+        max_workers: Concurrency for map()
+        ttls: [(url substring, seconds)] overrides for DEFAULT_TTLS
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = CACHE_DIR,
+        rate: float = 8.0,
+        burst: int = 8,
+        max_workers: int = 8,
+        ttls: Optional[List] = None,
+        headers: Optional[Dict[str, str]] = None
+    ):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self.bucket = TokenBucket(rate, burst)
+        self.max_workers = max_workers
+        self.ttls = list(ttls or []) + DEFAULT_TTLS
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        if headers:
+            self.session.headers.update(headers)
+
+        self.stats = {'requests': 0, 'cache_hits': 0, 'not_modified': 0, 'stale': 0, 'errors': 0}
+        self._stats_lock = threading.Lock()
+
+    # ---- cache -----------------------------------------------------------
+
+    def ttl_for(self, url: str) -> int:
+        for pattern, ttl in self.ttls:
+            if pattern in url:
+                return ttl
+        return DEFAULT_TTL
+
+    def _path(self, url: str, params: Optional[Dict]) -> str:
+        # API keys are part of the request but not of the cache identity
+        key_params = sorted((k, str(v)) for k, v in (params or {}).items() if k.lower() != 'apikey')
+        digest = hashlib.sha256(json.dumps([url, key_params]).encode()).hexdigest()[:32]
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def _load(self, path: str) -> Optional[Dict]:
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, path: str, entry: Dict):
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    # ---- requests --------------------------------------------------------
+
+    def get(
+        self,
+        url: str,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict] = None,
+        timeout: float = 10,
+        ttl: Optional[int] = None
+    ) -> CachedResponse:
+        """
+        GET through the cache
+
+        Non-200 responses are returned as-is and never cached. Network errors
+        fall back to the last cached body (source='stale') or re-raise.
+        """
+        path = self._path(url, params)
+        entry = self._load(path)
+        ttl = self.ttl_for(url) if ttl is None else ttl
+
+        if entry and time.time() - entry['fetched_at'] < ttl:
+            self._count('cache_hits')
+            return CachedResponse(200, entry['body'], entry.get('headers', {}), 'cache')
+
+        request_headers = dict(headers or {})
+        if entry:
+            if entry.get('etag'):
+                request_headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                request_headers['If-Modified-Since'] = entry['last_modified']
+
+        self.bucket.acquire()
+        self._count('requests')
+        try:
+            response = self.session.get(url, params=params, headers=request_headers, timeout=timeout)
+        except requests.RequestException:
+            self._count('errors')
+            if entry:
+                self._count('stale')
+                return CachedResponse(200, entry['body'], entry.get('headers', {}), 'stale')
+            raise
+
+        if response.status_code == 304 and entry:
+            self._count('not_modified')
+            entry['fetched_at'] = time.time()
+            self._store(path, entry)
+            return CachedResponse(200, entry['body'], entry.get('headers', {}), 'revalidated')
+
+        result = CachedResponse(response.status_code, response.text, dict(response.headers))
+        if response.status_code == 200:
+            self._store(path, {
+                'url': url,
+                'fetched_at': time.time(),
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'headers': {'Content-Type': response.headers.get('Content-Type', '')},
+                'body': response.text,
+            })
+        elif entry and response.status_code >= 500:
+            self._count('stale')
+            return CachedResponse(200, entry['body'], entry.get('headers', {}), 'stale')
+        return result
+
+    def map(self, fn: Callable, items: Iterable, max_workers: Optional[int] = None) -> List:
+        """fn over items with bounded concurrency, results in input order"""
+        items = list(items)
+        workers = min(max_workers or self.max_workers, len(items))
+        if workers <= 1:
+            return [fn(item) for item in items]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(fn, items))
+
+    def get_stats(self) -> Dict:
+        with self._stats_lock:
+            return dict(self.stats)
+
+
+_shared_client: Optional[CachedHTTPClient] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_client() -> CachedHTTPClient:
+    """Process-wide client so every fetcher shares one pool, bucket and cache"""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = CachedHTTPClient()
+        return _shared_client
@@ -0,0 +1,568 @@
+"""
+NBA DFS Lineup Optimizer
+Builds N lineups from RankingEngine output under salary cap, roster-slot,
+per-team, exposure, stacking and uniqueness rules
+
+Pure Python branch-and-bound (no solver service):
+- Slots are filled one at a time, candidates tried best bound first
+- Upper bound = points so far + best possible fill of the remaining slots for
+  the remaining salary, precomputed per slot as a knapsack table with numpy
+  (ignores duplicates/teams, so it never underestimates)
+- Stacking rules search one designated stack team at a time, bounded by a
+  per-team table that counts each of the team's players only once
+- Lineups that only differ by swapping players between slots are searched once
+- Each new lineup re-solves with exposure-capped players removed and a
+  max-overlap rule against every lineup already built
+- With min_unique <= 1 one search keeps the top remaining-N distinct lineups
+  instead; they are taken in order until one breaks an exposure cap, which is
+  exactly what re-solving after every lineup would pick, then the pool shrinks
+  and it searches again. 150 stacked lineups from a 300-player pool take
+  under a second, a few seconds with tight exposure caps. A wider min_unique
+  still re-solves per lineup: 15-30s for the same portfolio
+- A lineup found after the node budget or time limit ran out is returned with
+  optimal=False (best found, not proven best)
+"""
+import heapq
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Classic 8-man NBA roster: (slot, eligible positions)
+DEFAULT_SLOTS = [
+    ('PG', ('PG',)),
+    ('SG', ('SG',)),
+    ('SF', ('SF',)),
+    ('PF', ('PF',)),
+    ('C', ('C',)),
+    ('G', ('PG', 'SG')),
+    ('F', ('SF', 'PF')),
+    ('UTIL', ('PG', 'SG', 'SF', 'PF', 'C')),
+]
+
+SALARY_BUCKET = 100  # Upper-bound table resolution in salary dollars
+
+
+@dataclass
+class RosterRules:
+    """Contest rules and portfolio constraints for lineup generation"""
+    slots: List[Tuple[str, Tuple[str, ...]]] = field(default_factory=lambda: list(DEFAULT_SLOTS))
+    salary_cap: int = 50000
+    min_salary: int = 0
+    max_per_team: int = 4
+    max_exposure: float = 1.0                 # Share of lineups any player may appear in
+    player_exposure: Dict[str, float] = field(default_factory=dict)  # Per-player overrides
+    min_unique: int = 1                       # Players each lineup must differ by
+    stack_sizes: List[int] = field(default_factory=list)  # e.g. [3] or [3, 2]
+    stack_teams: Optional[List[str]] = None   # Teams allowed to form stacks
+    locks: List[str] = field(default_factory=list)
+    excludes: List[str] = field(default_factory=list)
+    max_nodes: int = 2_000_000                # Search budget per solve
+    time_limit: Optional[float] = None        # Seconds for the whole portfolio
+
+
+@dataclass
+class Lineup:
+    """One optimized lineup"""
+    players: List[Dict]          # Player records with an added 'slot' key, in slot order
+    salary: int
+    projection: float
+    optimal: bool = True         # False when the search budget ran out first
+
+    @property
+    def names(self) -> List[str]:
+        return [p['name'] for p in self.players]
+
+    def to_row(self) -> Dict:
+        row = {p['slot']: p['name'] for p in self.players}
+        row['salary'] = self.salary
+        row['projection'] = round(self.projection, 2)
+        return row
+
+
+class LineupOptimizer:
+    """
+    Generate lineups from a ranked player DataFrame
+
+    Args:
+        df: RankingEngine.rank_players()/assign_tiers() output (needs name, team,
+            position, salary and the objective column)
+        objective: Column to maximize ('projected_points', 'ceiling', ...)
+    """
+
+    def __init__(self, df: pd.DataFrame, objective: str = 'projected_points'):
+        self.objective = objective
+        pool = df.dropna(subset=['name', 'salary', objective])
+        pool = pool[pool[objective] > 0].sort_values(objective, ascending=False, kind='stable')
+        self.records = pool.to_dict('records')
+        self.names = [str(p['name']) for p in self.records]
+        self.teams = [str(p.get('team', '')) for p in self.records]
+        self.salaries = [int(p['salary']) for p in self.records]
+        self.points = [float(p[objective]) for p in self.records]
+        self.positions = [set(str(p.get('position', '')).split('/')) for p in self.records]
+
+    # ---- public API ------------------------------------------------------
+
+    def generate(self, n: int = 20, rules: Optional[RosterRules] = None) -> List[Lineup]:
+        """
+        Build up to n lineups, best first
+
+        Stops early when the rules leave no feasible lineup, or when
+        rules.time_limit runs out (timed_out is set).
+        """
+        rules = rules or RosterRules()
+        deadline = time.monotonic() + rules.time_limit if rules.time_limit is not None else None
+        self.timed_out = False
+        size = len(rules.slots)
+        max_overlap = size - max(rules.min_unique, 1)
+        excluded = set(rules.excludes)
+        locked = {i for i, name in enumerate(self.names) if name in set(rules.locks)}
+
+        caps = []
+        for i, name in enumerate(self.names):
+            share = 1.0 if i in locked else rules.player_exposure.get(name, rules.max_exposure)
+            caps.append(max(1, math.floor(share * n + 1e-9)) if share > 0 else 0)
+        used = [0] * len(self.names)
+
+        lineups: List[Lineup] = []
+        player_lineups = [0] * len(self.names)  # player -> bitmask of lineups containing them
+
+        ctx, pool = None, None
+        while len(lineups) < n:
+            available = [
+                i for i in range(len(self.names))
+                if self.names[i] not in excluded and used[i] < caps[i]
+            ]
+            if available != pool:
+                # Exposure caps changed the pool: rebuild bound tables
+                pool = available
+                ctx = self._prepare(rules, available, locked) if locked.issubset(available) else None
+            if ctx is None:
+                break
+            if deadline is not None and time.monotonic() > deadline:
+                self.timed_out = True
+                break
+            # Any lineup is distinct from the rest of a top-N batch, so without a
+            # wider min_unique only exposure caps can stop the batch early
+            keep = n - len(lineups) if rules.min_unique <= 1 else 1
+            batch = self._solve(rules, ctx, locked, player_lineups, max_overlap, deadline, keep)
+            if not batch:
+                self.timed_out = deadline is not None and time.monotonic() > deadline
+                break
+
+            for picks in batch:
+                if any(used[i] >= caps[i] for i, _ in picks):
+                    break  # Pool changed: re-solve without the capped player
+                lineup = self._build(rules, picks)
+                lineup.optimal = self.last_optimal
+                index = len(lineups)
+                lineups.append(lineup)
+                for i, _ in picks:
+                    used[i] += 1
+                    player_lineups[i] |= 1 << index
+
+        return lineups
+
+    def exposure(self, lineups: Sequence[Lineup]) -> List[Dict]:
+        """Per-player lineup counts and share, most used first"""
+        counts: Dict[str, int] = {}
+        for lineup in lineups:
+            for name in lineup.names:
+                counts[name] = counts.get(name, 0) + 1
+        total = len(lineups) or 1
+        return [
+            {'name': name, 'lineups': count, 'exposure_pct': round(count / total * 100, 1)}
+            for name, count in sorted(counts.items(), key=lambda item: -item[1])
+        ]
+
+    @staticmethod
+    def to_dataframe(lineups: Sequence[Lineup]) -> pd.DataFrame:
+        """One row per lineup: slot columns with player names, salary, projection"""
+        return pd.DataFrame([lineup.to_row() for lineup in lineups])
+
+    # ---- search ----------------------------------------------------------
+
+    @staticmethod
+    def _convolve(out: np.ndarray, src: np.ndarray, options: List[Tuple[int, float]]):
+        """out[b] = max(out[b], src[b - cost] + points) over (cost, points) options"""
+        width = out.shape[0]
+        for cost, p in options:
+            if cost < width:
+                np.maximum(out[cost:], src[:width - cost] + p, out=out[cost:])
+
+    @staticmethod
+    def _best_per_cost(pairs) -> List[Tuple[int, float]]:
+        """Keep only the best projection at each salary bucket"""
+        best: Dict[int, float] = {}
+        for cost, p in pairs:
+            if p > best.get(cost, -math.inf):
+                best[cost] = p
+        return list(best.items())
+
+    def _prepare(self, rules: RosterRules, available: List[int], locked: set) -> Optional[Dict]:
+        """
+        Per-pool search tables, reused until the available players change
+
+        tables[k][b] bounds the best points for filling slots k.. with bucketed
+        salary <= b. Salaries are floored to SALARY_BUCKET and players may
+        repeat, so the tables can only overestimate, which keeps pruning
+        exact. Candidate lists per (slot, budget) are built lazily by _order,
+        sorted by each candidate's own bound so the search can stop at the
+        first one that cannot beat the incumbent.
+        """
+        width = rules.salary_cap // SALARY_BUCKET + 1
+        size = len(rules.slots)
+
+        candidates = []
+        for _, positions in rules.slots:
+            positions = set(positions)
+            candidates.append([i for i in available if self.positions[i] & positions])
+
+        arrays = []
+        options = []
+        for slot in candidates:
+            costs = [self.salaries[i] // SALARY_BUCKET for i in slot]
+            pts = [self.points[i] for i in slot]
+            arrays.append((
+                np.array(slot, dtype=np.int64),
+                np.array(costs, dtype=np.int64),
+                np.array(pts),
+            ))
+            options.append(self._best_per_cost(zip(costs, pts)))
+
+        tables = [None] * (size + 1)
+        tables[size] = np.zeros(width)
+        for k in range(size - 1, -1, -1):
+            tables[k] = np.full(width, -np.inf)
+            self._convolve(tables[k], tables[k + 1], options[k])
+        if tables[0][-1] == -np.inf:
+            return None
+
+        eligible = [set(slot) for slot in candidates]
+        # Slot pairs where one player could stand in for the other: a swap gives
+        # the same lineup, so only the order with the better-ranked player in
+        # the earlier slot is searched (any lineup can be swapped into that form)
+        swappable = [
+            [j for j in range(k) if eligible[j] & eligible[k]]
+            for k in range(size)
+        ]
+        ctx = {
+            'arrays': arrays,
+            'tables': tables,
+            'eligible': eligible,
+            'swappable': swappable,
+            'orders': {},
+        }
+        if rules.stack_sizes:
+            allowed = set(rules.stack_teams) if rules.stack_teams else None
+            teams: Dict[str, List[int]] = {}
+            for i in available:
+                if allowed is None or self.teams[i] in allowed:
+                    teams.setdefault(self.teams[i], []).append(i)
+            self._prepare_groups(ctx, teams, max(rules.stack_sizes), candidates, options, width)
+        elif locked:
+            self._prepare_groups(ctx, {'locks': sorted(locked)}, len(locked), candidates, options, width)
+        return ctx
+
+    def _prepare_groups(self, ctx, groups, depth, candidates, options, width):
+        """
+        Bound tables for searches that need players from a designated group
+
+        A group is one team (stacking) or the locked players. The knapsack
+        tables let a player fill several slots, so they know nothing about a
+        group supplying `need` distinct players. For a group G:
+
+            combos[G][c][x]  best c distinct G players with bucketed salary <= x
+            skip[k][c][b]    best fill of slots k.. leaving c of them empty
+
+        and group_table(G, k)[c] = max over x of combos[G][c][x] + skip[k][c][b - x]
+        bounds any fill of slots k.. containing c more G players.
+        """
+        tables = ctx['tables']
+        size = len(tables) - 1
+
+        skip = [None] * (size + 1)
+        skip[size] = np.full((depth + 1, width), -np.inf)
+        skip[size][0] = 0.0
+        for k in range(size - 1, -1, -1):
+            skip[k] = np.full((depth + 1, width), -np.inf)
+            skip[k][0] = tables[k]
+            for c in range(1, depth + 1):
+                self._convolve(skip[k][c], skip[k + 1][c], options[k])
+                np.maximum(skip[k][c], skip[k + 1][c - 1], out=skip[k][c])
+
+        combos = {}
+        group_of = {}
+        for group, members in groups.items():
+            table = np.full((depth + 1, width), -np.inf)
+            table[0] = 0.0
+            for i in members:
+                group_of[i] = group
+                cost = self.salaries[i] // SALARY_BUCKET
+                if cost >= width:
+                    continue
+                for c in range(depth, 0, -1):
+                    np.maximum(table[c][cost:], table[c - 1][:width - cost] + self.points[i],
+                               out=table[c][cost:])
+            combos[group] = table
+
+        codes = {group: n for n, group in enumerate(combos)}
+        ctx['skip'] = skip
+        ctx['combos'] = combos
+        ctx['group_of'] = group_of
+        ctx['group_codes'] = codes
+        ctx['slot_groups'] = [
+            np.array([codes.get(group_of.get(i), -1) for i in slot], dtype=np.int64)
+            for slot in candidates
+        ]
+        ctx['group_tables'] = {}
+        ctx['group_orders'] = {}
+
+    def _group_table(self, ctx: Dict, group: str, k: int) -> np.ndarray:
+        """[c][b] bound for slots k.. with c more players from group (cached)"""
+        key = (group, k)
+        table = ctx['group_tables'].get(key)
+        if table is None:
+            general = ctx['tables'][k]
+            skip = ctx['skip'][k]
+            combos = ctx['combos'][group]
+            width = general.shape[0]
+            table = np.full(combos.shape, -np.inf)
+            table[0] = general
+            for c in range(1, combos.shape[0]):
+                row = combos[c]
+                # row is a step function of salary: only its steps matter
+                steps = np.flatnonzero(np.isfinite(row) & (row > np.concatenate(([-np.inf], row[:-1]))))
+                for x in steps.tolist():
+                    np.maximum(table[c][x:], skip[c][:width - x] + row[x], out=table[c][x:])
+                np.minimum(table[c], general, out=table[c])
+            ctx['group_tables'][key] = table
+        return table
+
+    def _order(self, ctx: Dict, k: int, b: int) -> Tuple[List[int], List[float]]:
+        """Slot k candidates affordable with b buckets, by descending bound"""
+        key = (k, b)
+        cached = ctx['orders'].get(key)
+        if cached is None:
+            ids, costs, pts = ctx['arrays'][k]
+            mask = costs <= b
+            bound = pts[mask] + ctx['tables'][k + 1][b - costs[mask]]
+            keep = np.isfinite(bound)
+            ids, bound = ids[mask][keep], bound[keep]
+            order = np.argsort(-bound, kind='stable')
+            cached = (ids[order].tolist(), bound[order].tolist())
+            ctx['orders'][key] = cached
+        return cached
+
+    def _group_order(self, ctx: Dict, group: str, k: int, b: int, need: int) -> Tuple[List[int], List[float]]:
+        """_order for a search that still needs `need` players from group"""
+        key = (group, k, b, need)
+        cached = ctx['group_orders'].get(key)
+        if cached is None:
+            ids, costs, pts = ctx['arrays'][k]
+            mask = costs <= b
+            in_group = ctx['slot_groups'][k][mask] == ctx['group_codes'][group]
+            still = np.maximum(need - in_group, 0)
+            bound = pts[mask] + self._group_table(ctx, group, k + 1)[still, b - costs[mask]]
+            keep = np.isfinite(bound)
+            ids, bound = ids[mask][keep], bound[keep]
+            order = np.argsort(-bound, kind='stable')
+            cached = (ids[order].tolist(), bound[order].tolist())
+            ctx['group_orders'][key] = cached
+        return cached
+
+    def _solve(
+        self,
+        rules: RosterRules,
+        ctx: Dict,
+        locked: set,
+        player_lineups: List[int],
+        max_overlap: int,
+        deadline: Optional[float] = None,
+        keep: int = 1
+    ) -> List[List[Tuple[int, int]]]:
+        """
+        Best `keep` feasible lineups with distinct players, best first, each as
+        [(player index, slot index)]; empty when nothing is feasible
+
+        The bound prunes against the keep-th best lineup so far. The search
+        gives up after rules.max_nodes nodes or at deadline (time.monotonic()),
+        returning the best lineups found so far; last_optimal records whether
+        it finished.
+
+        Overlap with earlier lineups is tracked as bit-sliced counters: plane b
+        holds bit b of every earlier lineup's shared-player count, so adding a
+        player is a ripple-carry over a few big ints regardless of how many
+        lineups exist.
+        """
+        size = len(rules.slots)
+        eligible = ctx['eligible']
+        swappable = ctx['swappable']
+        group_of = ctx.get('group_of', {})
+        points_of = self.points
+        salaries = self.salaries
+        teams = self.teams
+        max_per_team = rules.max_per_team
+        stack_sizes = sorted(rules.stack_sizes, reverse=True)
+        stack_teams = set(rules.stack_teams) if rules.stack_teams else None
+        stack_total = sum(stack_sizes)
+        threshold = max_overlap + 1
+        planes_needed = max(size, 1).bit_length()
+        team_counts: Dict[str, int] = {}
+        chosen: List[int] = []
+        in_lineup = set()
+        # best['points'] is the score to beat: the keep-th best once there are keep
+        best = {'points': -math.inf, 'heap': [], 'seen': set()}
+        nodes = [0]
+
+        def stack_deficit() -> int:
+            """Fewest extra players needed to satisfy every stack rule"""
+            counts = sorted(
+                (c for t, c in team_counts.items() if stack_teams is None or t in stack_teams),
+                reverse=True
+            )
+            return sum(
+                max(0, need - (counts[j] if j < len(counts) else 0))
+                for j, need in enumerate(stack_sizes)
+            )
+
+        def too_close(planes: Tuple[int, ...]) -> bool:
+            """Any earlier lineup sharing >= threshold players (bit-sliced compare)"""
+            above, equal = 0, -1
+            for b in range(planes_needed - 1, -1, -1):
+                plane = planes[b]
+                if (threshold >> b) & 1:
+                    equal &= plane
+                else:
+                    above |= equal & plane
+                    equal &= ~plane
+            return (above | equal) != 0
+
+        def search(k: int, salary_left: int, points: float, planes: Tuple[int, ...], need: int):
+            nodes[0] += 1
+            if k == size:
+                if rules.salary_cap - salary_left < rules.min_salary:
+                    return
+                if locked and not locked.issubset(in_lineup):
+                    return
+                if points > best['points']:
+                    # The same players can come up in another slot order or
+                    # under another stack team; keep one copy
+                    players = frozenset(chosen)
+                    if players in best['seen']:
+                        return
+                    heap = best['heap']
+                    heapq.heappush(heap, (points, -nodes[0], players, list(zip(chosen, range(size)))))
+                    best['seen'].add(players)
+                    if len(heap) > keep:
+                        best['seen'].discard(heapq.heappop(heap)[2])
+                    if len(heap) == keep:
+                        best['points'] = heap[0][0]
+                return
+            if nodes[0] > rules.max_nodes:
+                return
+            if deadline is not None and nodes[0] % 1024 == 0 and time.monotonic() > deadline:
+                nodes[0] = rules.max_nodes + 1  # Out of time: unwind as if out of nodes
+                return
+
+            remaining = size - k
+            # Once every remaining slot is needed for a lock, only locks may go in
+            locks_only = bool(locked) and len(locked - in_lineup) >= remaining
+            # The designated team's bound already rules out lineups that cannot
+            # finish its stack; secondary stacks are checked over the last few picks
+            check_stack = len(stack_sizes) > 1 and stack_total > remaining - 1
+
+            if group is None:
+                ids, bounds = self._order(ctx, k, salary_left // SALARY_BUCKET)
+            else:
+                ids, bounds = self._group_order(ctx, group, k, salary_left // SALARY_BUCKET, need)
+            for i, bound in zip(ids, bounds):
+                if points + bound <= best['points']:
+                    break  # Sorted by bound: nobody later can beat the incumbent
+                s = salaries[i]
+                if s > salary_left or i in in_lineup or (locks_only and i not in locked):
+                    continue
+                team = teams[i]
+                if team_counts.get(team, 0) >= max_per_team:
+                    continue
+                # Group players are exempt: the group bound assumes they can
+                # still take any later slot, so forbidding that would leave the
+                # search chasing lineups it may not finish
+                if group_of.get(i) != group and any(
+                    chosen[j] > i and i in eligible[j] and chosen[j] in eligible[k]
+                    and group_of.get(chosen[j]) != group
+                    for j in swappable[k]
+                ):
+                    continue
+
+                # Overlap with earlier lineups may only grow, so prune as soon as
+                # this pick makes the lineup too close to any of them
+                carry = player_lineups[i]
+                child = planes
+                if carry:
+                    child = []
+                    for plane in planes:
+                        child.append(plane ^ carry)
+                        carry &= plane
+                    child = tuple(child)
+                    if k >= max_overlap and too_close(child):
+                        continue
+
+                team_counts[team] = team_counts.get(team, 0) + 1
+                if check_stack and stack_deficit() > remaining - 1:
+                    self._release(team_counts, team)
+                    continue
+                chosen.append(i)
+                in_lineup.add(i)
+                search(k + 1, salary_left - s, points + points_of[i], child,
+                       need - 1 if need and group_of.get(i) == group else need)
+                in_lineup.discard(i)
+                chosen.pop()
+                self._release(team_counts, team)
+
+        root = (0, rules.salary_cap, 0.0, (0,) * planes_needed)
+        if not stack_sizes:
+            # With locks the whole search is designated to the locked group
+            group = 'locks' if locked else None
+            search(*root, len(locked))
+        else:
+            # Every valid lineup has some team supplying the biggest stack, so
+            # searching each team as the designated stack covers them all, with
+            # a bound that knows the team only has so many players
+            depth = stack_sizes[0]
+            cap = rules.salary_cap // SALARY_BUCKET
+            by_bound = sorted(
+                ((self._group_table(ctx, team, 0)[depth][cap], team) for team in ctx['combos']),
+                reverse=True
+            )
+            for bound, group in by_bound:
+                if bound <= best['points'] or nodes[0] > rules.max_nodes:
+                    break
+                search(*root, depth)
+
+        self.last_nodes = nodes[0]
+        self.last_optimal = nodes[0] <= rules.max_nodes
+        return [entry[3] for entry in sorted(best['heap'], reverse=True)]
+
+    @staticmethod
+    def _release(team_counts: Dict[str, int], team: str):
+        """Undo one team pick, dropping empty teams so stack checks stay small"""
+        if team_counts[team] == 1:
+            del team_counts[team]
+        else:
+            team_counts[team] -= 1
+
+    def _build(self, rules: RosterRules, picks: List[Tuple[int, int]]) -> Lineup:
+        players = []
+        for i, slot_index in picks:
+            player = dict(self.records[i])
+            player['slot'] = rules.slots[slot_index][0]
+            players.append(player)
+        return Lineup(
+            players=players,
+            salary=sum(self.salaries[i] for i, _ in picks),
+            projection=sum(self.points[i] for i, _ in picks)
+        )
@@ -5,11 +5,18 @@ Generates tier recommendations
 """
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 
 class RankingEngine:
-    def __init__(self):
+    def __init__(self, simulator=None):
+        """
+        Args:
+            simulator: Optional SlateSimulator; when set, ceiling/floor come from
+                       simulated percentiles instead of position multipliers
+        """
+        self.simulator = simulator
+        self.last_simulation = None
         self.variance_factors = {
             'PG': 1.15,  # Point guards have higher variance
             'SG': 1.12,
@@ -27,11 +34,16 @@ class RankingEngine:
         # Variance based on position
         variance = self.variance_factors.get(position, 1.10)
         
-        # Ceiling: best case scenario (90th percentile)
-        ceiling = projected * variance * 1.25
-        
-        # Floor: worst case scenario (10th percentile)
-        floor = projected * (2 - variance) * 0.75
+        if 'sim_ceiling' in player:
+            # Simulated 90th/10th percentile outcomes
+            ceiling = player['sim_ceiling']
+            floor = player['sim_floor']
+        else:
+            # Ceiling: best case scenario (90th percentile)
+            ceiling = projected * variance * 1.25
+            
+            # Floor: worst case scenario (10th percentile)
+            floor = projected * (2 - variance) * 0.75
         
         # Value: ceiling divided by salary (per $1000)
         value = (ceiling / salary) * 1000
@@ -52,14 +64,92 @@ class RankingEngine:
             'variance': round(variance, 2)
         }
     
-    def rank_players(self, players: List[Dict]) -> pd.DataFrame:
+    def calculate_metrics_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """calculate_player_metrics for a whole DataFrame of players at once"""
+        projected = df['projected_points'].astype(float)
+        salary = df['salary'].astype(float)
+        variance = df['position'].map(self.variance_factors).fillna(1.10).astype(float)
+        
+        ceiling = projected * variance * 1.25
+        floor = projected * (2 - variance) * 0.75
+        if 'sim_ceiling' in df.columns:
+            # Simulated 90th/10th percentile outcomes where available
+            ceiling = df['sim_ceiling'].astype(float).where(df['sim_ceiling'].notna(), ceiling)
+            floor = df['sim_floor'].astype(float).where(df['sim_floor'].notna(), floor)
+        
+        df['ceiling'] = self._round2(ceiling)
+        df['floor'] = self._round2(floor)
+        df['value'] = self._round2(ceiling / salary * 1000)
+        df['upside'] = self._round2(ceiling - projected)
+        df['ppd'] = self._round2(projected / (salary / 1000))
+        df['variance'] = self._round2(variance)
+        return df
+    
+    @staticmethod
+    def _round2(values: pd.Series) -> pd.Series:
+        """
+        round(x, 2) for a whole Series
+        
+        numpy rounds x * 100, which can land on the other side of a half; values
+        that close to a half are re-rounded with the builtin so results match
+        calculate_player_metrics exactly.
+        """
+        scaled = values.to_numpy(dtype=float) * 100
+        result = np.round(scaled) / 100
+        near_half = np.abs(np.abs(scaled - np.floor(scaled)) - 0.5) < 1e-6
+        for i in np.flatnonzero(near_half):
+            result[i] = round(float(values.iat[i]), 2)
+        return pd.Series(result, index=values.index)
+    
+    def rank_players(self, players: List[Dict], vegas_lines: Optional[Dict] = None) -> pd.DataFrame:
         """Rank all players by multiple metrics"""
-        # Calculate metrics for all players
-        enriched_players = [self.calculate_player_metrics(p) for p in players]
+        df = pd.DataFrame(players)
+        if self.simulator is not None and players:
+            df = self.simulate_players(df, vegas_lines)
+        
+        # Calculate metrics for all players (columnar version of calculate_player_metrics)
+        df = self.calculate_metrics_frame(df)
+        return self._rank_frame(df)
+    
+    def update_players(self, df: pd.DataFrame, players: List[Dict],
+                       vegas_lines: Optional[Dict] = None) -> pd.DataFrame:
+        """
+        Partial re-rank after some players' projections changed
+        
+        Only the changed players are re-simulated and get new metrics; every
+        other row keeps its numbers and just gets re-ranked and re-tiered.
         
-        # Convert to DataFrame for easier ranking
-        df = pd.DataFrame(enriched_players)
+        Args:
+            df: Previous rank_players/assign_tiers output
+            players: New projections for the changed players (matched by name)
+        """
+        if not players:
+            return df
+        updates = pd.DataFrame(players)
+        unchanged = df[~df['name'].isin(updates['name'])]
+        if self.simulator is not None and self.last_simulation is None:
+            # Nothing to patch yet; fall back to a full rank
+            return self.assign_tiers(self.rank_players(
+                unchanged.to_dict('records') + list(players), vegas_lines
+            ))
         
+        if self.simulator is not None:
+            self.last_simulation = self.simulator.update(self.last_simulation, players, vegas_lines)
+            summary = self.last_simulation.summary(updates['name'].astype(str).tolist())
+            for col in ['sim_mean', 'sim_floor', 'sim_ceiling', 'boom_pct', 'bust_pct']:
+                updates[col] = summary[col].to_numpy(dtype=float)
+        updates = self.calculate_metrics_frame(updates)
+        
+        combined = pd.concat([unchanged, updates], ignore_index=True)
+        return self.assign_tiers(self._rank_frame(combined))
+    
+    def remove_players(self, df: pd.DataFrame, names) -> pd.DataFrame:
+        """Drop players who left the slate; everyone else keeps their numbers and is re-ranked"""
+        remaining = df[~df['name'].isin(list(names))].reset_index(drop=True)
+        return self.assign_tiers(self._rank_frame(remaining))
+    
+    def _rank_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Slate-wide ranks and composite score from the per-player metrics"""
         # Add rankings
         df['value_rank'] = df['value'].rank(ascending=False)
         df['ceiling_rank'] = df['ceiling'].rank(ascending=False)
@@ -78,55 +168,59 @@ class RankingEngine:
         
         return df.sort_values('overall_rank')
     
+    def simulate_players(self, df: pd.DataFrame, vegas_lines: Optional[Dict] = None) -> pd.DataFrame:
+        """Attach simulated ceiling/floor and boom/bust rates to each player"""
+        self.last_simulation = self.simulator.simulate(df.to_dict('records'), vegas_lines)
+        summary = self.last_simulation.summary()
+        for col in ['sim_mean', 'sim_floor', 'sim_ceiling', 'boom_pct', 'bust_pct']:
+            df[col] = summary[col].to_numpy(dtype=float)
+        return df
+    
     def assign_tiers(self, df: pd.DataFrame) -> pd.DataFrame:
         """Assign players to tiers based on salary and rankings"""
-        def determine_tier(row):
-            salary = row['salary']
-            value = row['value']
-            ceiling = row['ceiling']
-            ownership = row['ownership_pct']
-            
-            # Tier 1: Stars - high salary, elite ceiling (play everyone)
-            if salary >= 9000 and ceiling >= 42:
-                return 'Tier 1: Stars'
-            
-            # Tier 2: Value plays - high value score, good ceiling
-            elif value >= 4.5 and ceiling >= 28:
-                return 'Tier 2: Value'
-            
-            # Tier 3: Punts - low salary, decent floor
-            elif salary <= 5500 and row['floor'] >= 15:
-                return 'Tier 3: Punts'
-            
-            # Tier 4: Fades - poor value or high ownership with risk
-            elif value < 3.5 or (ownership > 25 and row['floor'] < 25):
-                return 'Tier 4: Fades'
-            
-            else:
-                return 'Tier 2: Value'
+        salary = df['salary']
+        value = df['value']
+        ceiling = df['ceiling']
+        floor = df['floor']
+        ownership = df['ownership_pct']
         
-        df['tier'] = df.apply(determine_tier, axis=1)
+        # First matching rule wins, same order as the criteria in generate_recommendations
+        df['tier'] = np.select(
+            [
+                # Tier 1: Stars - high salary, elite ceiling (play everyone)
+                (salary >= 9000) & (ceiling >= 42),
+                # Tier 2: Value plays - high value score, good ceiling
+                (value >= 4.5) & (ceiling >= 28),
+                # Tier 3: Punts - low salary, decent floor
+                (salary <= 5500) & (floor >= 15),
+                # Tier 4: Fades - poor value or high ownership with risk
+                (value < 3.5) | ((ownership > 25) & (floor < 25)),
+            ],
+            ['Tier 1: Stars', 'Tier 2: Value', 'Tier 3: Punts', 'Tier 4: Fades'],
+            default='Tier 2: Value'
+        )
         return df
     
     def find_stacks(self, df: pd.DataFrame) -> List[Dict]:
         """Identify teams with correlated upside (game stacks)"""
-        stacks = []
+        # Rank teams by combined upside
+        team_upside = df.groupby('team')['upside'].sum().reset_index()
+        top_teams = team_upside.sort_values('upside', ascending=False)['team'].head(3).tolist()
         
-        # Group by team and calculate team metrics
-        team_groups = df.groupby('team').agg({
-            'upside': 'sum',
-            'ceiling': 'sum',
-            'value': 'mean',
-            'name': lambda x: list(x)
-        }).reset_index()
-        
-        # Sort by combined upside
-        team_groups = team_groups.sort_values('upside', ascending=False)
+        # Top 3 ceilings per team in one pass (stable sort keeps nlargest's tie order)
+        best = (
+            df[df['team'].isin(top_teams)]
+            .sort_values('ceiling', ascending=False, kind='stable')
+            .groupby('team', sort=False)
+            .head(3)
+        )
+        by_team = dict(tuple(best.groupby('team', sort=False)))
         
-        for idx, row in team_groups.head(5).iterrows():
-            players = df[df['team'] == row['team']].nlargest(3, 'ceiling')
+        stacks = []
+        for team in top_teams:
+            players = by_team[team]
             stacks.append({
-                'team': str(row['team']),
+                'team': str(team),
                 'players': players['name'].tolist(),
                 'combined_ceiling': round(float(players['ceiling'].sum()), 2),
                 'combined_upside': round(float(players['upside'].sum()), 2),
@@ -134,7 +228,7 @@ class RankingEngine:
                 'total_salary': int(players['salary'].sum())
             })
         
-        return stacks[:3]  # Top 3 stacks
+        return stacks  # Top 3 stacks
     
     def find_contrarian_pivots(self, df: pd.DataFrame) -> List[Dict]:
         """Find low-owned players with high upside"""
@@ -166,8 +260,16 @@ class RankingEngine:
             'recommended_stacks': stacks,
             'contrarian_pivots': contrarian,
             'methodology': {
-                'ceiling_calc': 'Projected points × position variance × 1.25 (90th percentile outcome)',
-                'floor_calc': 'Projected points × (2 - variance) × 0.75 (10th percentile outcome)',
+                'ceiling_calc': (
+                    f'90th percentile of {self.simulator.n_sims} correlated simulations'
+                    if self.simulator is not None else
+                    'Projected points × position variance × 1.25 (90th percentile outcome)'
+                ),
+                'floor_calc': (
+                    f'10th percentile of {self.simulator.n_sims} correlated simulations'
+                    if self.simulator is not None else
+                    'Projected points × (2 - variance) × 0.75 (10th percentile outcome)'
+                ),
                 'value_calc': '(Ceiling / Salary) × 1000 (points per $1K)',
                 'upside_calc': 'Ceiling - Projected points',
                 'tier1_criteria': 'Salary >= $9K, Ceiling >= 42 pts',
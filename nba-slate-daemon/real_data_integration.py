@@ -2,16 +2,18 @@
 Real NBA Data Integration for Underdog Contest Feb 9, 2026
 Fetches live NBA roster, injury data, Vegas lines, and calculates real projections
 """
-import requests
 from typing import Dict, List, Optional
 from datetime import datetime
 import json
-import time
+
+from http_cache import CachedHTTPClient, get_shared_client
 
 class RealNBADataFetcher:
     """Fetches real NBA data from free APIs"""
     
-    def __init__(self):
+    def __init__(self, http: Optional[CachedHTTPClient] = None):
+        self.http = http or get_shared_client()
+        
         # Free NBA APIs
         self.nba_api_base = "https://stats.nba.com/stats"
         self.balldontlie_api = "https://api.balldontlie.io/v1"
@@ -34,7 +36,7 @@ class RealNBADataFetcher:
             url = f"{self.espn_api}/scoreboard"
             params = {'dates': date_str.replace('-', '')}  # Format: 20260209
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -89,7 +91,7 @@ class RealNBADataFetcher:
         try:
             # Try ESPN API first
             url = f"{self.espn_api}/teams/{team_abbrev}/roster"
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self.http.get(url, headers=self.headers, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -126,12 +128,12 @@ class RealNBADataFetcher:
         
         print(f"📋 Fetching rosters for {len(teams_playing)} teams...")
         
-        for team in teams_playing:
-            roster = self.get_active_roster(team)
+        # Concurrent fetches; the shared client's token bucket does the rate limiting
+        teams = sorted(t for t in teams_playing if t)
+        for team, roster in zip(teams, self.http.map(self.get_active_roster, teams)):
             for player in roster:
                 player['team'] = team
             all_players.extend(roster)
-            time.sleep(0.5)  # Rate limiting
         
         print(f"✅ Total players loaded: {len(all_players)}")
         return all_players
@@ -162,6 +164,10 @@ class RealNBADataFetcher:
             print(f"Error fetching stats for {player_name}: {e}")
             return {}
     
+    def get_players_season_stats(self, player_names: List[str], season: str = "2025-26") -> List[Dict]:
+        """get_player_season_stats for many players with bounded concurrency (input order)"""
+        return self.http.map(lambda name: self.get_player_season_stats(name, season), player_names)
+    
     def calculate_projection_from_vegas(self, player_stats: Dict, game_total: float, 
                                        team_pace: float = 100.0) -> Dict:
         """
@@ -193,7 +199,8 @@ class RealNBADataFetcher:
 class RealInjuryDataFetcher:
     """Fetches real-time NBA injury data from free sources"""
     
-    def __init__(self):
+    def __init__(self, http: Optional[CachedHTTPClient] = None):
+        self.http = http or get_shared_client()
         self.espn_api = "https://site.api.espn.com/apis/site/v2/sports/basketball/nba"
         self.headers = {'User-Agent': 'Mozilla/5.0'}
     
@@ -205,7 +212,7 @@ class RealInjuryDataFetcher:
         try:
             # ESPN has a public injuries endpoint
             url = f"{self.espn_api}/injuries"
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self.http.get(url, headers=self.headers, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -259,7 +266,8 @@ class RealInjuryDataFetcher:
 class RealVegasLinesFetcher:
     """Fetches Vegas betting lines from free sources"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, http: Optional[CachedHTTPClient] = None):
+        self.http = http or get_shared_client()
         self.api_key = api_key  # The Odds API key (free tier available)
         self.api_base = "https://api.the-odds-api.com/v4"
         self.backup_sources = [
@@ -287,7 +295,7 @@ class RealVegasLinesFetcher:
                 'markets': 'totals,spreads'
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -329,7 +337,7 @@ class RealVegasLinesFetcher:
         """Try to get lines from ESPN"""
         # ESPN sometimes includes betting lines in their scoreboard data
         try:
-            response = requests.get(self.backup_sources[0], timeout=10)
+            response = self.http.get(self.backup_sources[0], timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 # Parse betting data if available
@@ -389,10 +397,11 @@ class RealVegasLinesFetcher:
 class RealDataIntegrator:
     """Integrates all real data sources for Underdog contest"""
     
-    def __init__(self, odds_api_key: Optional[str] = None):
-        self.nba_fetcher = RealNBADataFetcher()
-        self.injury_fetcher = RealInjuryDataFetcher()
-        self.vegas_fetcher = RealVegasLinesFetcher(api_key=odds_api_key)
+    def __init__(self, odds_api_key: Optional[str] = None, http: Optional[CachedHTTPClient] = None):
+        self.http = http or get_shared_client()
+        self.nba_fetcher = RealNBADataFetcher(self.http)
+        self.injury_fetcher = RealInjuryDataFetcher(self.http)
+        self.vegas_fetcher = RealVegasLinesFetcher(api_key=odds_api_key, http=self.http)
         self.contest_date = "2026-02-09"
     
     def get_complete_slate_data(self) -> Dict:
@@ -416,10 +425,11 @@ class RealDataIntegrator:
         # Step 3: Get Vegas lines
         vegas_lines = self.vegas_fetcher.get_vegas_lines(self.contest_date)
         
-        # Step 4: Enrich player data with projections
+        # Step 4: Enrich player data with projections (stats fetched concurrently)
         enriched_players = []
+        all_stats = self.nba_fetcher.get_players_season_stats([p.get('name') for p in all_players])
         
-        for player in all_players:
+        for player, season_stats in zip(all_players, all_stats):
             player_name = player.get('name')
             team = player.get('team')
             
@@ -430,9 +440,6 @@ class RealDataIntegrator:
             # Get game total for projection adjustment
             game_total = self._get_game_total_for_team(team, vegas_lines)
             
-            # Get season stats (would be real API call in production)
-            season_stats = self.nba_fetcher.get_player_season_stats(player_name)
-            
             # Calculate Vegas-adjusted projection
             if season_stats and game_total:
                 projection = self.nba_fetcher.calculate_projection_from_vegas(
@@ -447,6 +454,7 @@ class RealDataIntegrator:
         print(f"   - {len(enriched_players)} total players")
         print(f"   - {injury_data['count']} injury reports")
         print(f"   - {len(vegas_lines)} Vegas lines")
+        print(f"   - HTTP: {self.http.get_stats()}")
         print("=" * 60)
         
         return {
@@ -13,7 +13,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from underdog_scoring import UnderdogScoring
 from real_data_integration import RealDataIntegrator
-from typing import Dict, List
+from typing import Dict, List, Optional
 import json
 
 class RealProjectionsEngine:
@@ -22,6 +22,10 @@ class RealProjectionsEngine:
     Uses real data instead of mock/hardcoded values
     """
     
+    # Hand-tuned multipliers (tunable per instance; see nba/backtest.py)
+    AVG_GAME_TOTAL = 222.5          # Game total that leaves stats unscaled
+    QUESTIONABLE_MULTIPLIER = 0.8   # Questionable/doubtful discount
+    
     def __init__(self):
         self.underdog_scorer = UnderdogScoring()
         self.data_integrator = RealDataIntegrator()
@@ -142,6 +146,14 @@ class RealProjectionsEngine:
             'minutes': 28.0, 'fg_pct': 0.450
         }
     
+    def get_game_logs(self, player_name: str) -> List[Dict]:
+        """
+        Player's recent box scores for the slate simulator's dispersion fit
+        In production: would fetch the last 10 games from the NBA API
+        For now: no log source, so the simulator falls back to DEFAULT_SHAPE
+        """
+        return []
+    
     def adjust_for_vegas_total(self, base_stats: Dict, game_total: float, 
                                team_pace: float = 100.0) -> Dict:
         """
@@ -149,7 +161,7 @@ class RealProjectionsEngine:
         Higher totals = more possessions = more stats expected
         """
         # NBA average game total is ~220-225
-        avg_total = 222.5
+        avg_total = self.AVG_GAME_TOTAL
         pace_multiplier = game_total / avg_total
         
         # Apply pace adjustment to counting stats
@@ -174,7 +186,7 @@ class RealProjectionsEngine:
         if injury_status.lower() == 'out':
             return {k: 0 for k in projection.keys()}
         elif injury_status.lower() in ['questionable', 'doubtful']:
-            multiplier = 0.8
+            multiplier = self.QUESTIONABLE_MULTIPLIER
             return {k: round(v * multiplier, 1) for k, v in projection.items()}
         
         return projection
@@ -201,7 +213,9 @@ class RealProjectionsEngine:
     
     def generate_full_projection(self, player_name: str, team: str, 
                                 position: str, game_total: float = 220.0,
-                                injury_status: str = 'active') -> Dict:
+                                injury_status: str = 'active',
+                                recent_stats: Optional[Dict] = None,
+                                game_logs: Optional[List[Dict]] = None) -> Dict:
         """
         Generate complete projection for a player including:
         - Base stats from recent performance
@@ -209,9 +223,13 @@ class RealProjectionsEngine:
         - Injury adjustment
         - Ceiling/floor calculation
         - Underdog fantasy points
+        
+        recent_stats overrides the built-in averages (e.g. archived slates in backtests)
+        game_logs (per-game stat dicts, most recent first) ride along to the
+        slate simulator, which fits each player's dispersion from them
         """
         # Step 1: Get recent stats
-        recent_stats = self.get_recent_stats(player_name)
+        recent_stats = recent_stats or self.get_recent_stats(player_name)
         
         # Step 2: Adjust for Vegas game total
         vegas_adjusted = self.adjust_for_vegas_total(recent_stats, game_total)
@@ -254,6 +272,8 @@ class RealProjectionsEngine:
             'injury_status': injury_status,
             'projected_stats': final_projection,
             'projected_underdog_points': projected_pts,
+            'projected_points': projected_pts,     # RankingEngine input
+            'ownership_pct': 0.0,                  # No ownership source yet
             'ceiling': ceiling_pts,
             'floor': floor_pts,
             'value': value,
@@ -261,7 +281,8 @@ class RealProjectionsEngine:
             'ceiling_stats': variance['ceiling_stats'],
             'floor_stats': variance['floor_stats'],
             'game_total': game_total,
-            'minutes': final_projection.get('minutes', 30)
+            'minutes': final_projection.get('minutes', 30),
+            'game_logs': game_logs if game_logs is not None else self.get_game_logs(player_name)
         }
     
     def generate_slate_projections(self, contest_date: str = "2026-02-09") -> List[Dict]:
@@ -276,24 +297,21 @@ class RealProjectionsEngine:
         
         projections = []
         
-        # Generate projections for all known players
-        for player_name, salary in self.salary_tiers.items():
-            # Find player's team and game
-            team = self._find_player_team(player_name, slate_data)
-            if not team:
-                continue  # Skip if not playing today
+        # Generate projections for all players on the slate
+        for player in self.slate_roster(slate_data):
+            team = player['team']
             
             # Get game total for player's game
             game_total = self._get_game_total(team, slate_data['vegas_lines'])
             
             # Check injury status
-            injury_status = self._get_injury_status(player_name, slate_data['injuries'])
+            injury_status = self._get_injury_status(player['name'], slate_data['injuries'])
             
             # Generate projection
             projection = self.generate_full_projection(
-                player_name=player_name,
+                player_name=player['name'],
                 team=team,
-                position=self._get_position(player_name),
+                position=player['position'],
                 game_total=game_total,
                 injury_status=injury_status
             )
@@ -312,22 +330,25 @@ class RealProjectionsEngine:
         
         return projections
     
-    def _find_player_team(self, player_name: str, slate_data: Dict) -> str:
-        """Find which team a player plays for"""
-        # Simplified lookup - in production would use roster data
-        team_map = {
-            'Luka Doncic': 'DAL',
-            'Nikola Jokic': 'DEN',
-            'Giannis Antetokounmpo': 'MIL',
-            'Shai Gilgeous-Alexander': 'OKC',
-            'Joel Embiid': 'PHI',
-            'Jayson Tatum': 'BOS',
-            'Kevin Durant': 'PHX',
-            'Stephen Curry': 'GSW',
-            'LeBron James': 'LAL',
-            'Anthony Davis': 'LAL',
-        }
-        return team_map.get(player_name)
+    def slate_roster(self, slate_data: Dict) -> List[Dict]:
+        """
+        Players on today's slate (name, team, position) from the slate's own
+        player list (today's team rosters), without projecting them - cheap
+        enough to re-check on every incremental update
+        """
+        roster = []
+        seen = set()
+        for player in slate_data.get('players', []):
+            name, team = player.get('name'), player.get('team')
+            if not name or not team or name in seen:
+                continue
+            seen.add(name)
+            roster.append({
+                'name': name,
+                'team': team,
+                'position': player.get('position') or self._get_position(name)
+            })
+        return roster
     
     def _get_game_total(self, team: str, vegas_lines: Dict) -> float:
         """Get Vegas total for team's game"""
@@ -0,0 +1,283 @@
+"""
+NBA Slate Monte Carlo Simulator
+Draws thousands of correlated box scores per player and scores them with
+Underdog scoring to get real percentile ceilings/floors, boom/bust rates
+and lineup win probabilities
+
+Model (all NumPy, sims x players at once):
+- Game shock: each game's final total is drawn around its Vegas total, and
+  both teams scale with it (shared pace)
+- Team shock: teammates share a usage/efficiency swing on top of it
+- Player shock: minutes/role swing shared by all of one player's stats
+- Stat draws: gamma-Poisson (negative binomial) around the projected means,
+  with per-stat dispersion fitted from each player's 'game_logs' when the
+  caller supplies them. RealProjectionsEngine passes logs through but has no
+  log source yet (get_game_logs returns []), so live slates use DEFAULT_SHAPE
+"""
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from underdog_scoring import UnderdogScoring
+
+STATS = list(UnderdogScoring.SCORING.keys())
+
+MATCHUP_SPLIT = re.compile(r'\s+(?:@|vs\.?)\s+')  # 'LAL @ DAL' or 'DAL vs LAL'
+AVG_GAME_TOTAL = 222.5     # Same baseline RealProjectionsEngine uses
+GAME_TOTAL_SD = 17.0       # Typical miss of a closing NBA total, in points
+TEAM_SD = 0.06             # Shared teammate swing (log scale)
+PLAYER_SD = 0.16           # Minutes/role swing (log scale)
+
+# Gamma-Poisson shape per stat when a player has no usable logs
+# (lower = more spread beyond Poisson)
+DEFAULT_SHAPE = {
+    'points': 14.0,
+    'rebounds': 12.0,
+    'assists': 8.0,
+    'steals': 6.0,
+    'blocks': 4.0,
+    'turnovers': 8.0,
+}
+MIN_LOG_GAMES = 5
+MAX_SHAPE = 1000.0         # ~pure Poisson
+
+# Same ratios RankingEngine used for its fixed ceiling/floor multipliers
+BOOM_RATIO = 1.25
+BUST_RATIO = 0.75
+
+
+@dataclass
+class SimulationResult:
+    """Simulated Underdog points, sims x players"""
+    names: List[str]
+    teams: List[str]
+    projections: np.ndarray      # Mean-projection Underdog points per player
+    points: np.ndarray           # float32 (n_sims, n_players)
+
+    def __post_init__(self):
+        self._index = {name: i for i, name in enumerate(self.names)}
+
+    @property
+    def n_sims(self) -> int:
+        return self.points.shape[0]
+
+    def percentiles(self, q: Sequence[float]) -> np.ndarray:
+        """Per-player percentiles, shape (len(q), n_players)"""
+        return np.percentile(self.points, q, axis=0)
+
+    def summary(self, names: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Per-player mean, floor (p10), median, ceiling (p90), boom and bust rates
+
+        Args:
+            names: Only summarize these players (in this order); default all
+        """
+        cols = list(range(len(self.names))) if names is None else [self._index[n] for n in names]
+        points = self.points if names is None else self.points[:, cols]
+        p10, p50, p90 = np.percentile(points, [10, 50, 90], axis=0)
+        projections = self.projections[np.newaxis, cols]
+        boom = (points >= projections * BOOM_RATIO).mean(axis=0)
+        bust = (points <= projections * BUST_RATIO).mean(axis=0)
+        return pd.DataFrame({
+            'name': [self.names[c] for c in cols],
+            'team': [self.teams[c] for c in cols],
+            'sim_mean': points.mean(axis=0).round(2),
+            'sim_floor': p10.round(2),
+            'sim_median': p50.round(2),
+            'sim_ceiling': p90.round(2),
+            'boom_pct': (boom * 100).round(1),
+            'bust_pct': (bust * 100).round(1),
+        })
+
+    def lineup_points(self, lineups: Sequence) -> np.ndarray:
+        """
+        Simulated totals per lineup, shape (n_sims, n_lineups)
+
+        Lineups are lists of player names or objects with a .names list
+        (lineup_optimizer.Lineup). Unknown names score 0.
+        """
+        totals = np.zeros((self.n_sims, len(lineups)), dtype=np.float32)
+        for j, lineup in enumerate(lineups):
+            names = getattr(lineup, 'names', lineup)
+            cols = [self._index[name] for name in names if name in self._index]
+            if cols:
+                totals[:, j] = self.points[:, cols].sum(axis=1)
+        return totals
+
+    def lineup_win_probabilities(self, lineups: Sequence) -> np.ndarray:
+        """Share of sims each lineup finishes first among lineups (ties split)"""
+        if not lineups:
+            return np.zeros(0)
+        totals = self.lineup_points(lineups)
+        best = totals.max(axis=1, keepdims=True)
+        winners = totals == best
+        return (winners / winners.sum(axis=1, keepdims=True)).mean(axis=0)
+
+
+class SlateSimulator:
+    """
+    Correlated Monte Carlo over a slate of players
+
+    Args:
+        n_sims: Simulations per run
+        seed: RNG seed for reproducible runs
+    """
+
+    def __init__(self, n_sims: int = 10000, seed: Optional[int] = None):
+        self.n_sims = n_sims
+        self.seed = seed
+        self.scorer = UnderdogScoring()
+
+    def simulate(self, players: Sequence[Dict], vegas_lines: Optional[Dict] = None) -> SimulationResult:
+        """
+        Simulate every player's Underdog points
+
+        Args:
+            players: Player dicts with name and team, plus per-stat means in
+                'projected_stats' or 'stat_projections' (otherwise a generic
+                stat line scaled to projected points), and optional
+                'game_logs' (list of per-game stat dicts, most recent first)
+            vegas_lines: {'AWAY @ HOME': {'total': 228.5, ...}} ('A vs B' keys work too)
+        """
+        # One child generator per stat so the draws can run on threads (numpy
+        # releases the GIL while sampling) and stay reproducible with a seed
+        rng, *stat_rngs = [np.random.default_rng(child) for child in
+                           np.random.SeedSequence(self.seed).spawn(len(STATS) + 1)]
+        players = list(players)
+        n = len(players)
+        names = [str(p['name']) for p in players]
+        teams = [str(p.get('team', '')) for p in players]
+
+        means = np.zeros((len(STATS), n))
+        shapes = np.zeros((len(STATS), n))
+        for j, player in enumerate(players):
+            stat_means = self._stat_means(player)
+            logs = player.get('game_logs') or []
+            for s, stat in enumerate(STATS):
+                means[s, j] = stat_means[stat]
+                shapes[s, j] = self._fit_shape(stat, stat_means[stat], logs)
+
+        shock = self._team_shocks(rng, teams, vegas_lines or {})
+        shock *= np.exp(rng.normal(-PLAYER_SD ** 2 / 2, PLAYER_SD, (self.n_sims, n)))
+
+        shock = shock.astype(np.float32)
+
+        def draw(s: int) -> np.ndarray:
+            stat_rng = stat_rngs[s]
+            lam = shock * means[s].astype(np.float32)
+            if (shapes[s] < MAX_SHAPE).any():
+                # Gamma-Poisson: the gamma factor has mean 1, so shocks keep the mean
+                shape = shapes[s].astype(np.float32)
+                lam *= stat_rng.standard_gamma(shape, (self.n_sims, n), dtype=np.float32) / shape
+            return stat_rng.poisson(lam).astype(np.float32)
+
+        with ThreadPoolExecutor(max_workers=min(len(STATS), os.cpu_count() or 1)) as pool:
+            draws = dict(zip(STATS, pool.map(draw, range(len(STATS)))))
+
+        points = self.scorer.score_stat_arrays(draws)
+        projections = self.scorer.score_stat_arrays(dict(zip(STATS, means)))
+        return SimulationResult(names, teams, np.asarray(projections), points)
+
+    def update(self, result: SimulationResult, players: Sequence[Dict],
+               vegas_lines: Optional[Dict] = None) -> SimulationResult:
+        """
+        Patch a previous result for players whose projections changed
+
+        Players already in the result keep their correlated draws rescaled to
+        the new mean projection (game totals move the projections, the shocks
+        are mean-one); new players and players coming back from a zero
+        projection get fresh draws. Returns a new result, the old one is untouched.
+        """
+        players = list(players)
+        projections = result.projections.copy()
+        points = result.points.copy()
+        names, teams = list(result.names), list(result.teams)
+
+        fresh = []
+        for player in players:
+            means = self._stat_means(player)
+            projected = float(self.scorer.score_stat_arrays(means))
+            j = result._index.get(str(player['name']))
+            if j is None or projections[j] <= 0:
+                fresh.append(player)
+                continue
+            points[:, j] *= np.float32(projected / projections[j])
+            projections[j] = projected
+
+        if fresh:
+            drawn = self.simulate(fresh, vegas_lines)
+            for k, name in enumerate(drawn.names):
+                j = result._index.get(name)
+                if j is None:
+                    names.append(name)
+                    teams.append(drawn.teams[k])
+                    projections = np.append(projections, drawn.projections[k])
+                    points = np.column_stack([points, drawn.points[:, k]])
+                else:
+                    projections[j] = drawn.projections[k]
+                    points[:, j] = drawn.points[:, k]
+        return SimulationResult(names, teams, projections, points)
+
+    # ---- inputs ----------------------------------------------------------
+
+    def _stat_means(self, player: Dict) -> Dict[str, float]:
+        stats = player.get('projected_stats') or player.get('stat_projections')
+        if stats and all(stat in stats for stat in STATS):
+            return {stat: max(float(stats[stat]), 0.0) for stat in STATS}
+
+        logs = player.get('game_logs') or []
+        if len(logs) >= MIN_LOG_GAMES:
+            return {stat: float(np.mean([g.get(stat, 0) for g in logs])) for stat in STATS}
+
+        # Scale UnderdogScoring's default line to the player's projection
+        base = self.scorer.calculate_underdog_points('', custom_stats=None)
+        projected = player.get('projected_underdog_points') or player.get('projected_points')
+        scale = float(projected) / base['underdog_points'] if projected else 1.0
+        return {stat: base['stats'][stat] * scale for stat in STATS}
+
+    @staticmethod
+    def _fit_shape(stat: str, mean: float, logs: List[Dict]) -> float:
+        """
+        Method-of-moments gamma shape from recent logs
+
+        Observed variance = mean + mean^2 * (1/shape + player shock variance),
+        so the player shock is taken out before solving for the shape.
+        """
+        values = [g[stat] for g in logs if stat in g]
+        if len(values) < MIN_LOG_GAMES or mean <= 0:
+            return DEFAULT_SHAPE[stat]
+        excess = (np.var(values, ddof=1) - mean) / mean ** 2 - (np.exp(PLAYER_SD ** 2) - 1)
+        if excess <= 1.0 / MAX_SHAPE:
+            return MAX_SHAPE
+        return float(1.0 / excess)
+
+    def _team_shocks(self, rng: np.random.Generator, teams: List[str], vegas_lines: Dict) -> np.ndarray:
+        """Mean-one multiplier per (sim, player) shared by game and team"""
+        games: Dict[str, Dict] = {}
+        for matchup, lines in vegas_lines.items():
+            for team in MATCHUP_SPLIT.split(matchup.strip()):
+                if team:
+                    games[team] = {'matchup': matchup, 'total': float(lines.get('total') or AVG_GAME_TOTAL)}
+
+        # One draw per game (teams without lines get a game of their own)
+        keys = sorted({games[t]['matchup'] if t in games else f"solo:{t}" for t in teams})
+        totals = np.array([
+            next((g['total'] for g in games.values() if g['matchup'] == key), AVG_GAME_TOTAL)
+            for key in keys
+        ])
+        game_draws = rng.normal(totals, GAME_TOTAL_SD, (self.n_sims, len(keys)))
+        game_factor = np.clip(game_draws / totals, 0.5, 1.5)
+
+        team_keys = sorted(set(teams))
+        team_factor = np.exp(rng.normal(-TEAM_SD ** 2 / 2, TEAM_SD, (self.n_sims, len(team_keys))))
+
+        game_col = {key: c for c, key in enumerate(keys)}
+        team_col = {key: c for c, key in enumerate(team_keys)}
+        player_game = [game_col[games[t]['matchup'] if t in games else f"solo:{t}"] for t in teams]
+        player_team = [team_col[t] for t in teams]
+        return game_factor[:, player_game] * team_factor[:, player_team]
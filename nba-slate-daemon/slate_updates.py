@@ -0,0 +1,247 @@
+"""
+Incremental slate updates and server-sent events
+Keeps the last injury/Vegas snapshot and slate roster, re-projects only the
+players whose status or game line changed (plus players new to the slate),
+drops players who left it, re-ranks with a partial update and publishes the
+rows that changed to every connected dashboard over SSE
+"""
+import json
+import queue
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from slate_simulator import MATCHUP_SPLIT
+
+# Columns whose change is worth pushing to clients
+WATCHED_COLUMNS = [
+    'injury_status', 'projected_points', 'projected_underdog_points', 'ceiling', 'floor',
+    'value', 'upside', 'overall_rank', 'tier', 'boom_pct', 'bust_pct', 'game_total'
+]
+HEARTBEAT_SECONDS = 15
+DEFAULT_GAME_TOTAL = 220.0     # Same fallback RealProjectionsEngine uses
+
+
+# ---- diffs ------------------------------------------------------------------
+
+def injury_statuses(injuries: Dict) -> Dict[str, str]:
+    """player -> status from an injury report"""
+    return {
+        name: info.get('status') or 'active'
+        for name, info in (injuries or {}).get('by_player', {}).items()
+    }
+
+
+def diff_injuries(old: Dict, new: Dict) -> Dict[str, str]:
+    """Players whose status changed -> new status ('active' when dropped from the report)"""
+    before, after = injury_statuses(old), injury_statuses(new)
+    return {
+        name: after.get(name, 'active')
+        for name in set(before) | set(after)
+        if before.get(name, 'active') != after.get(name, 'active')
+    }
+
+
+def team_totals(vegas_lines: Dict) -> Dict[str, Tuple]:
+    """team -> (total, spread) of its game ('AWAY @ HOME' or 'A vs B' keys)"""
+    lines = {}
+    for matchup, line in (vegas_lines or {}).items():
+        for team in MATCHUP_SPLIT.split(matchup.strip()):
+            if team:
+                lines[team] = (line.get('total'), line.get('spread'))
+    return lines
+
+
+def diff_vegas(old: Dict, new: Dict) -> Dict[str, float]:
+    """Teams whose game total/spread moved -> new game total"""
+    before, after = team_totals(old), team_totals(new)
+    return {
+        team: line[0] if line[0] is not None else DEFAULT_GAME_TOTAL
+        for team, line in after.items()
+        if before.get(team) != line
+    }
+
+
+def changed_rows(old: pd.DataFrame, new: pd.DataFrame) -> List[Dict]:
+    """Rows of new that are new or differ from old in any watched column"""
+    rows = [_clean(row) for row in new.to_dict('records')]
+    if old is None or old.empty:
+        return rows
+    columns = [c for c in WATCHED_COLUMNS if c in new.columns]
+    before = old.set_index('name')
+    changed = []
+    for row in rows:
+        name = row['name']
+        if name not in before.index:
+            changed.append(row)
+            continue
+        prev = before.loc[name]
+        if any(not _same(prev.get(c), row.get(c)) for c in columns):
+            changed.append(row)
+    return changed
+
+
+def _clean(row: Dict) -> Dict:
+    """NaN -> None so rows serialize to valid JSON for EventSource clients"""
+    return {k: None if _missing(v) else v for k, v in row.items()}
+
+
+def _same(a, b) -> bool:
+    """Equality that treats two missing values (None/NaN) as equal"""
+    if _missing(a) or _missing(b):
+        return _missing(a) and _missing(b)
+    return a == b
+
+
+def _missing(value) -> bool:
+    return value is None or (isinstance(value, float) and value != value)
+
+
+# ---- incremental state -------------------------------------------------------
+
+class IncrementalSlate:
+    """
+    Slate state that can be updated from new injury/Vegas snapshots
+
+    Args:
+        ranking_engine: RankingEngine used for the full load and partial re-ranks
+        reproject: (player, injury_status, game_total) -> new projection dict
+                   (e.g. RealProjectionsEngine.generate_full_projection inputs)
+    """
+
+    def __init__(self, ranking_engine, reproject: Callable[[Dict, str, float], Dict]):
+        self.ranking_engine = ranking_engine
+        self.reproject = reproject
+        self.players: Dict[str, Dict] = {}     # name -> unranked projection
+        self.injuries: Dict = {}
+        self.vegas_lines: Dict = {}
+        self.ranked: Optional[pd.DataFrame] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.ranked is not None
+
+    def load(self, players: List[Dict], injuries: Dict, vegas_lines: Dict) -> pd.DataFrame:
+        """Full build; later ticks go through update()"""
+        self.players = {p['name']: p for p in players}
+        self.injuries = injuries
+        self.vegas_lines = vegas_lines
+        ranked = self.ranking_engine.rank_players(list(self.players.values()), vegas_lines)
+        self.ranked = self.ranking_engine.assign_tiers(ranked)
+        return self.ranked
+
+    def update(self, injuries: Dict, vegas_lines: Dict,
+               roster: Optional[List[Dict]] = None) -> Tuple[pd.DataFrame, List[Dict], Set[str]]:
+        """
+        Apply new snapshots
+
+        Args:
+            roster: Current slate players (name/team/position at least). Players
+                    not seen before are projected and added, players on a new
+                    team are re-projected for it, and players missing from it
+                    are dropped. None keeps the loaded roster.
+
+        Returns:
+            (ranked DataFrame, changed rows to publish, names re-projected);
+            dropped players are published as {'name': ..., 'removed': True}
+        """
+        status_changes = diff_injuries(self.injuries, injuries)
+        total_changes = diff_vegas(self.vegas_lines, vegas_lines)
+        self.injuries = injuries
+        self.vegas_lines = vegas_lines
+
+        listed = {p['name']: p for p in roster} if roster is not None else {}
+        added = set(listed) - set(self.players) if roster is not None else set()
+        removed = set(self.players) - set(listed) if roster is not None else set()
+        for name in removed:
+            del self.players[name]
+        traded = {
+            name for name, p in listed.items()
+            if name in self.players and p.get('team') != self.players[name].get('team')
+        }
+
+        affected = added | traded | {
+            name for name, p in self.players.items()
+            if name in status_changes or p.get('team') in total_changes
+        }
+        if not affected and not removed:
+            return self.ranked, [], affected
+
+        statuses = injury_statuses(injuries)
+        totals = team_totals(vegas_lines)
+        for name in affected:
+            player = listed.get(name) or self.players[name]
+            total = totals.get(player.get('team'), (None,))[0] or DEFAULT_GAME_TOTAL
+            self.players[name] = self.reproject(player, statuses.get(name, 'active'), total)
+
+        previous = self.ranked
+        ranked = previous
+        if removed:
+            ranked = self.ranking_engine.remove_players(ranked, removed)
+        if affected:
+            ranked = self.ranking_engine.update_players(
+                ranked, [self.players[name] for name in affected], vegas_lines
+            )
+        self.ranked = ranked
+        changed = changed_rows(previous, ranked) + [{'name': name, 'removed': True} for name in sorted(removed)]
+        return self.ranked, changed, affected
+
+
+# ---- server-sent events ------------------------------------------------------
+
+class SlateEventBus:
+    """
+    Thread-safe fan-out of slate events to SSE clients
+
+    Keeps the last `history` events so a reconnecting EventSource (which sends
+    Last-Event-ID) gets what it missed instead of a full reload.
+    """
+
+    def __init__(self, history: int = 500, encoder=None):
+        self.lock = threading.Lock()
+        self.subscribers: List[queue.Queue] = []
+        self.history = deque(maxlen=history)
+        self.next_id = 1
+        self.encoder = encoder
+
+    def publish(self, event: str, data) -> int:
+        with self.lock:
+            event_id = self.next_id
+            self.next_id += 1
+            message = self._format(event_id, event, data)
+            self.history.append((event_id, message))
+            for subscriber in self.subscribers:
+                subscriber.put(message)
+        return event_id
+
+    def _format(self, event_id: int, event: str, data) -> str:
+        payload = json.dumps(data, cls=self.encoder, default=str)
+        return f"id: {event_id}\nevent: {event}\ndata: {payload}\n\n"
+
+    def stream(self, last_event_id: Optional[str] = None, heartbeat: float = HEARTBEAT_SECONDS) -> Iterator[str]:
+        """SSE text for one client (replays missed events first)"""
+        inbox: queue.Queue = queue.Queue()
+        with self.lock:
+            if last_event_id and str(last_event_id).isdigit():
+                for event_id, message in self.history:
+                    if event_id > int(last_event_id):
+                        inbox.put(message)
+            self.subscribers.append(inbox)
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    yield inbox.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield f": keepalive {int(time.time())}\n\n"
+        finally:
+            with self.lock:
+                self.subscribers.remove(inbox)
+
+    @property
+    def client_count(self) -> int:
+        with self.lock:
+            return len(self.subscribers)
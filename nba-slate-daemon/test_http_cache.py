@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for the cached HTTP client used by the real-data fetchers
+Runs against a local server that speaks ETag/Last-Modified
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from http_cache import CachedHTTPClient, TokenBucket
+from real_data_integration import RealNBADataFetcher
+
+HITS = []
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        HITS.append(self.path)
+        etag = '"v1"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        if '/roster' in self.path:
+            team = self.path.split('/')[-2]
+            body = {'athletes': [{'athlete': {'displayName': f"{team} Guard", 'position': {'abbreviation': 'PG'}}}]}
+        else:
+            body = {'path': self.path}
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('ETag', etag)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_ttl_then_conditional_revalidation(tmp_path):
+    server, base = start_server()
+    try:
+        client = CachedHTTPClient(cache_dir=str(tmp_path), ttls=[('/fresh', 60), ('/stale', 0)])
+        HITS.clear()
+
+        first = client.get(f"{base}/fresh", params={'a': 1})
+        again = client.get(f"{base}/fresh", params={'a': 1})
+        assert (first.source, again.source) == ('network', 'cache')
+        assert again.json() == first.json() and len(HITS) == 1
+
+        client.get(f"{base}/stale")
+        revalidated = client.get(f"{base}/stale")
+        assert revalidated.source == 'revalidated' and revalidated.status_code == 200
+        assert revalidated.json() == {'path': '/stale'}
+        assert client.get_stats()['not_modified'] == 1
+
+        # A fresh client reuses the on-disk cache
+        other = CachedHTTPClient(cache_dir=str(tmp_path), ttls=[('/fresh', 60)])
+        assert other.get(f"{base}/fresh", params={'a': 1}).source == 'cache'
+    finally:
+        server.shutdown()
+
+    # Server gone: the last good body is served
+    down = CachedHTTPClient(cache_dir=str(tmp_path), ttls=[('/stale', 0)])
+    assert down.get(f"{base}/stale", timeout=1).source == 'stale'
+
+
+def test_concurrent_rosters(tmp_path):
+    server, base = start_server()
+    try:
+        fetcher = RealNBADataFetcher(CachedHTTPClient(cache_dir=str(tmp_path), max_workers=4))
+        fetcher.espn_api = base
+        fetcher.get_games_for_date = lambda date_str: [
+            {'home_team': 'DAL', 'away_team': 'LAL'}, {'home_team': 'DEN', 'away_team': 'PHX'}
+        ]
+        players = fetcher.get_all_active_players_for_date()
+        assert [(p['name'], p['team']) for p in players] == [
+            ('DAL Guard', 'DAL'), ('DEN Guard', 'DEN'), ('LAL Guard', 'LAL'), ('PHX Guard', 'PHX')
+        ]
+    finally:
+        server.shutdown()
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=50, capacity=5)
+    start = time.monotonic()
+    for _ in range(15):
+        bucket.acquire()
+    # 5 burst tokens, then 10 more at 50/s
+    assert time.monotonic() - start >= 0.18
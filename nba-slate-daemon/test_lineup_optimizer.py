@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Tests for the lineup optimizer
+Checks optimality against brute force on small pools and that every
+portfolio rule holds on a full-size slate
+"""
+
+import itertools
+import random
+from collections import Counter
+
+import pandas as pd
+
+from lineup_optimizer import DEFAULT_SLOTS, LineupOptimizer, RosterRules
+
+POSITIONS = ['PG', 'SG', 'SF', 'PF', 'C', 'PG/SG', 'SF/PF', 'PF/C']
+
+
+def make_pool(n, teams, seed):
+    rng = random.Random(seed)
+    players = []
+    for i in range(n):
+        salary = rng.randrange(3000, 11100, 100)
+        players.append({
+            'name': f"Player {i}",
+            'team': f"T{rng.randrange(teams):02d}",
+            'position': rng.choice(POSITIONS),
+            'salary': salary,
+            'projected_points': round(salary / 1000 * rng.uniform(4, 6.5), 2),
+        })
+    return players
+
+
+def brute_force(players, stack_sizes):
+    """Best lineup projection by enumerating every 8-player combination"""
+    def fills_slots(combo, k=0, used=frozenset()):
+        if k == len(DEFAULT_SLOTS):
+            return True
+        return any(
+            i not in used
+            and set(players[i]['position'].split('/')) & set(DEFAULT_SLOTS[k][1])
+            and fills_slots(combo, k + 1, used | {i})
+            for i in combo
+        )
+
+    best = None
+    for combo in itertools.combinations(range(len(players)), 8):
+        if sum(players[i]['salary'] for i in combo) > 50000:
+            continue
+        counts = sorted(Counter(players[i]['team'] for i in combo).values(), reverse=True) + [0]
+        if counts[0] > 4 or any(counts[j] < need for j, need in enumerate(stack_sizes)):
+            continue
+        points = sum(players[i]['projected_points'] for i in combo)
+        if (best is None or points > best + 1e-9) and fills_slots(combo):
+            best = points
+    return best
+
+
+def test_matches_brute_force():
+    for seed in range(2):
+        players = make_pool(18, 4, seed)
+        optimizer = LineupOptimizer(pd.DataFrame(players))
+        for stack_sizes in ([], [3], [3, 2]):
+            lineups = optimizer.generate(1, RosterRules(stack_sizes=stack_sizes))
+            assert abs(lineups[0].projection - brute_force(players, stack_sizes)) < 1e-6
+
+
+def test_portfolio_rules():
+    optimizer = LineupOptimizer(pd.DataFrame(make_pool(120, 30, 7)))
+    rules = RosterRules(max_exposure=0.5, min_unique=3, stack_sizes=[3])
+    lineups = optimizer.generate(20, rules)
+    assert len(lineups) == 20
+
+    projections = [lineup.projection for lineup in lineups]
+    assert projections == sorted(projections, reverse=True)
+    for lineup in lineups:
+        assert lineup.salary <= 50000
+        assert [p['slot'] for p in lineup.players] == [slot for slot, _ in DEFAULT_SLOTS]
+        counts = Counter(p['team'] for p in lineup.players)
+        assert 3 <= max(counts.values()) <= 4
+    for a, b in itertools.combinations(lineups, 2):
+        assert len(set(a.names) - set(b.names)) >= 3
+    assert max(row['lineups'] for row in optimizer.exposure(lineups)) <= 10
+
+    df = LineupOptimizer.to_dataframe(lineups)
+    assert list(df.columns) == [slot for slot, _ in DEFAULT_SLOTS] + ['salary', 'projection']
+
+
+def test_locks_and_excludes():
+    optimizer = LineupOptimizer(pd.DataFrame(make_pool(120, 30, 7)))
+    rules = RosterRules(max_exposure=0.3, locks=['Player 5', 'Player 60'], excludes=['Player 0'])
+    lineups = optimizer.generate(10, rules)
+    assert len(lineups) == 10
+    for lineup in lineups:
+        assert {'Player 5', 'Player 60'} <= set(lineup.names)
+        assert 'Player 0' not in lineup.names
+
+
+class OneAtATime(LineupOptimizer):
+    """Re-solves after every lineup (no top-N batches)"""
+
+    def _solve(self, rules, ctx, locked, player_lineups, max_overlap, deadline=None, keep=1):
+        return super()._solve(rules, ctx, locked, player_lineups, max_overlap, deadline, 1)
+
+
+def test_batches_match_one_at_a_time():
+    df = pd.DataFrame(make_pool(200, 20, 11))
+    for rules in (RosterRules(), RosterRules(stack_sizes=[3]), RosterRules(stack_sizes=[3, 2]),
+                  RosterRules(max_exposure=0.4, stack_sizes=[3]),
+                  RosterRules(max_exposure=0.5, locks=['Player 3'], player_exposure={'Player 0': 0.1})):
+        batched = LineupOptimizer(df).generate(40, rules)
+        single = OneAtATime(df).generate(40, rules)
+        assert len(batched) == len(single) == 40
+        for a, b in zip(batched, single):
+            assert abs(a.projection - b.projection) < 1e-6
+        assert len({frozenset(lineup.names) for lineup in batched}) == 40
+        for name, count in Counter(n for lineup in batched for n in lineup.names).items():
+            share = 1.0 if name in rules.locks else rules.player_exposure.get(name, rules.max_exposure)
+            assert count <= max(1, int(share * 40 + 1e-9))
+
+
+def test_search_budget_marks_lineups():
+    optimizer = LineupOptimizer(pd.DataFrame(make_pool(120, 30, 7)))
+    lineups = optimizer.generate(3, RosterRules())
+    assert all(lineup.optimal for lineup in lineups) and not optimizer.timed_out
+
+    # A tiny node budget still returns lineups, flagged as unproven
+    capped = optimizer.generate(3, RosterRules(max_nodes=50))
+    assert capped and not any(lineup.optimal for lineup in capped)
+    assert capped[0].projection <= lineups[0].projection + 1e-9
+
+
+def test_time_limit_stops_portfolio():
+    optimizer = LineupOptimizer(pd.DataFrame(make_pool(120, 30, 7)))
+    assert optimizer.generate(50, RosterRules(time_limit=0)) == []
+    assert optimizer.timed_out
+
+    lineups = optimizer.generate(5, RosterRules(time_limit=60))
+    assert len(lineups) == 5 and not optimizer.timed_out
+
+
+if __name__ == '__main__':
+    test_matches_brute_force()
+    test_portfolio_rules()
+    test_locks_and_excludes()
+    test_batches_match_one_at_a_time()
+    test_search_budget_marks_lineups()
+    test_time_limit_stops_portfolio()
+    print("✅ Lineup optimizer tests passed")
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Tests for the columnar RankingEngine
+Checks it matches the original per-player implementation
+"""
+
+import pandas as pd
+
+from benchmark_ranking import build_pool, legacy_rank, legacy_stacks, legacy_tiers
+from ranking_engine import RankingEngine
+
+
+def test_matches_per_player_implementation():
+    engine = RankingEngine()
+    for size, seed in [(50, 1), (2000, 2)]:
+        players = build_pool(size, seed)
+        expected = legacy_tiers(legacy_rank(engine, players))
+        ranked = engine.assign_tiers(engine.rank_players(players))
+        pd.testing.assert_frame_equal(expected, ranked)
+        assert engine.find_stacks(ranked) == legacy_stacks(expected)
+
+
+def test_mixed_positions_and_sim_columns():
+    engine = RankingEngine()
+    players = build_pool(30, 3)
+    players[0]['position'] = 'PG/SG'
+    players[1].update({'sim_ceiling': 60.0, 'sim_floor': 12.5})
+    df = engine.rank_players(players).set_index('name')
+    assert df.loc['Player 0', 'variance'] == 1.10
+    assert df.loc['Player 1', 'ceiling'] == 60.0 and df.loc['Player 1', 'floor'] == 12.5
+    assert df.loc['Player 2', 'ceiling'] == engine.calculate_player_metrics(players[2])['ceiling']
+
+
+if __name__ == '__main__':
+    test_matches_per_player_implementation()
+    test_mixed_positions_and_sim_columns()
+    print("✅ Ranking engine tests passed")
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for the Monte Carlo slate simulator
+"""
+
+import numpy as np
+
+from ranking_engine import RankingEngine
+from real_projections_engine import RealProjectionsEngine
+from slate_simulator import SlateSimulator
+from underdog_scoring import UnderdogScoring
+
+VEGAS = {'LAL @ DAL': {'total': 228.5, 'spread': -3.5}, 'PHX @ DEN': {'total': 230.0, 'spread': -2.5}}
+
+
+def make_players():
+    line = {'points': 25.0, 'rebounds': 8.0, 'assists': 6.0, 'steals': 1.2, 'blocks': 0.8, 'turnovers': 3.0}
+    players = []
+    for team in ['LAL', 'DAL', 'DEN', 'PHX']:
+        for i in range(4):
+            players.append({'name': f"{team} {i}", 'team': team, 'projected_stats': dict(line)})
+    return players
+
+
+def test_means_and_percentiles():
+    players = make_players()
+    result = SlateSimulator(n_sims=20000, seed=1).simulate(players, VEGAS)
+    expected = UnderdogScoring().calculate_underdog_points('', custom_stats=players[0]['projected_stats'])
+    summary = result.summary()
+
+    assert result.points.shape == (20000, len(players))
+    assert np.allclose(summary['sim_mean'], expected['underdog_points'], rtol=0.02)
+    assert (summary['sim_floor'] < summary['sim_median']).all()
+    assert (summary['sim_median'] < summary['sim_ceiling']).all()
+    assert ((summary['boom_pct'] > 0) & (summary['bust_pct'] > 0)).all()
+
+
+def test_teammates_and_opponents_correlate():
+    result = SlateSimulator(n_sims=20000, seed=2).simulate(make_players(), VEGAS)
+    corr = np.corrcoef(result.points.T)
+    same_team = corr[0, 1]        # LAL 0 / LAL 1
+    same_game = corr[0, 4]        # LAL 0 / DAL 0
+    other_game = corr[0, 8]       # LAL 0 / DEN 0
+    assert same_team > same_game > other_game
+    assert abs(other_game) < 0.03
+
+
+def test_game_logs_set_dispersion():
+    steady = {'name': 'Steady', 'team': 'AAA',
+              'game_logs': [{'points': 20, 'rebounds': 5, 'assists': 4, 'steals': 1, 'blocks': 0, 'turnovers': 2}] * 10}
+    swingy = {'name': 'Swingy', 'team': 'BBB',
+              'game_logs': [{'points': p, 'rebounds': 5, 'assists': 4, 'steals': 1, 'blocks': 0, 'turnovers': 2}
+                            for p in [5, 35] * 5]}
+    result = SlateSimulator(n_sims=20000, seed=3).simulate([steady, swingy])
+    spread = result.percentiles([90])[0] - result.percentiles([10])[0]
+    assert abs(result.points.mean(axis=0)[0] - result.points.mean(axis=0)[1]) < 1.0
+    assert spread[1] > spread[0] * 1.5
+
+
+def test_projection_game_logs_reach_simulator():
+    engine = RealProjectionsEngine()
+    logs = [{'points': p, 'rebounds': 9, 'assists': 9, 'steals': 1, 'blocks': 0, 'turnovers': 4}
+            for p in [10, 55] * 5]
+    without = engine.generate_full_projection('Luka Doncic', 'DAL', 'PG', 228.5)
+    with_logs = engine.generate_full_projection('Luka Doncic', 'DAL', 'PG', 228.5, game_logs=logs)
+    assert without['game_logs'] == [] and with_logs['game_logs'] == logs
+
+    result = SlateSimulator(n_sims=20000, seed=6).simulate([without, dict(with_logs, name='Luka (logs)')])
+    spread = result.percentiles([90])[0] - result.percentiles([10])[0]
+    assert spread[1] > spread[0] * 1.3
+
+
+def test_lineup_win_probabilities():
+    result = SlateSimulator(n_sims=5000, seed=4).simulate(make_players(), VEGAS)
+    strong = [f"DAL {i}" for i in range(4)] + [f"LAL {i}" for i in range(4)]
+    weak = strong[:7]
+    probs = result.lineup_win_probabilities([strong, weak, strong[:6]])
+    assert abs(probs.sum() - 1.0) < 1e-9
+    assert probs[0] == 1.0
+
+
+def test_ranking_engine_uses_simulation():
+    players = make_players()
+    for i, player in enumerate(players):
+        player.update({'position': 'SF', 'salary': 6000 + 100 * i, 'ownership_pct': 10.0})
+        player['projected_points'] = UnderdogScoring().calculate_underdog_points(
+            '', custom_stats=player['projected_stats'])['underdog_points']
+    engine = RankingEngine(simulator=SlateSimulator(n_sims=2000, seed=5))
+    df = engine.rank_players(players, VEGAS)
+    assert engine.last_simulation is not None
+    assert (df['ceiling'] == df['sim_ceiling']).all()
+    assert (df['floor'] == df['sim_floor']).all()
+    assert {'boom_pct', 'bust_pct'} <= set(df.columns)
+
+
+if __name__ == '__main__':
+    test_means_and_percentiles()
+    test_teammates_and_opponents_correlate()
+    test_game_logs_set_dispersion()
+    test_projection_game_logs_reach_simulator()
+    test_lineup_win_probabilities()
+    test_ranking_engine_uses_simulation()
+    print("✅ Slate simulator tests passed")
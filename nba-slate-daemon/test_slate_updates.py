@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental slate updates and the SSE event bus
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from ranking_engine import RankingEngine
+from real_projections_engine import RealProjectionsEngine
+from slate_simulator import SlateSimulator
+from slate_updates import IncrementalSlate, SlateEventBus, diff_injuries, diff_vegas
+
+VEGAS = {'LAL @ DAL': {'total': 228.5, 'spread': -3.5}, 'PHX @ DEN': {'total': 230.0, 'spread': -2.5}}
+BASE_STATS = {'points': 20.0, 'rebounds': 6.0, 'assists': 5.0, 'steals': 1.0, 'blocks': 0.5, 'turnovers': 2.0}
+
+
+def project(player, status='active', game_total=220.0):
+    """Stand-in for RealProjectionsEngine.generate_full_projection"""
+    scale = 0.0 if status.lower() == 'out' else 0.8 if status.lower() == 'questionable' else 1.0
+    scale *= game_total / 222.5 * (1 + player['salary'] / 20000)
+    stats = {stat: round(value * scale, 1) for stat, value in BASE_STATS.items()}
+    points = round(stats['points'] + stats['rebounds'] * 1.2 + stats['assists'] * 1.5 +
+                   stats['steals'] * 3 + stats['blocks'] * 3 - stats['turnovers'], 2)
+    return {**player, 'injury_status': status, 'game_total': game_total,
+            'projected_stats': stats, 'projected_underdog_points': points, 'projected_points': points}
+
+
+def make_players():
+    players = []
+    for t, team in enumerate(['LAL', 'DAL', 'DEN', 'PHX']):
+        for i in range(5):
+            player = {'name': f"{team} {i}", 'team': team, 'position': ['PG', 'SG', 'SF', 'PF', 'C'][i],
+                      'salary': 4000 + 1000 * i + 100 * t, 'ownership_pct': 5.0 + 3 * i}
+            total = VEGAS['LAL @ DAL' if team in ('LAL', 'DAL') else 'PHX @ DEN']['total']
+            players.append(project(player, 'active', total))
+    return players
+
+
+def test_diffs():
+    old = {'by_player': {'A': {'status': 'Questionable'}, 'B': {'status': 'Out'}}}
+    new = {'by_player': {'A': {'status': 'Out'}, 'C': {'status': 'Questionable'}}}
+    assert diff_injuries(old, new) == {'A': 'Out', 'B': 'active', 'C': 'Questionable'}
+
+    moved = dict(VEGAS, **{'PHX @ DEN': {'total': 234.0, 'spread': -2.5}})
+    assert diff_vegas(VEGAS, moved) == {'PHX': 234.0, 'DEN': 234.0}
+    assert diff_vegas(VEGAS, VEGAS) == {}
+
+
+def test_partial_update_matches_full_rerank():
+    engine = RankingEngine()
+    slate = IncrementalSlate(engine, project)
+    slate.load(make_players(), {'by_player': {}}, VEGAS)
+
+    injuries = {'by_player': {'DAL 4': {'status': 'Out'}}}
+    moved = dict(VEGAS, **{'PHX @ DEN': {'total': 236.0, 'spread': -1.0}})
+    ranked, changed, affected = slate.update(injuries, moved)
+
+    assert affected == {'DAL 4'} | {f"{team} {i}" for team in ('PHX', 'DEN') for i in range(5)}
+    assert {row['name'] for row in changed} >= affected
+    assert all(isinstance(row, dict) for row in changed)
+
+    full = engine.assign_tiers(engine.rank_players(list(slate.players.values()), moved))
+    cols = ['name', 'projected_points', 'ceiling', 'floor', 'value', 'overall_rank', 'tier']
+    pd.testing.assert_frame_equal(
+        ranked[cols].sort_values('name').reset_index(drop=True),
+        full[cols].sort_values('name').reset_index(drop=True)
+    )
+
+    # Nothing moved: nothing re-projected or published
+    _, changed, affected = slate.update(injuries, moved)
+    assert changed == [] and affected == set()
+
+
+def test_roster_changes_add_and_drop_players():
+    engine = RankingEngine(simulator=SlateSimulator(n_sims=2000, seed=3))
+    slate = IncrementalSlate(engine, project)
+    players = make_players()
+    slate.load(players, {'by_player': {}}, VEGAS)
+
+    roster = [{k: p[k] for k in ('name', 'team', 'position', 'salary')} for p in players if p['name'] != 'DEN 1']
+    roster.append({'name': 'DAL 5', 'team': 'DAL', 'position': 'SG', 'salary': 3500})
+    ranked, changed, affected = slate.update({'by_player': {}}, VEGAS, roster)
+
+    assert affected == {'DAL 5'}
+    assert set(ranked['name']) == {p['name'] for p in roster} and len(ranked) == len(roster)
+    assert ranked['overall_rank'].min() == 1 and ranked['overall_rank'].max() <= len(roster)
+    assert {'name': 'DEN 1', 'removed': True} in changed
+    added = next(row for row in changed if row['name'] == 'DAL 5')
+    assert added['game_total'] == 228.5 and added['ceiling'] > 0
+
+    # Same roster again: nothing to do
+    _, changed, affected = slate.update({'by_player': {}}, VEGAS, roster)
+    assert changed == [] and affected == set()
+
+    # A trade moves a player to another team's game
+    traded = next(p for p in roster if p['team'] == 'DAL' and p['name'] != 'DAL 5')
+    traded['team'] = 'PHX'
+    ranked, changed, affected = slate.update({'by_player': {}}, VEGAS, roster)
+    assert affected == {traded['name']}
+    row = ranked.set_index('name').loc[traded['name']]
+    assert row['team'] == 'PHX' and row['game_total'] == VEGAS['PHX @ DEN']['total']
+
+
+def test_slate_roster_comes_from_slate_players():
+    engine = RealProjectionsEngine()
+    slate = {'players': [
+        {'name': 'Luka Doncic', 'team': 'LAL', 'position': 'PG'},      # Traded: slate team wins
+        {'name': 'Bench Guy', 'team': 'SAC', 'position': 'F'},         # Not a salary-tier star
+        {'name': 'No Position', 'team': 'SAC', 'position': None},
+        {'name': None, 'team': 'SAC'},
+        {'name': 'Luka Doncic', 'team': 'LAL', 'position': 'PG'},
+    ]}
+    assert engine.slate_roster(slate) == [
+        {'name': 'Luka Doncic', 'team': 'LAL', 'position': 'PG'},
+        {'name': 'Bench Guy', 'team': 'SAC', 'position': 'F'},
+        {'name': 'No Position', 'team': 'SAC', 'position': 'SG'},
+    ]
+    assert engine.slate_roster({}) == []
+
+
+def test_simulated_update_rescales_draws():
+    engine = RankingEngine(simulator=SlateSimulator(n_sims=4000, seed=7))
+    slate = IncrementalSlate(engine, project)
+    slate.load(make_players(), {'by_player': {}}, VEGAS)
+    before = engine.last_simulation
+    col = before.names.index('LAL 2')
+    other = before.names.index('DEN 0')
+
+    ranked, _, affected = slate.update({'by_player': {'LAL 2': {'status': 'Questionable'}}}, VEGAS)
+    after = engine.last_simulation
+    assert affected == {'LAL 2'}
+    ratio = after.projections[col] / before.projections[col]
+    assert 0.7 < ratio < 0.9
+    assert np.allclose(after.points[:, col], before.points[:, col] * np.float32(ratio), rtol=1e-5)
+    assert np.array_equal(after.points[:, other], before.points[:, other])
+    row = ranked.set_index('name').loc['LAL 2']
+    assert row['ceiling'] == after.summary(['LAL 2'])['sim_ceiling'].iloc[0]
+
+    # Out and back again: the zeroed column gets fresh draws
+    slate.update({'by_player': {'LAL 2': {'status': 'Out'}}}, VEGAS)
+    assert not engine.last_simulation.points[:, col].any()
+    ranked, _, _ = slate.update({'by_player': {}}, VEGAS)
+    assert engine.last_simulation.points[:, col].mean() > 0
+    assert ranked.set_index('name').loc['LAL 2', 'ceiling'] > 0
+
+
+def test_event_bus_streams_and_replays():
+    bus = SlateEventBus(history=10)
+    stream = bus.stream(heartbeat=0.01)
+    assert next(stream).startswith('retry:')
+    assert bus.client_count == 1
+
+    event_id = bus.publish('players', {'players': [{'name': 'A', 'ceiling': np.float64(40.5)}]})
+    message = next(stream)
+    assert message.startswith(f"id: {event_id}\nevent: players\n")
+    assert json.loads(message.split('data: ', 1)[1])['players'][0]['ceiling'] == 40.5
+    assert next(stream).startswith(': keepalive')
+    stream.close()
+    assert bus.client_count == 0
+
+    bus.publish('status', {'locked': True})
+    replay = bus.stream(last_event_id=str(event_id))
+    next(replay)
+    assert 'event: status' in next(replay)
+    replay.close()
+
+
+if __name__ == '__main__':
+    test_diffs()
+    test_partial_update_matches_full_rerank()
+    test_roster_changes_add_and_drop_players()
+    test_slate_roster_comes_from_slate_players()
+    test_simulated_update_rescales_draws()
+    test_event_bus_streams_and_replays()
+    print("✅ Slate update tests passed")
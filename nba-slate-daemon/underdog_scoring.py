@@ -103,6 +103,22 @@ class UnderdogScoring:
             }
         }
     
+    def score_stat_arrays(self, stats: Dict):
+        """
+        Underdog points for whole arrays of stat lines at once
+        
+        Args:
+            stats: stat name -> array (e.g. simulations x players); any
+                   objects supporting * and + work
+        
+        Returns:
+            Array of Underdog points with the same shape as the inputs
+        """
+        total = 0
+        for stat, multiplier in self.SCORING.items():
+            total = total + stats[stat] * multiplier
+        return total
+    
     def enrich_player_with_underdog_scoring(self, player: Dict) -> Dict:
         """
         Add Underdog scoring calculations to player dict
@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+NBA Projection Backtester
+Archives each slate's inputs and the actual box scores in a compact columnar
+store, then replays the projection engines against history:
+
+- DawgBowlOptimizer.calculate_projection (form blend, defense, pace)
+- RealProjectionsEngine.generate_full_projection (Vegas total, injuries)
+- HybridRankingEngine.calculate_fantasy_projection (home, usage)
+
+Multiplier grids are swept across a process pool and every engine/parameter
+set is scored on MAE (vs official Underdog points), per-slate Spearman rank
+correlation and top-N hit rate.
+
+Usage:
+    python3 backtest.py archive-inputs slate_template.json     # before lock
+    python3 backtest.py archive-results 2026-02-20             # after the games
+    python3 backtest.py sweep --workers 8 --top-n 10
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'nba-slate-daemon'))
+
+ARCHIVE_DIR = Path.home() / 'clawd' / 'nba' / 'backtest'
+
+# Official Underdog scoring (same as nba-slate-daemon/underdog_scoring.py)
+UNDERDOG_SCORING = {'pts': 1.0, 'reb': 1.2, 'ast': 1.5, 'stl': 3.0, 'blk': 3.0, 'tov': -1.0}
+
+STATS = ['pts', 'reb', 'ast', 'stl', 'blk', '3pm', 'tov', 'min']
+RECENT_MINUTES = 10     # recent_min_1 (latest) .. recent_min_10
+
+# Archive stat -> DawgBowlOptimizer season dict key / stats API game log column
+SEASON_KEYS = {'pts': 'ppg', 'reb': 'rpg', 'ast': 'apg', 'stl': 'spg',
+               'blk': 'bpg', '3pm': '3pm', 'tov': 'topg', 'min': 'min'}
+GAME_LOG_KEYS = {'pts': 'PTS', 'reb': 'REB', 'ast': 'AST', 'stl': 'STL',
+                 'blk': 'BLK', '3pm': 'FG3M', 'tov': 'TOV', 'min': 'MIN'}
+
+# Archive columns: identity, slate context, inputs as of lock, actual box score
+TEXT_COLUMNS = ['player_id', 'name', 'team', 'opponent', 'position', 'injury_status']
+NUMERIC_COLUMNS = (
+    ['salary', 'is_home', 'game_total', 'team_pace', 'opp_pace', 'opp_def_rating', 'usage_rate', 'recent_games'] +
+    [f"season_{s}" for s in STATS] +
+    [f"recent_{s}" for s in STATS] +
+    [f"recent_min_{i}" for i in range(1, RECENT_MINUTES + 1)] +
+    [f"actual_{s}" for s in STATS]
+)
+
+
+# ============================================================================
+# COLUMNAR ARCHIVE
+# ============================================================================
+
+class SlateArchive:
+    """
+    One compressed .npz per slate, one array per column
+
+    Numbers are stored as float32 (NaN = unknown), text as fixed-width
+    unicode, so a season of slates stays a few MB and loads without pickle.
+    """
+
+    def __init__(self, root: Path = ARCHIVE_DIR):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path(self, slate_date: str) -> Path:
+        return self.root / f"{slate_date}.npz"
+
+    def dates(self) -> List[str]:
+        return sorted(p.stem for p in self.root.glob('*.npz'))
+
+    def save(self, slate_date: str, frame: pd.DataFrame):
+        frame = frame.reindex(columns=TEXT_COLUMNS + NUMERIC_COLUMNS)
+        arrays = {col: frame[col].fillna('').astype(str).to_numpy(dtype=str) for col in TEXT_COLUMNS}
+        arrays.update({col: frame[col].to_numpy(dtype=np.float32) for col in NUMERIC_COLUMNS})
+        tmp = self.root / f".{slate_date}.tmp.npz"
+        np.savez_compressed(tmp, **arrays)
+        os.replace(tmp, self.path(slate_date))
+
+    def load(self, slate_date: str) -> pd.DataFrame:
+        with np.load(self.path(slate_date), allow_pickle=False) as data:
+            frame = pd.DataFrame({col: data[col] for col in data.files})
+        frame[NUMERIC_COLUMNS] = frame[NUMERIC_COLUMNS].astype(float)
+        return frame
+
+    def load_all(self, dates: Optional[List[str]] = None) -> pd.DataFrame:
+        """Every slate with actual results, with a 'slate' column"""
+        frames = []
+        for slate_date in dates or self.dates():
+            frame = self.load(slate_date)
+            frame = frame[frame['actual_pts'].notna()]
+            if len(frame):
+                frames.append(frame.assign(slate=slate_date))
+        if not frames:
+            return pd.DataFrame(columns=['slate'] + TEXT_COLUMNS + NUMERIC_COLUMNS)
+        return pd.concat(frames, ignore_index=True)
+
+
+def underdog_points(frame: pd.DataFrame, prefix: str = 'actual_') -> np.ndarray:
+    """Official Underdog points from box-score columns"""
+    return sum(frame[f"{prefix}{stat}"].to_numpy(dtype=float) * mult for stat, mult in UNDERDOG_SCORING.items())
+
+
+# ============================================================================
+# RECORDING SLATES
+# ============================================================================
+
+def archive_inputs(slate_file: str, archive: Optional[SlateArchive] = None, optimizer=None) -> Path:
+    """
+    Snapshot a slate's inputs before lock (slate_template.json format:
+    slate_date, games with home_team/away_team/total, players with player_id)
+    """
+    from dawgbowl_optimizer import DawgBowlOptimizer
+
+    archive = archive or SlateArchive()
+    optimizer = optimizer or DawgBowlOptimizer()
+    with open(slate_file) as f:
+        slate = json.load(f)
+
+    games = {}
+    for game in slate.get('games', []):
+        home, away = game.get('home_team', ''), game.get('away_team', '')
+        games[home] = {'opponent': away, 'is_home': 1, 'game_total': game.get('total')}
+        games[away] = {'opponent': home, 'is_home': 0, 'game_total': game.get('total')}
+
+    season_stats = optimizer.get_player_season_stats()
+    advanced_stats = optimizer.get_player_advanced_stats()
+    team_defense = optimizer.get_team_defensive_ratings()
+
+    rows = []
+    for player in slate.get('players', []):
+        player_id = str(player.get('player_id', ''))
+        season = season_stats.get(player_id)
+        if not season:
+            print(f"⚠️  Skipping {player.get('name', 'Unknown')} - no stats found")
+            continue
+        game = games.get(player['team'], {})
+        opponent = game.get('opponent', '')
+        logs = optimizer.get_recent_game_logs(player_id, last_n_games=RECENT_MINUTES)
+        usage = advanced_stats.get(player_id, {}).get('usage_rate', np.nan)
+
+        row = {
+            'player_id': player_id,
+            'name': season['name'],
+            'team': player['team'],
+            'opponent': opponent,
+            'position': player.get('position', 'F'),
+            'injury_status': player.get('injury_status', 'active'),
+            'salary': player.get('salary', np.nan),
+            'is_home': game.get('is_home', np.nan),
+            'game_total': game.get('game_total', np.nan),
+            'team_pace': team_defense.get(player['team'], {}).get('pace', np.nan),
+            'opp_pace': team_defense.get(opponent, {}).get('pace', np.nan),
+            'opp_def_rating': team_defense.get(opponent, {}).get('def_rating', np.nan),
+            # The stats API reports USG_PCT as a fraction; the engines use percent
+            'usage_rate': usage * 100 if usage <= 1 else usage,
+            'recent_games': len(logs),
+        }
+        for stat in STATS:
+            row[f"season_{stat}"] = season.get(SEASON_KEYS[stat], np.nan)
+            values = [g.get(GAME_LOG_KEYS[stat]) or 0 for g in logs]
+            row[f"recent_{stat}"] = sum(values) / len(values) if values else np.nan
+        for i, game_log in enumerate(logs, 1):
+            row[f"recent_min_{i}"] = game_log.get('MIN') or 0
+        rows.append(row)
+
+    path = archive.path(slate['slate_date'])
+    archive.save(slate['slate_date'], pd.DataFrame(rows))
+    print(f"✅ Archived inputs for {len(rows)} players: {path}")
+    return path
+
+
+def archive_results(slate_date: str, archive: Optional[SlateArchive] = None, actuals: Optional[Dict] = None) -> Path:
+    """
+    Add actual box scores to an archived slate (players without a box
+    score, i.e. DNPs, score 0 so missed inactives count against an engine)
+    """
+    archive = archive or SlateArchive()
+    if actuals is None:
+        from validate_optimizer import OptimizerValidator
+        actuals = OptimizerValidator().get_game_results(slate_date)
+
+    frame = archive.load(slate_date)
+    for stat in STATS:
+        frame[f"actual_{stat}"] = [
+            float(actuals.get(pid, {}).get(stat, 0) or 0) for pid in frame['player_id']
+        ]
+    archive.save(slate_date, frame)
+    print(f"✅ Archived results for {sum(pid in actuals for pid in frame['player_id'])}/{len(frame)} players")
+    return archive.path(slate_date)
+
+
+# ============================================================================
+# ENGINE REPLAY
+# ============================================================================
+
+def _value(row: Dict, key: str, default: float = 0.0) -> float:
+    value = row.get(key)
+    return default if value is None or value != value else float(value)
+
+
+def _season_line(row: Dict) -> Dict:
+    return {SEASON_KEYS[stat]: _value(row, f"season_{stat}") for stat in STATS}
+
+
+def _make_dawgbowl():
+    from dawgbowl_optimizer import DawgBowlOptimizer
+    return DawgBowlOptimizer()
+
+
+def _project_dawgbowl(engine, row: Dict) -> float:
+    season = _season_line(row)
+    recent_games = int(_value(row, 'recent_games'))
+    form = engine.blend_recent_form({s: _value(row, f"recent_{s}") for s in STATS}, recent_games, season)
+    minutes = [row[f"recent_min_{i}"] for i in range(1, RECENT_MINUTES + 1)
+               if row.get(f"recent_min_{i}") == row.get(f"recent_min_{i}")]
+    consistency = engine.score_minutes_consistency(minutes)
+
+    team, opponent = row['team'], row['opponent']
+    team_defense = {}
+    if row.get('team_pace') == row.get('team_pace') and row.get('opp_def_rating') == row.get('opp_def_rating'):
+        team_defense = {
+            team: {'pace': _value(row, 'team_pace', 100.0)},
+            opponent: {'pace': _value(row, 'opp_pace', 100.0), 'def_rating': _value(row, 'opp_def_rating')},
+        }
+    matchup = engine.calculate_matchup_multiplier(team, opponent, team_defense) if opponent else 1.0
+    advanced = {'usage_rate': _value(row, 'usage_rate', 20.0)}
+    return engine.calculate_projection(season, form, advanced, consistency, matchup)['projection']
+
+
+def _make_real():
+    from real_projections_engine import RealProjectionsEngine
+    return RealProjectionsEngine()
+
+
+def _project_real(engine, row: Dict) -> float:
+    prefix = 'recent_' if _value(row, 'recent_games') >= 3 else 'season_'
+    stats = {
+        'points': _value(row, f"{prefix}pts"), 'rebounds': _value(row, f"{prefix}reb"),
+        'assists': _value(row, f"{prefix}ast"), 'steals': _value(row, f"{prefix}stl"),
+        'blocks': _value(row, f"{prefix}blk"), 'turnovers': _value(row, f"{prefix}tov"),
+        'minutes': _value(row, f"{prefix}min", 32.0),
+    }
+    projection = engine.generate_full_projection(
+        row['name'], row['team'], row['position'],
+        game_total=_value(row, 'game_total', 220.0),
+        injury_status=row.get('injury_status') or 'active',
+        recent_stats=stats
+    )
+    return projection['projected_underdog_points']
+
+
+def _make_hybrid():
+    from rank_generator_v3 import HybridRankingEngine
+    return HybridRankingEngine()
+
+
+def _project_hybrid(engine, row: Dict) -> float:
+    return engine.calculate_fantasy_projection({
+        'ppg': _value(row, 'season_pts'), 'rpg': _value(row, 'season_reb'), 'apg': _value(row, 'season_ast'),
+        'is_home': _value(row, 'is_home') == 1, 'usage_rate': _value(row, 'usage_rate', 20.0),
+    })
+
+
+# name -> (factory, projector, default grid); grid keys are engine attributes
+ENGINES: Dict[str, Tuple[Callable, Callable, Dict[str, List]]] = {
+    'dawgbowl': (_make_dawgbowl, _project_dawgbowl, {
+        'FORM_WEIGHT': [0.4, 0.5, 0.6, 0.7, 0.8],
+        'PACE_BOUNDS': [(0.90, 1.12), (0.95, 1.06), (1.0, 1.0)],
+        'WORST_DEFENSE_MULTIPLIER': [1.05, 1.10],
+    }),
+    'real': (_make_real, _project_real, {
+        'AVG_GAME_TOTAL': [215.0, 220.0, 222.5, 225.0, 230.0],
+        'QUESTIONABLE_MULTIPLIER': [0.6, 0.7, 0.8, 0.9],
+    }),
+    'hybrid': (_make_hybrid, _project_hybrid, {
+        'HOME_BOOST': [1.0, 1.025, 1.05, 1.075],
+        'USAGE_BOOSTS': [[(28, 1.08), (25, 1.04)], [(28, 1.04), (25, 1.02)], []],
+    }),
+}
+
+
+def expand_grid(grid: Dict[str, List]) -> List[Dict]:
+    """Cartesian product of a {param: [values]} grid"""
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def project(engine_name: str, rows: List[Dict], params: Optional[Dict] = None, engine=None) -> np.ndarray:
+    """Replay one engine (with multiplier overrides) over archived rows"""
+    factory, projector, _ = ENGINES[engine_name]
+    engine = engine or factory()
+    for key, value in (params or {}).items():
+        if not hasattr(engine, key):
+            raise ValueError(f"{engine_name} has no multiplier {key}")
+        setattr(engine, key, value)     # Instance attribute shadows the class default
+    return np.array([projector(engine, row) for row in rows], dtype=float)
+
+
+# ============================================================================
+# METRICS
+# ============================================================================
+
+def score(frame: pd.DataFrame, projected: np.ndarray, top_n: int = 10) -> Dict:
+    """
+    MAE vs official Underdog points, mean per-slate Spearman correlation
+    and mean per-slate top-N hit rate (share of projected top N that
+    finished in the actual top N)
+    """
+    actual = underdog_points(frame)
+    scored = pd.DataFrame({'slate': frame['slate'].to_numpy(), 'projected': projected, 'actual': actual})
+
+    correlations, hits = [], []
+    for _, slate in scored.groupby('slate', sort=False):
+        if len(slate) < 2:
+            continue
+        ranks = slate[['projected', 'actual']].rank()
+        corr = ranks['projected'].corr(ranks['actual'])
+        if corr == corr:
+            correlations.append(corr)
+        n = min(top_n, len(slate))
+        best_projected = set(slate.nlargest(n, 'projected').index)
+        best_actual = set(slate.nlargest(n, 'actual').index)
+        hits.append(len(best_projected & best_actual) / n)
+
+    return {
+        'players': len(scored),
+        'slates': scored['slate'].nunique(),
+        'mae': round(float(np.abs(scored['projected'] - scored['actual']).mean()), 3),
+        'spearman': round(float(np.mean(correlations)), 4) if correlations else None,
+        f"top{top_n}_hit_rate": round(float(np.mean(hits)), 4) if hits else None,
+    }
+
+
+# ============================================================================
+# PARALLEL SWEEPS
+# ============================================================================
+
+_worker_frame = None
+_worker_rows = None
+_worker_top_n = 10
+
+
+def _init_worker(archive_root: str, dates: List[str], top_n: int):
+    """Process-pool initializer: load the archive once per worker"""
+    global _worker_frame, _worker_rows, _worker_top_n
+    _worker_frame = SlateArchive(Path(archive_root)).load_all(dates)
+    _worker_rows = _worker_frame.to_dict('records')
+    _worker_top_n = top_n
+
+
+def _evaluate(task: Tuple[str, Dict]) -> Dict:
+    """Process-pool worker: replay one engine/parameter set over the archive"""
+    engine_name, params = task
+    # Fresh engine per task so one parameter set never leaks into the next
+    projected = project(engine_name, _worker_rows, params)
+    return {'engine': engine_name, 'params': params, **score(_worker_frame, projected, _worker_top_n)}
+
+
+def sweep(
+    archive: Optional[SlateArchive] = None,
+    grids: Optional[Dict[str, Dict[str, List]]] = None,
+    dates: Optional[List[str]] = None,
+    workers: Optional[int] = None,
+    top_n: int = 10
+) -> pd.DataFrame:
+    """
+    Score every engine over every parameter set in its grid
+
+    Args:
+        grids: engine name -> {multiplier: [values]}; defaults to ENGINES' grids.
+               The engine's current defaults ({}) are always included as a baseline.
+        workers: Process count (default: CPU count)
+
+    Returns:
+        One row per engine/parameter set, best MAE first within each engine
+    """
+    archive = archive or SlateArchive()
+    dates = dates or archive.dates()
+    grids = grids if grids is not None else {name: spec[2] for name, spec in ENGINES.items()}
+    tasks = [(name, {}) for name in grids]
+    tasks += [(name, params) for name, grid in grids.items() for params in expand_grid(grid)]
+
+    workers = workers or os.cpu_count() or 1
+    initargs = (str(archive.root), dates, top_n)
+    if workers <= 1:
+        _init_worker(*initargs)
+        results = [_evaluate(task) for task in tasks]
+    else:
+        # Spread each engine's parameter sets over the workers
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool:
+            results = list(pool.map(_evaluate, tasks, chunksize=chunksize))
+
+    report = pd.DataFrame(results)
+    report['baseline'] = report['params'].map(lambda p: not p)
+    return report.sort_values(['engine', 'mae'], kind='stable').reset_index(drop=True)
+
+
+def print_report(report: pd.DataFrame, top_n: int = 10):
+    """Baseline vs best parameter set per engine"""
+    hit_col = f"top{top_n}_hit_rate"
+    print("\n" + "=" * 80)
+    print("🏀 PROJECTION BACKTEST")
+    print("=" * 80)
+    if report.empty:
+        print("No archived slates with results yet")
+        return
+    print(f"Slates: {report['slates'].max()} | Player games: {report['players'].max()}\n")
+    for engine_name, rows in report.groupby('engine', sort=False):
+        baseline = rows[rows['baseline']].iloc[0]
+        best = rows.iloc[0]
+        print(f"{engine_name:10s} baseline  MAE {baseline['mae']:6.2f} | Spearman {baseline['spearman']} | "
+              f"Top-{top_n} {baseline[hit_col]}")
+        print(f"{'':10s} best      MAE {best['mae']:6.2f} | Spearman {best['spearman']} | "
+              f"Top-{top_n} {best[hit_col]}")
+        print(f"{'':10s} params    {best['params'] or 'defaults'}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backtest NBA projection engines')
+    parser.add_argument('--archive', default=str(ARCHIVE_DIR), help='Archive directory')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    inputs = commands.add_parser('archive-inputs', help='Snapshot a slate before lock')
+    inputs.add_argument('slate_file')
+    results = commands.add_parser('archive-results', help='Add box scores to an archived slate')
+    results.add_argument('slate_date')
+    run = commands.add_parser('sweep', help='Sweep multiplier grids and report')
+    run.add_argument('--workers', type=int, default=None)
+    run.add_argument('--top-n', type=int, default=10)
+    run.add_argument('--engines', default=','.join(ENGINES), help='Comma-separated engine names')
+    run.add_argument('--output', help='Write the full report to this CSV')
+    args = parser.parse_args()
+
+    archive = SlateArchive(Path(args.archive))
+    if args.command == 'archive-inputs':
+        archive_inputs(args.slate_file, archive)
+    elif args.command == 'archive-results':
+        archive_results(args.slate_date, archive)
+    else:
+        grids = {name: ENGINES[name][2] for name in args.engines.split(',')}
+        report = sweep(archive, grids, workers=args.workers, top_n=args.top_n)
+        print_report(report, args.top_n)
+        if args.output:
+            report.to_csv(args.output, index=False)
+            print(f"💾 Full report: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
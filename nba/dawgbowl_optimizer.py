@@ -39,6 +39,18 @@ class DawgBowlOptimizer:
     # Team pace factors (updated via API)
     TEAM_PACE = {}
     
+    # Hand-tuned multipliers (tunable per instance; see backtest.py)
+    FORM_WEIGHT = 0.6                  # Recent form share of the form blend
+    DEFENSE_MULTIPLIERS = [            # (opponent DEF_RATING below, multiplier)
+        (108, 0.92),                   # Elite defense
+        (110, 0.96),                   # Good defense
+        (114, 1.00),                   # Average
+        (116, 1.05),                   # Poor defense
+    ]
+    WORST_DEFENSE_MULTIPLIER = 1.10    # Terrible defense
+    LEAGUE_AVG_PACE = 100.0
+    PACE_BOUNDS = (0.90, 1.12)
+    
     def __init__(self):
         self.workspace = Path.home() / 'clawd'
         self.output_dir = self.workspace / 'nba'
@@ -197,19 +209,7 @@ class DawgBowlOptimizer:
         recent_games = self.get_recent_game_logs(player_id, last_n_games=10)
         
         if not recent_games or len(recent_games) < 3:
-            # Not enough data, use season average
-            return {
-                'form_ppg': season_avg.get('ppg', 0),
-                'form_rpg': season_avg.get('rpg', 0),
-                'form_apg': season_avg.get('apg', 0),
-                'form_spg': season_avg.get('spg', 0),
-                'form_bpg': season_avg.get('bpg', 0),
-                'form_3pm': season_avg.get('3pm', 0),
-                'form_topg': season_avg.get('topg', 0),
-                'form_min': season_avg.get('min', 0),
-                'recent_games': 0,
-                'form_confidence': 0.5  # Low confidence
-            }
+            return self.blend_recent_form({}, 0, season_avg)
         
         # Calculate averages from recent games
         recent_stats = {
@@ -224,19 +224,41 @@ class DawgBowlOptimizer:
         }
         
         recent_avg = {k: sum(v) / len(v) if v else 0 for k, v in recent_stats.items()}
+        return self.blend_recent_form(recent_avg, len(recent_games), season_avg)
+    
+    def blend_recent_form(self, recent_avg: Dict, recent_games: int, season_avg: Dict) -> Dict:
+        """
+        Blend last-N averages (pts/reb/ast/stl/blk/3pm/tov/min keys) with season
+        averages; fewer than 3 recent games falls back to the season line
+        """
+        if recent_games < 3:
+            # Not enough data, use season average
+            return {
+                'form_ppg': season_avg.get('ppg', 0),
+                'form_rpg': season_avg.get('rpg', 0),
+                'form_apg': season_avg.get('apg', 0),
+                'form_spg': season_avg.get('spg', 0),
+                'form_bpg': season_avg.get('bpg', 0),
+                'form_3pm': season_avg.get('3pm', 0),
+                'form_topg': season_avg.get('topg', 0),
+                'form_min': season_avg.get('min', 0),
+                'recent_games': 0,
+                'form_confidence': 0.5  # Low confidence
+            }
         
         # 60/40 weighted blend (recent 60%, season 40%)
+        w = self.FORM_WEIGHT
         form_weighted = {
-            'form_ppg': (recent_avg['pts'] * 0.6) + (season_avg.get('ppg', 0) * 0.4),
-            'form_rpg': (recent_avg['reb'] * 0.6) + (season_avg.get('rpg', 0) * 0.4),
-            'form_apg': (recent_avg['ast'] * 0.6) + (season_avg.get('apg', 0) * 0.4),
-            'form_spg': (recent_avg['stl'] * 0.6) + (season_avg.get('spg', 0) * 0.4),
-            'form_bpg': (recent_avg['blk'] * 0.6) + (season_avg.get('bpg', 0) * 0.4),
-            'form_3pm': (recent_avg['3pm'] * 0.6) + (season_avg.get('3pm', 0) * 0.4),
-            'form_topg': (recent_avg['tov'] * 0.6) + (season_avg.get('topg', 0) * 0.4),
-            'form_min': (recent_avg['min'] * 0.6) + (season_avg.get('min', 0) * 0.4),
-            'recent_games': len(recent_games),
-            'form_confidence': min(len(recent_games) / 10.0, 1.0)  # Higher with more games
+            'form_ppg': (recent_avg['pts'] * w) + (season_avg.get('ppg', 0) * (1 - w)),
+            'form_rpg': (recent_avg['reb'] * w) + (season_avg.get('rpg', 0) * (1 - w)),
+            'form_apg': (recent_avg['ast'] * w) + (season_avg.get('apg', 0) * (1 - w)),
+            'form_spg': (recent_avg['stl'] * w) + (season_avg.get('spg', 0) * (1 - w)),
+            'form_bpg': (recent_avg['blk'] * w) + (season_avg.get('bpg', 0) * (1 - w)),
+            'form_3pm': (recent_avg['3pm'] * w) + (season_avg.get('3pm', 0) * (1 - w)),
+            'form_topg': (recent_avg['tov'] * w) + (season_avg.get('topg', 0) * (1 - w)),
+            'form_min': (recent_avg['min'] * w) + (season_avg.get('min', 0) * (1 - w)),
+            'recent_games': recent_games,
+            'form_confidence': min(recent_games / 10.0, 1.0)  # Higher with more games
         }
         
         return form_weighted
@@ -285,8 +307,11 @@ class DawgBowlOptimizer:
         Flag players with inconsistent playing time
         """
         recent_games = self.get_recent_game_logs(player_id, last_n_games=10)
-        
-        if not recent_games or len(recent_games) < 5:
+        return self.score_minutes_consistency([g.get('MIN', 0) for g in recent_games])
+    
+    def score_minutes_consistency(self, minutes: List[float]) -> Dict:
+        """Consistency flag/score from recent minutes (most recent first)"""
+        if len(minutes) < 5:
             return {
                 'min_variance': 0,
                 'min_std_dev': 0,
@@ -294,8 +319,6 @@ class DawgBowlOptimizer:
                 'consistency_score': 0.5
             }
         
-        minutes = [g.get('MIN', 0) for g in recent_games]
-        
         # Calculate variance
         mean_min = statistics.mean(minutes)
         std_dev = statistics.stdev(minutes) if len(minutes) > 1 else 0
@@ -372,12 +395,13 @@ class DawgBowlOptimizer:
         High pace = more opportunities = higher projections
         """
         avg_pace = (team_pace + opp_pace) / 2
-        league_avg_pace = 100.0  # Approximate league average
+        league_avg_pace = self.LEAGUE_AVG_PACE  # Approximate league average
         
         pace_factor = avg_pace / league_avg_pace
         
         # Cap the multiplier between 0.90 and 1.12
-        return max(0.90, min(1.12, pace_factor))
+        low, high = self.PACE_BOUNDS
+        return max(low, min(high, pace_factor))
     
     def calculate_matchup_multiplier(self, player_team: str, opponent: str, 
                                     team_defense: Dict[str, Dict]) -> float:
@@ -393,18 +417,10 @@ class DawgBowlOptimizer:
         
         # Defensive rating multiplier (lower rating = better defense = lower multiplier)
         def_rating = opp_def['def_rating']
-        league_avg_def = 112.0  # Approximate league average
-        
-        if def_rating < 108:
-            def_mult = 0.92  # Elite defense
-        elif def_rating < 110:
-            def_mult = 0.96  # Good defense
-        elif def_rating < 114:
-            def_mult = 1.00  # Average
-        elif def_rating < 116:
-            def_mult = 1.05  # Poor defense
-        else:
-            def_mult = 1.10  # Terrible defense
+        def_mult = next(
+            (mult for below, mult in self.DEFENSE_MULTIPLIERS if def_rating < below),
+            self.WORST_DEFENSE_MULTIPLIER
+        )
         
         # Pace multiplier
         pace_mult = self.calculate_pace_multiplier(
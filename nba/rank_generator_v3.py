@@ -159,6 +159,10 @@ class ESPNDataFetcher:
 class HybridRankingEngine:
     """Hybrid ranking engine using ESPN + manual enrichment"""
     
+    # Hand-tuned multipliers (tunable per instance; see backtest.py)
+    HOME_BOOST = 1.05
+    USAGE_BOOSTS = [(28, 1.08), (25, 1.04)]    # (usage above, multiplier), first match wins
+    
     def __init__(self):
         self.trade_analyzer = TradeImpactAnalyzer()
     
@@ -173,14 +177,14 @@ class HybridRankingEngine:
         
         # Home boost
         if player.get('is_home', False):
-            base *= 1.05
+            base *= self.HOME_BOOST
         
         # Usage boost
         usage = player.get('usage_rate', 20)
-        if usage > 28:
-            base *= 1.08
-        elif usage > 25:
-            base *= 1.04
+        for above, boost in self.USAGE_BOOSTS:
+            if usage > above:
+                base *= boost
+                break
         
         return base
     
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Tests for the projection backtester
+"""
+
+import random
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from backtest import ENGINES, STATS, SlateArchive, expand_grid, project, score, sweep, underdog_points
+from dawgbowl_optimizer import DawgBowlOptimizer
+from rank_generator_v3 import HybridRankingEngine
+
+TEAMS = [('BOS', 'ATL'), ('PHI', 'NYK'), ('MIL', 'CHA')]
+
+
+def make_slate(seed: int, players_per_team: int = 5) -> pd.DataFrame:
+    """Actual box scores equal recent form; season lines are noise around it"""
+    rng = random.Random(seed)
+    rows = []
+    for home, away in TEAMS:
+        for team, opponent, is_home in [(home, away, 1), (away, home, 0)]:
+            for i in range(players_per_team):
+                recent = {'pts': rng.uniform(5, 32), 'reb': rng.uniform(2, 12), 'ast': rng.uniform(1, 9),
+                          'stl': rng.uniform(0.3, 2), 'blk': rng.uniform(0, 2), '3pm': rng.uniform(0, 4),
+                          'tov': rng.uniform(0.5, 4), 'min': rng.uniform(18, 38)}
+                row = {'player_id': f"{team}{i}", 'name': f"{team} Player {i}", 'team': team,
+                       'opponent': opponent, 'position': 'F', 'injury_status': 'active',
+                       'salary': 5000, 'is_home': is_home, 'game_total': rng.uniform(212, 236),
+                       'team_pace': rng.uniform(96, 104), 'opp_pace': rng.uniform(96, 104),
+                       'opp_def_rating': rng.uniform(106, 118), 'usage_rate': rng.uniform(14, 34),
+                       'recent_games': 10}
+                for stat in STATS:
+                    row[f"recent_{stat}"] = recent[stat]
+                    row[f"season_{stat}"] = recent[stat] * rng.uniform(0.4, 1.6)
+                    row[f"actual_{stat}"] = recent[stat]
+                for g in range(1, 11):
+                    row[f"recent_min_{g}"] = recent['min'] + rng.uniform(-3, 3)
+                rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def make_archive(root: Path) -> SlateArchive:
+    archive = SlateArchive(root)
+    for day, seed in [('2026-02-18', 1), ('2026-02-19', 2), ('2026-02-20', 3)]:
+        archive.save(day, make_slate(seed))
+    # Inputs archived before lock, no results yet: excluded from backtests
+    pending = make_slate(4)
+    pending[[f"actual_{s}" for s in STATS]] = np.nan
+    archive.save('2026-02-21', pending)
+    return archive
+
+
+def test_archive_round_trip():
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = make_archive(Path(tmp))
+        assert archive.dates() == ['2026-02-18', '2026-02-19', '2026-02-20', '2026-02-21']
+        original = make_slate(1)
+        loaded = archive.load('2026-02-18')
+        assert list(loaded['name']) == list(original['name'])
+        assert np.allclose(loaded['recent_pts'], original['recent_pts'], rtol=1e-6)
+        frame = archive.load_all()
+        assert sorted(frame['slate'].unique()) == ['2026-02-18', '2026-02-19', '2026-02-20']
+        assert np.allclose(underdog_points(frame[:1]), underdog_points(frame[:1], 'recent_'))
+
+
+def test_engine_refactors_keep_behaviour():
+    optimizer = DawgBowlOptimizer()
+    season = {'ppg': 20, 'rpg': 5, 'apg': 4, 'spg': 1, 'bpg': 0.5, '3pm': 2, 'topg': 2, 'min': 32}
+    recent = {'pts': 25, 'reb': 6, 'ast': 5, 'stl': 1.5, 'blk': 0.5, '3pm': 3, 'tov': 3, 'min': 34}
+    form = optimizer.blend_recent_form(recent, 10, season)
+    assert abs(form['form_ppg'] - (25 * 0.6 + 20 * 0.4)) < 1e-9
+    assert optimizer.blend_recent_form(recent, 2, season)['form_ppg'] == 20
+
+    defense = {'AAA': {'pace': 100, 'def_rating': 112}, 'BBB': {'pace': 100, 'def_rating': 107}}
+    assert optimizer.calculate_matchup_multiplier('AAA', 'BBB', defense) == 0.92
+    defense['BBB']['def_rating'] = 120
+    assert optimizer.calculate_matchup_multiplier('AAA', 'BBB', defense) == 1.10
+    assert optimizer.score_minutes_consistency([30] * 10)['consistency_flag'] == 'CONSISTENT'
+
+    hybrid = HybridRankingEngine()
+    assert abs(hybrid.calculate_fantasy_projection({'ppg': 20, 'rpg': 0, 'apg': 0, 'is_home': True, 'usage_rate': 30})
+               - 20 * 1.05 * 1.08) < 1e-9
+
+
+def test_project_applies_overrides_per_instance():
+    rows = make_slate(5).to_dict('records')
+    low = project('dawgbowl', rows, {'FORM_WEIGHT': 0.2})
+    high = project('dawgbowl', rows, {'FORM_WEIGHT': 0.8})
+    assert not np.allclose(low, high)
+    assert DawgBowlOptimizer.FORM_WEIGHT == 0.6
+    try:
+        project('hybrid', rows, {'NOT_A_MULTIPLIER': 1})
+        assert False, 'unknown multiplier accepted'
+    except ValueError:
+        pass
+
+
+def test_score_metrics():
+    frame = make_slate(6).assign(slate='s1')
+    perfect = underdog_points(frame)
+    metrics = score(frame, perfect, top_n=5)
+    assert metrics['mae'] == 0 and metrics['spearman'] == 1.0 and metrics['top5_hit_rate'] == 1.0
+    reversed_metrics = score(frame, -perfect, top_n=5)
+    assert reversed_metrics['spearman'] == -1.0 and reversed_metrics['top5_hit_rate'] == 0.0
+
+
+def test_sweep_ranks_parameter_sets():
+    assert len(expand_grid(ENGINES['dawgbowl'][2])) == 30
+    grids = {'dawgbowl': {'FORM_WEIGHT': [0.2, 0.8]}, 'hybrid': {'HOME_BOOST': [1.0, 1.05]}}
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = make_archive(Path(tmp))
+        parallel = sweep(archive, grids, workers=2, top_n=5)
+        serial = sweep(archive, grids, workers=1, top_n=5)
+
+    pd.testing.assert_frame_equal(parallel, serial)
+    assert len(parallel) == 2 + 4
+    assert parallel['slates'].eq(3).all() and parallel['players'].eq(90).all()
+    dawgbowl = parallel[parallel['engine'] == 'dawgbowl']
+    # Actuals equal recent form, so the heavier recent-form weight wins
+    assert dawgbowl.iloc[0]['params'] == {'FORM_WEIGHT': 0.8}
+    assert dawgbowl.iloc[0]['spearman'] > dawgbowl[dawgbowl['params'] == {'FORM_WEIGHT': 0.2}].iloc[0]['spearman']
+    assert parallel['baseline'].sum() == 2
+
+
+if __name__ == '__main__':
+    test_archive_round_trip()
+    test_engine_refactors_keep_behaviour()
+    test_project_applies_overrides_per_instance()
+    test_score_metrics()
+    test_sweep_ranks_parameter_sets()
+    print("✅ Backtest tests passed")
@@ -9,14 +9,14 @@ Can also just chat and give advice as Ross would.
 """
 
 import json
-import urllib.request
 from pathlib import Path
 
+from local_llm import get_client
+
 WORKSPACE = Path.home() / "clawd"
 GOD_MODE_DATA = WORKSPACE / "god_mode" / "behavioral_data.json"
 INSIGHTS_DATA = WORKSPACE / "god_mode" / "insights.json"
 REVENUE_DATA = WORKSPACE / "revenue" / "opportunities.json"
-OLLAMA_URL = "http://localhost:11434/api/generate"
 
 def load_ross_profile():
     """Load everything we know about Ross"""
@@ -62,22 +62,14 @@ def load_ross_profile():
 def call_local_ai(prompt, temperature=0.7):
     """Call local AI"""
     try:
-        data = json.dumps({
-            "model": "qwen2.5:14b",
-            "prompt": prompt,
-            "temperature": temperature,
-            "stream": False
-        }).encode('utf-8')
-        
-        req = urllib.request.Request(
-            OLLAMA_URL,
-            data=data,
-            headers={'Content-Type': 'application/json'}
+        result = get_client().generate(
+            prompt,
+            model="qwen2.5:14b",
+            temperature=temperature,
+            caller="ai_ross",
+            timeout=120
         )
-        
-        with urllib.request.urlopen(req, timeout=120) as response:
-            result = json.loads(response.read().decode('utf-8'))
-            return result.get("response")
+        return result["response"]
     except Exception as e:
         return f"Error: {e}"
 
@@ -6,6 +6,8 @@ Tracks opportunity conversions, social engagement, and source quality
 
 import json
 import logging
+import os
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any
@@ -38,8 +40,38 @@ class AnalyticsTracker:
     
     def __init__(self):
         self.analytics_data = self._load_analytics()
+        self._batch_depth = 0
+        self._dirty = False
+        self._build_indexes()
         logger.info("Analytics Tracker initialized")
     
+    def _build_indexes(self):
+        """Index tracked records by ID (first occurrence wins, like a linear scan)"""
+        self._opportunity_index = {}
+        for opp in self.analytics_data['opportunities']:
+            self._opportunity_index.setdefault(opp.get('tracking_id'), opp)
+        self._post_index = {}
+        for post in self.analytics_data['social_posts']:
+            self._post_index.setdefault(post.get('id'), post)
+    
+    @contextmanager
+    def batch(self):
+        """
+        Group many track_* calls into a single save
+        
+        Usage:
+            with tracker.batch():
+                for opp in opportunities:
+                    tracker.track_opportunity(opp)
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._dirty:
+                self._save_analytics()
+    
     def _load_analytics(self) -> Dict:
         """Load existing analytics or create new structure"""
         if ANALYTICS_FILE.exists():
@@ -70,11 +102,18 @@ class AnalyticsTracker:
         }
     
     def _save_analytics(self):
-        """Save analytics to file"""
+        """Save analytics to file (deferred until the outermost batch() exits)"""
+        if self._batch_depth:
+            self._dirty = True
+            return
         try:
             self.analytics_data["last_updated"] = datetime.utcnow().isoformat()
-            with open(ANALYTICS_FILE, 'w') as f:
+            # Write to a temp file and rename so readers never see a partial file
+            tmp = ANALYTICS_FILE.with_suffix('.tmp')
+            with open(tmp, 'w') as f:
                 json.dump(self.analytics_data, f, indent=2)
+            os.replace(tmp, ANALYTICS_FILE)
+            self._dirty = False
             logger.info("Analytics data saved successfully")
         except Exception as e:
             logger.error(f"Error saving analytics: {e}")
@@ -95,7 +134,7 @@ class AnalyticsTracker:
                 opportunity['tracking_id'] = f"{opportunity.get('source', 'unknown')}_{opportunity.get('timestamp', datetime.utcnow().isoformat())}"
             
             # Check if already tracked
-            existing = next((o for o in self.analytics_data['opportunities'] if o.get('tracking_id') == opportunity['tracking_id']), None)
+            existing = self._opportunity_index.get(opportunity['tracking_id'])
             
             if existing:
                 # Update existing
@@ -108,6 +147,7 @@ class AnalyticsTracker:
                 opportunity['status'] = opportunity.get('status', 'pending')
                 opportunity['converted'] = False
                 self.analytics_data['opportunities'].append(opportunity)
+                self._opportunity_index[opportunity['tracking_id']] = opportunity
                 
                 # Update source counts
                 source = self._normalize_source(opportunity.get('source', 'other'))
@@ -135,7 +175,7 @@ class AnalyticsTracker:
             bool: Success status
         """
         try:
-            opportunity = next((o for o in self.analytics_data['opportunities'] if o.get('tracking_id') == tracking_id), None)
+            opportunity = self._opportunity_index.get(tracking_id)
             
             if not opportunity:
                 logger.warning(f"Opportunity not found: {tracking_id}")
@@ -187,7 +227,7 @@ class AnalyticsTracker:
                 return False
             
             # Check if already tracked
-            existing = next((p for p in self.analytics_data['social_posts'] if p.get('id') == post_id), None)
+            existing = self._post_index.get(post_id)
             
             if existing:
                 # Update engagement metrics
@@ -209,6 +249,7 @@ class AnalyticsTracker:
                 post['replies'] = post.get('replies', 0)
                 post['clicks'] = post.get('clicks', 0)
                 self.analytics_data['social_posts'].append(post)
+                self._post_index.setdefault(post.get('id'), post)
                 
                 # Track posting time
                 if 'posted_at' in post:
@@ -253,21 +294,22 @@ class AnalyticsTracker:
             opportunities = data.get('opportunities', [])
             synced = 0
             
-            for opp in opportunities:
-                # Create tracking structure
-                tracking_opp = {
-                    'tracking_id': f"{opp.get('source', 'unknown')}_{opp.get('timestamp', datetime.utcnow().isoformat())}_{opp.get('sender', 'unknown')}",
-                    'source': opp.get('source', 'other'),
-                    'type': opp.get('type', 'unknown'),
-                    'score': opp.get('score', 0),
-                    'revenue_potential': opp.get('revenue_potential', '$0'),
-                    'timestamp': opp.get('timestamp', datetime.utcnow().isoformat()),
-                    'sender': opp.get('sender'),
-                    'content_preview': opp.get('content', '')[:200]
-                }
+            with self.batch():
+                for opp in opportunities:
+                    # Create tracking structure
+                    tracking_opp = {
+                        'tracking_id': f"{opp.get('source', 'unknown')}_{opp.get('timestamp', datetime.utcnow().isoformat())}_{opp.get('sender', 'unknown')}",
+                        'source': opp.get('source', 'other'),
+                        'type': opp.get('type', 'unknown'),
+                        'score': opp.get('score', 0),
+                        'revenue_potential': opp.get('revenue_potential', '$0'),
+                        'timestamp': opp.get('timestamp', datetime.utcnow().isoformat()),
+                        'sender': opp.get('sender'),
+                        'content_preview': opp.get('content', '')[:200]
+                    }
                 
-                if self.track_opportunity(tracking_opp):
-                    synced += 1
+                    if self.track_opportunity(tracking_opp):
+                        synced += 1
             
             logger.info(f"Synced {synced} opportunities from opportunities.json")
             return synced
@@ -292,10 +334,11 @@ class AnalyticsTracker:
                 posts = json.load(f)
             
             synced = 0
-            for post in posts:
-                if post.get('posted') and post.get('posted_at'):
-                    if self.track_social_post(post):
-                        synced += 1
+            with self.batch():
+                for post in posts:
+                    if post.get('posted') and post.get('posted_at'):
+                        if self.track_social_post(post):
+                            synced += 1
             
             logger.info(f"Synced {synced} social posts from queue")
             return synced
@@ -13,9 +13,10 @@ import os
 import time
 from datetime import datetime
 from pathlib import Path
-import subprocess
 import re
 
+from local_llm import get_client
+
 WORKSPACE = Path.home() / "clawd"
 DECISION_HISTORY_FILE = WORKSPACE / "memory" / "decision_history.json"
 CONVERSION_DATA_FILE = WORKSPACE / "memory" / "conversion_data.json"
@@ -150,20 +151,14 @@ class AskCommand:
         }
     
     def _query_local_llm(self, prompt, max_tokens=500):
-        """Query local LLM via ollama"""
+        """Query local LLM via the shared local LLM client"""
         try:
             # Try fast models first, fall back to larger models
             models_to_try = ["qwen2.5:3b", "llama3.1:8b", "qwen2.5:14b"]
             
             # Check which models are available
             try:
-                list_result = subprocess.run(
-                    ["ollama", "list"],
-                    capture_output=True,
-                    text=True,
-                    timeout=2
-                )
-                available_models = list_result.stdout
+                available_models = " ".join(get_client().models(timeout=2))
                 
                 # Use first available model
                 model = None
@@ -177,20 +172,15 @@ class AskCommand:
             except:
                 return None
             
-            cmd = ["ollama", "run", model, "--no-interactive"]
-            
-            result = subprocess.run(
-                cmd,
-                input=prompt,
-                capture_output=True,
-                text=True,
-                timeout=3  # 3 second timeout
+            result = get_client().generate(
+                prompt,
+                model=model,
+                max_tokens=max_tokens,
+                caller="ask_command",
+                timeout=3,  # 3 second timeout
+                cache=False  # Sampled at Ollama's default temperature
             )
-            
-            if result.returncode == 0:
-                return result.stdout.strip()
-            else:
-                return None
+            return result["response"].strip()
         except Exception as e:
             print(f"LLM error: {e}")
             return None
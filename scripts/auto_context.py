@@ -5,10 +5,14 @@ Automatically loads relevant context at session start
 """
 
 import json
+import re
 from datetime import datetime, timedelta
 from pathlib import Path
 import sys
 
+sys.path.insert(0, str(Path(__file__).parent))
+from file_catalog import get_catalog
+
 WORKSPACE = Path('/Users/clawdbot/clawd')
 MEMORY_DIR = WORKSPACE / 'memory'
 LOGS_DIR = WORKSPACE / 'logs'
@@ -88,35 +92,39 @@ class AutoContextLoader:
         return False
     
     def scan_active_builds(self):
-        """Scan for active BUILD_*.md files"""
-        builds = list(WORKSPACE.glob('BUILD_*.md'))
+        """Scan for active BUILD_*.md files (from the shared file catalog)"""
+        builds = get_catalog().files_in('', 'BUILD_*.md')
         
         # Get most recent 5
-        builds_sorted = sorted(builds, key=lambda p: p.stat().st_mtime, reverse=True)[:5]
+        builds_sorted = sorted(builds, key=lambda b: b['mtime'], reverse=True)[:5]
         
         for build in builds_sorted:
-            self.context['active_projects'].append(build.name)
+            self.context['active_projects'].append(build['name'])
     
     def scan_live_services(self):
         """Check what services are running"""
         services = []
         
-        # Check for common ports
+        # Check for common ports (one lsof call for all of them)
         import subprocess
         ports_to_check = [3000, 5001, 8080, 5000]
         
-        for port in ports_to_check:
-            try:
-                result = subprocess.run(
-                    ['lsof', '-i', f':{port}'],
-                    capture_output=True,
-                    text=True,
-                    timeout=1
-                )
-                if result.returncode == 0 and result.stdout:
+        try:
+            args = ['lsof', '-nP']
+            for port in ports_to_check:
+                args.append(f'-i:{port}')
+            result = subprocess.run(
+                args,
+                capture_output=True,
+                text=True,
+                timeout=2
+            )
+            open_ports = {int(p) for p in re.findall(r':(\d+)\b', result.stdout)}
+            for port in ports_to_check:
+                if port in open_ports:
                     services.append(f'Service running on port {port}')
-            except:
-                pass
+        except:
+            pass
         
         if services:
             self.context['key_facts'].extend(services)
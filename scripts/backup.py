@@ -2,16 +2,49 @@
 """
 Automated backup system for Jarvis workspace
 Runs daily via cron or on-demand
+
+Two modes:
+- full: copies everything into backups/backup_<timestamp>/ (original behaviour)
+- incremental: file contents go once into a content-addressed store
+  (backups/store/<hash[:2]>/<hash>, zlib-compressed) and each backup is just
+  a manifest in backups/manifests/. Files whose (size, mtime) match the
+  previous manifest are not even read. Old manifests are pruned and store
+  objects no manifest references are garbage-collected.
 """
 
 import os
+import sys
 import shutil
+import hashlib
+import threading
+import zlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import json
 
 WORKSPACE = os.path.expanduser("~/clawd")
 BACKUP_DIR = os.path.expanduser("~/clawd/backups")
+STORE_DIR = os.path.join(BACKUP_DIR, "store")
+MANIFEST_DIR = os.path.join(BACKUP_DIR, "manifests")
 MAX_BACKUPS = 7  # Keep last 7 days
+HASH_WORKERS = 4  # Threads for hashing/compressing (hashlib and zlib release the GIL)
+READ_CHUNK = 1024 * 1024
+
+# Critical files/dirs to backup
+TO_BACKUP = [
+    "TODO.md",
+    "CHANGELOG.md",
+    "DECISIONS.md",
+    "IDEAS.md",
+    "AUTONOMOUS_WORK.md",
+    "HEARTBEAT.md",
+    "memory/",
+    "projects/",
+    "scripts/",
+    "monitoring/",
+    "ross/"
+]
 
 def create_backup():
     """Create timestamped backup of critical files"""
@@ -21,20 +54,7 @@ def create_backup():
     # Ensure backup directory exists
     os.makedirs(BACKUP_DIR, exist_ok=True)
     
-    # Critical files/dirs to backup
-    to_backup = [
-        "TODO.md",
-        "CHANGELOG.md",
-        "DECISIONS.md",
-        "IDEAS.md",
-        "AUTONOMOUS_WORK.md",
-        "HEARTBEAT.md",
-        "memory/",
-        "projects/",
-        "scripts/",
-        "monitoring/",
-        "ross/"
-    ]
+    to_backup = TO_BACKUP
     
     os.makedirs(backup_path, exist_ok=True)
     
@@ -71,51 +91,290 @@ def create_backup():
     
     return backup_path
 
+def _object_path(digest):
+    return os.path.join(STORE_DIR, digest[:2], digest)
+
+def _walk_items(items):
+    """Yield (relative path, absolute path) for every file under the backup items"""
+    for item in items:
+        source = os.path.join(WORKSPACE, item)
+        if os.path.isfile(source):
+            yield item, source
+        elif os.path.isdir(source):
+            for root, dirs, files in os.walk(source):
+                dirs.sort()
+                for name in sorted(files):
+                    full = os.path.join(root, name)
+                    yield os.path.relpath(full, WORKSPACE), full
+
+def _store_file(source):
+    """
+    Hash a file and add it to the store if new. Returns (digest, stored_bytes)
+    
+    Streams in READ_CHUNK pieces, hashing and compressing into a temp object
+    in one pass, so memory stays flat however big the file is.
+    """
+    hasher = hashlib.sha256()
+    compressor = zlib.compressobj(6)
+    tmp_dir = os.path.join(STORE_DIR, "tmp")
+    os.makedirs(tmp_dir, exist_ok=True)
+    tmp = os.path.join(tmp_dir, f"{os.getpid()}.{threading.get_ident()}.tmp")
+    written = 0
+    try:
+        with open(source, "rb") as f, open(tmp, "wb") as out:
+            while True:
+                chunk = f.read(READ_CHUNK)
+                if not chunk:
+                    break
+                hasher.update(chunk)
+                data = compressor.compress(chunk)
+                out.write(data)
+                written += len(data)
+            data = compressor.flush()
+            out.write(data)
+            written += len(data)
+        
+        digest = hasher.hexdigest()
+        obj = _object_path(digest)
+        if os.path.exists(obj):
+            return digest, 0
+        os.makedirs(os.path.dirname(obj), exist_ok=True)
+        os.replace(tmp, obj)
+        return digest, written
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+def _load_manifest(name):
+    with open(os.path.join(MANIFEST_DIR, f"{name}.json")) as f:
+        return json.load(f)
+
+def _try_load_manifest(name):
+    """Manifest dict, or None (with a warning) if it is missing or corrupt"""
+    try:
+        manifest = _load_manifest(name)
+        if not isinstance(manifest.get("entries"), dict):
+            raise ValueError("no entries")
+        return manifest
+    except (OSError, ValueError, AttributeError) as e:
+        print(f"⚠️  Unreadable manifest {name}: {e}")
+        return None
+
+def _manifest_names():
+    if not os.path.exists(MANIFEST_DIR):
+        return []
+    return sorted(f[:-5] for f in os.listdir(MANIFEST_DIR) if f.startswith("backup_") and f.endswith(".json"))
+
+def create_incremental_backup():
+    """Create a manifest-only backup backed by the content-addressed store"""
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
+    name = f"backup_{timestamp}"
+    os.makedirs(MANIFEST_DIR, exist_ok=True)
+    os.makedirs(STORE_DIR, exist_ok=True)
+    
+    # Previous manifest lets unchanged files skip reading entirely
+    previous = {}
+    for prev_name in reversed(_manifest_names()):
+        manifest = _try_load_manifest(prev_name)
+        if manifest is not None:
+            previous = manifest["entries"]
+            break
+    
+    entries = {}
+    to_hash = []
+    backed_up = [item for item in TO_BACKUP if os.path.exists(os.path.join(WORKSPACE, item))]
+    
+    for rel, full in _walk_items(backed_up):
+        try:
+            st = os.stat(full)
+        except OSError:
+            continue
+        old = previous.get(rel)
+        if old and old["size"] == st.st_size and old["mtime"] == st.st_mtime_ns \
+                and os.path.exists(_object_path(old["hash"])):
+            entries[rel] = old
+        else:
+            entries[rel] = {"size": st.st_size, "mtime": st.st_mtime_ns, "hash": None}
+            to_hash.append((rel, full))
+    
+    stored_bytes = 0
+    new_objects = 0
+    with ThreadPoolExecutor(max_workers=HASH_WORKERS) as pool:
+        futures = {pool.submit(_store_file, full): rel for rel, full in to_hash}
+        for future, rel in futures.items():
+            try:
+                digest, written = future.result()
+            except Exception as e:
+                print(f"⚠️  Failed to backup {rel}: {e}")
+                del entries[rel]
+                continue
+            entries[rel]["hash"] = digest
+            stored_bytes += written
+            new_objects += 1 if written else 0
+    
+    manifest = {
+        "timestamp": timestamp,
+        "mode": "incremental",
+        "files": backed_up,
+        "entries": entries,
+        "total_bytes": sum(e["size"] for e in entries.values()),
+    }
+    tmp = os.path.join(MANIFEST_DIR, f"{name}.json.tmp")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp, os.path.join(MANIFEST_DIR, f"{name}.json"))
+    
+    print(f"✅ Incremental backup created: {name}")
+    print(f"📦 {len(entries)} files, {len(entries) - len(to_hash)} unchanged (skipped), "
+          f"{len(to_hash)} hashed, {new_objects} new objects ({stored_bytes / 1024:.1f} KB stored)")
+    
+    cleanup_old_backups()
+    
+    return name
+
+def restore_file(backup_name, rel_path, out=None):
+    """
+    Stream one file out of an incremental backup
+    
+    Args:
+        backup_name: e.g. backup_2026-02-10_030000
+        rel_path: workspace-relative path (e.g. scripts/backup.py)
+        out: writable binary file object (default: stdout)
+    """
+    entry = _load_manifest(backup_name)["entries"].get(rel_path)
+    if not entry:
+        raise FileNotFoundError(f"{rel_path} not in {backup_name}")
+    
+    out = out or sys.stdout.buffer
+    decompressor = zlib.decompressobj()
+    with open(_object_path(entry["hash"]), "rb") as f:
+        while True:
+            chunk = f.read(READ_CHUNK)
+            if not chunk:
+                break
+            out.write(decompressor.decompress(chunk))
+    out.write(decompressor.flush())
+
+def restore_backup(backup_name, target_dir):
+    """Restore every file of an incremental backup under target_dir"""
+    entries = _load_manifest(backup_name)["entries"]
+    for rel_path in entries:
+        dest = os.path.join(target_dir, rel_path)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        with open(dest, "wb") as f:
+            restore_file(backup_name, rel_path, f)
+    print(f"✅ Restored {len(entries)} files to {target_dir}")
+
+def _all_backups():
+    """(name, kind) for full and incremental backups, oldest first"""
+    backups = []
+    if os.path.exists(BACKUP_DIR):
+        backups += [
+            (d, "full") for d in os.listdir(BACKUP_DIR)
+            if d.startswith("backup_") and os.path.isdir(os.path.join(BACKUP_DIR, d))
+        ]
+    backups += [(name, "incremental") for name in _manifest_names()]
+    return sorted(backups)
+
+def collect_garbage():
+    """
+    Delete store objects that no remaining manifest references
+    
+    Refuses to delete anything while a manifest is unreadable, since the
+    objects it references can't be known.
+    """
+    if not os.path.exists(STORE_DIR):
+        return 0
+    
+    refcounts = Counter()
+    for name in _manifest_names():
+        manifest = _try_load_manifest(name)
+        if manifest is None:
+            print("⚠️  Skipping garbage collection until the manifest is fixed or removed")
+            return 0
+        for entry in manifest["entries"].values():
+            refcounts[entry["hash"]] += 1
+    
+    removed = 0
+    for prefix in os.listdir(STORE_DIR):
+        prefix_dir = os.path.join(STORE_DIR, prefix)
+        if prefix == "tmp" or not os.path.isdir(prefix_dir):
+            continue  # In-flight writes from a running backup
+        for digest in os.listdir(prefix_dir):
+            if digest.endswith(".tmp"):
+                continue  # Left by older versions that wrote temps in place
+            if refcounts[digest] == 0:
+                os.remove(os.path.join(prefix_dir, digest))
+                removed += 1
+    
+    if removed:
+        print(f"🗑️  Garbage-collected {removed} unreferenced objects")
+    return removed
+
 def cleanup_old_backups():
     """Remove backups older than MAX_BACKUPS"""
     if not os.path.exists(BACKUP_DIR):
         return
     
-    backups = sorted([
-        d for d in os.listdir(BACKUP_DIR) 
-        if d.startswith("backup_") and os.path.isdir(os.path.join(BACKUP_DIR, d))
-    ])
+    backups = _all_backups()
+    removed_manifest = False
     
     while len(backups) > MAX_BACKUPS:
-        old_backup = backups.pop(0)
-        old_path = os.path.join(BACKUP_DIR, old_backup)
+        old_backup, kind = backups.pop(0)
         try:
-            shutil.rmtree(old_path)
+            if kind == "full":
+                shutil.rmtree(os.path.join(BACKUP_DIR, old_backup))
+            else:
+                os.remove(os.path.join(MANIFEST_DIR, f"{old_backup}.json"))
+                removed_manifest = True
             print(f"🗑️  Removed old backup: {old_backup}")
         except Exception as e:
             print(f"⚠️  Failed to remove {old_backup}: {e}")
+    
+    if removed_manifest:
+        collect_garbage()
 
 def list_backups():
     """List available backups"""
-    if not os.path.exists(BACKUP_DIR):
+    backups = _all_backups()
+    if not backups:
         print("No backups found")
         return
     
-    backups = sorted([
-        d for d in os.listdir(BACKUP_DIR) 
-        if d.startswith("backup_") and os.path.isdir(os.path.join(BACKUP_DIR, d))
-    ], reverse=True)
-    
     print(f"\n📦 Available Backups ({len(backups)}):")
     print("━" * 50)
-    for backup in backups:
+    for backup, kind in reversed(backups):
+        if kind == "incremental":
+            manifest = _try_load_manifest(backup)
+            if manifest is None:
+                continue
+            print(f"  {manifest['timestamp']} - {len(manifest['files'])} items, "
+                  f"{len(manifest['entries'])} files (incremental)")
+            continue
         manifest_path = os.path.join(BACKUP_DIR, backup, "manifest.json")
         if os.path.exists(manifest_path):
-            with open(manifest_path) as f:
-                manifest = json.load(f)
+            try:
+                with open(manifest_path) as f:
+                    manifest = json.load(f)
                 print(f"  {manifest['timestamp']} - {len(manifest['files'])} items")
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                print(f"⚠️  Unreadable manifest {backup}: {e}")
         else:
             print(f"  {backup}")
 
 if __name__ == "__main__":
-    import sys
-    
     if len(sys.argv) > 1 and sys.argv[1] == "list":
         list_backups()
+    elif len(sys.argv) > 1 and sys.argv[1] == "incremental":
+        create_incremental_backup()
+    elif len(sys.argv) > 3 and sys.argv[1] == "restore":
+        # backup.py restore <backup_name> <path> [dest]
+        if len(sys.argv) > 4:
+            with open(sys.argv[4], "wb") as f:
+                restore_file(sys.argv[2], sys.argv[3], f)
+        else:
+            restore_file(sys.argv[2], sys.argv[3])
+    elif len(sys.argv) > 3 and sys.argv[1] == "restore-all":
+        restore_backup(sys.argv[2], sys.argv[3])
     else:
         create_backup()
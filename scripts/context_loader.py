@@ -6,11 +6,15 @@ Loads: docs, past work, related code, decision history
 """
 
 import os
+import sys
 import json
 import subprocess
 from datetime import datetime, timedelta
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent))
+from file_catalog import get_catalog
+
 WORKSPACE = Path("/Users/clawdbot/clawd")
 MEMORY_DIR = WORKSPACE / "memory"
 CONTEXT_CACHE = MEMORY_DIR / "context_cache.json"
@@ -63,23 +67,13 @@ def detect_current_work():
     return []
 
 def get_recent_files(hours=24):
-    """Get recently modified files"""
-    cutoff = datetime.now().timestamp() - (hours * 3600)
-    recent = []
-    
-    # Scan workspace for recent files
-    for filepath in WORKSPACE.rglob("*.py"):
-        if filepath.stat().st_mtime > cutoff:
-            recent.append({
-                "path": str(filepath),
-                "name": filepath.name,
-                "modified": datetime.fromtimestamp(filepath.stat().st_mtime).isoformat()
-            })
-    
-    # Sort by modification time
-    recent.sort(key=lambda x: x["modified"], reverse=True)
-    
-    return recent[:10]  # Top 10
+    """Get recently modified files (top-N query on the shared file catalog)"""
+    recent = get_catalog().recent(hours=hours, suffix=".py", limit=10)
+    
+    return [
+        {"path": entry["path"], "name": entry["name"], "modified": entry["modified"]}
+        for entry in recent
+    ]
 
 def load_relevant_docs(topics):
     """Load documentation relevant to current topics"""
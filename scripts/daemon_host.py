@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Daemon Host - Runs the polling daemons in one long-lived process
+
+Instead of cron/launchd starting a fresh interpreter per tick (and every
+daemon re-importing requests, numpy, ...), the host imports each daemon
+module once and schedules its check function as an asyncio task:
+
+- Per-job interval, or wall-clock times of day (cron-style), with random
+  jitter so jobs don't all fire together
+- Each job's last run is persisted, so a restart (or a launchd KeepAlive
+  crash loop) doesn't re-fire jobs that already ran
+- Check functions are blocking; they run on a bounded thread pool
+- One pooled HTTP session shared by every job (http_pool.get_session)
+- Per-job health, last-run latency and failure counters, served as JSON
+  on http://127.0.0.1:8765/status
+
+A job whose module fails to import (missing dependency, no credentials) is
+reported as disabled; the others keep running.
+
+Usage:
+    python daemon_host.py                 # Run forever
+    python daemon_host.py --list          # Show configured jobs
+    python daemon_host.py --once weather  # Run one job now and exit
+    python daemon_host.py --only weather,flights
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+DAEMONS_DIR = SCRIPTS_DIR.parent / "daemons"
+sys.path.insert(0, str(SCRIPTS_DIR))
+sys.path.insert(1, str(DAEMONS_DIR))
+
+from http_pool import get_session
+import http_pool
+
+LOG_FILE = Path.home() / "clawd" / "logs" / "daemon-host.log"
+STATE_FILE = Path.home() / "clawd" / "data" / "daemon_host_state.json"
+STATUS_HOST = "127.0.0.1"
+STATUS_PORT = 8765
+MAX_WORKERS = 4              # Jobs running at once; the rest wait their turn
+UNHEALTHY_AFTER = 3          # Consecutive failures before a job is reported unhealthy
+MISSED_GRACE = 3600          # A time-of-day run missed by less than this (host down) still runs
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+
+logger = logging.getLogger("daemon_host")
+
+
+def _succeeded(result) -> bool:
+    """main() conventions: False or a non-zero exit code is a failure, anything else succeeded"""
+    if result is False:
+        return False
+    if isinstance(result, int) and not isinstance(result, bool):
+        return result == 0
+    return True
+
+
+def _main_then(module, function: str, success=_succeeded):
+    """Check function -> callable returning True on success"""
+    target = getattr(module, function)
+    return lambda: success(target())
+
+
+def _spending_evening(module):
+    def run():
+        summary = module.generate_evening_summary()
+        module.save_alert('evening_summary', summary)
+        return True
+    return run
+
+
+@dataclass
+class Job:
+    """
+    A daemon check run every `interval` seconds (+/- jitter), or at the
+    local times of day in `at` (e.g. ['08:00', '20:00'], up to `jitter` late)
+    """
+    name: str
+    module: str
+    interval: Optional[float] = None
+    jitter: float = 0.0
+    bind: Callable = None       # module -> zero-arg callable; default calls module.main()
+    at: Optional[List[str]] = None
+
+    # Runtime state
+    run: Optional[Callable] = field(default=None, repr=False)
+    disabled: Optional[str] = None
+    runs: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    running: bool = False
+    last_run: Optional[float] = None
+    last_success: Optional[float] = None
+    last_latency: Optional[float] = None
+    total_latency: float = 0.0
+    last_error: Optional[str] = None
+    next_run: Optional[float] = None
+
+    def load(self):
+        """Import the module (once) and bind its check function"""
+        try:
+            module = importlib.import_module(self.module)
+            self.run = (self.bind or (lambda m: _main_then(m, 'main')))(module)
+        except (Exception, SystemExit) as e:   # Some daemons sys.exit() at import without credentials
+            self.disabled = f"{type(e).__name__}: {e}"
+
+    def _slots(self, now: float) -> List[float]:
+        """Scheduled times of day from yesterday to tomorrow, as timestamps"""
+        today = datetime.fromtimestamp(now).date()
+        times = [datetime.strptime(t, '%H:%M').time() for t in self.at]
+        return sorted(datetime.combine(today + timedelta(days=d), t).timestamp()
+                      for d in (-1, 0, 1, 2) for t in times)
+
+    def next_due(self, now: float) -> float:
+        """When to run next, counting from the last (possibly persisted) run"""
+        if self.at:
+            after = self.last_run if self.last_run is not None else float('-inf')
+            slots = self._slots(now)
+            slot = next((s for s in slots if s > after and s >= now - MISSED_GRACE), slots[-1])
+            return max(now, slot + random.uniform(0, self.jitter))
+        if self.last_run is None:
+            return now + random.uniform(0, self.jitter)
+        return max(now, self.last_run + self.interval + random.uniform(-self.jitter, self.jitter))
+
+    def describe(self) -> str:
+        return f"at {', '.join(self.at)}" if self.at else f"every {self.interval / MINUTE:g} min"
+
+    def status(self) -> Dict:
+        fmt = lambda ts: datetime.fromtimestamp(ts).isoformat(timespec='seconds') if ts else None
+        if self.disabled:
+            health = 'disabled'
+        elif self.consecutive_failures >= UNHEALTHY_AFTER:
+            health = 'unhealthy'
+        elif self.consecutive_failures:
+            health = 'degraded'
+        else:
+            health = 'ok'
+        return {
+            'health': health,
+            'schedule': self.describe(),
+            'running': self.running,
+            'runs': self.runs,
+            'failures': self.failures,
+            'consecutive_failures': self.consecutive_failures,
+            'last_run': fmt(self.last_run),
+            'last_success': fmt(self.last_success),
+            'last_latency_ms': round(self.last_latency * 1000, 1) if self.last_latency is not None else None,
+            'avg_latency_ms': round(self.total_latency / self.runs * 1000, 1) if self.runs else None,
+            'last_error': self.last_error or self.disabled,
+            'next_run': fmt(self.next_run),
+        }
+
+
+def default_jobs() -> List[Job]:
+    """
+    The daemons previously started by cron/launchd. Polling daemons keep
+    their intervals; cron jobs keep their wall-clock times.
+    """
+    return [
+        Job('twitter', 'twitter_daemon', 15 * MINUTE, jitter=60),
+        Job('email', 'email_daemon', 10 * MINUTE, jitter=60,
+            bind=lambda m: _main_then(m, 'fetch_and_process_emails')),
+        Job('weather', 'weather_daemon', HOUR, jitter=5 * MINUTE),     # Conditional refresh keeps this cheap
+        Job('flights', 'flight_monitor', at=['08:00', '14:00', '20:00'], jitter=5 * MINUTE,
+            bind=lambda m: _main_then(m, 'check_and_report', success=lambda r: True)),
+        Job('jobs', 'job_hunter', at=['02:00'], jitter=10 * MINUTE,
+            bind=lambda m: _main_then(m, 'main', success=lambda r: r.get('success', False))),
+        Job('reservations', 'reservation_check_daemon', HOUR, jitter=5 * MINUTE,
+            bind=lambda m: _main_then(m, 'check_saved_searches', success=lambda r: True)),
+        Job('spending', 'spending_alerts', at=['20:00'], bind=_spending_evening),   # Summarises "today"
+        Job('router', 'route_classifier', at=['03:00'], jitter=10 * MINUTE,     # Retrain the escalation fast path
+            bind=lambda m: _main_then(m, 'train_from_log', success=lambda r: True)),
+    ]
+
+
+class DaemonHost:
+    """
+    Schedules jobs on one event loop, runs them on a bounded thread pool
+
+    Args:
+        jobs: Jobs to host (default_jobs() if omitted)
+        max_workers: Thread pool size for the blocking check functions
+        status_port: Port for the status endpoint (None to disable)
+        state_path: JSON file holding each job's last run (None to keep it in memory)
+    """
+
+    def __init__(self, jobs: Optional[List[Job]] = None, max_workers: int = MAX_WORKERS,
+                 status_port: Optional[int] = STATUS_PORT, state_path: Optional[Path] = STATE_FILE):
+        self.jobs = {job.name: job for job in (jobs if jobs is not None else default_jobs())}
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='daemon-job')
+        self.status_port = status_port
+        self.state_path = Path(state_path) if state_path else None
+        self.started_at = time.time()
+        self.server = None
+
+    def load_state(self):
+        """Restore each job's last run/success from the state file"""
+        if not self.state_path:
+            return
+        try:
+            state = json.loads(self.state_path.read_text())
+        except (OSError, ValueError):
+            return
+        for name, saved in state.items():
+            if name in self.jobs:
+                self.jobs[name].last_run = saved.get('last_run')
+                self.jobs[name].last_success = saved.get('last_success')
+
+    def save_state(self):
+        """Merge this host's jobs into the state file (a --once host only knows one job)"""
+        if not self.state_path:
+            return
+        try:
+            state = json.loads(self.state_path.read_text())
+        except (OSError, ValueError):
+            state = {}
+        state.update({name: {'last_run': job.last_run, 'last_success': job.last_success}
+                      for name, job in self.jobs.items() if job.last_run is not None})
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(state, indent=2))
+        tmp.replace(self.state_path)
+
+    def load(self):
+        get_session()   # Warm the shared pool before any job needs it
+        self.load_state()
+        for job in self.jobs.values():
+            job.load()
+            if job.disabled:
+                logger.warning(f"⚠️  {job.name}: disabled ({job.disabled})")
+            else:
+                logger.info(f"✅ {job.name}: loaded {job.module}, {job.describe()}")
+
+    async def run_job(self, job: Job) -> bool:
+        """Run one tick of a job on the pool and record the outcome"""
+        loop = asyncio.get_running_loop()
+        job.running = True
+        job.last_run = time.time()
+        self.save_state()   # Before running: a job that takes the host down won't re-fire on restart
+        started = time.perf_counter()
+        try:
+            ok = await loop.run_in_executor(self.pool, _call, job.run)
+            error = None if ok else 'check reported failure'
+        except Exception as e:
+            ok, error = False, f"{type(e).__name__}: {e}"
+        finally:
+            job.running = False
+
+        job.last_latency = time.perf_counter() - started
+        job.total_latency += job.last_latency
+        job.runs += 1
+        if ok:
+            job.consecutive_failures = 0
+            job.last_success = time.time()
+            job.last_error = None
+            logger.info(f"✓ {job.name} finished in {job.last_latency:.1f}s")
+        else:
+            job.failures += 1
+            job.consecutive_failures += 1
+            job.last_error = error
+            logger.error(f"✗ {job.name} failed after {job.last_latency:.1f}s: {error}")
+        self.save_state()
+        return ok
+
+    async def schedule(self, job: Job):
+        """Run a job forever, each tick at its next due time"""
+        while True:
+            job.next_run = job.next_due(time.time())
+            await asyncio.sleep(max(0.0, job.next_run - time.time()))
+            await self.run_job(job)
+
+    def status(self) -> Dict:
+        jobs = {name: job.status() for name, job in self.jobs.items()}
+        return {
+            'started_at': datetime.fromtimestamp(self.started_at).isoformat(timespec='seconds'),
+            'uptime_seconds': round(time.time() - self.started_at),
+            'healthy': all(j['health'] in ('ok', 'disabled') for j in jobs.values()),
+            'http': http_pool.stats(),
+            'jobs': jobs,
+        }
+
+    async def handle_status(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Minimal HTTP/1.0 responder: GET /status (or /) -> JSON"""
+        try:
+            request_line = (await asyncio.wait_for(reader.readline(), 5)).decode('latin-1')
+            while (await asyncio.wait_for(reader.readline(), 5)) not in (b'\r\n', b'\n', b''):
+                pass
+            parts = request_line.split()
+            path = parts[1] if len(parts) > 1 else '/'
+            if path in ('/', '/status'):
+                code, body = '200 OK', self.status()
+            elif path.startswith('/status/') and path[8:] in self.jobs:
+                code, body = '200 OK', self.jobs[path[8:]].status()
+            else:
+                code, body = '404 Not Found', {'error': f"Unknown path: {path}"}
+            payload = json.dumps(body, indent=2).encode()
+            writer.write(f"HTTP/1.0 {code}\r\nContent-Type: application/json\r\n"
+                         f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload)
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self):
+        self.load()
+        if self.status_port is not None:
+            self.server = await asyncio.start_server(self.handle_status, STATUS_HOST, self.status_port)
+            logger.info(f"📡 Status on http://{STATUS_HOST}:{self.status_port}/status")
+        tasks = [asyncio.create_task(self.schedule(job), name=job.name)
+                 for job in self.jobs.values() if not job.disabled]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            if self.server:
+                self.server.close()
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _call(run: Callable) -> bool:
+    """Run a check function; daemons written as scripts may sys.exit() when done"""
+    try:
+        return bool(run())
+    except SystemExit as e:
+        return e.code in (0, None)
+
+
+def setup_logging():
+    """Host-level logging, configured before the daemon modules import"""
+    LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[logging.FileHandler(LOG_FILE), logging.StreamHandler(sys.stdout)]
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the polling daemons in one process')
+    parser.add_argument('--list', action='store_true', help='List configured jobs')
+    parser.add_argument('--once', metavar='JOB', help='Run one job now and exit')
+    parser.add_argument('--only', metavar='JOBS', help='Comma-separated jobs to host')
+    parser.add_argument('--port', type=int, default=STATUS_PORT, help='Status endpoint port')
+    args = parser.parse_args()
+
+    jobs = default_jobs()
+    if args.only:
+        wanted = set(args.only.split(','))
+        jobs = [job for job in jobs if job.name in wanted]
+
+    if args.list:
+        for job in jobs:
+            print(f"   {job.name:<13} {job.module:<26} {job.describe()} (jitter {job.jitter:g}s)")
+        return 0
+
+    setup_logging()
+
+    if args.once:
+        job = next((j for j in jobs if j.name == args.once), None)
+        if job is None:
+            print(f"❌ Unknown job: {args.once}")
+            return 1
+        host = DaemonHost([job], status_port=None)
+        host.load()
+        if job.disabled:
+            return 1
+        return 0 if asyncio.run(host.run_job(job)) else 1
+
+    logger.info("🚀 Daemon host starting")
+    try:
+        asyncio.run(DaemonHost(jobs, status_port=args.port).serve())
+    except KeyboardInterrupt:
+        logger.info("👋 Daemon host stopped")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
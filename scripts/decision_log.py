@@ -21,7 +21,12 @@ import logging
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-import statistics
+
+try:
+    from decision_vectors import DecisionVectorIndex
+    VECTORS_AVAILABLE = True
+except ImportError:  # numpy not installed - predictions stay recency-based
+    VECTORS_AVAILABLE = False
 
 # Paths
 WORKSPACE = Path("/Users/clawdbot/clawd")
@@ -47,10 +52,18 @@ logger = logging.getLogger(__name__)
 class DecisionLog:
     """Logs decisions and tracks ROI"""
     
-    def __init__(self, db_path: Path = DB_PATH):
+    def __init__(self, db_path: Path = DB_PATH, use_vectors: bool = True):
         self.db_path = db_path
         self.conn = None
+        self.vectors = None
         self._init_database()
+        
+        if use_vectors and VECTORS_AVAILABLE:
+            index_dir = Path(db_path).parent / f"{Path(db_path).stem}_vectors"
+            self.vectors = DecisionVectorIndex(index_dir, self.conn)
+            added = self.vectors.backfill()
+            if added:
+                logger.info(f"✅ Indexed {added} existing decisions for similarity search")
     
     def _init_database(self):
         """Initialize SQLite database with schema"""
@@ -157,6 +170,18 @@ class DecisionLog:
             ON outcomes(decision_id)
         """)
         
+        # Covering indexes for prediction lookups and metric rebuilds:
+        # (type, source) -> newest decisions, then their outcome columns
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_decisions_type_recent
+            ON decisions(opportunity_type, opportunity_source, timestamp DESC, decision_id)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_outcomes_decision_covering
+            ON outcomes(decision_id, outcome_status, customer_acquired, revenue_generated,
+                        time_to_outcome_hours, response_received, deal_closed)
+        """)
+        
         self.conn.commit()
         logger.info("✅ Database initialized successfully")
     
@@ -207,15 +232,30 @@ class DecisionLog:
                 decision_maker, context_json
             ))
             
+            # Keep an existing metrics row current (rows are created on first outcome)
+            cursor.execute("""
+                UPDATE conversion_metrics SET
+                    total_decisions = total_decisions + 1,
+                    conversion_rate = COALESCE(total_customers, 0) * 100.0 / (total_decisions + 1),
+                    last_updated = CURRENT_TIMESTAMP
+                WHERE source_type = ? AND opportunity_type = ?
+            """, (opportunity_source, opportunity_type))
+            
+            if self.vectors:
+                self.vectors.add(decision_id, opportunity_type, opportunity_source, opportunity_content[:1000])
+            
             self.conn.commit()
             
             logger.info(f"✅ Logged decision {decision_id}: {action_taken} on {opportunity_type} from {opportunity_source}")
             return True
             
         except sqlite3.IntegrityError:
+            self.conn.rollback()
             logger.warning(f"⚠️  Decision {decision_id} already exists")
             return False
         except Exception as e:
+            # Don't leave a half-written decision for the next commit to save
+            self.conn.rollback()
             logger.error(f"❌ Error logging decision: {e}")
             return False
     
@@ -250,7 +290,8 @@ class DecisionLog:
             # Get decision timestamp to calculate time to outcome
             cursor = self.conn.cursor()
             cursor.execute("""
-                SELECT timestamp FROM decisions WHERE decision_id = ?
+                SELECT timestamp, opportunity_type, opportunity_source
+                FROM decisions WHERE decision_id = ?
             """, (decision_id,))
             
             row = cursor.fetchone()
@@ -275,84 +316,131 @@ class DecisionLog:
                 time_to_outcome, notes
             ))
             
-            self.conn.commit()
+            # Update conversion metrics (same transaction as the outcome)
+            self._apply_outcome_delta(
+                row['opportunity_type'], row['opportunity_source'],
+                revenue_generated, customer_acquired, deal_closed,
+                response_received, time_to_outcome
+            )
             
-            # Update conversion metrics
-            self._update_conversion_metrics(decision_id)
+            if self.vectors:
+                self.vectors.mark_labeled(decision_id)
+            
+            self.conn.commit()
             
             logger.info(f"✅ Recorded outcome for {decision_id}: {outcome_status} (${revenue_generated})")
             return True
             
         except Exception as e:
+            # Drop the outcome row and any partial counter delta with it
+            self.conn.rollback()
             logger.error(f"❌ Error recording outcome: {e}")
             return False
     
-    def _update_conversion_metrics(self, decision_id: str):
-        """Update aggregated conversion metrics after an outcome is recorded"""
-        try:
-            cursor = self.conn.cursor()
-            
-            # Get decision details
-            cursor.execute("""
-                SELECT opportunity_type, opportunity_source
-                FROM decisions
-                WHERE decision_id = ?
-            """, (decision_id,))
-            
-            row = cursor.fetchone()
-            if not row:
-                return
-            
-            opp_type = row['opportunity_type']
-            source = row['opportunity_source']
-            
-            # Calculate metrics for this source+type combination
-            cursor.execute("""
-                SELECT 
-                    COUNT(DISTINCT d.decision_id) as total_decisions,
-                    SUM(CASE WHEN o.response_received = 1 THEN 1 ELSE 0 END) as total_responses,
-                    SUM(CASE WHEN o.customer_acquired = 1 THEN 1 ELSE 0 END) as total_customers,
-                    SUM(CASE WHEN o.deal_closed = 1 THEN 1 ELSE 0 END) as total_deals,
-                    SUM(o.revenue_generated) as total_revenue,
-                    AVG(CASE WHEN o.deal_closed = 1 THEN o.time_to_outcome_hours END) as avg_time
-                FROM decisions d
-                LEFT JOIN outcomes o ON d.decision_id = o.decision_id
-                WHERE d.opportunity_type = ? AND d.opportunity_source = ?
-            """, (opp_type, source))
-            
-            metrics = cursor.fetchone()
-            
-            total_decisions = metrics['total_decisions'] or 0
-            total_customers = metrics['total_customers'] or 0
-            conversion_rate = (total_customers / total_decisions * 100) if total_decisions > 0 else 0
-            
-            # Upsert metrics
-            cursor.execute("""
-                INSERT INTO conversion_metrics (
-                    source_type, opportunity_type, total_decisions, total_responses,
-                    total_customers, total_deals_closed, total_revenue,
-                    avg_time_to_conversion_hours, conversion_rate
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(source_type, opportunity_type) DO UPDATE SET
-                    total_decisions = excluded.total_decisions,
-                    total_responses = excluded.total_responses,
-                    total_customers = excluded.total_customers,
-                    total_deals_closed = excluded.total_deals_closed,
-                    total_revenue = excluded.total_revenue,
-                    avg_time_to_conversion_hours = excluded.avg_time_to_conversion_hours,
-                    conversion_rate = excluded.conversion_rate,
-                    last_updated = CURRENT_TIMESTAMP
-            """, (
-                source, opp_type, total_decisions, metrics['total_responses'],
-                total_customers, metrics['total_deals'], metrics['total_revenue'],
-                metrics['avg_time'], conversion_rate
-            ))
-            
-            self.conn.commit()
-            logger.info(f"✅ Updated conversion metrics for {source}/{opp_type}: {conversion_rate:.1f}% conversion")
-            
-        except Exception as e:
-            logger.error(f"❌ Error updating conversion metrics: {e}")
+    def _apply_outcome_delta(
+        self,
+        opp_type: str,
+        source: str,
+        revenue_generated: float,
+        customer_acquired: bool,
+        deal_closed: bool,
+        response_received: bool,
+        time_to_outcome: float
+    ):
+        """
+        Fold one new outcome into conversion_metrics without re-aggregating.
+        The first outcome for a source/type pair bootstraps the row with a full
+        aggregate; after that every outcome is an O(1) delta update.
+        """
+        cursor = self.conn.cursor()
+        customers = 1 if customer_acquired else 0
+        closed = 1 if deal_closed else 0
+        
+        # SQLite evaluates every SET expression against the old row values
+        cursor.execute("""
+            UPDATE conversion_metrics SET
+                total_responses = COALESCE(total_responses, 0) + ?,
+                total_customers = COALESCE(total_customers, 0) + ?,
+                avg_time_to_conversion_hours = CASE WHEN ? THEN
+                    (COALESCE(avg_time_to_conversion_hours, 0) * COALESCE(total_deals_closed, 0) + ?)
+                    / (COALESCE(total_deals_closed, 0) + 1)
+                    ELSE avg_time_to_conversion_hours END,
+                total_deals_closed = COALESCE(total_deals_closed, 0) + ?,
+                total_revenue = COALESCE(total_revenue, 0) + ?,
+                conversion_rate = CASE WHEN total_decisions > 0
+                    THEN (COALESCE(total_customers, 0) + ?) * 100.0 / total_decisions
+                    ELSE 0 END,
+                last_updated = CURRENT_TIMESTAMP
+            WHERE source_type = ? AND opportunity_type = ?
+        """, (
+            1 if response_received else 0, customers,
+            closed, time_to_outcome, closed,
+            revenue_generated or 0, customers,
+            source, opp_type
+        ))
+        
+        if cursor.rowcount == 0:
+            self._rebuild_conversion_metrics(opp_type, source)
+    
+    def _rebuild_conversion_metrics(self, opp_type: str, source: str):
+        """Recompute conversion metrics for one source/type pair from scratch"""
+        cursor = self.conn.cursor()
+        
+        # Calculate metrics for this source+type combination
+        cursor.execute("""
+            SELECT 
+                COUNT(DISTINCT d.decision_id) as total_decisions,
+                SUM(CASE WHEN o.response_received = 1 THEN 1 ELSE 0 END) as total_responses,
+                SUM(CASE WHEN o.customer_acquired = 1 THEN 1 ELSE 0 END) as total_customers,
+                SUM(CASE WHEN o.deal_closed = 1 THEN 1 ELSE 0 END) as total_deals,
+                SUM(o.revenue_generated) as total_revenue,
+                AVG(CASE WHEN o.deal_closed = 1 THEN o.time_to_outcome_hours END) as avg_time
+            FROM decisions d
+            LEFT JOIN outcomes o ON d.decision_id = o.decision_id
+            WHERE d.opportunity_type = ? AND d.opportunity_source = ?
+        """, (opp_type, source))
+        
+        metrics = cursor.fetchone()
+        
+        total_decisions = metrics['total_decisions'] or 0
+        total_customers = metrics['total_customers'] or 0
+        conversion_rate = (total_customers / total_decisions * 100) if total_decisions > 0 else 0
+        
+        # Upsert metrics
+        cursor.execute("""
+            INSERT INTO conversion_metrics (
+                source_type, opportunity_type, total_decisions, total_responses,
+                total_customers, total_deals_closed, total_revenue,
+                avg_time_to_conversion_hours, conversion_rate
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(source_type, opportunity_type) DO UPDATE SET
+                total_decisions = excluded.total_decisions,
+                total_responses = excluded.total_responses,
+                total_customers = excluded.total_customers,
+                total_deals_closed = excluded.total_deals_closed,
+                total_revenue = excluded.total_revenue,
+                avg_time_to_conversion_hours = excluded.avg_time_to_conversion_hours,
+                conversion_rate = excluded.conversion_rate,
+                last_updated = CURRENT_TIMESTAMP
+        """, (
+            source, opp_type, total_decisions, metrics['total_responses'],
+            total_customers, metrics['total_deals'], metrics['total_revenue'],
+            metrics['avg_time'], conversion_rate
+        ))
+        
+        logger.info(f"✅ Rebuilt conversion metrics for {source}/{opp_type}: {conversion_rate:.1f}% conversion")
+    
+    def rebuild_all_conversion_metrics(self):
+        """Full recompute of every source/type pair (repair tool for drifted counters)"""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT DISTINCT d.opportunity_type, d.opportunity_source
+            FROM decisions d
+            JOIN outcomes o ON d.decision_id = o.decision_id
+        """)
+        for row in cursor.fetchall():
+            self._rebuild_conversion_metrics(row['opportunity_type'], row['opportunity_source'])
+        self.conn.commit()
     
     def get_conversion_rates(self) -> List[Dict]:
         """Get conversion rates by source and opportunity type"""
@@ -490,6 +578,11 @@ class DecisionLog:
         
         return insights
     
+    # Newest outcome rows per (type, source) pair, used by the predictors
+    SIMILAR_LIMIT = 20
+    # Content-similarity predictions need at least this many close neighbours
+    MIN_SIMILAR_NEIGHBOURS = 3
+    
     def predict_outcome(self, opportunity: Dict) -> Dict:
         """
         Predict outcome for a new opportunity based on historical data
@@ -504,13 +597,19 @@ class DecisionLog:
         
         opp_type = opportunity.get('type', 'general')
         source = opportunity.get('source', 'unknown')
+        content = opportunity.get('content', '')
+        
+        # Prefer the nearest past decisions by content when the index has enough
+        if self.vectors and content:
+            neighbours = self.vectors.nearest(opp_type, source, content, k=self.SIMILAR_LIMIT)
+            prediction = self._predict_from_neighbours(opp_type, source, [neighbours])[0]
+            if prediction:
+                return prediction
         
         # Get historical data for similar opportunities
         cursor.execute("""
             SELECT 
                 d.decision_id,
-                d.opportunity_content,
-                d.opportunity_score,
                 o.customer_acquired,
                 o.revenue_generated,
                 o.time_to_outcome_hours
@@ -518,12 +617,143 @@ class DecisionLog:
             LEFT JOIN outcomes o ON d.decision_id = o.decision_id
             WHERE d.opportunity_type = ? AND d.opportunity_source = ?
             AND o.outcome_status IS NOT NULL
-            ORDER BY d.timestamp DESC
-            LIMIT 20
-        """, (opp_type, source))
+            ORDER BY d.timestamp DESC, o.id DESC
+            LIMIT ?
+        """, (opp_type, source, self.SIMILAR_LIMIT))
+        
+        return self._build_prediction(opp_type, source, cursor.fetchall())
+    
+    def predict_outcomes(self, opportunities: List[Dict]) -> List[Dict]:
+        """
+        Batch version of predict_outcome
+        
+        Opportunities are grouped by (type, source) and every group's recent
+        history is fetched in one windowed query, so scoring thousands of
+        opportunities costs one query per few hundred distinct groups instead
+        of one JOIN per opportunity.
+        
+        Returns:
+            Predictions in the same order as the input
+        """
+        keys = [
+            (opp.get('type', 'general'), opp.get('source', 'unknown'))
+            for opp in opportunities
+        ]
+        groups = list(dict.fromkeys(keys))
+        history = {group: [] for group in groups}
         
-        similar = cursor.fetchall()
+        cursor = self.conn.cursor()
+        chunk_size = 400  # Stay well under SQLite's bound-parameter limit
+        for start in range(0, len(groups), chunk_size):
+            chunk = groups[start:start + chunk_size]
+            values = ", ".join(["(?, ?)"] * len(chunk))
+            params = [value for group in chunk for value in group]
+            cursor.execute(f"""
+                WITH wanted(opportunity_type, opportunity_source) AS (VALUES {values}),
+                ranked AS (
+                    SELECT 
+                        d.opportunity_type,
+                        d.opportunity_source,
+                        d.decision_id,
+                        o.customer_acquired,
+                        o.revenue_generated,
+                        o.time_to_outcome_hours,
+                        ROW_NUMBER() OVER (
+                            PARTITION BY d.opportunity_type, d.opportunity_source
+                            ORDER BY d.timestamp DESC, o.id DESC
+                        ) AS rn
+                    FROM wanted w
+                    JOIN decisions d
+                        ON d.opportunity_type = w.opportunity_type
+                        AND d.opportunity_source = w.opportunity_source
+                    JOIN outcomes o ON d.decision_id = o.decision_id
+                    WHERE o.outcome_status IS NOT NULL
+                )
+                SELECT * FROM ranked WHERE rn <= ? ORDER BY opportunity_type, opportunity_source, rn
+            """, params + [self.SIMILAR_LIMIT])
+            
+            for row in cursor.fetchall():
+                history[(row['opportunity_type'], row['opportunity_source'])].append(row)
         
+        predictions = {
+            group: self._build_prediction(group[0], group[1], rows)
+            for group, rows in history.items()
+        }
+        results = [dict(predictions[key]) for key in keys]
+        
+        # Content-similarity predictions, one matrix product per group
+        if self.vectors:
+            by_group: Dict[Tuple[str, str], List[int]] = {}
+            for i, opp in enumerate(opportunities):
+                if opp.get('content'):
+                    by_group.setdefault(keys[i], []).append(i)
+            
+            for (opp_type, source), indices in by_group.items():
+                neighbours = self.vectors.nearest_batch(
+                    opp_type, source,
+                    [opportunities[i]['content'] for i in indices],
+                    k=self.SIMILAR_LIMIT
+                )
+                for i, prediction in zip(indices, self._predict_from_neighbours(opp_type, source, neighbours)):
+                    if prediction:
+                        results[i] = prediction
+        
+        return results
+    
+    def _predict_from_neighbours(
+        self,
+        opp_type: str,
+        source: str,
+        neighbour_lists: List[List[Tuple[str, float]]]
+    ) -> List[Optional[Dict]]:
+        """
+        Similarity-weighted predictions from nearest-neighbour lists
+        
+        Each neighbour contributes its latest outcome. Lists with fewer than
+        MIN_SIMILAR_NEIGHBOURS usable neighbours give None (caller falls back
+        to recency).
+        """
+        wanted = sorted({decision_id for hits in neighbour_lists for decision_id, _ in hits})
+        outcomes = {}
+        cursor = self.conn.cursor()
+        for start in range(0, len(wanted), 500):
+            chunk = wanted[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            cursor.execute(f"""
+                SELECT decision_id, customer_acquired, revenue_generated, time_to_outcome_hours
+                FROM outcomes
+                WHERE id IN (
+                    SELECT MAX(id) FROM outcomes
+                    WHERE decision_id IN ({placeholders}) AND outcome_status IS NOT NULL
+                    GROUP BY decision_id
+                )
+            """, chunk)
+            for row in cursor.fetchall():
+                outcomes[row['decision_id']] = row
+        
+        predictions = []
+        for hits in neighbour_lists:
+            similar = [outcomes[decision_id] for decision_id, _ in hits if decision_id in outcomes]
+            weights = [sim for decision_id, sim in hits if decision_id in outcomes]
+            if len(similar) < self.MIN_SIMILAR_NEIGHBOURS:
+                predictions.append(None)
+                continue
+            predictions.append(self._build_prediction(opp_type, source, similar, weights))
+        return predictions
+    
+    def _build_prediction(
+        self,
+        opp_type: str,
+        source: str,
+        similar: List,
+        weights: Optional[List[float]] = None
+    ) -> Dict:
+        """
+        Turn outcome rows for a type/source pair into a prediction
+        
+        Rows arrive best match first. With weights (content similarity) the
+        averages are similarity-weighted; without, every row counts equally.
+        """
         if not similar:
             return {
                 'predicted_outcome': 'unknown',
@@ -534,14 +764,19 @@ class DecisionLog:
                 'similar_count': 0
             }
         
+        weighted = weights is not None
+        if not weighted:
+            weights = [1.0] * len(similar)
+        total_weight = sum(weights)
+        
         # Calculate statistics from similar opportunities
         conversions = [1 if row['customer_acquired'] else 0 for row in similar]
         revenues = [row['revenue_generated'] or 0 for row in similar]
-        times = [row['time_to_outcome_hours'] or 0 for row in similar if row['time_to_outcome_hours']]
+        timed = [(row['time_to_outcome_hours'], w) for row, w in zip(similar, weights) if row['time_to_outcome_hours']]
         
-        conversion_rate = sum(conversions) / len(conversions) if conversions else 0
-        avg_revenue = statistics.mean(revenues) if revenues else 0
-        avg_time = statistics.mean(times) if times else 0
+        conversion_rate = sum(c * w for c, w in zip(conversions, weights)) / total_weight
+        avg_revenue = sum(r * w for r, w in zip(revenues, weights)) / total_weight
+        avg_time = sum(t * w for t, w in timed) / sum(w for _, w in timed) if timed else 0
         
         # Build prediction
         prediction = {
@@ -554,17 +789,28 @@ class DecisionLog:
             'reasoning': self._generate_prediction_reasoning(
                 opp_type, source, conversion_rate, avg_revenue, len(similar)
             ),
-            'similar_count': len(similar)
+            'similar_count': len(similar),
+            'method': 'recent'
         }
         
         # Find most similar past decision
-        if similar:
-            best_match = similar[0]
-            prediction['most_similar_decision'] = {
-                'decision_id': best_match['decision_id'],
-                'revenue': best_match['revenue_generated'],
-                'converted': bool(best_match['customer_acquired'])
-            }
+        best_match = similar[0]
+        prediction['most_similar_decision'] = {
+            'decision_id': best_match['decision_id'],
+            'revenue': best_match['revenue_generated'],
+            'converted': bool(best_match['customer_acquired'])
+        }
+        
+        if weighted:
+            # Scale confidence by how close the neighbours actually are
+            mean_similarity = total_weight / len(similar)
+            prediction['confidence'] = round(prediction['confidence'] * min(1.0, 0.5 + mean_similarity), 3)
+            prediction['method'] = 'content_similarity'
+            prediction['mean_similarity'] = round(mean_similarity, 3)
+            prediction['most_similar_decision']['similarity'] = round(weights[0], 3)
+            prediction['reasoning'] = prediction['reasoning'].replace(
+                "similar ", "content-similar ", 1
+            )
         
         return prediction
     
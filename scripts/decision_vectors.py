@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Decision Vector Index - Content similarity for the decision log
+
+Embeds every decision's opportunity_content as a hashed word n-gram vector
+(unigrams + bigrams, signed feature hashing, L2-normalized) and keeps them in a
+NumPy matrix memory-mapped from disk next to decision_log.db:
+
+    decision_log_vectors/
+        vectors.f32   capacity x DIM float32 rows (row i = i-th indexed decision)
+        groups.i32    opportunity type/source group code per row
+        labeled.u8    1 once the decision has a recorded outcome
+
+The row -> decision_id mapping lives in the decision log's own SQLite database
+(decision_vectors table), so the index is updated in the same transaction as
+log_decision. Rows past the last committed mapping row are ignored, and the
+per-bucket document frequencies used for IDF weighting are counted in memory
+from the committed rows only. Queries only score rows of the same type/source group that have
+outcomes, which keeps them in the low milliseconds at 100k decisions.
+
+Requires numpy; DecisionLog falls back to recency-based predictions without it.
+"""
+
+import math
+import re
+import sqlite3
+import zlib
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+DIM = 256  # Hashed feature buckets (100k decisions ~= 100MB of vectors)
+INITIAL_CAPACITY = 1024
+TOKEN_RE = re.compile(r"[a-z0-9$][a-z0-9$'.]*")
+
+
+def _features(text: str) -> Dict[int, float]:
+    """Signed hashed unigram + bigram counts for text"""
+    tokens = [t.strip(".'") for t in TOKEN_RE.findall(text.lower())]
+    tokens = [t for t in tokens if t]
+    grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+    counts: Dict[int, float] = {}
+    for gram in grams:
+        h = zlib.crc32(gram.encode())
+        bucket = h % DIM
+        sign = 1.0 if (h >> 31) & 1 else -1.0
+        counts[bucket] = counts.get(bucket, 0.0) + sign
+    return counts
+
+
+def embed(text: str) -> np.ndarray:
+    """Sublinear-tf hashed vector for text, L2-normalized (all zeros if empty)"""
+    vec = np.zeros(DIM, dtype=np.float32)
+    for bucket, count in _features(text).items():
+        vec[bucket] = math.copysign(1.0 + math.log(abs(count)), count) if count else 0.0
+    norm = float(np.linalg.norm(vec))
+    return vec / norm if norm else vec
+
+
+class DecisionVectorIndex:
+    """
+    Memory-mapped hashed-vector index over decision content
+
+    Args:
+        index_dir: Directory holding the memmapped arrays
+        conn: The decision log's SQLite connection (holds the row mapping)
+    """
+
+    def __init__(self, index_dir: Path, conn: sqlite3.Connection):
+        self.index_dir = Path(index_dir)
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.conn = conn
+        self.groups: Dict[str, int] = {}
+        self.count = 0
+        self.capacity = 0
+        # Per-bucket document frequency (+ doc count) over rows [0, count)
+        self.df = np.zeros(DIM + 1, dtype=np.float64)
+        # group code -> (candidate rows, contiguous copy of their vectors)
+        self._group_cache: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS decision_vectors (
+                row INTEGER PRIMARY KEY,
+                decision_id TEXT UNIQUE NOT NULL,
+                group_key TEXT NOT NULL
+            )
+        """)
+        self._open()
+        self._sync()
+
+    # ---- storage ---------------------------------------------------------
+
+    def _map(self, name: str, dtype, shape) -> np.memmap:
+        path = self.index_dir / name
+        size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        with open(path, "ab") as f:
+            if f.tell() < size:
+                f.truncate(size)
+        return np.memmap(path, dtype=dtype, mode="r+", shape=shape)
+
+    def _open(self, capacity: int = INITIAL_CAPACITY):
+        existing = self.index_dir / "groups.i32"
+        if existing.exists():
+            capacity = max(capacity, existing.stat().st_size // 4)
+        self.capacity = capacity
+        self.vectors = self._map("vectors.f32", np.float32, (capacity, DIM))
+        self.group_codes = self._map("groups.i32", np.int32, (capacity,))
+        self.labeled = self._map("labeled.u8", np.uint8, (capacity,))
+
+    def _grow(self, needed: int):
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        self.flush()
+        del self.vectors, self.group_codes, self.labeled
+        self._open(capacity)
+        self._group_cache.clear()
+
+    def _sync(self):
+        """Pick up rows written by other processes (the SQL table is the source of truth)"""
+        row = self.conn.execute("SELECT MAX(row) FROM decision_vectors").fetchone()
+        count = (row[0] + 1) if row[0] is not None else 0
+        if count == self.count:
+            return
+        if count > self.capacity:
+            self._grow(count)
+
+        if count < self.count:
+            self._reset()  # A transaction was rolled back
+        new_keys = {key for (key,) in self.conn.execute(
+            "SELECT DISTINCT group_key FROM decision_vectors WHERE row >= ?", (self.count,)
+        )}
+        if not new_keys <= self.groups.keys():
+            # Group codes are the order of each group's first row, so every
+            # process derives the same codes from the same table
+            self.groups = {
+                key: code for code, (key, _) in enumerate(self.conn.execute(
+                    "SELECT group_key, MIN(row) AS first_row FROM decision_vectors "
+                    "GROUP BY group_key ORDER BY first_row"
+                ))
+            }
+        for start in range(self.count, count, 8192):
+            block = self.vectors[start:min(start + 8192, count)]
+            self.df[:DIM] += (block != 0).sum(axis=0)
+        self.df[DIM] += count - self.count
+        self.count = count
+
+    def _reset(self):
+        """Forget what has been counted so the next _sync recounts every row"""
+        self.count = 0
+        self.df[:] = 0
+        self.groups = {}
+
+    def flush(self):
+        for arr in (self.vectors, self.group_codes, self.labeled):
+            arr.flush()
+
+    @staticmethod
+    def group_key(opp_type: str, source: str) -> str:
+        return f"{opp_type}\x1f{source}"
+
+    # ---- updates ---------------------------------------------------------
+
+    def add(self, decision_id: str, opp_type: str, source: str, content: str, labeled: bool = False):
+        """
+        Append one decision (caller commits the SQL transaction)
+
+        SQLite picks the row inside the INSERT, which holds the write lock until
+        the caller commits, so two processes can never claim the same row. The
+        vector is written after the mapping row exists; if the transaction
+        rolls back, the row is simply overwritten by the next add.
+        """
+        key = self.group_key(opp_type, source)
+        row = self.conn.execute(
+            "INSERT INTO decision_vectors (row, decision_id, group_key) "
+            "VALUES ((SELECT COALESCE(MAX(row) + 1, 0) FROM decision_vectors), ?, ?)",
+            (decision_id, key)
+        ).lastrowid
+        if row < self.count:
+            self._reset()  # Rows we counted were rolled back and reused
+        if row >= self.capacity:
+            self._grow(row + 1)
+
+        self.vectors[row] = embed(content or "")
+        self.labeled[row] = 1 if labeled else 0
+        self._sync()
+        self.group_codes[row] = self.groups[key]
+
+    def mark_labeled(self, decision_id: str):
+        """Flag a decision as having an outcome so queries consider it"""
+        row = self.conn.execute(
+            "SELECT row FROM decision_vectors WHERE decision_id = ?", (decision_id,)
+        ).fetchone()
+        if row is None:
+            return
+        if row[0] >= self.capacity:
+            self._sync()  # Appended by another process after our maps were sized
+        self.labeled[row[0]] = 1
+
+    def backfill(self) -> int:
+        """Index decisions logged before the index existed (or by older code)"""
+        cursor = self.conn.execute("""
+            SELECT d.decision_id, d.opportunity_type, d.opportunity_source, d.opportunity_content,
+                   EXISTS (
+                       SELECT 1 FROM outcomes o
+                       WHERE o.decision_id = d.decision_id AND o.outcome_status IS NOT NULL
+                   ) AS has_outcome
+            FROM decisions d
+            WHERE d.decision_id NOT IN (SELECT decision_id FROM decision_vectors)
+            ORDER BY d.timestamp, d.id
+        """)
+        added = 0
+        for decision_id, opp_type, source, content, has_outcome in cursor.fetchall():
+            self.add(decision_id, opp_type, source, content or "", bool(has_outcome))
+            added += 1
+        if added:
+            self.conn.commit()
+            self.flush()
+        return added
+
+    # ---- queries ---------------------------------------------------------
+
+    def _idf(self) -> np.ndarray:
+        n_docs = self.df[DIM]
+        return np.log((1.0 + n_docs) / (1.0 + self.df[:DIM])).astype(np.float32) + 1.0
+
+    def nearest_batch(
+        self,
+        opp_type: str,
+        source: str,
+        texts: Sequence[str],
+        k: int = 20,
+        min_similarity: float = 0.05
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        k nearest labeled decisions of the same type/source for each text
+
+        Returns:
+            Per text, [(decision_id, cosine similarity)] best first
+        """
+        self._sync()
+        results: List[List[Tuple[str, float]]] = [[] for _ in texts]
+        code = self.groups.get(self.group_key(opp_type, source))
+        if code is None or not texts or self.count == 0:
+            return results
+
+        rows, matrix = self._candidates(code)
+        if rows.size == 0:
+            return results
+
+        queries = np.stack([embed(text) for text in texts]) * self._idf()
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries /= np.where(norms == 0, 1, norms)
+        scores = queries @ matrix.T
+
+        top = min(k, rows.size)
+        wanted = set()
+        picks = []
+        for i in range(len(texts)):
+            best = np.argpartition(-scores[i], top - 1)[:top]
+            best = best[np.argsort(-scores[i][best], kind="stable")]
+            hits = [(int(rows[j]), float(scores[i][j])) for j in best if scores[i][j] >= min_similarity]
+            picks.append(hits)
+            wanted.update(row for row, _ in hits)
+
+        ids = self._decision_ids(sorted(wanted))
+        for i, hits in enumerate(picks):
+            results[i] = [(ids[row], sim) for row, sim in hits if row in ids]
+        return results
+
+    def _candidates(self, code: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Labeled rows of a group plus a contiguous copy of their vectors
+
+        Scoring a contiguous block is several times faster than gathering
+        scattered rows out of the memmap on every query, so the copy is cached
+        and only the rows appended since the last query are gathered.
+        """
+        n = self.count
+        rows = np.flatnonzero((self.group_codes[:n] == code) & (self.labeled[:n] == 1))
+        cached = self._group_cache.get(code)
+        if cached is not None:
+            old_rows, old_matrix = cached
+            if np.array_equal(rows, old_rows):
+                return cached
+            if rows.size > old_rows.size and np.array_equal(rows[:old_rows.size], old_rows):
+                matrix = np.concatenate([old_matrix, self.vectors[rows[old_rows.size:]]])
+                self._group_cache[code] = (rows, matrix)
+                return rows, matrix
+        matrix = np.ascontiguousarray(self.vectors[rows])
+        self._group_cache[code] = (rows, matrix)
+        return rows, matrix
+
+    def nearest(self, opp_type: str, source: str, text: str, k: int = 20,
+                min_similarity: float = 0.05) -> List[Tuple[str, float]]:
+        return self.nearest_batch(opp_type, source, [text], k, min_similarity)[0]
+
+    def _decision_ids(self, rows: List[int]) -> Dict[int, str]:
+        ids: Dict[int, str] = {}
+        for start in range(0, len(rows), 500):
+            chunk = rows[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for row, decision_id in self.conn.execute(
+                f"SELECT row, decision_id FROM decision_vectors WHERE row IN ({placeholders})", chunk
+            ):
+                ids[row] = decision_id
+        return ids
+
+    def get_stats(self) -> Dict:
+        self._sync()
+        return {
+            'indexed_decisions': self.count,
+            'labeled_decisions': int(self.labeled[:self.count].sum()) if self.count else 0,
+            'groups': len(self.groups),
+            'dimensions': DIM,
+            'capacity': self.capacity,
+            'size_mb': round(self.capacity * DIM * 4 / 1024 / 1024, 1)
+        }
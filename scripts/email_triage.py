@@ -13,10 +13,11 @@ from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
-import subprocess
 import base64
 import re
 
+from local_llm import get_client
+
 DATA_DIR = Path(__file__).parent.parent / 'data'
 EMAIL_DATA_PATH = DATA_DIR / 'email_classifications.json'
 CREDENTIALS_PATH = Path(__file__).parent.parent / 'credentials' / 'gmail_credentials.json'
@@ -115,14 +116,15 @@ Preview: {body_preview}
 Category (respond with just one word: URGENT, ACTION_REQUIRED, FYI, or SPAM):"""
 
         # Call Ollama
-        result = subprocess.run(
-            ['ollama', 'run', 'qwen2.5', prompt],
-            capture_output=True,
-            text=True,
+        result = get_client().generate(
+            prompt,
+            model='qwen2.5',
+            temperature=0,
+            caller='email_triage',
             timeout=30
         )
         
-        classification = result.stdout.strip().upper()
+        classification = result['response'].strip().upper()
         
         # Map to our categories
         if 'URGENT' in classification:
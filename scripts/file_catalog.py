@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+Workspace File Catalog - Persistent (path, mtime, size, kind) index of the workspace
+
+Shared by every context loader so session startup doesn't walk the tree.
+
+How it stays current:
+- refresh() walks directories, but only re-lists a directory whose own mtime
+  changed (adds/removes/renames); files in unchanged directories get a single
+  stat to catch in-place edits
+- refreshes are throttled (REFRESH_INTERVAL) across processes via the DB,
+  so several loaders starting together pay for one walk
+- `file_catalog.py watch` keeps the catalog live from filesystem events
+  (needs the optional `watchdog` package); while a watcher heartbeat is
+  fresh, loaders skip the walk entirely
+
+Usage:
+    from file_catalog import get_catalog
+    catalog = get_catalog()
+    catalog.recent(hours=24, suffix=".py", limit=10)
+    catalog.files_in("", "BUILD_*.md")
+
+CLI:
+    python3 file_catalog.py refresh
+    python3 file_catalog.py recent [hours] [suffix]
+    python3 file_catalog.py watch
+    python3 file_catalog.py stats
+"""
+
+import fnmatch
+import os
+import sqlite3
+import stat
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+WORKSPACE = Path("/Users/clawdbot/clawd")
+CATALOG_DB = WORKSPACE / "data" / "file_catalog.db"
+
+REFRESH_INTERVAL = 60  # seconds between walks shared by all loaders
+WATCHER_HEARTBEAT = 30  # watcher writes a heartbeat this often
+EXCLUDED_DIRS = {
+    ".git", "node_modules", "__pycache__", ".venv", "venv",
+    ".pytest_cache", ".mypy_cache", ".ruff_cache", ".tox",
+}
+
+KINDS = {
+    ".py": "python",
+    ".md": "markdown",
+    ".json": "json",
+    ".jsonl": "json",
+    ".sh": "shell",
+    ".html": "html",
+    ".csv": "csv",
+    ".txt": "text",
+    ".log": "log",
+    ".db": "database",
+}
+
+
+def file_kind(name: str) -> str:
+    return KINDS.get(os.path.splitext(name)[1].lower(), "other")
+
+
+class FileCatalog:
+    """SQLite-backed catalog of workspace files"""
+
+    def __init__(self, root: Path = WORKSPACE, db_path: Path = CATALOG_DB):
+        self.root = Path(root)
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path), timeout=10)
+        self.conn.row_factory = sqlite3.Row
+        # The catalog's own DB files change on every write; never index them
+        self._own_files = {
+            str(self.db_path) + suffix for suffix in ("", "-wal", "-shm", "-journal")
+        }
+        self._init_database()
+
+    def _init_database(self):
+        cursor = self.conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                parent TEXT NOT NULL,
+                name TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                mtime REAL NOT NULL,
+                size INTEGER NOT NULL
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS dirs (
+                path TEXT PRIMARY KEY,
+                parent TEXT,
+                mtime_ns INTEGER NOT NULL
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_files_parent ON files(parent)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_files_mtime ON files(mtime DESC)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_files_kind_mtime ON files(kind, mtime DESC)")
+        self.conn.commit()
+
+    # ------------------------------------------------------------------ meta
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def _set_meta(self, key: str, value):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value))
+        )
+
+    def is_fresh(self, max_age: float = REFRESH_INTERVAL) -> bool:
+        """True if a recent walk or a live watcher already covers the tree"""
+        now = time.time()
+        heartbeat = float(self._get_meta("watcher_heartbeat") or 0)
+        if now - heartbeat < WATCHER_HEARTBEAT * 2:
+            return True
+        last_refresh = float(self._get_meta("last_refresh") or 0)
+        return now - last_refresh < max_age
+
+    # ---------------------------------------------------------------- refresh
+
+    def _rel(self, path: str) -> str:
+        rel = os.path.relpath(path, self.root)
+        return "" if rel == "." else rel
+
+    def ensure_fresh(self, max_age: float = REFRESH_INTERVAL) -> Dict:
+        """Refresh only if the catalog is older than max_age"""
+        if self.is_fresh(max_age):
+            return {"skipped": True}
+        return self.refresh()
+
+    def refresh(self) -> Dict:
+        """
+        Incrementally sync the catalog with the filesystem
+
+        Returns:
+            Stats dict (dirs listed/skipped, files added/updated/removed, ms)
+        """
+        start = time.perf_counter()
+        stats = {"dirs_listed": 0, "dirs_unchanged": 0, "added": 0, "updated": 0, "removed": 0}
+
+        known_dirs = {
+            row["path"]: row["mtime_ns"]
+            for row in self.conn.execute("SELECT path, mtime_ns FROM dirs")
+        }
+        children = {}
+        for row in self.conn.execute("SELECT path, parent FROM dirs"):
+            children.setdefault(row["parent"], []).append(row["path"])
+        known_files = {}
+        for row in self.conn.execute("SELECT path, parent, mtime, size FROM files"):
+            known_files.setdefault(row["parent"], {})[row["path"]] = (row["mtime"], row["size"])
+
+        seen_dirs = {}
+        file_upserts = []
+        file_deletes = []
+        stack = [""]
+
+        while stack:
+            rel_dir = stack.pop()
+            abs_dir = os.path.join(self.root, rel_dir) if rel_dir else str(self.root)
+            try:
+                dir_mtime = os.stat(abs_dir).st_mtime_ns
+            except OSError:
+                continue
+            seen_dirs[rel_dir] = dir_mtime
+            previous = known_files.get(rel_dir, {})
+
+            if known_dirs.get(rel_dir) == dir_mtime:
+                # Entry list unchanged: just re-stat known files for in-place edits
+                stats["dirs_unchanged"] += 1
+                stack.extend(children.get(rel_dir, []))
+                for rel_path, (mtime, size) in previous.items():
+                    try:
+                        st = os.stat(os.path.join(self.root, rel_path))
+                    except OSError:
+                        file_deletes.append((rel_path,))
+                        continue
+                    if st.st_mtime != mtime or st.st_size != size:
+                        file_upserts.append(self._row(rel_path, rel_dir, st))
+                        stats["updated"] += 1
+                continue
+
+            stats["dirs_listed"] += 1
+            current = set()
+            try:
+                entries = list(os.scandir(abs_dir))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in EXCLUDED_DIRS:
+                            stack.append(self._rel(entry.path))
+                        continue
+                    if not entry.is_file(follow_symlinks=False) or entry.path in self._own_files:
+                        continue
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                rel_path = self._rel(entry.path)
+                current.add(rel_path)
+                old = previous.get(rel_path)
+                if old is None:
+                    stats["added"] += 1
+                elif old != (st.st_mtime, st.st_size):
+                    stats["updated"] += 1
+                else:
+                    continue
+                file_upserts.append(self._row(rel_path, rel_dir, st))
+
+            for rel_path in previous:
+                if rel_path not in current:
+                    file_deletes.append((rel_path,))
+
+        removed_dirs = [d for d in known_dirs if d not in seen_dirs]
+        for rel_dir in removed_dirs:
+            file_deletes.extend((p,) for p in known_files.get(rel_dir, {}))
+        stats["removed"] = len(file_deletes)
+
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO files (path, parent, name, kind, mtime, size) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                file_upserts,
+            )
+            self.conn.executemany("DELETE FROM files WHERE path = ?", file_deletes)
+            self.conn.executemany("DELETE FROM dirs WHERE path = ?", [(d,) for d in removed_dirs])
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO dirs (path, parent, mtime_ns) VALUES (?, ?, ?)",
+                [
+                    (d, os.path.dirname(d) if d else None, mtime)
+                    for d, mtime in seen_dirs.items()
+                    if known_dirs.get(d) != mtime
+                ],
+            )
+            self._set_meta("last_refresh", time.time())
+
+        stats["ms"] = round((time.perf_counter() - start) * 1000, 1)
+        return stats
+
+    @staticmethod
+    def _row(rel_path: str, rel_dir: str, st: os.stat_result) -> tuple:
+        name = os.path.basename(rel_path)
+        return (rel_path, rel_dir, name, file_kind(name), st.st_mtime, st.st_size)
+
+    # ---------------------------------------------------------------- queries
+
+    def _entry(self, row) -> Dict:
+        return {
+            "path": str(self.root / row["path"]),
+            "name": row["name"],
+            "kind": row["kind"],
+            "size": row["size"],
+            "mtime": row["mtime"],
+            "modified": datetime.fromtimestamp(row["mtime"]).isoformat(),
+        }
+
+    def recent(self, hours: float = 24, kind: str = None, suffix: str = None,
+               limit: int = 10) -> List[Dict]:
+        """Most recently modified files (index-ordered top-N, no tree walk)"""
+        cutoff = time.time() - hours * 3600
+        query = "SELECT * FROM files WHERE mtime > ?"
+        params: list = [cutoff]
+        if kind:
+            query += " AND kind = ?"
+            params.append(kind)
+        if suffix:
+            query += " AND name LIKE ?"
+            params.append(f"%{suffix}")
+        query += " ORDER BY mtime DESC LIMIT ?"
+        params.append(limit)
+        return [self._entry(row) for row in self.conn.execute(query, params)]
+
+    def files_in(self, directory: str = "", pattern: str = "*") -> List[Dict]:
+        """Files directly inside a workspace-relative directory matching a glob"""
+        rows = self.conn.execute("SELECT * FROM files WHERE parent = ?", (directory,))
+        return [self._entry(row) for row in rows if fnmatch.fnmatchcase(row["name"], pattern)]
+
+    def get_stats(self) -> Dict:
+        by_kind = {
+            row["kind"]: row["n"]
+            for row in self.conn.execute("SELECT kind, COUNT(*) AS n FROM files GROUP BY kind")
+        }
+        last_refresh = float(self._get_meta("last_refresh") or 0)
+        return {
+            "files": sum(by_kind.values()),
+            "dirs": self.conn.execute("SELECT COUNT(*) FROM dirs").fetchone()[0],
+            "by_kind": by_kind,
+            "last_refresh": datetime.fromtimestamp(last_refresh).isoformat() if last_refresh else None,
+            "watcher_live": self.is_fresh(0),
+        }
+
+    # ---------------------------------------------------------------- watcher
+
+    def watch(self):
+        """Keep the catalog live from filesystem events (requires watchdog)"""
+        try:
+            from watchdog.observers import Observer
+            from watchdog.events import FileSystemEventHandler
+        except ImportError:
+            print("watchdog not installed. Install with: pip3 install watchdog")
+            print("Falling back to periodic refresh every", REFRESH_INTERVAL, "seconds")
+            while True:
+                print(self.refresh())
+                time.sleep(REFRESH_INTERVAL)
+
+        catalog = self
+        dirty = set()
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                for path in (event.src_path, getattr(event, "dest_path", None)):
+                    if path:
+                        dirty.add(path)
+
+        self.refresh()
+        observer = Observer()
+        observer.schedule(Handler(), str(self.root), recursive=True)
+        observer.start()
+        print(f"👀 Watching {self.root}")
+
+        try:
+            while True:
+                time.sleep(1)
+                if dirty:
+                    paths = list(dirty)
+                    dirty.clear()
+                    catalog._apply_events(paths)
+                with catalog.conn:
+                    catalog._set_meta("watcher_heartbeat", time.time())
+        except KeyboardInterrupt:
+            observer.stop()
+        observer.join()
+
+    def _apply_events(self, paths: List[str]):
+        """Re-stat the paths touched by watcher events (new directories are walked)"""
+        upserts, dir_upserts, deletes = [], [], []
+        for path in paths:
+            rel_path = self._rel(path)
+            if path in self._own_files or rel_path.startswith("..") or set(Path(rel_path).parts) & EXCLUDED_DIRS:
+                continue
+            try:
+                st = os.stat(path, follow_symlinks=False)
+            except OSError:
+                if rel_path:
+                    deletes.append(rel_path)
+                continue
+            if stat.S_ISREG(st.st_mode):
+                upserts.append(self._row(rel_path, os.path.dirname(rel_path), st))
+            elif stat.S_ISDIR(st.st_mode):
+                known = self.conn.execute("SELECT 1 FROM dirs WHERE path = ?", (rel_path,)).fetchone()
+                dir_upserts.append((rel_path, os.path.dirname(rel_path) if rel_path else None, st.st_mtime_ns))
+                if not known:
+                    # Created or moved in: a moved tree only raises one event
+                    self._walk_new(path, upserts, dir_upserts)
+
+        # Exact prefix match; LIKE would treat _ and % as wildcards and ignore case
+        subtree = "path = ? OR substr(path, 1, length(?) + 1) = ? || '/'"
+        with self.conn:
+            self.conn.executemany(f"DELETE FROM files WHERE {subtree}", [(p, p, p) for p in deletes])
+            self.conn.executemany(f"DELETE FROM dirs WHERE {subtree}", [(p, p, p) for p in deletes])
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO files (path, parent, name, kind, mtime, size) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                upserts,
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO dirs (path, parent, mtime_ns) VALUES (?, ?, ?)",
+                dir_upserts,
+            )
+
+    def _walk_new(self, abs_dir: str, upserts: list, dir_upserts: list):
+        """Catalog everything under a directory the catalog has not seen"""
+        for dirpath, dirnames, filenames in os.walk(abs_dir):
+            dirnames[:] = [d for d in dirnames if d not in EXCLUDED_DIRS]
+            rel_dir = self._rel(dirpath)
+            for name in dirnames:
+                try:
+                    st = os.stat(os.path.join(dirpath, name), follow_symlinks=False)
+                except OSError:
+                    continue
+                if stat.S_ISDIR(st.st_mode):
+                    dir_upserts.append((os.path.join(rel_dir, name), rel_dir, st.st_mtime_ns))
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path, follow_symlinks=False)
+                except OSError:
+                    continue
+                if stat.S_ISREG(st.st_mode) and path not in self._own_files:
+                    upserts.append(self._row(os.path.join(rel_dir, name), rel_dir, st))
+
+
+_catalog = None
+
+
+def get_catalog(refresh: bool = True) -> FileCatalog:
+    """Shared catalog instance, refreshed if stale"""
+    global _catalog
+    if _catalog is None:
+        _catalog = FileCatalog()
+    if refresh:
+        _catalog.ensure_fresh()
+    return _catalog
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    command = sys.argv[1]
+    catalog = get_catalog(refresh=False)
+
+    if command == "refresh":
+        print(catalog.refresh())
+    elif command == "recent":
+        hours = float(sys.argv[2]) if len(sys.argv) > 2 else 24
+        suffix = sys.argv[3] if len(sys.argv) > 3 else None
+        catalog.ensure_fresh()
+        for entry in catalog.recent(hours=hours, suffix=suffix, limit=20):
+            print(f"{entry['modified'][:16]}  {entry['path']}")
+    elif command == "watch":
+        catalog.watch()
+    elif command == "stats":
+        for key, value in catalog.get_stats().items():
+            print(f"{key}: {value}")
+    else:
+        print(f"Unknown command: {command}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,12 +6,13 @@ Search OpenTable, Resy, and Yelp for available reservations
 
 import argparse
 import json
-import requests
 from datetime import datetime, timedelta
 from pathlib import Path
 from bs4 import BeautifulSoup
 import re
 
+from http_pool import get_session
+
 DATA_DIR = Path(__file__).parent.parent / 'data'
 SAVED_SEARCHES_PATH = DATA_DIR / 'saved_searches.json'
 
@@ -55,7 +56,7 @@ def search_opentable(party_size, time, cuisine, location):
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
         }
         
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        response = get_session().get(url, params=params, headers=headers, timeout=10)
         
         if response.status_code == 200:
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -144,7 +145,7 @@ def search_yelp(party_size, time, cuisine, location):
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
         }
         
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        response = get_session().get(url, params=params, headers=headers, timeout=10)
         
         if response.status_code == 200:
             soup = BeautifulSoup(response.content, 'html.parser')
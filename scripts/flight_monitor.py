@@ -11,10 +11,14 @@ from pathlib import Path
 from typing import Dict, List, Optional
 import requests
 
+from timeseries_store import TimeSeriesStore, get_store
+
 # Configuration
 WORKSPACE = Path("/Users/clawdbot/clawd")
 DATA_DIR = WORKSPACE / "data"
-DATA_FILE = DATA_DIR / "flight_prices.json"
+DATA_FILE = DATA_DIR / "flight_prices.json"  # Legacy history, imported into the time-series store once
+SERIES = "flights"
+RETENTION_DAYS = 30
 
 # Flight search parameters
 ROUTE = {
@@ -83,59 +87,48 @@ def check_prices() -> List[Dict]:
     
     return all_flights
 
-def load_history() -> Dict:
-    """Load price history from disk"""
+def flight_key(flight: Dict) -> str:
+    """Entity key for a date combination"""
+    return f"{flight['depart_date']}>{flight['return_date']}"
+
+def import_legacy_history(store: TimeSeriesStore) -> int:
+    """Move checks from the old flight_prices.json into the store (once)"""
     if not DATA_FILE.exists():
-        return {"flights": [], "checks": []}
-    
+        return 0
     with open(DATA_FILE, 'r') as f:
-        return json.load(f)
+        history = json.load(f)
+    for check in history.get('checks', []):
+        store.record_many(SERIES, [(flight_key(f), f['price'], f) for f in check.get('flights', [])],
+                          ts=check['timestamp'])
+    DATA_FILE.rename(DATA_FILE.with_name(DATA_FILE.name + '.imported'))
+    return len(history.get('checks', []))
 
-def save_history(data: Dict):
-    """Save price history to disk"""
-    DATA_FILE.parent.mkdir(exist_ok=True)
-    with open(DATA_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
+def record_check(store: TimeSeriesStore, flights: List[Dict], ts=None) -> float:
+    """Store one check: a price observation per date combination"""
+    return store.record_many(SERIES, [(flight_key(f), f['price'], f) for f in flights], ts=ts)
 
-def analyze_price_changes(current_flights: List[Dict], history: Dict) -> List[Dict]:
-    """Analyze price changes and generate alerts"""
+def analyze_price_changes(store: TimeSeriesStore, since: float) -> List[Dict]:
+    """Alerts for date combinations whose price moved since the previous check"""
     alerts = []
     
-    if not history.get('checks'):
-        return alerts
-    
-    # Get previous check
-    previous_check = history['checks'][-1] if history['checks'] else None
-    if not previous_check:
-        return alerts
-    
-    previous_flights = previous_check.get('flights', [])
-    
-    for current in current_flights:
-        # Find matching previous flight
-        matching = None
-        for prev in previous_flights:
-            if (prev['depart_date'] == current['depart_date'] and 
-                prev['return_date'] == current['return_date']):
-                matching = prev
-                break
-        
-        if matching:
-            price_diff = current['price'] - matching['price']
-            
-            if abs(price_diff) >= THRESHOLD_PRICE_DROP:
-                alert_type = "price_drop" if price_diff < 0 else "price_increase"
-                alerts.append({
-                    "type": alert_type,
-                    "message": f"{'🔽 Price dropped' if price_diff < 0 else '🔼 Price increased'} ${abs(price_diff):.0f}",
-                    "flight": current,
-                    "old_price": matching['price'],
-                    "new_price": current['price']
-                })
+    for change in store.changes(SERIES, min_delta=THRESHOLD_PRICE_DROP, since=since):
+        price_diff = change.delta
+        alert_type = "price_drop" if price_diff < 0 else "price_increase"
+        alerts.append({
+            "type": alert_type,
+            "message": f"{'🔽 Price dropped' if price_diff < 0 else '🔼 Price increased'} ${abs(price_diff):.0f}",
+            "flight": change.current.data,
+            "old_price": change.previous.data['price'],
+            "new_price": change.current.data['price']
+        })
     
     return alerts
 
-def generate_report(flights: List[Dict], alerts: List[Dict], history: Dict) -> str:
+def latest_flights(store: TimeSeriesStore) -> List[Dict]:
+    """Most recent price for every date combination"""
+    return [obs.data for obs in store.latest_all(SERIES).values()]
+
+def generate_report(flights: List[Dict], alerts: List[Dict], store: TimeSeriesStore) -> str:
     """Generate human-readable report"""
     
     report = f"# ✈️  NFL Draft Flight Monitor - {datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n"
@@ -176,21 +169,17 @@ def generate_report(flights: List[Dict], alerts: List[Dict], history: Dict) -> s
         report += f"- **Book:** {flight['booking_url']}\n\n"
     
     # Price trends
-    if history.get('checks') and len(history['checks']) > 1:
+    trends = {}
+    for depart in ROUTE['depart_dates']:
+        for return_date in ROUTE['return_dates']:
+            recent = store.recent(SERIES, f"{depart}>{return_date}", 7)  # Last 7 checks
+            if len(recent) > 1:
+                trends[(depart, return_date)] = [obs.value for obs in recent]
+    
+    if trends:
         report += "## 📈 PRICE TRENDS (Last 7 Days)\n\n"
         
-        recent_checks = history['checks'][-7:]  # Last 7 checks
-        
-        for date_combo in [(d, r) for d in ROUTE['depart_dates'] for r in ROUTE['return_dates']]:
-            depart, return_date = date_combo
-            prices = []
-            
-            for check in recent_checks:
-                for flight in check.get('flights', []):
-                    if flight['depart_date'] == depart and flight['return_date'] == return_date:
-                        prices.append(flight['price'])
-                        break
-            
+        for (depart, return_date), prices in trends.items():
             if prices:
                 report += f"**{depart} → {return_date}:**\n"
                 report += f"- Current: ${prices[-1]}\n"
@@ -200,37 +189,28 @@ def generate_report(flights: List[Dict], alerts: List[Dict], history: Dict) -> s
     
     return report
 
-def check_and_report():
+def check_and_report(store: Optional[TimeSeriesStore] = None):
     """Main function: check prices, analyze, and report"""
+    store = store or get_store()
+    store.set_retention(SERIES, RETENTION_DAYS)
+    imported = import_legacy_history(store)
+    if imported:
+        print(f"📦 Imported {imported} checks from {DATA_FILE.name}")
     
-    # Check current prices
+    # Check current prices and record them
     current_flights = check_prices()
+    checked_at = record_check(store, current_flights)
     
-    # Load history
-    history = load_history()
-    
-    # Analyze changes
-    alerts = analyze_price_changes(current_flights, history)
+    # Compare against each combination's previous check
+    alerts = analyze_price_changes(store, since=checked_at)
     
     # Generate report
-    report = generate_report(current_flights, alerts, history)
-    
-    # Save to history
-    history['checks'].append({
-        "timestamp": datetime.now().isoformat(),
-        "flights": current_flights
-    })
+    report = generate_report(current_flights, alerts, store)
     
     # Keep only last 30 days of checks
-    cutoff_date = datetime.now() - timedelta(days=30)
-    history['checks'] = [
-        check for check in history['checks']
-        if datetime.fromisoformat(check['timestamp']) > cutoff_date
-    ]
-    
-    save_history(history)
+    store.prune()
     
-    print(f"\n💾 Saved to {DATA_FILE}")
+    print(f"\n💾 Saved to {store.path}")
     print(f"📝 Report generated\n")
     
     # Save report to file
@@ -266,10 +246,11 @@ if __name__ == "__main__":
                 print(f"  {alert['message']}")
     
     elif command == "report":
-        history = load_history()
-        if history.get('checks'):
-            latest = history['checks'][-1]
-            report = generate_report(latest['flights'], [], history)
+        store = get_store()
+        import_legacy_history(store)
+        flights = latest_flights(store)
+        if flights:
+            report = generate_report(flights, [], store)
             print(report)
         else:
             print("No flight data yet. Run: python3 scripts/flight_monitor.py check")
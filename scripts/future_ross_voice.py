@@ -9,36 +9,28 @@ Uses OpenAI TTS (Onyx voice - Ross's preference from jarvis_voice.py)
 """
 
 import json
-import urllib.request
 from pathlib import Path
 from datetime import datetime
 
+from local_llm import get_client
+
 WORKSPACE = Path.home() / "clawd"
 TIMELINES_FILE = WORKSPACE / "multiverse" / "timelines.json"
 VOICES_DIR = WORKSPACE / "multiverse" / "voices"
-OLLAMA_URL = "http://localhost:11434/api/generate"
 
 VOICES_DIR.mkdir(parents=True, exist_ok=True)
 
 def call_local_ai(prompt, temperature=0.8):
     """Generate message content with local AI"""
     try:
-        data = json.dumps({
-            "model": "qwen2.5:14b",
-            "prompt": prompt,
-            "temperature": temperature,
-            "stream": False
-        }).encode('utf-8')
-        
-        req = urllib.request.Request(
-            OLLAMA_URL,
-            data=data,
-            headers={'Content-Type': 'application/json'}
+        result = get_client().generate(
+            prompt,
+            model="qwen2.5:14b",
+            temperature=temperature,
+            caller="future_ross_voice",
+            timeout=90
         )
-        
-        with urllib.request.urlopen(req, timeout=90) as response:
-            result = json.loads(response.read().decode('utf-8'))
-            return result.get("response")
+        return result["response"]
     except Exception as e:
         print(f"AI error: {e}")
         return None
@@ -8,10 +8,11 @@ Topics: golf coaching, fitness, monetization journey, products
 import json
 import logging
 import random
-import subprocess
 from datetime import datetime
 from pathlib import Path
 
+from local_llm import LLMError, get_client
+
 # Configuration
 WORKSPACE = Path("/Users/clawdbot/clawd")
 QUEUE_FILE = WORKSPACE / "data" / "social-posts-queue.json"
@@ -73,23 +74,16 @@ def call_ollama(prompt: str, model: str = OLLAMA_MODEL) -> str:
     """Call local Ollama LLM and return generated text (optional)"""
     try:
         logger.info("Calling Ollama LLM...")
-        result = subprocess.run(
-            ["ollama", "run", model, prompt],
-            capture_output=True,
-            text=True,
-            timeout=180
+        result = get_client().generate(
+            prompt,
+            model=model,
+            caller="generate_social_posts",
+            timeout=180,
+            cache=False  # Every run should produce new posts
         )
-        
-        if result.returncode == 0:
-            return result.stdout.strip()
-        else:
-            logger.error(f"Ollama error: {result.stderr}")
-            return None
-    except subprocess.TimeoutExpired:
-        logger.error("Ollama request timed out after 180s")
-        return None
-    except Exception as e:
-        logger.error(f"Error calling Ollama: {e}")
+        return result["response"].strip()
+    except LLMError as e:
+        logger.error(f"Ollama error: {e}")
         return None
 
 def generate_post_from_template(theme: str) -> dict:
@@ -10,14 +10,14 @@ Takes raw behavioral data and uses qwen2.5:14b to:
 """
 
 import json
-import urllib.request
 from pathlib import Path
 from datetime import datetime
 
+from local_llm import get_client
+
 WORKSPACE = Path.home() / "clawd"
 DATA_FILE = WORKSPACE / "god_mode" / "behavioral_data.json"
 INSIGHTS_FILE = WORKSPACE / "god_mode" / "insights.json"
-OLLAMA_URL = "http://localhost:11434/api/generate"
 
 def load_behavioral_data():
     """Load mined behavioral data"""
@@ -30,22 +30,14 @@ def load_behavioral_data():
 def call_local_ai(prompt, temperature=0.3):
     """Call local AI for analysis"""
     try:
-        data = json.dumps({
-            "model": "qwen2.5:14b",
-            "prompt": prompt,
-            "temperature": temperature,
-            "stream": False
-        }).encode('utf-8')
-        
-        req = urllib.request.Request(
-            OLLAMA_URL,
-            data=data,
-            headers={'Content-Type': 'application/json'}
+        result = get_client().generate(
+            prompt,
+            model="qwen2.5:14b",
+            temperature=temperature,
+            caller="god_mode_analyzer",
+            timeout=180
         )
-        
-        with urllib.request.urlopen(req, timeout=180) as response:
-            result = json.loads(response.read().decode('utf-8'))
-            return result.get("response")
+        return result["response"]
             
     except Exception as e:
         print(f"AI error: {e}")
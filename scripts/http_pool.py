@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP Session Pool
+One pooled requests.Session per process, so scripts running inside the
+daemon host reuse TCP/TLS connections instead of opening a new one for
+every requests.get(). Standalone scripts get the same session API.
+
+Usage:
+    from http_pool import get_session
+    response = get_session().get(url, timeout=10)
+"""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+POOL_CONNECTIONS = 16     # Distinct hosts kept warm
+POOL_MAXSIZE = 8          # Concurrent connections per host
+RETRIES = Retry(total=2, backoff_factor=0.5, status_forcelist=(502, 503, 504),
+                allowed_methods=frozenset(['GET', 'HEAD']))
+
+_session = None
+_lock = threading.Lock()
+_stats = {'requests': 0, 'errors': 0}
+
+
+def _count(response, *args, **kwargs):
+    _stats['requests'] += 1
+    if response.status_code >= 400:
+        _stats['errors'] += 1
+
+
+def make_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=RETRIES)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.hooks['response'].append(_count)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Process-wide pooled session (thread-safe to share for plain requests)"""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = make_session()
+    return _session
+
+
+def stats() -> dict:
+    return dict(_stats)
@@ -12,6 +12,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 import logging
 
+from timeseries_store import get_store
+
 # Try to import scrapers (may not work due to anti-bot measures)
 SCRAPERS_AVAILABLE = False
 try:
@@ -136,46 +138,71 @@ def generate_search_urls():
     
     return searches
 
-def load_job_history():
-    """Load history of previously seen jobs"""
-    history_file = Path.home() / 'clawd' / 'data' / 'jobs_history.json'
-    
-    if not history_file.exists():
-        return {}
-    
-    try:
-        with open(history_file, 'r') as f:
-            return json.load(f)
-    except Exception as e:
-        logger.error(f"Error loading job history: {e}")
-        return {}
+# Seen jobs live in the shared time-series store: entity = job URL, ts = first seen, value = score
+HISTORY_SERIES = 'jobs'
+LEGACY_HISTORY_FILE = Path.home() / 'clawd' / 'data' / 'jobs_history.json'
 
-def save_job_history(history):
-    """Save job history"""
-    history_file = Path.home() / 'clawd' / 'data' / 'jobs_history.json'
-    history_file.parent.mkdir(exist_ok=True)
-    
+def import_legacy_job_history(store):
+    """Move the old jobs_history.json into the store (once)"""
+    if not LEGACY_HISTORY_FILE.exists():
+        return 0
     try:
-        with open(history_file, 'w') as f:
-            json.dump(history, f, indent=2)
+        with open(LEGACY_HISTORY_FILE, 'r') as f:
+            history = json.load(f)
     except Exception as e:
-        logger.error(f"Error saving job history: {e}")
-
-def clean_old_history(history, days=7):
-    """Remove jobs older than N days from history"""
-    cutoff = datetime.now() - timedelta(days=days)
-    cutoff_str = cutoff.isoformat()
+        logger.error(f"Error loading job history: {e}")
+        return 0
     
-    cleaned = {}
     for url, data in history.items():
-        if data.get('first_seen', '') >= cutoff_str:
-            cleaned[url] = data
-    
-    removed = len(history) - len(cleaned)
+        store.record(HISTORY_SERIES, url, data={'title': data.get('title'), 'company': data.get('company')},
+                     ts=data.get('first_seen'))
+    LEGACY_HISTORY_FILE.rename(LEGACY_HISTORY_FILE.with_name(LEGACY_HISTORY_FILE.name + '.imported'))
+    logger.info(f"Imported {len(history)} jobs from {LEGACY_HISTORY_FILE.name}")
+    return len(history)
+
+def clean_old_history(store, days=7):
+    """Forget jobs first seen more than N days ago"""
+    store.set_retention(HISTORY_SERIES, days)
+    removed = store.prune().get(HISTORY_SERIES, 0)
     if removed > 0:
         logger.info(f"Cleaned {removed} old jobs from history")
+    return removed
+
+def new_jobs(store, scraped_jobs, now=None):
+    """Score scraped jobs not seen before and record them as seen"""
+    seen = store.seen(HISTORY_SERIES, [job.get('url') for job in scraped_jobs if job.get('url')])
+    found_date = (now or datetime.now()).isoformat()
+    jobs = []
+    
+    for job in scraped_jobs:
+        url = job.get('url')
+        if not url or url in seen:
+            continue
+        
+        company = job.get('company', '')
+        if is_excluded_company(company):
+            logger.info(f"Excluding {company}: {job.get('title')}")
+            continue
+        
+        score = score_job(
+            job.get('title', ''),
+            company,
+            job.get('location', ''),
+            job.get('description', '')
+        )
+        
+        if score == 0:
+            continue
+        
+        job['score'] = score
+        job['found_date'] = found_date
+        job['status'] = 'new'
+        seen.add(url)
+        jobs.append(job)
     
-    return cleaned
+    store.record_many(HISTORY_SERIES, [(job['url'], job['score'], {'title': job.get('title'), 'company': job.get('company', '')})
+                                       for job in jobs], ts=now)
+    return jobs
 
 def is_excluded_company(company):
     """Check if company should be excluded"""
@@ -465,11 +492,13 @@ def main(test_mode=False):
     
     # Load job history
     logger.info("Loading job history...")
-    history = load_job_history()
-    logger.info(f"Loaded {len(history)} previously seen jobs")
+    store = get_store()
+    import_legacy_job_history(store)
     
     # Clean old history
-    history = clean_old_history(history, days=7)
+    clean_old_history(store, days=7)
+    seen_count = store.stats().get(HISTORY_SERIES, {}).get('entities', 0)
+    logger.info(f"Tracking {seen_count} previously seen jobs")
     
     # Generate all search URLs
     logger.info("Generating search URLs...")
@@ -487,42 +516,7 @@ def main(test_mode=False):
         logger.info(f"✅ Scraped {scraped_count} jobs successfully")
         
         # Score and deduplicate
-        jobs = []
-        now = datetime.now().isoformat()
-        
-        for job in scraped_jobs:
-            url = job.get('url')
-            if not url or url in history:
-                continue
-            
-            company = job.get('company', '')
-            if is_excluded_company(company):
-                logger.info(f"Excluding {company}: {job.get('title')}")
-                continue
-            
-            score = score_job(
-                job.get('title', ''),
-                company,
-                job.get('location', ''),
-                job.get('description', '')
-            )
-            
-            if score == 0:
-                continue
-            
-            job['score'] = score
-            job['found_date'] = now
-            job['status'] = 'new'
-            
-            history[url] = {
-                'first_seen': now,
-                'title': job.get('title'),
-                'company': company
-            }
-            
-            jobs.append(job)
-        
-        save_job_history(history)
+        jobs = new_jobs(store, scraped_jobs)
     else:
         logger.warning("⚠️  No jobs scraped (sites may be blocking bots)")
         logger.info("💡 Search URLs available for manual review")
@@ -12,6 +12,8 @@ import json
 from urllib.parse import urlencode
 import logging
 
+from http_pool import get_session
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -76,7 +78,7 @@ def scrape_linkedin_jobs(keywords, location, max_results=25, delay=2.0):
         time.sleep(delay + random.uniform(0, 1))
         
         # Make request with headers
-        response = requests.get(url, headers=get_random_headers(), timeout=15)
+        response = get_session().get(url, headers=get_random_headers(), timeout=15)
         response.raise_for_status()
         
         # Parse HTML
@@ -13,13 +13,12 @@ Only escalates to Sonnet when:
 """
 
 import json
-import urllib.request
-import urllib.error
 from pathlib import Path
 from datetime import datetime
 
+from local_llm import get_client
+
 WORKSPACE = Path.home() / "clawd"
-OLLAMA_URL = "http://localhost:11434/api/generate"
 
 # Model preference: qwen2.5:14b (smarter) > llama3.1:8b (faster)
 LOCAL_MODELS = ["qwen2.5:14b", "llama3.1:8b"]
@@ -27,22 +26,14 @@ LOCAL_MODELS = ["qwen2.5:14b", "llama3.1:8b"]
 def call_ollama(prompt, model="qwen2.5:14b", temperature=0.3):
     """Call local ollama model using standard library"""
     try:
-        data = json.dumps({
-            "model": model,
-            "prompt": prompt,
-            "temperature": temperature,
-            "stream": False
-        }).encode('utf-8')
-        
-        req = urllib.request.Request(
-            OLLAMA_URL,
-            data=data,
-            headers={'Content-Type': 'application/json'}
+        result = get_client().generate(
+            prompt,
+            model=model,
+            temperature=temperature,
+            caller="local_analyzer",
+            timeout=60
         )
-        
-        with urllib.request.urlopen(req, timeout=60) as response:
-            result = json.loads(response.read().decode('utf-8'))
-            return result.get("response")
+        return result["response"]
             
     except Exception as e:
         print(f"Ollama error: {e}", file=__import__('sys').stderr)
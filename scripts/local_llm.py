@@ -0,0 +1,589 @@
+#!/usr/bin/env python3
+"""
+Shared Local LLM Client - one way to talk to Ollama for every script and daemon
+
+- Keep-alive connection pool (one requests.Session per process)
+- Concurrency limit shared by every process on the machine (flock'd slot
+  files), so overlapping daemons queue instead of thrashing the model
+- Prompt-hash response cache on disk with TTL and size eviction, used by
+  default only for deterministic calls (temperature explicitly 0)
+- Token streaming and batched calls
+- Per-caller latency and token metrics, logged to logs/llm_calls.jsonl
+  (rotated past METRICS_LOG_MAX_BYTES)
+
+Usage:
+    from local_llm import get_client
+    text = get_client().generate("Summarize...", caller="my_script")["response"]
+
+    python3 local_llm.py ask "What's on my plate today?"
+    python3 local_llm.py stats --hours 24
+    python3 local_llm.py clear-cache
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-process limit only
+    fcntl = None
+
+WORKSPACE = Path.home() / "clawd"
+OLLAMA_BASE_URL = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
+DEFAULT_MODEL = "qwen2.5:14b"
+DEFAULT_TIMEOUT = 120              # seconds, read timeout and total wait for a slot
+CONNECT_TIMEOUT = 5
+MAX_CONCURRENT = int(os.environ.get("LOCAL_LLM_CONCURRENCY", "2"))
+
+CACHE_DIR = WORKSPACE / "cache" / "llm"
+SLOT_DIR = CACHE_DIR / "slots"
+CACHE_TTL = 24 * 3600              # seconds
+CACHE_MAX_ENTRIES = 2000
+PRUNE_EVERY = 50                   # cache writes between eviction passes
+METRICS_LOG = WORKSPACE / "logs" / "llm_calls.jsonl"
+METRICS_LOG_MAX_BYTES = 5 * 1024 * 1024
+METRICS_LOG_BACKUPS = 3            # llm_calls.jsonl.1 (newest) .. .3 (oldest)
+
+SLOT_POLL_SECONDS = 0.05
+
+
+class LLMError(RuntimeError):
+    """Local model call failed (server down, HTTP error, timeout or busy)"""
+
+
+class ResponseCache:
+    """
+    Prompt-hash -> Ollama response, one JSON file per entry
+
+    Entries older than ttl are misses (and removed); past max_entries the
+    oldest files are evicted.
+    """
+
+    def __init__(self, directory: Path = CACHE_DIR, ttl: float = CACHE_TTL,
+                 max_entries: int = CACHE_MAX_ENTRIES):
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    @staticmethod
+    def key(payload: Dict) -> str:
+        """Stable hash of everything that shapes the response"""
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict]:
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get("created", 0) > self.ttl:
+            path.unlink(missing_ok=True)
+            return None
+        return entry["response"]
+
+    def set(self, key: str, response: Dict):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, 'w') as f:
+            json.dump({"created": time.time(), "response": response}, f)
+        os.replace(tmp, path)
+
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % PRUNE_EVERY == 1
+        if prune:
+            self.prune()
+
+    def prune(self) -> int:
+        """Drop expired entries, then the oldest beyond max_entries; returns count removed"""
+        if not self.directory.exists():
+            return 0
+        now = time.time()
+        entries = []
+        removed = 0
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith('.json'):
+                continue
+            try:
+                mtime = entry.stat().st_mtime
+            except OSError:
+                continue
+            if now - mtime > self.ttl:
+                Path(entry.path).unlink(missing_ok=True)
+                removed += 1
+            else:
+                entries.append((mtime, entry.path))
+
+        excess = len(entries) - self.max_entries
+        if excess > 0:
+            for _, path in sorted(entries)[:excess]:
+                Path(path).unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def clear(self) -> int:
+        removed = 0
+        if self.directory.exists():
+            for path in self.directory.glob('*.json'):
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+
+class ProcessSlots:
+    """
+    Machine-wide concurrency limit: N lock files, a caller holds one flock'd
+    slot for the length of its request. Locks die with the process.
+    """
+
+    def __init__(self, directory: Path = SLOT_DIR, slots: int = MAX_CONCURRENT):
+        self.directory = Path(directory)
+        self.slots = slots
+
+    def acquire(self, timeout: float) -> int:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        deadline = time.monotonic() + timeout
+        while True:
+            for i in range(self.slots):
+                fd = os.open(self.directory / f"slot{i}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    return fd
+                except OSError:
+                    os.close(fd)
+            if time.monotonic() >= deadline:
+                raise LLMError(f"Local model busy: no free slot after {timeout:.0f}s")
+            time.sleep(SLOT_POLL_SECONDS)
+
+    @staticmethod
+    def release(fd: int):
+        try:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+
+class LocalLLMClient:
+    """
+    Pooled, rate-limited, caching client for the Ollama generate API
+
+    Args:
+        base_url: Ollama server
+        max_concurrent: Requests in flight across all processes using slot_dir
+        cache_dir: Response cache directory (None disables caching)
+        metrics_log: JSONL file every call is appended to (None disables)
+    """
+
+    def __init__(self, base_url: str = OLLAMA_BASE_URL, max_concurrent: int = MAX_CONCURRENT,
+                 timeout: float = DEFAULT_TIMEOUT, cache_dir: Optional[Path] = CACHE_DIR,
+                 cache_ttl: float = CACHE_TTL, cache_max_entries: int = CACHE_MAX_ENTRIES,
+                 slot_dir: Optional[Path] = SLOT_DIR, metrics_log: Optional[Path] = METRICS_LOG,
+                 default_model: str = DEFAULT_MODEL):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.default_model = default_model
+        self.max_concurrent = max_concurrent
+        self.cache = ResponseCache(cache_dir, cache_ttl, cache_max_entries) if cache_dir else None
+        self.metrics_log = Path(metrics_log) if metrics_log else None
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(max_concurrent, 4))
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._semaphore = threading.BoundedSemaphore(max_concurrent)
+        self._slots = ProcessSlots(slot_dir, max_concurrent) if slot_dir and fcntl else None
+        self._metrics: Dict[str, Dict] = {}
+        self._metrics_lock = threading.Lock()
+
+    # ---- requests ----------------------------------------------------------
+
+    def _payload(self, prompt: str, model: Optional[str], system: Optional[str],
+                 temperature: Optional[float], max_tokens: Optional[int],
+                 options: Optional[Dict], images: Optional[List[str]]) -> Dict:
+        options = dict(options or {})
+        if temperature is not None:
+            options['temperature'] = temperature
+        if max_tokens is not None:
+            options['num_predict'] = max_tokens
+        payload = {"model": model or self.default_model, "prompt": prompt}
+        if system:
+            payload["system"] = system
+        if options:
+            payload["options"] = options
+        if images:
+            payload["images"] = images
+        return payload
+
+    def _acquire(self, timeout: float):
+        """In-process then machine-wide slot, both within one timeout"""
+        deadline = time.monotonic() + timeout
+        if not self._semaphore.acquire(timeout=timeout):
+            raise LLMError(f"Local model busy: no free slot after {timeout:.0f}s")
+        try:
+            if not self._slots:
+                return None
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise LLMError(f"Local model busy: no free slot after {timeout:.0f}s")
+            return self._slots.acquire(remaining)
+        except Exception:
+            self._semaphore.release()
+            raise
+
+    def _cache_key(self, payload: Dict, cache: Optional[bool]) -> Optional[str]:
+        """
+        Cache key, or None when the call shouldn't be cached
+
+        cache=None caches only deterministic calls, i.e. temperature set to
+        0. Unset means Ollama's default (0.8), which samples like any other
+        temperature above 0 and is meant to give a different answer each time.
+        """
+        if cache is None:
+            cache = payload.get("options", {}).get("temperature") == 0
+        return ResponseCache.key(payload) if self.cache and cache else None
+
+    def _release(self, slot):
+        if slot is not None:
+            self._slots.release(slot)
+        self._semaphore.release()
+
+    def generate(self, prompt: str, model: Optional[str] = None, system: Optional[str] = None,
+                 temperature: Optional[float] = None, max_tokens: Optional[int] = None,
+                 options: Optional[Dict] = None, images: Optional[List[str]] = None,
+                 caller: str = "default", timeout: Optional[float] = None,
+                 cache: Optional[bool] = None) -> Dict:
+        """
+        One completion
+
+        cache: True/False forces caching on/off; None (default) caches only
+        when temperature is explicitly 0.
+
+        Returns the Ollama response dict ('response', 'prompt_eval_count',
+        'eval_count', ...) plus 'cached' and 'latency' (seconds, including
+        time queued for a slot). Raises LLMError on failure.
+        """
+        payload = self._payload(prompt, model, system, temperature, max_tokens, options, images)
+        key = self._cache_key(payload, cache)
+        started = time.monotonic()
+
+        if key:
+            hit = self.cache.get(key)
+            if hit is not None:
+                latency = time.monotonic() - started
+                self._record(caller, payload['model'], latency, hit, cached=True)
+                return {**hit, "cached": True, "latency": latency}
+
+        timeout = timeout or self.timeout
+        try:
+            slot = self._acquire(timeout)
+            try:
+                response = self.session.post(
+                    f"{self.base_url}/api/generate",
+                    json={**payload, "stream": False},
+                    timeout=(CONNECT_TIMEOUT, timeout)
+                )
+                response.raise_for_status()
+                result = response.json()
+            finally:
+                self._release(slot)
+        except LLMError as e:
+            self._record(caller, payload['model'], time.monotonic() - started, error=str(e))
+            raise
+        except (requests.RequestException, ValueError) as e:
+            self._record(caller, payload['model'], time.monotonic() - started, error=str(e))
+            raise LLMError(f"Local model call failed: {e}") from e
+
+        latency = time.monotonic() - started
+        self._record(caller, payload['model'], latency, result)
+        if key:
+            self.cache.set(key, result)
+        return {**result, "cached": False, "latency": latency}
+
+    def stream(self, prompt: str, model: Optional[str] = None, system: Optional[str] = None,
+               temperature: Optional[float] = None, max_tokens: Optional[int] = None,
+               options: Optional[Dict] = None, images: Optional[List[str]] = None,
+               caller: str = "default", timeout: Optional[float] = None,
+               cache: Optional[bool] = None) -> Iterator[str]:
+        """
+        Yield response text as the model produces it
+
+        A cache hit yields the whole response at once; a completed stream is
+        cached under the same rules as generate(). The slot is held until the stream is
+        exhausted or closed.
+        """
+        payload = self._payload(prompt, model, system, temperature, max_tokens, options, images)
+        key = self._cache_key(payload, cache)
+        started = time.monotonic()
+
+        if key:
+            hit = self.cache.get(key)
+            if hit is not None:
+                self._record(caller, payload['model'], time.monotonic() - started, hit, cached=True)
+                yield hit.get("response", "")
+                return
+
+        timeout = timeout or self.timeout
+        slot = self._acquire(timeout)
+        parts = []
+        final = None
+        try:
+            with self.session.post(
+                f"{self.base_url}/api/generate",
+                json={**payload, "stream": True},
+                timeout=(CONNECT_TIMEOUT, timeout),
+                stream=True
+            ) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("error"):
+                        raise LLMError(f"Local model error: {chunk['error']}")
+                    text = chunk.get("response", "")
+                    if text:
+                        parts.append(text)
+                        yield text
+                    if chunk.get("done"):
+                        final = chunk
+                        break
+        except (requests.RequestException, ValueError) as e:
+            self._record(caller, payload['model'], time.monotonic() - started, error=str(e))
+            raise LLMError(f"Local model stream failed: {e}") from e
+        except LLMError as e:
+            self._record(caller, payload['model'], time.monotonic() - started, error=str(e))
+            raise
+        finally:
+            self._release(slot)
+
+        if final is None:
+            return  # Closed early: nothing complete to record or cache
+        result = {**final, "response": "".join(parts)}
+        self._record(caller, payload['model'], time.monotonic() - started, result)
+        if key:
+            self.cache.set(key, result)
+
+    def batch(self, prompts: List[str], caller: str = "default", **kwargs) -> List[Optional[Dict]]:
+        """
+        generate() for many prompts, as many in flight as the concurrency
+        limit allows. Results keep prompt order; failed prompts are None.
+        """
+        def run(prompt):
+            try:
+                return self.generate(prompt, caller=caller, **kwargs)
+            except LLMError:
+                return None
+
+        if not prompts:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrent, len(prompts))) as pool:
+            return list(pool.map(run, prompts))
+
+    def models(self, timeout: float = 5) -> List[str]:
+        """Installed model names; raises LLMError if the server is down"""
+        try:
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=(CONNECT_TIMEOUT, timeout))
+            response.raise_for_status()
+            return [m.get("name", "") for m in response.json().get("models", [])]
+        except (requests.RequestException, ValueError) as e:
+            raise LLMError(f"Ollama not available: {e}") from e
+
+    def available(self) -> bool:
+        try:
+            self.models()
+            return True
+        except LLMError:
+            return False
+
+    # ---- metrics -----------------------------------------------------------
+
+    def _record(self, caller: str, model: str, latency: float, result: Optional[Dict] = None,
+                cached: bool = False, error: Optional[str] = None):
+        prompt_tokens = int((result or {}).get("prompt_eval_count") or 0)
+        completion_tokens = int((result or {}).get("eval_count") or 0)
+        with self._metrics_lock:
+            stats = self._metrics.setdefault(caller, {
+                "calls": 0, "cache_hits": 0, "errors": 0, "total_latency": 0.0,
+                "max_latency": 0.0, "prompt_tokens": 0, "completion_tokens": 0,
+                "eval_seconds": 0.0
+            })
+            stats["calls"] += 1
+            stats["total_latency"] += latency
+            stats["max_latency"] = max(stats["max_latency"], latency)
+            if error:
+                stats["errors"] += 1
+            elif cached:
+                stats["cache_hits"] += 1
+            else:
+                stats["prompt_tokens"] += prompt_tokens
+                stats["completion_tokens"] += completion_tokens
+                stats["eval_seconds"] += (result or {}).get("eval_duration", 0) / 1e9
+
+        if self.metrics_log:
+            entry = {
+                "timestamp": datetime.now().isoformat(),
+                "caller": caller,
+                "model": model,
+                "latency_ms": round(latency * 1000, 1),
+                "cached": cached,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+            }
+            if error:
+                entry["error"] = error
+            try:
+                self.metrics_log.parent.mkdir(parents=True, exist_ok=True)
+                _rotate_log(self.metrics_log)
+                with open(self.metrics_log, 'a') as f:
+                    f.write(json.dumps(entry) + "\n")
+            except OSError:
+                pass  # Metrics must never break a call
+
+    def metrics(self) -> Dict[str, Dict]:
+        """Per-caller stats for this process"""
+        with self._metrics_lock:
+            snapshot = {caller: dict(stats) for caller, stats in self._metrics.items()}
+        for stats in snapshot.values():
+            stats["avg_latency"] = round(stats["total_latency"] / stats["calls"], 3) if stats["calls"] else 0.0
+            stats["tokens_per_sec"] = (
+                round(stats["completion_tokens"] / stats["eval_seconds"], 1) if stats["eval_seconds"] else 0.0
+            )
+        return snapshot
+
+    def close(self):
+        self.session.close()
+
+
+def _rotate_log(path: Path):
+    """Shift path -> path.1 -> ... -> path.N (dropping the oldest) once it reaches METRICS_LOG_MAX_BYTES"""
+    try:
+        if path.stat().st_size < METRICS_LOG_MAX_BYTES:
+            return
+    except FileNotFoundError:
+        return
+    for i in range(METRICS_LOG_BACKUPS - 1, 0, -1):
+        older = path.with_name(f"{path.name}.{i}")
+        if older.exists():
+            os.replace(older, path.with_name(f"{path.name}.{i + 1}"))
+    os.replace(path, path.with_name(f"{path.name}.1"))
+
+
+def _log_files(path: Path) -> List[Path]:
+    """Rotated logs oldest first, then the live one"""
+    path = Path(path)
+    files = [path.with_name(f"{path.name}.{i}") for i in range(METRICS_LOG_BACKUPS, 0, -1)] + [path]
+    return [f for f in files if f.exists()]
+
+
+_client: Optional[LocalLLMClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> LocalLLMClient:
+    """Process-wide shared client"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = LocalLLMClient()
+        return _client
+
+
+def summarize_metrics_log(path: Path = METRICS_LOG, hours: Optional[float] = None) -> Dict[str, Dict]:
+    """Per-caller latency/token/cache stats from the JSONL call log (and its rotations)"""
+    cutoff = (datetime.now() - timedelta(hours=hours)).isoformat() if hours else None
+    summary: Dict[str, Dict] = {}
+    latencies: Dict[str, List[float]] = {}
+    for log_file in _log_files(path):
+        with open(log_file) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if cutoff and entry.get("timestamp", "") < cutoff:
+                    continue
+                caller = entry.get("caller", "default")
+                stats = summary.setdefault(caller, {
+                    "calls": 0, "cache_hits": 0, "errors": 0, "prompt_tokens": 0, "completion_tokens": 0
+                })
+                stats["calls"] += 1
+                stats["cache_hits"] += bool(entry.get("cached"))
+                stats["errors"] += "error" in entry
+                stats["prompt_tokens"] += entry.get("prompt_tokens", 0)
+                stats["completion_tokens"] += entry.get("completion_tokens", 0)
+                latencies.setdefault(caller, []).append(entry.get("latency_ms", 0))
+
+    for caller, values in latencies.items():
+        values.sort()
+        summary[caller]["avg_latency_ms"] = round(sum(values) / len(values), 1)
+        summary[caller]["p95_latency_ms"] = values[min(len(values) - 1, int(len(values) * 0.95))]
+    return summary
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Shared local LLM client")
+    sub = parser.add_subparsers(dest="command")
+
+    ask = sub.add_parser("ask", help="Stream a completion to stdout")
+    ask.add_argument("prompt")
+    ask.add_argument("--model", default=DEFAULT_MODEL)
+    ask.add_argument("--no-cache", action="store_true")
+
+    stats = sub.add_parser("stats", help="Per-caller latency and token usage")
+    stats.add_argument("--hours", type=float, default=None)
+
+    sub.add_parser("clear-cache", help="Delete cached responses")
+    args = parser.parse_args()
+
+    if args.command == "ask":
+        try:
+            for text in get_client().stream(args.prompt, model=args.model, caller="cli",
+                                            cache=False if args.no_cache else None):
+                print(text, end="", flush=True)
+            print()
+        except LLMError as e:
+            print(f"❌ {e}")
+            raise SystemExit(1)
+
+    elif args.command == "stats":
+        summary = summarize_metrics_log(hours=args.hours)
+        if not summary:
+            print("📊 No local LLM calls logged yet")
+            return
+        print(f"📊 Local LLM usage{f' (last {args.hours:g}h)' if args.hours else ''}\n")
+        print(f"{'Caller':<28}{'Calls':>7}{'Cached':>8}{'Errors':>8}{'Avg ms':>10}{'p95 ms':>10}{'Tokens in/out':>18}")
+        for caller, s in sorted(summary.items(), key=lambda item: -item[1]["calls"]):
+            tokens = f"{s['prompt_tokens']}/{s['completion_tokens']}"
+            print(f"{caller:<28}{s['calls']:>7}{s['cache_hits']:>8}{s['errors']:>8}"
+                  f"{s['avg_latency_ms']:>10}{s['p95_latency_ms']:>10}{tokens:>18}")
+
+    elif args.command == "clear-cache":
+        removed = ResponseCache().clear()
+        print(f"🗑️  Removed {removed} cached responses")
+
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
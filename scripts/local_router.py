@@ -6,10 +6,11 @@ Routes tasks to appropriate model based on complexity to reduce costs by 70%+
 
 import json
 import os
-import requests
 from datetime import datetime
 from typing import Dict, Any, Optional, Literal
 
+from local_llm import LLMError, get_client
+
 # Model endpoints and costs (per 1M tokens)
 MODELS = {
     "ollama": {
@@ -159,39 +160,27 @@ class LocalRouter:
         }
     
     def call_ollama(self, prompt: str, model: str = "qwen2.5:14b", max_tokens: int = 2000) -> Dict[str, Any]:
-        """Call Ollama API"""
+        """Call Ollama API through the shared local LLM client"""
         try:
-            response = requests.post(
-                "http://localhost:11434/api/generate",
-                json={
-                    "model": model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "num_predict": max_tokens,
-                        "temperature": 0.7
-                    }
-                },
+            result = get_client().generate(
+                prompt,
+                model=model,
+                temperature=0.7,
+                max_tokens=max_tokens,
+                caller="local_router",
                 timeout=60
             )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return {
-                    "success": True,
-                    "response": result.get("response", ""),
-                    "tokens": {
-                        "prompt": result.get("prompt_eval_count", 0),
-                        "completion": result.get("eval_count", 0)
-                    },
-                    "latency": result.get("total_duration", 0) / 1e9  # nanoseconds to seconds
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": f"HTTP {response.status_code}: {response.text}"
-                }
-        except Exception as e:
+            return {
+                "success": True,
+                "response": result.get("response", ""),
+                "tokens": {
+                    "prompt": result.get("prompt_eval_count", 0),
+                    "completion": result.get("eval_count", 0)
+                },
+                "latency": result["latency"],
+                "cached": result["cached"]
+            }
+        except LLMError as e:
             return {
                 "success": False,
                 "error": str(e)
@@ -129,9 +129,11 @@ def get_weather_conditions():
         
         # Get primary location (Nolensville, TN)
         primary = None
+        primary_id = None
         for loc_key, loc_data in locations.items():
             if loc_data.get("primary", False):
                 primary = loc_data
+                primary_id = loc_key
                 break
         
         if not primary:
@@ -146,10 +148,22 @@ def get_weather_conditions():
             best = max(activities, key=lambda x: x.get("score", 0))
             best_activity = f"{best['activity']}: {best['verdict']} ({best['score']}/100)"
         
+        # Hourly forecast cached by the weather daemon: when is rain likely today?
+        rain_hours = []
+        try:
+            sys.path.insert(0, str(Path(__file__).parent))
+            from weather_cache import HourlyForecast
+            forecast = HourlyForecast.load(DATA_DIR / "weather_hourly.npz")
+            if forecast and primary_id in forecast.location_ids:
+                rain_hours = forecast.rain_hours(primary_id, datetime.now().date())
+        except Exception as e:
+            log(f"⚠️ Hourly forecast unavailable: {e}")
+        
         return {
             "temp": current.get("temperature", 0),
             "conditions": current.get("conditions", "Unknown"),
-            "best_activity": best_activity or "No activity scores available"
+            "best_activity": best_activity or "No activity scores available",
+            "rain_hours": rain_hours
         }
     
     except Exception as e:
@@ -213,6 +227,8 @@ def generate_brief():
     if weather:
         q1_items.append(f"☀️ Weather: {weather['temp']}°F, {weather['conditions']}")
         q1_items.append(f"🏃 {weather['best_activity']}")
+        if weather['rain_hours']:
+            q1_items.append(f"🌧️ Rain likely {weather['rain_hours'][0]}-{weather['rain_hours'][-1]}")
     
     brief["questions"].append({
         "question": "What's most important today?",
@@ -184,14 +184,11 @@ def get_jobs():
 def get_flight_prices():
     """Get latest flight prices for NFL Draft"""
     try:
-        flight_data = load_json_safe(DATA_DIR / "flight_prices.json", {"checks": []})
+        sys.path.insert(0, str(Path(__file__).parent))
+        from timeseries_store import get_store
         
-        if not flight_data.get("checks"):
-            return None
-        
-        # Get latest check
-        latest_check = flight_data["checks"][-1]
-        flights = latest_check.get("flights", [])
+        # Latest price per date combination, recorded by flight_monitor
+        flights = [obs.data for obs in get_store().latest_all("flights").values()]
         
         if not flights:
             return None
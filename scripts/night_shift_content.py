@@ -5,10 +5,11 @@ Generates tweets, Reddit posts, LinkedIn content using local model
 """
 
 import json
-import subprocess
 from datetime import datetime
 from pathlib import Path
 
+from local_llm import get_client
+
 WORKSPACE = Path("/Users/clawdbot/clawd")
 OUTPUT_DIR = WORKSPACE / "content" / "night-shift"
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -16,13 +17,14 @@ OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 def generate_with_ollama(prompt, model="qwen2.5:14b"):
     """Generate content using local Ollama model"""
     try:
-        result = subprocess.run(
-            ["ollama", "run", model, prompt],
-            capture_output=True,
-            text=True,
-            timeout=300
+        result = get_client().generate(
+            prompt,
+            model=model,
+            caller="night_shift_content",
+            timeout=300,
+            cache=False  # Fresh ideas every night
         )
-        return result.stdout.strip()
+        return result["response"].strip()
     except Exception as e:
         return f"Error: {str(e)}"
 
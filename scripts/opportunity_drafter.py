@@ -7,17 +7,15 @@ Learns from Ross's feedback to improve over time.
 """
 
 import json
-import urllib.request
-import urllib.error
 from pathlib import Path
 from datetime import datetime
 import sys
 
 sys.path.insert(0, str(Path.home() / "clawd" / "scripts"))
 from opportunity_scanner import OpportunityQueue
+from local_llm import get_client
 
 WORKSPACE = Path.home() / "clawd"
-OLLAMA_URL = "http://localhost:11434/api/generate"
 LEARNING_FILE = WORKSPACE / "memory" / "drafting_feedback.json"
 
 # Ross's profile for context injection
@@ -44,22 +42,14 @@ Style: Professional but conversational. Direct, helpful, shows expertise without
 def call_local_model(prompt, temperature=0.7):
     """Call local ollama model"""
     try:
-        data = json.dumps({
-            "model": "qwen2.5:14b",
-            "prompt": prompt,
-            "temperature": temperature,
-            "stream": False
-        }).encode('utf-8')
-        
-        req = urllib.request.Request(
-            OLLAMA_URL,
-            data=data,
-            headers={'Content-Type': 'application/json'}
+        result = get_client().generate(
+            prompt,
+            model="qwen2.5:14b",
+            temperature=temperature,
+            caller="opportunity_drafter",
+            timeout=120
         )
-        
-        with urllib.request.urlopen(req, timeout=120) as response:
-            result = json.loads(response.read().decode('utf-8'))
-            return result.get("response")
+        return result["response"]
             
     except Exception as e:
         print(f"Local model error: {e}", file=sys.stderr)
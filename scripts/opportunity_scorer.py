@@ -69,12 +69,13 @@ class OpportunityScorer:
         
         return indexed
     
-    def score_opportunity(self, opportunity: Dict) -> Dict:
+    def score_opportunity(self, opportunity: Dict, prediction: Optional[Dict] = None) -> Dict:
         """
         Score an opportunity using historical data
         
         Args:
             opportunity: Opportunity dict with type, source, content, etc.
+            prediction: Precomputed decision log prediction (batch scoring)
         
         Returns:
             Enhanced opportunity dict with:
@@ -95,7 +96,8 @@ class OpportunityScorer:
         roi_data = self.roi_data.get(key)
         
         # Get prediction from decision log
-        prediction = self.decision_log.predict_outcome(opportunity)
+        if prediction is None:
+            prediction = self.decision_log.predict_outcome(opportunity)
         
         # Calculate adjusted score
         adjusted_score = self._calculate_adjusted_score(
@@ -241,9 +243,12 @@ class OpportunityScorer:
         
         logger.info(f"Scoring {len(opportunities)} opportunities...")
         
+        # One grouped history query for the whole batch
+        predictions = self.decision_log.predict_outcomes(opportunities)
+        
         scored = []
-        for opp in opportunities:
-            enhanced = self.score_opportunity(opp)
+        for opp, prediction in zip(opportunities, predictions):
+            enhanced = self.score_opportunity(opp, prediction)
             scored.append(enhanced)
         
         # Sort by adjusted score (descending)
@@ -12,14 +12,17 @@ Features:
 - Full social scheduler integration
 """
 
+import base64
 import json
-import subprocess
 import sys
 import os
 import time
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+
+from local_llm import get_client
 
 # Paths
 BASE_DIR = Path("/Users/clawdbot/clawd")
@@ -114,18 +117,16 @@ class CaptionOptimizer:
         prompt = "Describe this image in 2-3 sentences. Focus on: subject, mood, key visual elements, and what story it tells. Be specific and concrete."
         
         try:
-            result = subprocess.run(
-                ["ollama", "run", IMAGE_MODEL, prompt],
-                input=f"Analyzing image: {image_path}",
-                capture_output=True,
-                text=True,
+            with open(image_path, 'rb') as f:
+                image = base64.b64encode(f.read()).decode('ascii')
+            result = get_client().generate(
+                prompt,
+                model=IMAGE_MODEL,
+                images=[image],
+                caller="optimize_caption",
                 timeout=10
             )
-            
-            if result.returncode == 0:
-                return result.stdout.strip()
-            else:
-                return ""
+            return result["response"].strip()
         except Exception as e:
             print(f"Image analysis failed: {e}", file=sys.stderr)
             return ""
@@ -149,27 +150,22 @@ Use 2-3 line breaks.
 Caption:"""
         
         try:
-            # Use ollama directly for speed
-            result = subprocess.run(
-                ["ollama", "run", TEXT_MODEL, prompt],
-                capture_output=True,
-                text=True,
-                timeout=20  # Increased for model loading
+            result = get_client().generate(
+                prompt,
+                model=TEXT_MODEL,
+                caller="optimize_caption",
+                timeout=20,  # Increased for model loading
+                cache=False  # Re-running should give fresh variations
             )
-            
-            if result.returncode == 0:
-                caption = result.stdout.strip()
-                # Clean up any meta-commentary
-                if "Here's" in caption[:20] or "Here is" in caption[:20]:
-                    lines = caption.split('\n')
-                    caption = '\n'.join(lines[1:]) if len(lines) > 1 else caption
-                return caption
-            else:
+            caption = result["response"].strip()
+            if not caption:
                 return self._fallback_caption(context, tone)
+            # Clean up any meta-commentary
+            if "Here's" in caption[:20] or "Here is" in caption[:20]:
+                lines = caption.split('\n')
+                caption = '\n'.join(lines[1:]) if len(lines) > 1 else caption
+            return caption
         
-        except subprocess.TimeoutExpired:
-            print(f"Timeout generating {tone} caption, using fallback", file=sys.stderr)
-            return self._fallback_caption(context, tone)
         except Exception as e:
             print(f"Error generating {tone} caption: {e}", file=sys.stderr)
             return self._fallback_caption(context, tone)
@@ -221,9 +217,12 @@ Caption:"""
         
         print(f"✍️  Generating {len(tones_to_use)} variations...", file=sys.stderr)
         
-        for tone in tones_to_use:
+        # All tones in flight at once; the shared client caps model concurrency
+        with ThreadPoolExecutor(max_workers=len(tones_to_use)) as pool:
+            captions = pool.map(lambda tone: self.generate_caption(full_context, tone, best_practices), tones_to_use)
+        
+        for tone, caption in zip(tones_to_use, captions):
             print(f"  - {tone}...", file=sys.stderr)
-            caption = self.generate_caption(full_context, tone, best_practices)
             variations[tone] = {
                 "text": caption,
                 "tone": tone,
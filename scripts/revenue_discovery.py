@@ -7,13 +7,13 @@ Not generic advice - specific to what Ross has built and can do.
 """
 
 import json
-import urllib.request
 from pathlib import Path
 from datetime import datetime
 
+from local_llm import get_client
+
 WORKSPACE = Path.home() / "clawd"
 OUTPUT_FILE = WORKSPACE / "revenue" / "opportunities.json"
-OLLAMA_URL = "http://localhost:11434/api/generate"
 
 OUTPUT_FILE.parent.mkdir(exist_ok=True)
 
@@ -65,22 +65,14 @@ ROSS_INVENTORY = {
 def call_local_ai(prompt, temperature=0.4):
     """Call local AI for analysis"""
     try:
-        data = json.dumps({
-            "model": "qwen2.5:14b",
-            "prompt": prompt,
-            "temperature": temperature,
-            "stream": False
-        }).encode('utf-8')
-        
-        req = urllib.request.Request(
-            OLLAMA_URL,
-            data=data,
-            headers={'Content-Type': 'application/json'}
+        result = get_client().generate(
+            prompt,
+            model="qwen2.5:14b",
+            temperature=temperature,
+            caller="revenue_discovery",
+            timeout=180
         )
-        
-        with urllib.request.urlopen(req, timeout=180) as response:
-            result = json.loads(response.read().decode('utf-8'))
-            return result.get("response")
+        return result["response"]
             
     except Exception as e:
         print(f"AI error: {e}")
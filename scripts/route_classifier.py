@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Route Classifier - Learned fast path for the smart escalation engine
+
+Scoring a query with the local LLM is a full model round-trip before the
+engine has decided anything. Most messages are obviously simple ("what time
+is it?") or obviously not ("design a distributed system"), and escalation.log
+already holds the scorer's verdict for thousands of them. This learns those
+verdicts:
+
+- Hashed word unigram + bigram features (signed, sublinear tf, L2-normalized)
+  plus a query-length bucket
+- Logistic regression fit with batch gradient descent in NumPy
+- p(cloud) for a new query is a few dozen weight lookups - microseconds
+
+The engine only trusts a prediction outside the uncertain band
+(LOCAL_BELOW..CLOUD_ABOVE), and only once the held-out split shows the
+confident predictions agree with the scorer at least MIN_AGREEMENT of the
+time. Everything else is still scored by the LLM.
+
+Training data: the scorer verdict of every LLM-scored decision in
+escalation.log, plus the shadow checks the engine runs on a sample of
+fast-path decisions (escalation_shadow.log).
+
+Usage:
+    python route_classifier.py train     # Retrain from the logs
+    python route_classifier.py stats     # Per-path latency and agreement
+    python route_classifier.py "query"   # p(cloud) for one query
+"""
+
+import json
+import math
+import re
+import sys
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+WORKSPACE = Path.home() / "clawd"
+ESCALATION_LOG = WORKSPACE / "memory" / "escalation.log"
+SHADOW_LOG = WORKSPACE / "memory" / "escalation_shadow.log"
+CLASSIFIER_PATH = WORKSPACE / "memory" / "escalation_router.npz"
+
+DIM = 2048                     # Hashed feature buckets
+TOKEN_RE = re.compile(r"[a-z0-9$][a-z0-9$'.]*")
+
+# Decision band: p(cloud) below LOCAL_BELOW or above CLOUD_ABOVE skips the scorer
+LOCAL_BELOW = 0.10
+CLOUD_ABOVE = 0.90
+
+# Training
+EPOCHS = 400
+LEARNING_RATE = 2.0
+L2 = 1e-4
+MAX_EXAMPLES = 5000            # Most recent distinct queries (keeps the dense matrix ~40MB)
+HOLDOUT_EVERY = 5              # 1 in 5 queries (by hash) held out for validation
+
+# Fast path is enabled only with enough data and a good held-out record
+MIN_EXAMPLES = 200
+MIN_PER_CLASS = 20
+MIN_AGREEMENT = 0.95           # Confident held-out predictions matching the scorer
+
+
+def _features(text: str) -> Dict[int, float]:
+    """Signed hashed unigram + bigram + length-bucket features, L2-normalized"""
+    tokens = [t.strip(".'") for t in TOKEN_RE.findall(text.lower())]
+    tokens = [t for t in tokens if t]
+    grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    grams.append(f"__len{len(tokens).bit_length()}")
+
+    counts: Dict[int, float] = {}
+    for gram in grams:
+        h = zlib.crc32(gram.encode())
+        bucket = h % DIM
+        sign = 1.0 if (h >> 31) & 1 else -1.0
+        counts[bucket] = counts.get(bucket, 0.0) + sign
+
+    weights = {b: math.copysign(1.0 + math.log(abs(c)), c) for b, c in counts.items() if c}
+    norm = math.sqrt(sum(v * v for v in weights.values()))
+    return {b: v / norm for b, v in weights.items()} if norm else {}
+
+
+def _matrix(texts: List[str]) -> np.ndarray:
+    X = np.zeros((len(texts), DIM), dtype=np.float32)
+    for i, text in enumerate(texts):
+        for bucket, value in _features(text).items():
+            X[i, bucket] = value
+    return X
+
+
+def _sigmoid(z):
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -30, 30)))
+
+
+def _query_text(query: str) -> str:
+    """Logged queries are cut at 100 chars with '...' appended"""
+    return query[:-3] if len(query) == 103 and query.endswith("...") else query
+
+
+class RouteClassifier:
+    """
+    Logistic regression over hashed query features -> p(route is cloud)
+
+    Args:
+        weights: DIM feature weights
+        bias: Intercept
+        meta: Training summary (examples, held-out agreement, ready, ...)
+    """
+
+    def __init__(self, weights: Optional[np.ndarray] = None, bias: float = 0.0, meta: Optional[Dict] = None):
+        self.weights = np.zeros(DIM, dtype=np.float32) if weights is None else weights.astype(np.float32)
+        self.bias = float(bias)
+        self.meta = meta or {}
+        self._w = self.weights.tolist()    # Plain floats: faster than indexing numpy one bucket at a time
+
+    @property
+    def ready(self) -> bool:
+        """Trained on enough data, with a good enough held-out record, to skip the scorer"""
+        return bool(self.meta.get("ready"))
+
+    def predict_proba(self, query: str) -> float:
+        """p(cloud) for one query"""
+        w = self._w
+        z = self.bias + sum(w[bucket] * value for bucket, value in _features(query).items())
+        return 1.0 / (1.0 + math.exp(-max(-30.0, min(30.0, z))))
+
+    @staticmethod
+    def path_for(p_cloud: float) -> str:
+        """'fast_local', 'fast_cloud', or 'scored' (uncertain band: ask the LLM)"""
+        if p_cloud < LOCAL_BELOW:
+            return "fast_local"
+        if p_cloud > CLOUD_ABOVE:
+            return "fast_cloud"
+        return "scored"
+
+    def fit(self, texts: List[str], labels: List[int], epochs: int = EPOCHS,
+            learning_rate: float = LEARNING_RATE, l2: float = L2) -> "RouteClassifier":
+        """Batch gradient descent on the log loss (labels: 1 = cloud, 0 = local)"""
+        X = _matrix(texts)
+        y = np.asarray(labels, dtype=np.float32)
+        n = len(y)
+        prior = min(max(float(y.mean()), 0.01), 0.99)
+        w = np.zeros(DIM, dtype=np.float32)
+        b = math.log(prior / (1 - prior))
+        for _ in range(epochs):
+            error = (_sigmoid(X @ w + b) - y) / n
+            w -= learning_rate * (X.T @ error + l2 * w)
+            b -= learning_rate * float(error.sum())
+        self.weights, self.bias, self._w = w, b, w.tolist()
+        return self
+
+    @classmethod
+    def load(cls, path: Path = CLASSIFIER_PATH) -> Optional["RouteClassifier"]:
+        try:
+            with np.load(path) as data:
+                return cls(data["weights"], float(data["bias"]), json.loads(str(data["meta"])))
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def save(self, path: Path = CLASSIFIER_PATH):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.stem + ".tmp.npz")
+        np.savez(tmp, weights=self.weights, bias=np.float64(self.bias), meta=np.array(json.dumps(self.meta)))
+        tmp.replace(path)
+
+
+# ----------------------------------------------------------------------
+# Training data
+# ----------------------------------------------------------------------
+
+def _read_jsonl(path: Path) -> List[Dict]:
+    entries = []
+    try:
+        with open(path) as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    except OSError:
+        pass
+    return entries
+
+
+def scored_route(entry: Dict) -> Optional[str]:
+    """The LLM scorer's verdict for a logged decision (None if it was never scored)"""
+    if "path" in entry:
+        return entry.get("scored_route")
+    # Logged before the fast path existed: every decision was scored
+    if entry.get("reason") == "Local model requested escalation":
+        return "local"
+    return entry.get("route")
+
+
+def load_examples(log_file: Path = ESCALATION_LOG, shadow_log: Path = SHADOW_LOG) -> Tuple[List[str], List[int]]:
+    """(queries, labels) from scorer verdicts, latest verdict per distinct query, newest last"""
+    verdicts: Dict[str, int] = {}
+    entries = _read_jsonl(log_file) + _read_jsonl(shadow_log)
+    entries.sort(key=lambda e: e.get("timestamp", ""))
+    for entry in entries:
+        route = scored_route(entry)
+        query = entry.get("query")
+        if route in ("local", "cloud") and query:
+            text = _query_text(query)
+            verdicts.pop(text, None)   # Re-insert so dict order tracks the latest verdict
+            verdicts[text] = 1 if route == "cloud" else 0
+    items = list(verdicts.items())[-MAX_EXAMPLES:]
+    return [q for q, _ in items], [label for _, label in items]
+
+
+def _held_out(query: str) -> bool:
+    return zlib.crc32(query.encode()) % HOLDOUT_EVERY == 0
+
+
+def evaluate(classifier: RouteClassifier, texts: List[str], labels: List[int]) -> Dict:
+    """Agreement with the scorer: overall, and for the predictions confident enough to skip it"""
+    if not texts:
+        return {"examples": 0, "agreement": None, "confident": 0, "confident_agreement": None}
+    probs = np.array([classifier.predict_proba(t) for t in texts])
+    y = np.asarray(labels)
+    agree = (probs >= 0.5) == (y == 1)
+    confident = (probs < LOCAL_BELOW) | (probs > CLOUD_ABOVE)
+    return {
+        "examples": len(texts),
+        "agreement": round(float(agree.mean()), 4),
+        "confident": int(confident.sum()),
+        "coverage": round(float(confident.mean()), 4),
+        "confident_agreement": round(float(agree[confident].mean()), 4) if confident.any() else None,
+    }
+
+
+def train(texts: List[str], labels: List[int]) -> RouteClassifier:
+    """Fit on the training split, validate on the held-out split, then refit on everything"""
+    held = [_held_out(t) for t in texts]
+    train_x = [t for t, h in zip(texts, held) if not h]
+    train_y = [label for label, h in zip(labels, held) if not h]
+    test_x = [t for t, h in zip(texts, held) if h]
+    test_y = [label for label, h in zip(labels, held) if h]
+
+    holdout = evaluate(RouteClassifier().fit(train_x, train_y), test_x, test_y)
+    classifier = RouteClassifier().fit(texts, labels)
+
+    cloud = sum(labels)
+    enough = len(texts) >= MIN_EXAMPLES and min(cloud, len(labels) - cloud) >= MIN_PER_CLASS
+    trusted = holdout["confident_agreement"] is not None and holdout["confident_agreement"] >= MIN_AGREEMENT
+
+    sample = texts[-200:]
+    started = time.perf_counter()
+    for text in sample:
+        classifier.predict_proba(text)
+    predict_us = (time.perf_counter() - started) / max(len(sample), 1) * 1e6
+
+    classifier.meta = {
+        "trained_at": datetime.now().isoformat(timespec="seconds"),
+        "examples": len(texts),
+        "cloud_fraction": round(cloud / len(labels), 4) if labels else None,
+        "holdout": holdout,
+        "predict_us": round(predict_us, 1),
+        "ready": bool(enough and trusted),
+    }
+    return classifier
+
+
+def train_from_log(log_file: Path = ESCALATION_LOG, shadow_log: Path = SHADOW_LOG,
+                   path: Path = CLASSIFIER_PATH) -> Optional[RouteClassifier]:
+    """Retrain from the decision logs and save (None if there are no scored decisions yet)"""
+    texts, labels = load_examples(log_file, shadow_log)
+    if not texts:
+        return None
+    classifier = train(texts, labels)
+    classifier.save(path)
+    return classifier
+
+
+# ----------------------------------------------------------------------
+# Reporting
+# ----------------------------------------------------------------------
+
+def routing_stats(log_file: Path = ESCALATION_LOG, shadow_log: Path = SHADOW_LOG) -> Dict:
+    """
+    Per-path end-to-end latency, and classifier agreement with the LLM scorer:
+    'uncertain' on queries it passed to the scorer, 'confident' on the shadow
+    checks of queries it settled itself
+    """
+    latencies: Dict[str, List[int]] = {}
+    uncertain = []
+    for entry in _read_jsonl(log_file):
+        path = entry.get("path", "scored")
+        ms = entry.get("total_ms", entry.get("response_time_ms"))
+        if ms is not None:
+            latencies.setdefault(path, []).append(ms)
+        if entry.get("p_cloud") is not None and entry.get("scored_route"):
+            uncertain.append((entry["p_cloud"] >= 0.5) == (entry["scored_route"] == "cloud"))
+
+    confident = [(e["p_cloud"] >= 0.5) == (e["scored_route"] == "cloud")
+                 for e in _read_jsonl(shadow_log) if e.get("p_cloud") is not None and e.get("scored_route")]
+
+    def rate(matches):
+        return {"checked": len(matches), "agreement": round(sum(matches) / len(matches), 4) if matches else None}
+
+    total = sum(len(v) for v in latencies.values())
+    return {
+        "paths": {
+            path: {
+                "count": len(values),
+                "share": round(len(values) / total, 4),
+                "avg_ms": round(float(np.mean(values)), 1),
+                "p50_ms": round(float(np.percentile(values, 50)), 1),
+                "p95_ms": round(float(np.percentile(values, 95)), 1),
+            }
+            for path, values in sorted(latencies.items())
+        },
+        "agreement": {"confident": rate(confident), "uncertain": rate(uncertain)},
+    }
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+
+    if command == "train":
+        classifier = train_from_log()
+        if classifier is None:
+            print(f"❌ No scored decisions in {ESCALATION_LOG}")
+            return 1
+        meta, holdout = classifier.meta, classifier.meta["holdout"]
+        print(f"🧠 Trained on {meta['examples']} queries ({meta['cloud_fraction']:.0%} cloud)")
+        print(f"   Held out: {holdout['examples']} queries, {holdout['agreement']} agreement, "
+              f"{holdout.get('coverage', 0):.0%} confident at {holdout['confident_agreement']}")
+        print(f"   Predict: {meta['predict_us']} µs/query")
+        print(f"   Fast path: {'✅ enabled' if classifier.ready else '⏸️  disabled (not enough data or agreement)'}")
+        return 0
+
+    if command == "stats":
+        classifier = RouteClassifier.load()
+        if classifier:
+            meta = classifier.meta
+            print(f"🧠 Model: {meta['examples']} queries, trained {meta['trained_at']}, "
+                  f"fast path {'on' if classifier.ready else 'off'}")
+        else:
+            print("🧠 Model: not trained (python route_classifier.py train)")
+        stats = routing_stats()
+        print("\n⏱️  Latency by path")
+        for path, info in stats["paths"].items():
+            print(f"   {path:<11} {info['count']:>6} ({info['share']:.0%})  avg {info['avg_ms']:>7.0f}ms  "
+                  f"p50 {info['p50_ms']:>7.0f}ms  p95 {info['p95_ms']:>7.0f}ms")
+        print("\n🤝 Agreement with the LLM scorer")
+        for band, info in stats["agreement"].items():
+            value = f"{info['agreement']:.1%}" if info["agreement"] is not None else "n/a"
+            print(f"   {band:<10} {value:>6}  ({info['checked']} checked)")
+        return 0
+
+    classifier = RouteClassifier.load()
+    if classifier is None:
+        print("❌ Model not trained (python route_classifier.py train)")
+        return 1
+    p_cloud = classifier.predict_proba(" ".join(sys.argv[1:]))
+    print(f"p(cloud) = {p_cloud:.3f} -> {RouteClassifier.path_for(p_cloud)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,15 +7,123 @@ Prevent accidental exposure of secrets
 
 import re
 import os
+import json
+import bisect
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+    from re import _constants as sre_constants
+except ImportError:
+    import sre_parse
+    import sre_constants
+
 WORKSPACE = Path.home() / "clawd"
+# Kept outside the workspace so it is never scanned or committed
+CACHE_FILE = Path.home() / ".cache" / "clawd" / "security_scan_cache.json"
+SKIP_FILES = {'security_scanner.py', 'security_audit.py', 'security_scan_cache.json'}
+
+# Files per worker task when scanning a directory in the process pool
+SCAN_CHUNK_SIZE = 32
+# Below this many files to read, a process pool costs more than it saves
+PARALLEL_MIN_FILES = 64
+
+# Lowercases ASCII plus the four non-ASCII characters that re.IGNORECASE
+# treats as equal to an ASCII letter. 1:1 per character, so offsets in the
+# folded text line up with the original.
+_FOLD = str.maketrans({
+    **{chr(c): chr(c + 32) for c in range(ord('A'), ord('Z') + 1)},
+    '\u0130': 'i', '\u0131': 'i', '\u017f': 's', '\u212a': 'k',
+})
+
+_SPANNING_CATEGORIES = {
+    sre_constants.CATEGORY_SPACE, sre_constants.CATEGORY_NOT_DIGIT,
+    sre_constants.CATEGORY_NOT_WORD, sre_constants.CATEGORY_LINEBREAK,
+}
+_STRING_ANCHORS = {
+    sre_constants.AT_BEGINNING, sre_constants.AT_END,
+    sre_constants.AT_BEGINNING_STRING, sre_constants.AT_END_STRING,
+}
+
+
+def _analyze_pattern(pattern, flags):
+    """
+    Static facts about a detector pattern, used to skip work safely:
+    - literal: longest literal every match must contain ('' if none)
+    - line_bounded: no match can cross a newline or depend on string anchors,
+      so the pattern only needs to run on lines containing the literal
+    """
+    runs = [""]
+    spans_lines = [False]
+
+    def check_set(items):
+        for op, av in items:
+            if op is sre_constants.NEGATE:
+                return True
+            if op is sre_constants.LITERAL and av == 10:
+                return True
+            if op is sre_constants.RANGE and av[0] <= 10 <= av[1]:
+                return True
+            if op is sre_constants.CATEGORY and av in _SPANNING_CATEGORIES:
+                return True
+        return False
+
+    def walk(items, collect):
+        for op, av in items:
+            if op is sre_constants.LITERAL:
+                if av == 10:
+                    spans_lines[0] = True
+                if collect:
+                    runs[-1] += chr(av)
+                continue
+            if collect:
+                runs.append("")
+            if op is sre_constants.SUBPATTERN:
+                runs.append("")
+                walk(av[-1], collect)
+                runs.append("")
+            elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+                walk(av[2], collect and av[0] >= 1)
+            elif op is sre_constants.BRANCH:
+                for branch in av[1]:
+                    walk(branch, False)
+            elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+                walk(av[1], False)
+            elif op is sre_constants.IN:
+                spans_lines[0] |= check_set(av)
+            elif op is sre_constants.ANY:
+                spans_lines[0] |= bool(flags & re.DOTALL)
+            elif op is sre_constants.AT:
+                spans_lines[0] |= av in _STRING_ANCHORS
+            else:
+                spans_lines[0] = True  # Unknown construct: stay conservative
+
+    walk(sre_parse.parse(pattern, flags), True)
+    literal = max(runs, key=len)
+    if not literal.isascii():
+        literal = ""
+    return literal.lower(), not spans_lines[0]
+
+
+class _Detector:
+    """One compiled detector pattern plus its prefilter facts"""
+
+    __slots__ = ("category", "pattern", "regex", "literal", "line_bounded")
+
+    def __init__(self, category, pattern):
+        self.category = category
+        self.pattern = pattern
+        self.regex = re.compile(pattern, re.IGNORECASE)
+        self.literal, self.line_bounded = _analyze_pattern(pattern, re.IGNORECASE)
+
 
 class SecurityScanner:
     """Scan for sensitive data patterns"""
     
-    def __init__(self):
+    def __init__(self, use_cache=True):
         # Sensitive patterns to detect
         self.patterns = {
             "api_key": [
@@ -67,6 +175,47 @@ class SecurityScanner:
             r'<[A-Z_]+>',  # Template variables like <API_KEY>
             r'Password \(encrypted\)',  # Documentation label
         ]
+        
+        self._compile()
+        self.cache = None
+        if use_cache:
+            self.cache = ScanCache(CACHE_FILE, self.rules_version)
+    
+    def _compile(self):
+        """Precompile detectors and fold the whitelist into one pattern"""
+        self._detectors = [
+            _Detector(category, pattern)
+            for category, patterns in self.patterns.items()
+            for pattern in patterns
+        ]
+        self._whitelist_re = re.compile(
+            "|".join(f"(?:{wl})" for wl in self.whitelist), re.IGNORECASE
+        )
+        self._variable_password_re = re.compile(r'["\'][A-Z_]+PASSWORD["\']')
+        self.rules_version = hashlib.sha1(
+            json.dumps([self.patterns, self.whitelist], sort_keys=True).encode()
+        ).hexdigest()[:12]
+    
+    def _detector_matches(self, detector, text, folded):
+        """
+        Yield matches of one detector, skipping text that can't contain one.
+        Same matches, in the same order, as detector.regex.finditer(text).
+        """
+        if detector.literal:
+            first = folded.find(detector.literal)
+            if first == -1:
+                return
+            if detector.line_bounded:
+                # Only run on lines that contain the literal
+                pos = first
+                while pos != -1:
+                    line_start = text.rfind('\n', 0, pos) + 1
+                    line_end = text.find('\n', pos)
+                    line_end = len(text) if line_end == -1 else line_end + 1
+                    yield from detector.regex.finditer(text, line_start, line_end)
+                    pos = folded.find(detector.literal, line_end)
+                return
+        yield from detector.regex.finditer(text)
     
     def scan_text(self, text, filename="unknown"):
         """
@@ -74,51 +223,49 @@ class SecurityScanner:
         Returns: List of findings
         """
         findings = []
+        folded = text.translate(_FOLD)
+        newlines = None
         
-        for category, patterns in self.patterns.items():
-            for pattern in patterns:
-                matches = re.finditer(pattern, text, re.IGNORECASE)
+        for detector in self._detectors:
+            for match in self._detector_matches(detector, text, folded):
+                matched_text = match.group(0)
                 
-                for match in matches:
-                    matched_text = match.group(0)
-                    
-                    # Check whitelist
-                    is_whitelisted = any(
-                        re.search(wl, matched_text, re.IGNORECASE)
-                        for wl in self.whitelist
-                    )
-                    
-                    # Check if we're loading from .credentials/ directory
-                    line_start = max(0, text.rfind('\n', 0, match.start()))
-                    line_end = text.find('\n', match.start())
-                    if line_end == -1:
-                        line_end = len(text)
-                    line_context = text[line_start:line_end]
-                    
-                    # Skip if loading from credentials file
-                    if '.credentials' in line_context or 'credentials[' in line_context:
-                        is_whitelisted = True
-                    
-                    # Skip if getting from environment variable
-                    if 'os.getenv(' in line_context or 'os.environ' in line_context:
-                        is_whitelisted = True
-                    
-                    # Skip if it's a string literal containing a variable name
-                    if re.search(r'["\'][A-Z_]+PASSWORD["\']', line_context):
-                        is_whitelisted = True
+                # Check whitelist
+                is_whitelisted = self._whitelist_re.search(matched_text) is not None
+                
+                # Check if we're loading from .credentials/ directory
+                line_start = max(0, text.rfind('\n', 0, match.start()))
+                line_end = text.find('\n', match.start())
+                if line_end == -1:
+                    line_end = len(text)
+                line_context = text[line_start:line_end]
+                
+                # Skip if loading from credentials file
+                if '.credentials' in line_context or 'credentials[' in line_context:
+                    is_whitelisted = True
+                
+                # Skip if getting from environment variable
+                if 'os.getenv(' in line_context or 'os.environ' in line_context:
+                    is_whitelisted = True
+                
+                # Skip if it's a string literal containing a variable name
+                if self._variable_password_re.search(line_context):
+                    is_whitelisted = True
+                
+                if not is_whitelisted:
+                    # Get line number from the newline offset table
+                    if newlines is None:
+                        newlines = [m.start() for m in re.finditer('\n', text)]
+                    line_num = bisect.bisect_left(newlines, match.start()) + 1
                     
-                    if not is_whitelisted:
-                        # Get line number
-                        line_num = text[:match.start()].count('\n') + 1
-                        
-                        findings.append({
-                            "category": category,
-                            "pattern": pattern,
-                            "match": matched_text[:50],  # First 50 chars
-                            "file": filename,
-                            "line": line_num,
-                            "severity": self._get_severity(category)
-                        })
+                    findings.append({
+                        "category": detector.category,
+                        "pattern": detector.pattern,
+                        "match": matched_text[:50],  # First 50 chars
+                        "file": filename,
+                        "line": line_num,
+                        "severity": self._get_severity(detector.category)
+                    })
         
         return findings
     
@@ -135,28 +282,20 @@ class SecurityScanner:
             return "LOW"
     
     def scan_file(self, filepath):
-        """Scan a single file"""
+        """Scan a single file (served from the content-hash cache when unchanged)"""
         filepath_str = str(filepath)
         
-        # Skip scanning the security scanner itself (contains pattern definitions)
-        if 'security_scanner.py' in filepath_str or 'security_audit.py' in filepath_str:
+        # Skip the scanner itself (contains pattern definitions) and its cache
+        if _skipped(filepath_str):
             return []
         
-        # Be less strict for markdown documentation files
-        is_markdown = filepath_str.endswith('.md')
+        if self.cache:
+            cached = self.cache.lookup_stat(filepath_str)
+            if cached is not None:
+                return cached
         
         try:
-            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            findings = self.scan_text(content, filepath_str)
-            
-            # Filter out low-risk findings from markdown files
-            if is_markdown:
-                findings = [f for f in findings if self._is_high_risk_in_docs(f, content)]
-            
-            return findings
-        
+            raw, stat_key = _read_stable(filepath_str)
         except Exception as e:
             return [{
                 "category": "error",
@@ -164,8 +303,39 @@ class SecurityScanner:
                 "error": str(e),
                 "severity": "LOW"
             }]
+        
+        if not self.cache:
+            return self.scan_content(raw, filepath_str)
+        
+        # Same content seen before (at any path) reuses its findings
+        digest = hashlib.sha256(raw).hexdigest()
+        findings = self.cache.findings_for(digest, filepath_str)
+        if findings is None:
+            findings = self.scan_content(raw, filepath_str)
+        self.cache.record(filepath_str, stat_key, digest, findings)
+        return findings
     
-    def _is_high_risk_in_docs(self, finding, content):
+    def scan_content(self, raw, filepath_str):
+        """
+        Scan raw file bytes, applying the markdown documentation filter.
+        Matches come back redacted, so findings are safe to print and cache.
+        """
+        # Be less strict for markdown documentation files
+        is_markdown = filepath_str.endswith('.md')
+        
+        content = raw.decode('utf-8', errors='ignore')
+        findings = self.scan_text(content, filepath_str)
+        
+        # Filter out low-risk findings from markdown files
+        if is_markdown and findings:
+            lines = content.split('\n')
+            findings = [f for f in findings if self._is_high_risk_in_docs(f, content, lines)]
+        
+        for finding in findings:
+            finding["match"] = _redact(finding["match"])
+        return findings
+    
+    def _is_high_risk_in_docs(self, finding, content, lines=None):
         """Check if finding in documentation is actually high-risk"""
         # Allow password references in documentation if they're examples
         match_text = finding.get('match', '').lower()
@@ -173,7 +343,8 @@ class SecurityScanner:
         # Skip if it's just the word "password" in a sentence
         if 'password' in match_text and len(match_text) < 20:
             line_num = finding.get('line', 0)
-            lines = content.split('\n')
+            if lines is None:
+                lines = content.split('\n')
             if 0 < line_num <= len(lines):
                 line = lines[line_num - 1].lower()
                 # Check if it's an instruction or example
@@ -193,18 +364,19 @@ class SecurityScanner:
         
         return False
     
-    def scan_directory(self, directory, extensions=None):
+    def scan_directory(self, directory, extensions=None, workers=None):
         """
         Scan directory for sensitive data
         
         Args:
             directory: Path to scan
             extensions: List of file extensions to scan (None = all text files)
+            workers: Process pool size for files that need scanning (None = CPU count)
         """
         if extensions is None:
             extensions = ['.py', '.js', '.json', '.md', '.txt', '.env', '.sh', '.yaml', '.yml']
         
-        all_findings = []
+        paths = []
         
         for root, dirs, files in os.walk(directory):
             # Skip certain directories
@@ -216,9 +388,51 @@ class SecurityScanner:
                 
                 # Check extension
                 if filepath.suffix in extensions or extensions is None:
-                    findings = self.scan_file(filepath)
-                    all_findings.extend(findings)
+                    paths.append(filepath)
+        
+        return self.scan_files(paths, workers=workers)
+    
+    def scan_files(self, paths, workers=None):
+        """
+        Scan many files: unchanged files come from the cache, the rest are
+        read and scanned in a process pool. Findings keep the input order.
+        """
+        results = {}
+        pending = []
         
+        for filepath in paths:
+            filepath_str = str(filepath)
+            if _skipped(filepath_str):
+                results[filepath_str] = []
+                continue
+            cached = self.cache.lookup_stat(filepath_str) if self.cache else None
+            if cached is not None:
+                results[filepath_str] = cached
+            else:
+                pending.append(filepath_str)
+        
+        if len(pending) < PARALLEL_MIN_FILES or workers == 1:
+            for filepath_str in pending:
+                results[filepath_str] = self.scan_file(filepath_str)
+        else:
+            chunks = [pending[i:i + SCAN_CHUNK_SIZE] for i in range(0, len(pending), SCAN_CHUNK_SIZE)]
+            known = self.cache.known_keys() if self.cache else frozenset()
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(known,)) as pool:
+                for chunk_results in pool.map(_scan_chunk, chunks):
+                    for filepath_str, stat_key, digest, findings in chunk_results:
+                        if digest is not None and findings is None:
+                            findings = self.cache.findings_for(digest, filepath_str)
+                        results[filepath_str] = findings
+                        if self.cache and digest is not None:
+                            self.cache.record(filepath_str, stat_key, digest, findings)
+        
+        if self.cache:
+            self.cache.save()
+        
+        all_findings = []
+        for filepath in paths:
+            all_findings.extend(results[str(filepath)])
         return all_findings
     
     def scan_git_staged(self):
@@ -238,15 +452,8 @@ class SecurityScanner:
             staged_files = result.stdout.strip().split('\n')
             staged_files = [f for f in staged_files if f]  # Remove empty
             
-            all_findings = []
-            
-            for filepath in staged_files:
-                full_path = WORKSPACE / filepath
-                if full_path.exists() and full_path.is_file():
-                    findings = self.scan_file(full_path)
-                    all_findings.extend(findings)
-            
-            return all_findings
+            full_paths = [WORKSPACE / filepath for filepath in staged_files]
+            return self.scan_files([p for p in full_paths if p.exists() and p.is_file()])
         
         except Exception as e:
             return [{
@@ -314,6 +521,147 @@ class SecurityScanner:
         return len(high_severity) > 0, high_severity
 
 
+def _skipped(filepath_str):
+    return os.path.basename(filepath_str) in SKIP_FILES
+
+
+def _redact(text):
+    """Short prefix plus length and hash: enough to tell findings apart, useless as a secret"""
+    digest = hashlib.sha256(text.encode()).hexdigest()[:12]
+    return f"{text[:4]}…[{len(text)} chars, sha256:{digest}]"
+
+
+def _read_stable(filepath_str):
+    """
+    Read a file -> (bytes, stat key). The stat key is None when the file
+    changed while it was being read, so the result is never cached against
+    a size/mtime that belongs to different content.
+    """
+    before = ScanCache._stat_key(filepath_str)
+    with open(filepath_str, 'rb') as f:
+        raw = f.read()
+    after = ScanCache._stat_key(filepath_str)
+    return raw, before if before == after else None
+
+
+class ScanCache:
+    """
+    Persistent findings cache keyed by file content hash
+    
+    - files: path -> [size, mtime_ns, digest] so unchanged files skip the read
+    - results: "<digest>:<md|txt>" -> findings (without the file field,
+      matches redacted)
+    Invalidated wholesale when the detector/whitelist rules change.
+    """
+    
+    def __init__(self, path, rules_version):
+        self.path = Path(path)
+        self.rules_version = rules_version
+        self.files = {}
+        self.results = {}
+        self.dirty = False
+        try:
+            data = json.loads(self.path.read_text())
+            if data.get("version") == rules_version:
+                self.files = data.get("files", {})
+                self.results = data.get("results", {})
+        except (OSError, ValueError):
+            pass
+    
+    @staticmethod
+    def _kind(filepath_str):
+        return "md" if filepath_str.endswith('.md') else "txt"
+    
+    @staticmethod
+    def _stat_key(filepath_str):
+        try:
+            st = os.stat(filepath_str)
+        except OSError:
+            return None
+        return [st.st_size, st.st_mtime_ns]
+    
+    def _with_file(self, findings, filepath_str):
+        return [dict(f, file=filepath_str) for f in findings]
+    
+    def lookup_stat(self, filepath_str):
+        """Findings for a file whose size and mtime are unchanged, else None"""
+        entry = self.files.get(filepath_str)
+        if not entry or entry[:2] != self._stat_key(filepath_str):
+            return None
+        return self.findings_for(entry[2], filepath_str)
+    
+    def findings_for(self, digest, filepath_str):
+        cached = self.results.get(f"{digest}:{self._kind(filepath_str)}")
+        return None if cached is None else self._with_file(cached, filepath_str)
+    
+    def known_keys(self):
+        return frozenset(self.results)
+    
+    def record(self, filepath_str, stat_key, digest, findings):
+        if stat_key is None or any(f.get("category") == "error" for f in findings):
+            return
+        self.files[filepath_str] = stat_key + [digest]
+        self.results[f"{digest}:{self._kind(filepath_str)}"] = [
+            {k: v for k, v in f.items() if k != "file"} for f in findings
+        ]
+        self.dirty = True
+    
+    def save(self):
+        """Write atomically, dropping results no file points at anymore"""
+        if not self.dirty:
+            return
+        live = {f"{entry[2]}:{self._kind(path)}" for path, entry in self.files.items()}
+        self.results = {k: v for k, v in self.results.items() if k in live}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix('.tmp')
+        tmp.write_text(json.dumps({
+            "version": self.rules_version,
+            "files": self.files,
+            "results": self.results,
+        }))
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+
+_worker_scanner = None
+_worker_known = frozenset()
+
+
+def _init_worker(known):
+    """Process-pool initializer: compile detectors once per worker process"""
+    global _worker_scanner, _worker_known
+    _worker_scanner = SecurityScanner(use_cache=False)
+    _worker_known = known
+
+
+def _scan_chunk(paths):
+    """
+    Process-pool worker: read, hash and scan a chunk of files
+    Returns (path, stat_key, digest, findings); findings is None when the
+    digest is already in the parent's cache.
+    """
+    results = []
+    for filepath_str in paths:
+        try:
+            raw, stat_key = _read_stable(filepath_str)
+        except Exception as e:
+            results.append((filepath_str, None, None, [{
+                "category": "error",
+                "file": filepath_str,
+                "error": str(e),
+                "severity": "LOW"
+            }]))
+            continue
+        
+        digest = hashlib.sha256(raw).hexdigest()
+        if f"{digest}:{ScanCache._kind(filepath_str)}" in _worker_known:
+            results.append((filepath_str, stat_key, digest, None))
+        else:
+            results.append((filepath_str, stat_key, digest,
+                            _worker_scanner.scan_content(raw, filepath_str)))
+    return results
+
+
 def scan_before_commit():
     """Run security scan before git commit"""
     scanner = SecurityScanner()
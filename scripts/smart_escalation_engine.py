@@ -4,16 +4,30 @@ Smart Escalation Engine - Intelligent LLM routing layer
 
 Routes user queries to local Llama or cloud Sonnet based on complexity scoring.
 Tracks cost savings and logs all routing decisions.
+
+Routing paths (logged as "path"):
+- fast_local / fast_cloud: the trained route classifier (route_classifier.py)
+  is confident, so the LLM scorer is skipped entirely
+- scored: uncertain band (or no trained classifier) - the scorer runs, with
+  local generation started speculatively alongside it
 """
 
 import json
+import random
 import time
-import requests
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Tuple, Optional, List
 from dataclasses import dataclass, asdict
 
+from local_llm import LLMError, get_client
+
+try:
+    from route_classifier import CLASSIFIER_PATH, SHADOW_LOG, RouteClassifier, routing_stats
+except ImportError:  # numpy missing: every query goes through the LLM scorer
+    RouteClassifier = None
+
 WORKSPACE = Path.home() / "clawd"
 ESCALATION_LOG = WORKSPACE / "memory" / "escalation.log"
 COST_LOG = WORKSPACE / "memory" / "escalation_cost_savings.json"
@@ -23,11 +37,14 @@ SONNET_INPUT_COST = 3.00  # $3 per 1M input tokens
 SONNET_OUTPUT_COST = 15.00  # $15 per 1M output tokens
 LOCAL_COST = 0.00  # Free!
 
-# Ollama configuration
-OLLAMA_BASE_URL = "http://localhost:11434"
+# Ollama configuration (server, pooling and caching live in local_llm)
 SCORING_MODEL = "qwen2.5:14b"  # Strong reasoning for scoring
 RESPONSE_MODEL = "llama3.1:8b"  # Fast for simple queries
 
+# Fast path / speculation
+SPECULATE = True  # Start local generation while the scorer runs (both fit in local_llm's 2 slots)
+SHADOW_RATE = 0.05  # Fraction of fast-path decisions also scored in the background, to measure agreement
+
 
 @dataclass
 class ComplexityScore:
@@ -66,6 +83,20 @@ class ComplexityScore:
         if self.decision_making > 70 and self.reversibility > 70:
             return "Critical irreversible decision"
         return "Local handling"
+    
+    @classmethod
+    def from_probability(cls, p_cloud: float) -> "ComplexityScore":
+        """Stand-in scores for a fast-path decision (the LLM scorer did not run)"""
+        level = int(round(p_cloud * 100))
+        return cls(
+            overall=level,
+            factual_vs_reasoning=level,
+            data_retrieval=level,
+            decision_making=level,
+            time_sensitivity=50,
+            reversibility=level,
+            confidence=100 - level
+        )
 
 
 @dataclass
@@ -80,6 +111,10 @@ class RoutingDecision:
     tokens_saved: Optional[int] = None
     cost_saved: Optional[float] = None
     local_response: Optional[str] = None
+    path: str = "scored"  # "fast_local", "fast_cloud" or "scored"
+    p_cloud: Optional[float] = None  # Route classifier's estimate (None if not trained)
+    scored_route: Optional[str] = None  # LLM scorer's verdict, when it ran
+    total_ms: Optional[int] = None  # End-to-end routing time
 
 
 class SmartEscalationEngine:
@@ -87,6 +122,11 @@ class SmartEscalationEngine:
         self.workspace = WORKSPACE
         self.log_file = ESCALATION_LOG
         self.cost_log = COST_LOG
+        self.shadow_log = SHADOW_LOG if RouteClassifier else None
+        self.classifier_path = CLASSIFIER_PATH if RouteClassifier else None
+        self._classifier = None
+        self._classifier_mtime = None
+        self.pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="escalation")
         self._ensure_dirs()
     
     def _ensure_dirs(self):
@@ -95,24 +135,17 @@ class SmartEscalationEngine:
         self.cost_log.parent.mkdir(parents=True, exist_ok=True)
     
     def _call_ollama(self, model: str, prompt: str, system: str = None) -> Dict:
-        """Call Ollama API"""
+        """Call Ollama API through the shared local LLM client"""
         try:
-            payload = {
-                "model": model,
-                "prompt": prompt,
-                "stream": False
-            }
-            if system:
-                payload["system"] = system
-            
-            response = requests.post(
-                f"{OLLAMA_BASE_URL}/api/generate",
-                json=payload,
-                timeout=30
+            return get_client().generate(
+                prompt,
+                model=model,
+                system=system,
+                caller="smart_escalation",
+                timeout=30,
+                cache=False  # Sampled, and prompts carry live data and the current time
             )
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
+        except LLMError as e:
             # Fallback: if local LLM fails, escalate
             return {"error": str(e), "response": "", "eval_count": 0}
     
@@ -266,25 +299,79 @@ Respond directly to the query. Be brief and accurate."""
         
         return data
     
+    def classifier(self) -> Optional["RouteClassifier"]:
+        """Trained route classifier, reloaded when the model file changes (None until it is ready)"""
+        if RouteClassifier is None:
+            return None
+        try:
+            mtime = self.classifier_path.stat().st_mtime
+        except OSError:
+            return None
+        if mtime != self._classifier_mtime:
+            self._classifier = RouteClassifier.load(self.classifier_path)
+            self._classifier_mtime = mtime
+        return self._classifier if self._classifier and self._classifier.ready else None
+    
+    def _score_speculatively(self, query: str, context: Dict = None) -> Tuple[ComplexityScore, Optional[Tuple[str, int]]]:
+        """Score and generate at once; the local answer is discarded if scoring says cloud"""
+        if not SPECULATE:
+            return self.score_complexity(query, context), None
+        
+        local = self.pool.submit(self.generate_local_response, query, context)
+        complexity = self.score_complexity(query, context)
+        if complexity.should_escalate():
+            local.cancel()  # No-op if generation already started; its answer is simply dropped
+            return complexity, None
+        return complexity, local.result()
+    
+    def _shadow_score(self, query: str, context: Dict, p_cloud: float, path: str):
+        """Score a fast-path query anyway (in the background) to track agreement and feed retraining"""
+        start_time = time.time()
+        complexity = self.score_complexity(query, context)
+        entry = {
+            "timestamp": datetime.now().isoformat(),
+            "query": query[:100] + "..." if len(query) > 100 else query,
+            "path": path,
+            "p_cloud": round(p_cloud, 4),
+            "scored_route": "cloud" if complexity.should_escalate() else "local",
+            "score_ms": int((time.time() - start_time) * 1000)
+        }
+        with open(self.shadow_log, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+    
     def route_query(self, query: str, context: Dict = None) -> RoutingDecision:
         """Main routing logic - decide local or cloud"""
         
         start_time = time.time()
         
-        # Step 1: Score complexity
-        complexity = self.score_complexity(query, context)
+        # Step 1: Classifier fast path, LLM scoring only in the uncertain band
+        classifier = self.classifier()
+        p_cloud = classifier.predict_proba(query) if classifier else None
+        path = classifier.path_for(p_cloud) if classifier else "scored"
+        
+        local_result = None
+        scored_route = None
+        
+        if path == "scored":
+            complexity, local_result = self._score_speculatively(query, context)
+            scored_route = "cloud" if complexity.should_escalate() else "local"
+            reason = complexity.get_reason()
+        else:
+            complexity = ComplexityScore.from_probability(p_cloud)
+            reason = f"Fast path: {'cloud' if path == 'fast_cloud' else 'local'} (p_cloud={p_cloud:.2f})"
+            if random.random() < SHADOW_RATE:
+                self.pool.submit(self._shadow_score, query, context, p_cloud, path)
         
         # Step 2: Decide route
         should_escalate = complexity.should_escalate()
         route = "cloud" if should_escalate else "local"
-        reason = complexity.get_reason()
         
-        # Step 3: If local, try to generate response
+        # Step 3: If local, use (or generate) the local response
         local_response = None
         response_time_ms = None
         
         if route == "local":
-            local_response, response_time_ms = self.generate_local_response(query, context)
+            local_response, response_time_ms = local_result or self.generate_local_response(query, context)
             
             # If local model escalates itself, change route
             if local_response == "ESCALATE_NEEDED":
@@ -317,7 +404,11 @@ Respond directly to the query. Be brief and accurate."""
             response_time_ms=response_time_ms or total_time,
             tokens_saved=tokens_saved,
             cost_saved=cost_saved,
-            local_response=local_response
+            local_response=local_response,
+            path=path,
+            p_cloud=p_cloud,
+            scored_route=scored_route,
+            total_ms=total_time
         )
         
         # Log decision
@@ -339,7 +430,11 @@ Respond directly to the query. Be brief and accurate."""
             "complexity": asdict(decision.complexity),
             "response_time_ms": decision.response_time_ms,
             "tokens_saved": decision.tokens_saved,
-            "cost_saved": round(decision.cost_saved, 6) if decision.cost_saved else 0
+            "cost_saved": round(decision.cost_saved, 6) if decision.cost_saved else 0,
+            "path": decision.path,
+            "p_cloud": round(decision.p_cloud, 4) if decision.p_cloud is not None else None,
+            "scored_route": decision.scored_route,
+            "total_ms": decision.total_ms
         }
         
         with open(self.log_file, "a") as f:
@@ -390,6 +485,12 @@ Respond directly to the query. Be brief and accurate."""
             return json.loads(self.cost_log.read_text())
         except:
             return {}
+    
+    def get_routing_stats(self) -> Dict:
+        """Per-path latency and route classifier agreement with the LLM scorer"""
+        if RouteClassifier is None:
+            return {}
+        return routing_stats(self.log_file, self.shadow_log)
 
 
 # Singleton instance
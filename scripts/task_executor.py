@@ -17,14 +17,14 @@ import json
 import subprocess
 from pathlib import Path
 from datetime import datetime
-import urllib.request
 import re
 import sys
 
+from local_llm import get_client
+
 WORKSPACE = Path.home() / "clawd"
 TASK_QUEUE_FILE = WORKSPACE / "TASK_QUEUE.md"
 EXECUTION_LOG = WORKSPACE / "logs" / "task_execution.log"
-OLLAMA_URL = "http://localhost:11434/api/generate"
 
 EXECUTION_LOG.parent.mkdir(exist_ok=True)
 
@@ -39,22 +39,14 @@ def log(message):
 def call_local_model(prompt, temperature=0.3):
     """Call local ollama for task analysis"""
     try:
-        data = json.dumps({
-            "model": "qwen2.5:14b",
-            "prompt": prompt,
-            "temperature": temperature,
-            "stream": False
-        }).encode('utf-8')
-        
-        req = urllib.request.Request(
-            OLLAMA_URL,
-            data=data,
-            headers={'Content-Type': 'application/json'}
+        result = get_client().generate(
+            prompt,
+            model="qwen2.5:14b",
+            temperature=temperature,
+            caller="task_executor",
+            timeout=120
         )
-        
-        with urllib.request.urlopen(req, timeout=120) as response:
-            result = json.loads(response.read().decode('utf-8'))
-            return result.get("response")
+        return result["response"]
             
     except Exception as e:
         log(f"Local model error: {e}")
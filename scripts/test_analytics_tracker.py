@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Regression tests for AnalyticsTracker's indexed lookups and batched saves
+A tracker with the old linear scans and a save per call is the reference
+"""
+
+import json
+import random
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+import analytics_tracker
+from analytics_tracker import AnalyticsTracker
+
+FILES = ["ANALYTICS_FILE", "OPPORTUNITIES_FILE", "SOCIAL_POSTS_FILE"]
+CLOCK_FIELDS = {"tracked_at", "last_updated", "last_checked", "conversion_date", "date"}
+
+
+class _Scan:
+    """The old lookup: first record whose field matches, scanned every call"""
+
+    def __init__(self, records, field):
+        self.records = records
+        self.field = field
+
+    def get(self, key):
+        return next((r for r in self.records if r.get(self.field) == key), None)
+
+    def __setitem__(self, key, value):
+        pass
+
+    def setdefault(self, key, value):
+        return value
+
+
+class LinearTracker(AnalyticsTracker):
+    """AnalyticsTracker as it behaved before the indexes and batch()"""
+
+    def _build_indexes(self):
+        self._opportunity_index = _Scan(self.analytics_data['opportunities'], 'tracking_id')
+        self._post_index = _Scan(self.analytics_data['social_posts'], 'id')
+
+    @contextmanager
+    def batch(self):
+        yield self
+
+
+def use_dir(tmp_path):
+    """Point the tracker's files at tmp_path; returns the originals"""
+    original = {name: getattr(analytics_tracker, name) for name in FILES}
+    tmp_path.mkdir(parents=True, exist_ok=True)
+    analytics_tracker.ANALYTICS_FILE = tmp_path / "analytics.json"
+    analytics_tracker.OPPORTUNITIES_FILE = tmp_path / "opportunities.json"
+    analytics_tracker.SOCIAL_POSTS_FILE = tmp_path / "social-posts-queue.json"
+    return original
+
+
+def restore_files(original):
+    for name, value in original.items():
+        setattr(analytics_tracker, name, value)
+
+
+def write_inputs(tmp_path, seed):
+    rng = random.Random(seed)
+    opportunities = [
+        {"source": rng.choice(["email", "Twitter DM", "reddit", "linkedin"]),
+         "type": rng.choice(["coaching", "partnership", "speaking"]),
+         "score": rng.randint(40, 99), "revenue_potential": f"${rng.choice([500, 2000, 10000])}",
+         "timestamp": f"2026-03-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00",
+         "sender": rng.choice(["ana", "ben", "cy", "dee"]), "content": "hello " * rng.randint(1, 60)}
+        for _ in range(150)
+    ]
+    posts = [
+        {"id": f"post-{rng.randint(1, 60)}", "text": "tip", "posted": rng.random() < 0.9,
+         "posted_at": f"2026-03-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:15:00Z",
+         "likes": rng.randint(0, 50), "retweets": rng.randint(0, 10), "replies": rng.randint(0, 5)}
+        for _ in range(120)
+    ]
+    (tmp_path / "opportunities.json").write_text(json.dumps({"opportunities": opportunities}))
+    (tmp_path / "social-posts-queue.json").write_text(json.dumps(posts))
+    return rng
+
+
+def strip_clock(value):
+    if isinstance(value, dict):
+        return {k: strip_clock(v) for k, v in value.items() if k not in CLOCK_FIELDS}
+    if isinstance(value, list):
+        return [strip_clock(v) for v in value]
+    return value
+
+
+def run(tracker_class, tmp_path, seed):
+    """Two syncs, some conversions and engagement updates; returns (tracker, saves, results, stored file)"""
+    original = use_dir(tmp_path)
+    try:
+        rng = write_inputs(tmp_path, seed)
+        # A prior store with a duplicated tracking id: the first copy must win
+        dup = {"tracking_id": "email_dup", "source": "email", "status": "pending", "converted": False}
+        prior = AnalyticsTracker()._load_analytics()
+        prior["opportunities"] = [dict(dup, score=1), dict(dup, score=2)]
+        analytics_tracker.ANALYTICS_FILE.write_text(json.dumps(prior))
+
+        tracker = tracker_class()
+        saves = []
+        save = tracker._save_analytics
+        tracker._save_analytics = lambda: (saves.append(tracker._batch_depth), save())
+
+        results = [tracker.sync_opportunities(), tracker.sync_social_posts(), tracker.sync_opportunities()]
+        ids = [o["tracking_id"] for o in tracker.analytics_data["opportunities"]]
+        for tracking_id in rng.sample(ids, 20) + ["email_dup", "missing"]:
+            results.append(tracker.mark_conversion(tracking_id, rng.choice([0, 250, 1500]), "won"))
+        for i in range(1, 80, 3):
+            results.append(tracker.track_social_post({"id": f"post-{i}", "likes": i, "retweets": 1,
+                                                      "posted_at": "2026-03-02T09:00:00Z"}))
+        results += [tracker.get_conversion_rate(), tracker.get_conversion_rate("twitter"),
+                    tracker.get_best_posting_time()]
+        stored = json.loads(analytics_tracker.ANALYTICS_FILE.read_text())
+        return tracker, saves, results, stored
+    finally:
+        restore_files(original)
+
+
+def test_indexed_tracker_matches_linear_scan(tmp_path):
+    new, new_saves, new_results, new_stored = run(AnalyticsTracker, tmp_path / "indexed", seed=21)
+    old, old_saves, old_results, old_stored = run(LinearTracker, tmp_path / "linear", seed=21)
+
+    assert new_results == old_results
+    assert strip_clock(new.analytics_data) == strip_clock(old.analytics_data)
+    assert strip_clock(new_stored) == strip_clock(new.analytics_data)
+    assert strip_clock(old_stored) == strip_clock(new_stored)
+    summaries = [strip_clock(tracker.generate_summary()) for tracker in (new, old)]
+    for summary in summaries:
+        summary.pop("timestamp")   # When the summary was generated
+    assert summaries[0] == summaries[1]
+
+    dup = [o for o in new.analytics_data["opportunities"] if o["tracking_id"] == "email_dup"]
+    assert dup[0]["converted"] and not dup[1]["converted"]
+
+    # Each sync writes once; the old path wrote once per record
+    syncs = new_results[0] + new_results[1] + new_results[2]
+    calls_after_sync = len(new_results) - 3 - 3
+    assert sum(1 for depth in new_saves if depth == 0) == 3 + calls_after_sync - 1   # 'missing' never saves
+    assert len(old_saves) == syncs + calls_after_sync - 1
+
+
+def test_nested_batches_save_once(tmp_path):
+    original = use_dir(tmp_path)
+    try:
+        tracker = AnalyticsTracker()
+        with tracker.batch():
+            with tracker.batch():
+                tracker.track_opportunity({"source": "email", "timestamp": "2026-03-01T08:00:00"})
+            assert not analytics_tracker.ANALYTICS_FILE.exists()
+            tracker.track_opportunity({"source": "reddit", "timestamp": "2026-03-01T09:00:00"})
+        stored = json.loads(analytics_tracker.ANALYTICS_FILE.read_text())
+        assert [o["tracking_id"] for o in stored["opportunities"]] == \
+            ["email_2026-03-01T08:00:00", "reddit_2026-03-01T09:00:00"]
+        assert not analytics_tracker.ANALYTICS_FILE.with_suffix('.tmp').exists()
+    finally:
+        restore_files(original)
+
+
+if __name__ == "__main__":
+    for test in [test_indexed_tracker_matches_linear_scan, test_nested_batches_save_once]:
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ Analytics tracker regression tests passed")
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental backups: store round trips, pruning/GC and corrupt manifests
+Runs against a throwaway workspace, never ~/clawd
+"""
+
+import io
+import os
+import tempfile
+from pathlib import Path
+
+import backup
+
+SETTINGS = ["WORKSPACE", "BACKUP_DIR", "STORE_DIR", "MANIFEST_DIR", "TO_BACKUP", "MAX_BACKUPS", "READ_CHUNK"]
+
+
+def use_workspace(tmp_path):
+    """Point the module at tmp_path; returns the original settings"""
+    original = {name: getattr(backup, name) for name in SETTINGS}
+    workspace = tmp_path / "clawd"
+    backup.WORKSPACE = str(workspace)
+    backup.BACKUP_DIR = str(workspace / "backups")
+    backup.STORE_DIR = str(workspace / "backups" / "store")
+    backup.MANIFEST_DIR = str(workspace / "backups" / "manifests")
+    backup.TO_BACKUP = ["TODO.md", "memory/", "scripts/"]
+    backup.READ_CHUNK = 64 * 1024
+
+    (workspace / "memory" / "2026").mkdir(parents=True)
+    (workspace / "scripts").mkdir()
+    (workspace / "TODO.md").write_text("- [ ] ship it\n")
+    (workspace / "memory" / "2026" / "03-01.md").write_text("notes " * 1000)
+    (workspace / "scripts" / "big.bin").write_bytes(os.urandom(300 * 1024))   # Several chunks
+    return original
+
+
+def restore_settings(original):
+    for name, value in original.items():
+        setattr(backup, name, value)
+
+
+def run_backup(day):
+    """Incremental backup renamed to a fixed day (names only have 1s resolution)"""
+    name = backup.create_incremental_backup()
+    fixed = f"backup_2026-03-{day:02d}_030000"
+    os.replace(os.path.join(backup.MANIFEST_DIR, f"{name}.json"),
+               os.path.join(backup.MANIFEST_DIR, f"{fixed}.json"))
+    return fixed
+
+
+def objects():
+    return sorted(f for _, _, files in os.walk(backup.STORE_DIR) for f in files)
+
+
+def test_backup_and_restore_round_trip(tmp_path):
+    original = use_workspace(tmp_path)
+    try:
+        workspace = Path(backup.WORKSPACE)
+        first = run_backup(1)
+        assert len(objects()) == 3 and not os.listdir(os.path.join(backup.STORE_DIR, "tmp"))
+
+        before = (workspace / "TODO.md").read_bytes()
+        (workspace / "TODO.md").write_text("- [x] ship it\n")
+        second = run_backup(2)
+        assert len(objects()) == 4
+
+        out = io.BytesIO()
+        backup.restore_file(first, "TODO.md", out)
+        assert out.getvalue() == before
+
+        target = tmp_path / "restored"
+        backup.restore_backup(second, str(target))
+        for rel in ["TODO.md", "memory/2026/03-01.md", "scripts/big.bin"]:
+            assert (target / rel).read_bytes() == (workspace / rel).read_bytes()
+    finally:
+        restore_settings(original)
+
+
+def test_prune_and_garbage_collection(tmp_path):
+    original = use_workspace(tmp_path)
+    try:
+        workspace = Path(backup.WORKSPACE)
+        run_backup(1)
+        (workspace / "TODO.md").write_text("- [x] ship it\n")
+        run_backup(2)
+        assert len(objects()) == 4
+
+        # Pruning the first backup frees the old TODO.md object only
+        backup.MAX_BACKUPS = 1
+        backup.cleanup_old_backups()
+        backup.MAX_BACKUPS = 7
+        assert backup._manifest_names() == ["backup_2026-03-02_030000"] and len(objects()) == 3
+
+        # An unreferenced object survives GC while any manifest is unreadable
+        (workspace / "TODO.md").write_text("- [ ] and another\n")
+        run_backup(3)
+        Path(backup.MANIFEST_DIR, "backup_2026-03-03_030000.json").write_text('{"entries": ')
+        (workspace / "TODO.md").write_text("- [ ] final\n")
+        latest = run_backup(4)
+        assert backup.collect_garbage() == 0 and len(objects()) == 5
+
+        # The corrupt latest manifest was skipped as the base, and is skipped when listing
+        backup.list_backups()
+        out = io.BytesIO()
+        backup.restore_file(latest, "scripts/big.bin", out)
+        assert out.getvalue() == (workspace / "scripts" / "big.bin").read_bytes()
+
+        os.remove(os.path.join(backup.MANIFEST_DIR, "backup_2026-03-03_030000.json"))
+        assert backup.collect_garbage() == 1 and len(objects()) == 4
+    finally:
+        restore_settings(original)
+
+
+if __name__ == "__main__":
+    for test in [test_backup_and_restore_round_trip, test_prune_and_garbage_collection]:
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ Backup tests passed")
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Tests for the single-process daemon host
+Jobs are stand-in modules registered in sys.modules; no real daemons run
+"""
+
+import asyncio
+import json
+import sys
+import tempfile
+import threading
+import time
+import types
+from datetime import datetime
+from pathlib import Path
+
+from daemon_host import DaemonHost, Job, MISSED_GRACE, UNHEALTHY_AFTER
+
+CALLS = {'now': 0, 'max': 0, 'threads': set()}
+LOCK = threading.Lock()
+
+
+def fake_module(name, behaviour):
+    """Register a module whose main() does `behaviour`"""
+    module = types.ModuleType(name)
+
+    def main():
+        with LOCK:
+            CALLS['now'] += 1
+            CALLS['max'] = max(CALLS['max'], CALLS['now'])
+            CALLS['threads'].add(threading.current_thread().name)
+        try:
+            time.sleep(0.05)
+            return behaviour()
+        finally:
+            with LOCK:
+                CALLS['now'] -= 1
+
+    module.main = main
+    sys.modules[name] = module
+    return name
+
+
+def fail():
+    raise RuntimeError('feed down')
+
+
+def test_run_job_outcomes():
+    jobs = [Job('ok', fake_module('fake_ok', lambda: 0), 60),
+            Job('exits', fake_module('fake_exits', lambda: sys.exit(0)), 60),
+            Job('bad', fake_module('fake_bad', fail), 60),
+            Job('falsy', fake_module('fake_falsy', lambda: False), 60),
+            Job('missing', 'module_that_does_not_exist', 60)]
+    host = DaemonHost(jobs, status_port=None, state_path=None)
+    host.load()
+    assert host.jobs['missing'].disabled.startswith('ModuleNotFoundError')
+
+    async def tick():
+        return [await host.run_job(host.jobs[name]) for name in ('ok', 'exits', 'bad', 'falsy')]
+
+    assert asyncio.run(tick()) == [True, True, False, False]
+    for _ in range(UNHEALTHY_AFTER - 1):
+        asyncio.run(host.run_job(host.jobs['bad']))
+
+    status = host.status()
+    assert status['healthy'] is False
+    assert status['jobs']['ok']['health'] == 'ok' and status['jobs']['ok']['last_latency_ms'] >= 50
+    assert status['jobs']['bad']['health'] == 'unhealthy'
+    assert status['jobs']['bad']['failures'] == UNHEALTHY_AFTER
+    assert status['jobs']['bad']['last_error'] == 'RuntimeError: feed down'
+    assert status['jobs']['falsy']['health'] == 'degraded'
+    assert status['jobs']['missing']['health'] == 'disabled'
+    host.pool.shutdown()
+
+
+def test_schedule_bounded_pool_and_status_endpoint():
+    CALLS.update({'now': 0, 'max': 0, 'threads': set()})
+    jobs = [Job(f"job{i}", fake_module(f"fake_job{i}", lambda: True), interval=0.1, jitter=0.02) for i in range(4)]
+    host = DaemonHost(jobs, max_workers=2, status_port=0, state_path=None)
+
+    async def scenario():
+        serving = asyncio.create_task(host.serve())
+        await asyncio.sleep(0.6)
+        port = host.server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(b"GET /status HTTP/1.0\r\nHost: localhost\r\n\r\n")
+        response = await reader.read()
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(b"GET /nope HTTP/1.0\r\n\r\n")
+        missing = await reader.read()
+        serving.cancel()
+        try:
+            await serving
+        except asyncio.CancelledError:
+            pass
+        return response, missing
+
+    response, missing = asyncio.run(scenario())
+    head, body = response.split(b'\r\n\r\n', 1)
+    assert head.startswith(b'HTTP/1.0 200')
+    status = json.loads(body)
+    assert status['healthy'] is True and set(status['jobs']) == {'job0', 'job1', 'job2', 'job3'}
+    # Every job ran repeatedly on its own interval, never more than the pool size at once
+    assert all(job['runs'] >= 2 for job in status['jobs'].values())
+    assert CALLS['max'] == 2 and len(CALLS['threads']) <= 2
+    assert missing.startswith(b'HTTP/1.0 404')
+
+
+def test_time_of_day_schedule():
+    at = lambda day, hour, minute=0: datetime(2026, 3, day, hour, minute).timestamp()
+    job = Job('flights', 'flight_monitor', at=['08:00', '14:00', '20:00'])
+
+    assert job.next_due(at(2, 9)) == at(2, 9)          # Never ran: 08:00 missed by an hour, catch up now
+    assert job.next_due(at(2, 10)) == at(2, 14)        # Missed by more than the grace window: wait
+    job.last_run = at(2, 14, 2)
+    assert job.next_due(at(2, 14, 3)) == at(2, 20)     # Just ran (e.g. restarted right after): next slot
+    job.last_run = at(2, 20)
+    assert job.next_due(at(2, 21)) == at(3, 8)         # Tomorrow morning
+    assert MISSED_GRACE == 3600
+
+    interval = Job('weather', 'weather_daemon', 3600)
+    assert interval.next_due(at(2, 9)) == at(2, 9)
+    interval.last_run = at(2, 9)
+    assert interval.next_due(at(2, 9, 30)) == at(2, 10)
+
+
+def test_restart_does_not_refire(tmp_path):
+    module = fake_module('fake_summary', lambda: True)
+    state = tmp_path / 'state.json'
+    evening = datetime(2026, 3, 2, 20, 0).timestamp()
+    jobs = lambda: [Job('summary', module, at=['20:00']), Job('poll', module, 600)]
+
+    first = DaemonHost(jobs(), status_port=None, state_path=state)
+    first.load()
+    asyncio.run(first.run_job(first.jobs['summary']))
+    first.pool.shutdown()
+    first.jobs['summary'].last_run = evening + 120      # As if it ran at 20:02
+    first.save_state()
+
+    # A --once host for another job keeps the summary's entry
+    other = DaemonHost([Job('poll', module, 600)], status_port=None, state_path=state)
+    other.load()
+    asyncio.run(other.run_job(other.jobs['poll']))
+    other.pool.shutdown()
+    polled_at = other.jobs['poll'].last_run
+
+    # Crash and restart at 20:05: the summary already ran, so it waits for tomorrow
+    restarted = DaemonHost(jobs(), status_port=None, state_path=state)
+    restarted.load()
+    assert restarted.jobs['summary'].last_success is not None
+    assert restarted.jobs['summary'].next_due(evening + 300) == evening + 86400
+    assert restarted.jobs['poll'].next_due(polled_at + 1) == polled_at + 600
+    restarted.pool.shutdown()
+
+    # Without the state it would have fired again straight away
+    assert Job('summary', module, at=['20:00']).next_due(evening + 300) == evening + 300
+
+
+if __name__ == '__main__':
+    test_run_job_outcomes()
+    test_schedule_bounded_pool_and_status_endpoint()
+    test_time_of_day_schedule()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_restart_does_not_refire(Path(tmp))
+    print("✅ Daemon host tests passed")
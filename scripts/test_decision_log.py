@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Regression tests for decision_log's incremental conversion metrics and batched predictions
+Incremental results are checked against the full rebuild and single-opportunity paths they replaced
+"""
+
+import random
+import tempfile
+from pathlib import Path
+
+from decision_log import DecisionLog
+
+TYPES = ["coaching", "partnership", "speaking"]
+SOURCES = ["email", "twitter"]
+PHRASES = ["1:1 coaching for a SaaS founder", "podcast sponsorship", "keynote at a fintech summit",
+           "group program for realtors", "brand deal for golf gear", "workshop for a sales team"]
+METRIC_COLUMNS = ["total_decisions", "total_responses", "total_customers", "total_deals_closed",
+                  "total_revenue", "avg_time_to_conversion_hours", "conversion_rate"]
+
+
+def populate(log: DecisionLog, seed: int, decisions: int = 120):
+    rng = random.Random(seed)
+    logged = []
+    for i in range(decisions):
+        opp_type, source = rng.choice(TYPES), rng.choice(SOURCES)
+        content = f"{rng.choice(PHRASES)} #{rng.randint(1, 5)}"
+        assert log.log_decision(f"d{i}", opp_type, source, "accept", content)
+        logged.append(f"d{i}")
+        # Outcomes arrive interleaved with new decisions, sometimes several per decision
+        for decision_id in rng.sample(logged, min(len(logged), rng.randint(0, 2))):
+            customer = rng.random() < 0.3
+            log.record_outcome(decision_id, "response", rng.choice(["converted", "replied", "ignored"]),
+                               revenue_generated=rng.choice([0, 0, 250, 1200]) if customer else 0,
+                               customer_acquired=customer, deal_closed=customer and rng.random() < 0.7,
+                               response_received=rng.random() < 0.6)
+
+
+def metrics(log: DecisionLog):
+    rows = log.conn.execute("SELECT * FROM conversion_metrics ORDER BY source_type, opportunity_type")
+    return {(row["source_type"], row["opportunity_type"]): [row[c] for c in METRIC_COLUMNS] for row in rows}
+
+
+def assert_close(actual, expected):
+    assert actual.keys() == expected.keys()
+    for key in expected:
+        for column, a, e in zip(METRIC_COLUMNS, actual[key], expected[key]):
+            if e is None or a is None:
+                assert (a or 0) == (e or 0), (key, column, a, e)
+            else:
+                assert abs(a - e) < 1e-6 * max(1.0, abs(e)), (key, column, a, e)
+
+
+def test_incremental_metrics_match_rebuild(tmp_path):
+    log = DecisionLog(db_path=tmp_path / "decision_log.db", use_vectors=False)
+    populate(log, seed=11)
+    incremental = metrics(log)
+    assert len(incremental) == len(TYPES) * len(SOURCES)
+
+    log.rebuild_all_conversion_metrics()
+    assert_close(incremental, metrics(log))
+
+    # New decisions keep total_decisions and the rate current without an outcome
+    source, opp_type = next(iter(incremental))
+    before = metrics(log)[(source, opp_type)]
+    log.log_decision("late", opp_type, source, "accept", "late decision")
+    after = metrics(log)[(source, opp_type)]
+    assert after[0] == before[0] + 1
+    assert abs(after[6] - after[2] * 100.0 / after[0]) < 1e-9
+
+
+class _FailingVectors:
+    """Vector index whose writes fail after the SQL statements ran"""
+
+    def add(self, *args, **kwargs):
+        raise RuntimeError("disk full")
+
+    def mark_labeled(self, decision_id):
+        raise RuntimeError("disk full")
+
+
+def test_failed_writes_roll_back(tmp_path):
+    log = DecisionLog(db_path=tmp_path / "decision_log.db", use_vectors=False)
+    populate(log, seed=14, decisions=20)
+    outcomes = log.conn.execute("SELECT COUNT(*) FROM outcomes").fetchone()[0]
+    source, opp_type = next(iter(metrics(log)))
+
+    log.vectors = _FailingVectors()
+    assert not log.log_decision("failed", opp_type, source, "accept", "never saved")
+    assert not log.record_outcome("d0", "response", "converted", revenue_generated=500,
+                                  customer_acquired=True, deal_closed=True)
+    log.vectors = None
+    # The next successful write commits only itself
+    assert log.log_decision("after", "coaching", "email", "accept", "saved")
+
+    assert log.conn.execute("SELECT COUNT(*) FROM decisions WHERE decision_id = 'failed'").fetchone()[0] == 0
+    assert log.conn.execute("SELECT COUNT(*) FROM outcomes").fetchone()[0] == outcomes
+    # Counters hold no trace of the failed writes
+    incremental = metrics(log)
+    log.rebuild_all_conversion_metrics()
+    assert_close(incremental, metrics(log))
+
+
+def test_batch_predictions_match_single(tmp_path):
+    for use_vectors in (False, True):
+        log = DecisionLog(db_path=tmp_path / f"decisions_{use_vectors}.db", use_vectors=use_vectors)
+        populate(log, seed=12)
+        rng = random.Random(13)
+        opportunities = [
+            {"type": rng.choice(TYPES + ["unseen"]), "source": rng.choice(SOURCES),
+             "content": rng.choice(PHRASES + [""])}
+            for _ in range(60)
+        ]
+        batch = log.predict_outcomes(opportunities)
+        single = [log.predict_outcome(opp) for opp in opportunities]
+        assert batch == single
+        assert any(p["similar_count"] for p in batch)
+        assert all(p["predicted_outcome"] == "unknown" for p, o in zip(batch, opportunities) if o["type"] == "unseen")
+        log.conn.close()
+
+
+if __name__ == "__main__":
+    for test in [test_incremental_metrics_match_rebuild, test_failed_writes_roll_back,
+                 test_batch_predictions_match_single]:
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ Decision log regression tests passed")
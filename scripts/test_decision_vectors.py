@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Tests for the decision vector index (decision_log similarity search)
+Two connections on one database stand in for two processes
+"""
+
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from decision_log import DecisionLog
+from decision_vectors import DIM, DecisionVectorIndex, embed
+
+
+def open_index(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "decisions.db"))
+    return conn, DecisionVectorIndex(tmp_path / "vectors", conn)
+
+
+def expected_df(index):
+    return (np.asarray(index.vectors[:index.count]) != 0).sum(axis=0)
+
+
+def test_add_and_sync_across_connections(tmp_path):
+    conn_a, index_a = open_index(tmp_path)
+    conn_b, index_b = open_index(tmp_path)
+
+    index_a.add("a1", "coaching", "email", "coaching call about pricing")
+    conn_a.commit()
+    # B has not seen a1 yet; its row must not collide with it
+    index_b.add("b1", "partnership", "twitter", "brand partnership for a podcast")
+    index_b.add("b2", "coaching", "email", "group coaching program")
+    conn_b.commit()
+    index_a.add("a2", "partnership", "twitter", "sponsorship deal")
+    conn_a.commit()
+
+    rows = dict(conn_a.execute("SELECT decision_id, row FROM decision_vectors"))
+    assert rows == {"a1": 0, "b1": 1, "b2": 2, "a2": 3}
+    for index in (index_a, index_b):
+        index._sync()
+        assert index.count == 4 and index.df[DIM] == 4
+        assert np.array_equal(index.df[:DIM], expected_df(index))
+        assert index.groups == {index.group_key("coaching", "email"): 0,
+                                index.group_key("partnership", "twitter"): 1}
+    assert np.allclose(index_b.vectors[0], embed("coaching call about pricing"))
+    assert list(index_a.group_codes[:4]) == [0, 1, 0, 1]
+
+    # A rolled-back add leaves no trace in the counts, and its row is reused
+    index_a.add("a3", "coaching", "email", "refund request")
+    conn_a.rollback()
+    index_a._sync()
+    assert index_a.count == 4 and np.array_equal(index_a.df[:DIM], expected_df(index_a))
+    index_a.add("a4", "coaching", "email", "coaching renewal")
+    conn_a.commit()
+    assert conn_a.execute("SELECT row FROM decision_vectors WHERE decision_id = 'a4'").fetchone()[0] == 4
+    assert np.array_equal(index_a.df[:DIM], expected_df(index_a))
+
+    # The decision id stays unique
+    try:
+        index_b.add("a1", "coaching", "email", "duplicate")
+        raise AssertionError("duplicate decision_id was indexed")
+    except sqlite3.IntegrityError as e:
+        assert "decision_id" in str(e)
+
+
+def test_grow_keeps_rows(tmp_path):
+    conn, index = open_index(tmp_path)
+    first = index.capacity
+    for i in range(first + 10):
+        index.add(f"d{i}", "coaching", "email", f"coaching lead number {i}", labeled=i % 2 == 0)
+    conn.commit()
+    assert index.capacity == first * 2 and index.count == first + 10
+    assert np.allclose(index.vectors[0], embed("coaching lead number 0"))
+
+    # A second connection opened afterwards maps the grown files
+    _, other = open_index(tmp_path)
+    assert other.capacity == first * 2 and other.count == first + 10
+    assert np.allclose(other.vectors[first + 9], embed(f"coaching lead number {first + 9}"))
+    assert other.labeled[:other.count].sum() == (first + 10) // 2
+    assert np.array_equal(other.df, index.df)
+
+
+def test_mark_labeled_past_capacity(tmp_path):
+    conn_a, index_a = open_index(tmp_path)
+    conn_b, index_b = open_index(tmp_path)
+    first = index_a.capacity
+    for i in range(first + 5):
+        index_b.add(f"d{i}", "coaching", "email", f"coaching lead number {i}")
+    conn_b.commit()
+
+    # A's maps still have the old size; the outcome must not be dropped
+    index_a.mark_labeled(f"d{first + 3}")
+    assert index_a.capacity == first * 2 and index_a.labeled[first + 3] == 1
+    index_b.flush()
+    assert index_b.labeled[first + 3] == 1
+    index_a.mark_labeled("missing")
+
+
+def test_backfill_and_nearest_batch(tmp_path):
+    db = tmp_path / "decision_log.db"
+    log = DecisionLog(db_path=db, use_vectors=False)
+    contents = {
+        "c1": "1:1 coaching call for a SaaS founder",
+        "c2": "group coaching program for real estate agents",
+        "c3": "coaching call for a SaaS founder about pricing",
+        "p1": "podcast sponsorship for a SaaS founder",
+    }
+    for decision_id, content in contents.items():
+        opp_type = "partnership" if decision_id.startswith("p") else "coaching"
+        log.log_decision(decision_id, opp_type, "email", "accept", content)
+    for decision_id in ("c1", "c2", "p1"):
+        log.record_outcome(decision_id, "response", "converted", response_received=True)
+    log.conn.close()
+
+    log = DecisionLog(db_path=db)
+    index = log.vectors
+    assert index.count == 4 and index.backfill() == 0
+    assert int(index.labeled[:4].sum()) == 3
+
+    hits = index.nearest_batch("coaching", "email",
+                               ["coaching call for a SaaS founder", "real estate agents", "zzz"], k=5)
+    assert [d for d, _ in hits[0]] == ["c1", "c2"]        # c3 has no outcome, p1 is another group
+    assert hits[0][0][1] > hits[0][1][1]
+    assert hits[1][0][0] == "c2"
+    assert hits[2] == []
+    assert index.nearest_batch("coaching", "twitter", ["anything"]) == [[]]
+
+    # New outcomes and new decisions show up in later queries
+    log.record_outcome("c3", "response", "converted", response_received=True)
+    log.log_decision("c4", "coaching", "email", "accept", "coaching call for a SaaS founder")
+    log.record_outcome("c4", "response", "converted", response_received=True)
+    top = index.nearest("coaching", "email", "coaching call for a SaaS founder", k=2)
+    assert [d for d, _ in top] == ["c4", "c3"] and top[0][1] > 0.95
+    assert np.array_equal(index.df[:DIM], expected_df(index))
+
+
+if __name__ == "__main__":
+    for test in [test_add_and_sync_across_connections, test_grow_keeps_rows, test_mark_labeled_past_capacity,
+                 test_backfill_and_nearest_batch]:
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ Decision vector index tests passed")
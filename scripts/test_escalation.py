@@ -135,6 +135,15 @@ def show_stats(engine):
     if savings.get('last_updated'):
         print(f"Last updated:      {savings['last_updated']}")
     
+    routing = engine.get_routing_stats()
+    if routing.get('paths'):
+        print(f"\n{Colors.BOLD}Routing Paths{Colors.ENDC}")
+        for path, info in routing['paths'].items():
+            print(f"{path + ':':<19}{info['count']:,} ({info['share']*100:.0f}%), avg {info['avg_ms']:.0f}ms, p95 {info['p95_ms']:.0f}ms")
+        for band, info in routing['agreement'].items():
+            if info['agreement'] is not None:
+                print(f"{'Agreement (' + band + '):':<19}{info['agreement']*100:.1f}% of {info['checked']}")
+    
     print()
 
 
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for the workspace file catalog: incremental refresh and watcher events
+Watcher events are fed to _apply_events directly; no watchdog needed
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from file_catalog import FileCatalog
+
+
+def write(path: Path, text: str = "x"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def make_catalog(tmp_path):
+    root = tmp_path / "workspace"
+    for rel in ["README.md", "notes/a.md", "notes/deep/b.md", "notes_old/c.md", "NOTES/d.md",
+                "a_b/e.py", "axb/f.py", "node_modules/pkg/index.js"]:
+        write(root / rel)
+    return root, FileCatalog(root=root, db_path=tmp_path / "catalog.db")
+
+
+def paths(catalog):
+    return sorted(row["path"] for row in catalog.conn.execute("SELECT path FROM files"))
+
+
+def dirs(catalog):
+    return sorted(row["path"] for row in catalog.conn.execute("SELECT path FROM dirs"))
+
+
+def test_refresh_is_incremental(tmp_path):
+    root, catalog = make_catalog(tmp_path)
+    stats = catalog.refresh()
+    assert stats["added"] == 7 and "node_modules/pkg/index.js" not in paths(catalog)
+
+    assert catalog.refresh()["dirs_listed"] == 0
+    write(root / "notes/new.md")
+    os.remove(root / "axb/f.py")
+    stats = catalog.refresh()
+    assert (stats["added"], stats["removed"], stats["dirs_listed"]) == (1, 1, 2)
+    assert [e["name"] for e in catalog.files_in("notes", "*.md")] == ["a.md", "new.md"]
+
+
+def test_events_delete_only_the_subtree(tmp_path):
+    root, catalog = make_catalog(tmp_path)
+    catalog.refresh()
+
+    shutil.rmtree(root / "notes")
+    shutil.rmtree(root / "a_b")
+    catalog._apply_events([str(root / "notes"), str(root / "a_b")])
+    # LIKE ignores case (NOTES/) and reads _ as a wildcard (axb/)
+    assert paths(catalog) == ["NOTES/d.md", "README.md", "axb/f.py", "notes_old/c.md"]
+    assert dirs(catalog) == ["", "NOTES", "axb", "notes_old"]
+    assert catalog.refresh()["removed"] == 0
+
+
+def test_events_add_moved_in_trees(tmp_path):
+    root, catalog = make_catalog(tmp_path)
+    catalog.refresh()
+
+    # A tree moved into the workspace raises one event for its top directory
+    write(tmp_path / "outside/project/src/main.py")
+    write(tmp_path / "outside/project/__pycache__/main.pyc")
+    shutil.move(str(tmp_path / "outside/project"), str(root / "project"))
+    write(root / "README.md", "edited")
+    catalog._apply_events([str(root / "project"), str(root / "README.md"), str(root)])
+
+    assert "project/src/main.py" in paths(catalog)
+    assert "project/__pycache__/main.pyc" not in paths(catalog)
+    assert {"project", "project/src"} <= set(dirs(catalog))
+    assert catalog.conn.execute("SELECT size FROM files WHERE path = 'README.md'").fetchone()[0] == 6
+
+    # The catalog now matches the disk, so a walk finds nothing to do
+    stats = catalog.refresh()
+    assert (stats["added"], stats["updated"], stats["removed"], stats["dirs_listed"]) == (0, 0, 0, 0)
+
+
+if __name__ == "__main__":
+    for test in [test_refresh_is_incremental, test_events_delete_only_the_subtree, test_events_add_moved_in_trees]:
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ File catalog tests passed")
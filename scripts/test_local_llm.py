@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared local LLM client
+Runs against a local server that speaks the Ollama generate API
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import local_llm
+from local_llm import LLMError, LocalLLMClient, ResponseCache, summarize_metrics_log
+
+REQUESTS = []
+IN_FLIGHT = {'now': 0, 'max': 0}
+IN_FLIGHT_LOCK = threading.Lock()
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self._send_json({'models': [{'name': 'qwen2.5:14b'}, {'name': 'llama3.1:8b'}]})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        REQUESTS.append(body)
+        with IN_FLIGHT_LOCK:
+            IN_FLIGHT['now'] += 1
+            IN_FLIGHT['max'] = max(IN_FLIGHT['max'], IN_FLIGHT['now'])
+        try:
+            time.sleep(0.05)
+            if body['prompt'] == 'fail':
+                self._send_json({'error': 'model exploded'}, status=500)
+                return
+            words = f"echo {body['prompt']}".split()
+            stats = {'done': True, 'prompt_eval_count': 7, 'eval_count': len(words), 'eval_duration': 10 ** 8}
+            if not body.get('stream'):
+                self._send_json({'model': body['model'], 'response': ' '.join(words), **stats})
+                return
+            lines = [json.dumps({'response': w if i == 0 else f" {w}", 'done': False})
+                     for i, w in enumerate(words)]
+            lines.append(json.dumps({'response': '', **stats}))
+            payload = ('\n'.join(lines) + '\n').encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/x-ndjson')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        finally:
+            with IN_FLIGHT_LOCK:
+                IN_FLIGHT['now'] -= 1
+
+    def _send_json(self, body, status=200):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def make_client(base, root: Path, **kwargs) -> LocalLLMClient:
+    return LocalLLMClient(base_url=base, cache_dir=root / 'cache', slot_dir=root / 'slots',
+                          metrics_log=root / 'calls.jsonl', **kwargs)
+
+
+def test_generate_caches_and_records_metrics(tmp_path):
+    server, base = start_server()
+    try:
+        client = make_client(base, tmp_path)
+        REQUESTS.clear()
+        first = client.generate('hello there', temperature=0, max_tokens=50, caller='tests')
+        again = client.generate('hello there', temperature=0, max_tokens=50, caller='tests')
+        assert first['response'] == again['response'] == 'echo hello there'
+        assert (first['cached'], again['cached']) == (False, True)
+        assert len(REQUESTS) == 1
+        assert REQUESTS[0]['options'] == {'temperature': 0, 'num_predict': 50}
+
+        # Sampled calls skip the cache unless asked, including an unset temperature
+        # (Ollama's default samples); cache=False always asks the model
+        client.generate('hello there', temperature=0.9, caller='tests')
+        client.generate('hello there', temperature=0.9, caller='tests')
+        client.generate('hello there', temperature=0, max_tokens=50, caller='tests', cache=False)
+        assert len(REQUESTS) == 4
+        assert not client.generate('hello there', max_tokens=50, caller='sampled')['cached']
+        assert not client.generate('hello there', max_tokens=50, caller='sampled')['cached']
+        assert len(REQUESTS) == 6
+
+        # The disk cache outlives the client
+        other = make_client(base, tmp_path)
+        assert other.generate('hello there', temperature=0, max_tokens=50)['cached']
+        assert not other.generate('hello there', temperature=0.9, cache=True)['cached']
+        assert other.generate('hello there', temperature=0.9, cache=True)['cached']
+
+        stats = client.metrics()['tests']
+        assert stats['calls'] == 5 and stats['cache_hits'] == 1 and stats['errors'] == 0
+        assert stats['prompt_tokens'] == 28 and stats['completion_tokens'] == 12
+        assert stats['tokens_per_sec'] == 30.0
+
+        logged = summarize_metrics_log(tmp_path / 'calls.jsonl')
+        assert logged['tests']['calls'] == 5 and logged['default']['cache_hits'] == 2
+    finally:
+        server.shutdown()
+
+
+def test_cache_ttl_and_eviction(tmp_path):
+    cache = ResponseCache(tmp_path, ttl=60, max_entries=3)
+    for i in range(5):
+        cache.set(f"key{i}", {'response': str(i)})
+        path = tmp_path / f"key{i}.json"
+        stamp = time.time() - 10 + i
+        os.utime(path, (stamp, stamp))
+    assert cache.prune() == 2
+    assert cache.get('key0') is None and cache.get('key4') == {'response': '4'}
+
+    expired = ResponseCache(tmp_path, ttl=0)
+    time.sleep(0.01)
+    assert expired.get('key4') is None
+    assert not (tmp_path / 'key4.json').exists()
+
+
+def test_stream_yields_tokens_then_caches(tmp_path):
+    server, base = start_server()
+    try:
+        client = make_client(base, tmp_path)
+        REQUESTS.clear()
+        chunks = list(client.stream('one two three', temperature=0, caller='streamer'))
+        assert chunks == ['echo', ' one', ' two', ' three']
+        assert REQUESTS[0]['stream'] is True
+
+        assert list(client.stream('one two three', temperature=0, caller='streamer')) == ['echo one two three']
+        assert client.generate('one two three', temperature=0)['cached']
+        assert len(REQUESTS) == 1
+
+        # Abandoned stream: slot released, nothing cached
+        partial = client.stream('four five', temperature=0, caller='streamer')
+        next(partial)
+        partial.close()
+        assert not client.generate('four five', temperature=0)['cached']
+        assert client.metrics()['streamer']['completion_tokens'] == 4
+    finally:
+        server.shutdown()
+
+
+def test_concurrency_limit_spans_clients(tmp_path):
+    server, base = start_server()
+    try:
+        # Two "daemons" with separate clients share one machine-wide slot
+        clients = [make_client(base, tmp_path, max_concurrent=1) for _ in range(2)]
+        IN_FLIGHT['max'] = 0
+        results = {}
+        threads = [
+            threading.Thread(target=lambda i=i, c=c: results.__setitem__(
+                i, c.batch([f"prompt {i}-{n}" for n in range(3)], caller=f"daemon{i}", cache=False)))
+            for i, c in enumerate(clients)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert IN_FLIGHT['max'] == 1
+        assert [r['response'] for r in results[0]] == ['echo prompt 0-0', 'echo prompt 0-1', 'echo prompt 0-2']
+
+        wide = make_client(base, tmp_path / 'wide', max_concurrent=4)
+        IN_FLIGHT['max'] = 0
+        batch = wide.batch([f"p{n}" for n in range(8)] + ['fail'], cache=False)
+        assert IN_FLIGHT['max'] > 1
+        assert batch[-1] is None and batch[0]['response'] == 'echo p0'
+        assert wide.metrics()['default']['errors'] == 1
+    finally:
+        server.shutdown()
+
+
+def test_slot_waits_share_one_deadline(tmp_path):
+    client = LocalLLMClient(base_url='http://127.0.0.1:9', cache_dir=None, slot_dir=tmp_path / 'slots',
+                            metrics_log=None, max_concurrent=1)
+    held = local_llm.ProcessSlots(tmp_path / 'slots', 1).acquire(1)   # Another daemon owns the machine slot
+    client._semaphore.acquire()                                       # and this process is busy too
+    threading.Timer(0.3, client._semaphore.release).start()
+    started = time.monotonic()
+    try:
+        client._acquire(0.5)
+        assert False, 'slot acquired while held'
+    except LLMError:
+        pass
+    assert time.monotonic() - started < 0.7     # Not 0.3s + a fresh 0.5s
+
+    # Both freed: the next caller gets through
+    local_llm.ProcessSlots.release(held)
+    client._release(client._acquire(0.5))
+
+
+def test_metrics_log_rotates(tmp_path):
+    server, base = start_server()
+    original = local_llm.METRICS_LOG_MAX_BYTES
+    local_llm.METRICS_LOG_MAX_BYTES = 600
+    try:
+        client = make_client(base, tmp_path)
+        for n in range(40):
+            client.generate(f'prompt {n}', caller='rotating')
+        log = tmp_path / 'calls.jsonl'
+        rotated = [log.with_name(f'calls.jsonl.{i}') for i in (1, 2, 3, 4)]
+        assert all(path.exists() for path in rotated[:3]) and not rotated[3].exists()
+        assert all(path.stat().st_size < 600 + 300 for path in [log] + rotated[:3])
+
+        kept = sum(len(path.read_text().splitlines()) for path in [log] + rotated[:3])
+        assert kept < 40 and summarize_metrics_log(log)['rotating']['calls'] == kept
+    finally:
+        local_llm.METRICS_LOG_MAX_BYTES = original
+        server.shutdown()
+
+
+def test_errors_and_availability(tmp_path):
+    server, base = start_server()
+    try:
+        client = make_client(base, tmp_path)
+        assert client.models() == ['qwen2.5:14b', 'llama3.1:8b']
+        try:
+            client.generate('fail')
+            assert False, 'HTTP 500 not raised'
+        except LLMError:
+            pass
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    down = make_client(base, tmp_path)
+    assert not down.available()
+    try:
+        down.generate('hello again', timeout=1)
+        assert False, 'dead server not raised'
+    except LLMError:
+        pass
+
+
+def test_call_sites_use_shared_client(tmp_path):
+    from local_router import LocalRouter
+    from smart_escalation_engine import SmartEscalationEngine
+    import god_mode_analyzer
+
+    server, base = start_server()
+    previous = local_llm._client
+    local_llm._client = make_client(base, tmp_path)
+    try:
+        REQUESTS.clear()
+        routed = LocalRouter(workspace_dir=str(tmp_path)).call_ollama('route me', max_tokens=100)
+        assert routed['success'] and routed['response'] == 'echo route me'
+        assert routed['tokens'] == {'prompt': 7, 'completion': 3}
+        assert REQUESTS[-1]['options']['num_predict'] == 100
+
+        scored = SmartEscalationEngine()._call_ollama('llama3.1:8b', 'score me', system='be brief')
+        assert scored['response'] == 'echo score me' and REQUESTS[-1]['system'] == 'be brief'
+        assert god_mode_analyzer.call_local_ai('analyze me') == 'echo analyze me'
+
+        callers = local_llm._client.metrics()
+        assert {'local_router', 'smart_escalation', 'god_mode_analyzer'} <= set(callers)
+    finally:
+        local_llm._client = previous
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    for test in [test_generate_caches_and_records_metrics, test_cache_ttl_and_eviction,
+                 test_stream_yields_tokens_then_caches, test_concurrency_limit_spans_clients,
+                 test_slot_waits_share_one_deadline, test_metrics_log_rotates, test_errors_and_availability, test_call_sites_use_shared_client]:
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ Local LLM client tests passed")
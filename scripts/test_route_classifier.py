@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Tests for the route classifier fast path in the smart escalation engine
+A stand-in for the local LLM answers by keyword; no Ollama needed
+"""
+
+import json
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import smart_escalation_engine
+from route_classifier import RouteClassifier, load_examples, routing_stats, train_from_log
+from smart_escalation_engine import SCORING_MODEL, SmartEscalationEngine
+
+PLACES = ["paris", "tokyo", "nashville", "miami", "denver", "austin", "boston", "seattle", "chicago",
+          "london", "berlin", "orlando", "phoenix", "dallas", "atlanta", "portland", "detroit", "memphis",
+          "houston", "toronto", "madrid", "dublin", "oslo", "sydney", "lisbon", "prague", "seoul", "cairo"]
+LOCAL = ["what time is it in {}", "what's the weather in {} today", "show me today's notes about {}",
+         "when is my next meeting in {}"]
+CLOUD = ["design a distributed architecture for the {} office", "should i invest in {} real estate or index funds",
+         "write a strategic plan for launching in {}", "refactor the entire {} billing codebase for performance"]
+COMPLEX_WORDS = ("design", "invest", "strategic", "refactor", "plan")
+LLM_DELAY = 0.2
+
+
+def write_log(path, entries):
+    with open(path, "a") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+
+
+def legacy_entries():
+    """Decisions logged before the fast path existed (every one LLM-scored)"""
+    entries = []
+    for i, place in enumerate(PLACES):
+        for templates, route in ((LOCAL, "local"), (CLOUD, "cloud")):
+            for template in templates:
+                entries.append({"timestamp": f"2026-03-01T08:{i:02d}:00", "route": route,
+                                "query": template.format(place), "reason": "Local handling",
+                                "response_time_ms": 900})
+    return entries
+
+
+class FakeLLM:
+    """Scores by keyword, answers everything else; each call takes LLM_DELAY"""
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, model, prompt, system=None):
+        with self.lock:
+            self.calls.append(model)
+        time.sleep(LLM_DELAY)
+        if model == SCORING_MODEL:
+            query = prompt.split('"')[1].lower()
+            complex_query = any(word in query for word in COMPLEX_WORDS)
+            level = 80 if complex_query else 10
+            scores = {"overall": level, "factual_vs_reasoning": level, "data_retrieval": 10,
+                      "decision_making": level, "time_sensitivity": 10, "reversibility": 10,
+                      "confidence": 30 if complex_query else 95}
+            return {"response": json.dumps(scores), "eval_count": 40}
+        return {"response": "It's 3pm.", "eval_count": 5}
+
+
+def make_engine(tmp_path):
+    engine = SmartEscalationEngine()
+    engine.log_file = tmp_path / "escalation.log"
+    engine.cost_log = tmp_path / "escalation_cost_savings.json"
+    engine.shadow_log = tmp_path / "escalation_shadow.log"
+    engine.classifier_path = tmp_path / "escalation_router.npz"
+    engine.workspace = tmp_path
+    engine._call_ollama = FakeLLM()
+    return engine
+
+
+def test_classifier_learns_scorer_verdicts(tmp_path):
+    log = tmp_path / "escalation.log"
+    write_log(log, legacy_entries())
+    # Scorer said local, the local model bailed: the scorer's verdict is what gets learned
+    write_log(log, [{"timestamp": "2026-03-02T08:00:00", "route": "cloud", "query": "what time is it in lima",
+                     "reason": "Local model requested escalation"},
+                    {"timestamp": "2026-03-02T08:00:01", "route": "cloud", "query": "what time is it in rome",
+                     "reason": "Fast path: cloud (p_cloud=0.95)", "path": "fast_cloud", "scored_route": None}])
+    texts, labels = load_examples(log, tmp_path / "missing.log")
+    assert dict(zip(texts, labels))["what time is it in lima"] == 0
+    assert "what time is it in rome" not in texts   # Never scored: not a training example
+
+    classifier = train_from_log(log, tmp_path / "missing.log", tmp_path / "router.npz")
+    assert classifier.ready and classifier.meta["holdout"]["confident_agreement"] == 1.0
+
+    loaded = RouteClassifier.load(tmp_path / "router.npz")
+    assert loaded.ready and loaded.meta == classifier.meta
+    assert loaded.path_for(loaded.predict_proba("what time is it in vienna")) == "fast_local"
+    assert loaded.path_for(loaded.predict_proba("write a strategic plan for launching in vienna")) == "fast_cloud"
+
+    # Too little data: trained, but the engine must not trust it yet
+    small = tmp_path / "small.log"
+    write_log(small, legacy_entries()[:40])
+    assert not train_from_log(small, tmp_path / "missing.log", tmp_path / "small.npz").ready
+
+
+def test_engine_paths(tmp_path):
+    engine = make_engine(tmp_path)
+    llm = engine._call_ollama
+    original_rate = smart_escalation_engine.SHADOW_RATE
+    smart_escalation_engine.SHADOW_RATE = 0.0
+    try:
+        # No model yet: everything is scored, with local generation running alongside
+        started = time.perf_counter()
+        decision = engine.route_query("what time is it in paris")
+        assert time.perf_counter() - started < LLM_DELAY * 1.75
+        assert (decision.path, decision.route, decision.scored_route) == ("scored", "local", "local")
+        assert decision.local_response == "It's 3pm." and decision.p_cloud is None
+
+        decision = engine.route_query("design a distributed architecture for the paris office")
+        assert (decision.path, decision.route, decision.local_response) == ("scored", "cloud", None)
+
+        # Trained: confident queries skip the scorer
+        write_log(engine.log_file, legacy_entries())
+        assert train_from_log(engine.log_file, engine.shadow_log, engine.classifier_path).ready
+        llm.calls.clear()
+
+        decision = engine.route_query("what time is it in vienna")
+        assert (decision.path, decision.route, decision.local_response) == ("fast_local", "local", "It's 3pm.")
+        assert llm.calls == [smart_escalation_engine.RESPONSE_MODEL]
+
+        started = time.perf_counter()
+        decision = engine.route_query("should i invest in vienna real estate or index funds")
+        assert (decision.path, decision.route) == ("fast_cloud", "cloud") and decision.reason.startswith("Fast path")
+        assert time.perf_counter() - started < LLM_DELAY and len(llm.calls) == 1
+
+        # Shadow checks record the scorer's verdict on fast-path decisions
+        smart_escalation_engine.SHADOW_RATE = 1.0
+        engine.route_query("what's the weather in vienna today")
+        engine.pool.shutdown(wait=True)
+    finally:
+        smart_escalation_engine.SHADOW_RATE = original_rate
+
+    shadow = [json.loads(line) for line in engine.shadow_log.read_text().splitlines()]
+    assert [(s["path"], s["scored_route"]) for s in shadow] == [("fast_local", "local")]
+
+    logged = [json.loads(line) for line in engine.log_file.read_text().splitlines() if '"path"' in line]
+    assert [e["path"] for e in logged] == ["scored", "scored", "fast_local", "fast_cloud", "fast_local"]
+
+    stats = routing_stats(engine.log_file, engine.shadow_log)
+    assert stats["paths"]["fast_local"]["count"] == 2 and stats["paths"]["fast_cloud"]["count"] == 1
+    assert stats["agreement"]["confident"] == {"checked": 1, "agreement": 1.0}
+
+
+if __name__ == "__main__":
+    for test in [test_classifier_learns_scorer_verdicts, test_engine_paths]:
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ Route classifier tests passed")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for SecurityScanner's findings cache
+Each test uses its own cache file in a temporary directory
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import security_scanner
+from security_scanner import ScanCache, SecurityScanner
+
+SECRET = "sk-" + "a1B2c3D4e5F6g7H8i9J0k1L2m3N4"
+
+
+def make_scanner(tmp_path):
+    scanner = SecurityScanner(use_cache=False)
+    scanner.cache = ScanCache(tmp_path / "cache.json", scanner.rules_version)
+    return scanner
+
+
+def test_cache_hit_miss_and_invalidation(tmp_path):
+    scanner = make_scanner(tmp_path)
+    config = tmp_path / "config.py"
+    config.write_text(f'OPENAI = "{SECRET}"\n')
+
+    findings = scanner.scan_files([config])
+    assert [f["category"] for f in findings] == ["api_key"] and findings[0]["line"] == 1
+    assert SECRET not in findings[0]["match"] and findings[0]["match"].startswith("sk-a")
+    scanner.cache.save()
+    assert SECRET not in (tmp_path / "cache.json").read_text()
+
+    # Hit: unchanged size/mtime answers without reading the file
+    reloaded = ScanCache(tmp_path / "cache.json", scanner.rules_version)
+    assert reloaded.lookup_stat(str(config)) == findings
+
+    # Miss: content changed
+    config.write_text("OPENAI = os.getenv('OPENAI_API_KEY')\n")
+    assert reloaded.lookup_stat(str(config)) is None
+    scanner.cache = reloaded
+    assert scanner.scan_files([config]) == []
+    assert scanner.cache.lookup_stat(str(config)) == []
+
+    # Same content at another path reuses the result by digest
+    copy = tmp_path / "copy.py"
+    copy.write_text(config.read_text())
+    digest = scanner.cache.files[str(config)][2]
+    assert scanner.cache.findings_for(digest, str(copy)) == []
+
+
+def test_rules_change_invalidates_everything(tmp_path):
+    scanner = make_scanner(tmp_path)
+    config = tmp_path / "config.py"
+    config.write_text(f'OPENAI = "{SECRET}"\n')
+    scanner.scan_files([config])
+    assert json.loads((tmp_path / "cache.json").read_text())["files"]
+
+    scanner.whitelist.append(r'sk-a1B2')
+    scanner._compile()
+    fresh = ScanCache(tmp_path / "cache.json", scanner.rules_version)
+    assert fresh.files == {} and fresh.results == {}
+    scanner.cache = fresh
+    assert scanner.scan_files([config]) == []
+
+
+def test_file_changing_during_read_is_not_cached(tmp_path):
+    scanner = make_scanner(tmp_path)
+    config = tmp_path / "config.py"
+    config.write_text(f'OPENAI = "{SECRET}"\n')
+
+    # Size/mtime differ before and after the read, as if another write landed mid-read
+    original = ScanCache._stat_key
+    calls = []
+
+    def moving_stat(path):
+        calls.append(path)
+        key = original(path)
+        return key and [key[0], key[1] + len(calls)]
+
+    ScanCache._stat_key = staticmethod(moving_stat)
+    try:
+        assert len(scanner.scan_file(config)) == 1
+    finally:
+        ScanCache._stat_key = staticmethod(original)
+    assert str(config) not in scanner.cache.files
+
+
+def test_cache_files_are_never_scanned(tmp_path):
+    scanner = make_scanner(tmp_path)
+    leaked = tmp_path / "data" / "security_scan_cache.json"
+    leaked.parent.mkdir()
+    leaked.write_text(json.dumps({"results": {"x:txt": [{"match": SECRET}]}}))
+    assert scanner.scan_directory(tmp_path) == []
+    assert not str(security_scanner.CACHE_FILE).startswith(str(security_scanner.WORKSPACE) + os.sep)
+
+
+if __name__ == "__main__":
+    for test in [test_cache_hit_miss_and_invalidation, test_rules_change_invalidates_everything,
+                 test_file_changing_during_read_is_not_cached, test_cache_files_are_never_scanned]:
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ Security scanner cache tests passed")
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared time-series observation store
+Runs against a temporary SQLite file
+"""
+
+import json
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import flight_monitor
+from timeseries_store import TimeSeriesStore
+
+T0 = datetime(2026, 3, 1, 8, 0).timestamp()
+HOUR = 3600
+
+
+def test_latest_range_and_seen(tmp_path):
+    store = TimeSeriesStore(tmp_path / 'ts.db')
+    for i, temp in enumerate([61, 64, 70, 66]):
+        store.record('weather', 'nolensville_tn', temp, {'temperature': temp}, ts=T0 + i * HOUR)
+    store.record('weather', 'miami_fl', 80, ts=T0 + HOUR)
+    store.record('jobs', 'https://example.com/jobs/1', 9, {'title': 'Food Scientist'}, ts=T0)
+
+    latest = store.latest('weather', 'nolensville_tn')
+    assert (latest.value, latest.data, latest.ts) == (66, {'temperature': 66}, T0 + 3 * HOUR)
+    assert store.latest('weather', 'nolensville_tn', before=T0 + 2 * HOUR).value == 64
+    assert store.latest('weather', 'orlando_fl') is None
+    assert {e: o.value for e, o in store.latest_all('weather').items()} == {'nolensville_tn': 66, 'miami_fl': 80}
+
+    assert [o.value for o in store.range('weather', 'nolensville_tn', start=T0 + HOUR, end=T0 + 3 * HOUR)] == [64, 70]
+    assert [(o.entity, o.value) for o in store.range('weather', start=T0 + HOUR, end=T0 + 2 * HOUR)] == [
+        ('miami_fl', 80), ('nolensville_tn', 64)]
+    assert [o.value for o in store.recent('weather', 'nolensville_tn', 2)] == [70, 66]
+
+    # Same key replaces; ISO strings and datetimes are accepted as timestamps
+    store.record('weather', 'miami_fl', 82, ts=datetime.fromtimestamp(T0 + HOUR).isoformat())
+    assert store.latest('weather', 'miami_fl').value == 82 and len(store.range('weather', 'miami_fl')) == 1
+
+    assert store.seen('jobs', ['https://example.com/jobs/1', 'https://example.com/jobs/2']) == {
+        'https://example.com/jobs/1'}
+    assert store.stats()['weather'] == {'rows': 5, 'entities': 2, 'first': T0, 'last': T0 + 3 * HOUR,
+                                        'retention_days': None}
+
+
+def test_retention_and_changes(tmp_path):
+    store = TimeSeriesStore(tmp_path / 'ts.db')
+    day = 86400
+    store.set_retention('flights', 30)
+    for days_ago in (40, 31, 10, 1):
+        store.record('flights', 'a', 300 - days_ago, ts=T0 - days_ago * day)
+    store.record('jobs', 'old', ts=T0 - 400 * day)   # No policy: kept forever
+
+    assert store.prune(now=T0) == {'flights': 2}
+    assert [o.value for o in store.range('flights')] == [290, 299]
+    assert store.latest('jobs', 'old') is not None
+
+    store.record_many('flights', [('a', 330, None), ('b', 250, None)], ts=T0)
+    store.record('flights', 'b', 240, ts=T0 + HOUR)
+    store.record('flights', 'c', 100, ts=T0 + HOUR)   # Only one observation: no change yet
+
+    changes = store.changes('flights', min_delta=20)
+    assert [(c.entity, c.previous.value, c.current.value, c.delta) for c in changes] == [('a', 299, 330, 31)]
+    assert [c.entity for c in store.changes('flights')] == ['a', 'b']
+    assert [c.delta for c in store.changes('flights', since=T0 + HOUR)] == [-10]
+
+
+def test_flight_monitor_alerts(tmp_path):
+    store = TimeSeriesStore(tmp_path / 'ts.db')
+
+    def flights(*prices):
+        combos = [(d, r) for d in flight_monitor.ROUTE['depart_dates'] for r in flight_monitor.ROUTE['return_dates']]
+        return [{'depart_date': d, 'return_date': r, 'price': p, 'airline': 'Delta', 'stops': 0,
+                 'duration': '4h 10m', 'booking_url': 'https://example.com'} for (d, r), p in zip(combos, prices)]
+
+    first = flight_monitor.record_check(store, flights(300, 280, 310, 290), ts=T0)
+    assert flight_monitor.analyze_price_changes(store, since=first) == []
+
+    second = flight_monitor.record_check(store, flights(270, 285, 335, 290), ts=T0 + HOUR)
+    alerts = flight_monitor.analyze_price_changes(store, since=second)
+    assert [(a['type'], a['old_price'], a['new_price']) for a in alerts] == [
+        ('price_drop', 300, 270), ('price_increase', 310, 335)]
+    assert alerts[0]['message'] == '🔽 Price dropped $30'
+
+    latest = flight_monitor.latest_flights(store)
+    assert sorted(f['price'] for f in latest) == [270, 285, 290, 335]
+    report = flight_monitor.generate_report(latest, alerts, store)
+    assert '## 📈 PRICE TRENDS' in report and '- Lowest: $270' in report
+
+
+def test_flight_monitor_imports_legacy_json(tmp_path):
+    legacy = tmp_path / 'flight_prices.json'
+    legacy.write_text(json.dumps({'checks': [
+        {'timestamp': '2026-02-13T14:30:00',
+         'flights': [{'depart_date': '2026-04-23', 'return_date': '2026-04-26', 'price': 265}]},
+        {'timestamp': '2026-02-14T14:30:00',
+         'flights': [{'depart_date': '2026-04-23', 'return_date': '2026-04-26', 'price': 240}]},
+    ]}))
+    original = flight_monitor.DATA_FILE
+    flight_monitor.DATA_FILE = legacy
+    try:
+        store = TimeSeriesStore(tmp_path / 'ts.db')
+        assert flight_monitor.import_legacy_history(store) == 2
+        assert flight_monitor.import_legacy_history(store) == 0
+    finally:
+        flight_monitor.DATA_FILE = original
+    assert (tmp_path / 'flight_prices.json.imported').exists()
+    assert [o.value for o in store.range('flights', '2026-04-23>2026-04-26')] == [265, 240]
+
+
+if __name__ == '__main__':
+    for test in [test_latest_range_and_seen, test_retention_and_changes, test_flight_monitor_alerts,
+                 test_flight_monitor_imports_legacy_json]:
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ Time-series store tests passed")
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Tests for the batched Open-Meteo fetch and hourly forecast cache
+A stand-in for the API answers from generated data; no network needed
+"""
+
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+import weather_cache
+from weather_cache import HourlyForecast, fetch_forecasts, refresh
+
+LOCATIONS = {
+    "nolensville_tn": {"name": "Nolensville, TN", "lat": 35.9523, "lon": -86.6694, "primary": True},
+    "miami_fl": {"name": "Miami, FL", "lat": 25.7617, "lon": -80.1918, "primary": False},
+}
+START = date(2026, 3, 1)
+
+
+def fake_response(base_temp):
+    hours = [datetime.combine(START, datetime.min.time()) + timedelta(hours=h) for h in range(48)]
+    return {
+        "current": {"temperature_2m": base_temp, "weather_code": 1},
+        "daily": {"time": [START.isoformat(), (START + timedelta(days=1)).isoformat()],
+                  "temperature_2m_max": [base_temp + 10, base_temp + 12]},
+        "hourly": {
+            "time": [h.strftime("%Y-%m-%dT%H:%M") for h in hours],
+            "temperature_2m": [base_temp + h.hour / 2 for h in hours],
+            "apparent_temperature": [base_temp + h.hour / 2 for h in hours],
+            "precipitation_probability": [80 if 14 <= h.hour <= 16 else 10 for h in hours],
+            "wind_speed_10m": [25 if h.hour < 9 else 5 for h in hours],
+            "weather_code": [61 if 14 <= h.hour <= 16 else 2 for h in hours],
+            "uv_index": [None] * len(hours),
+        },
+    }
+
+
+class FakeAPI:
+    def __init__(self):
+        self.forecast_calls = []
+        self.meta_calls = 0
+        self.model_run = 1_000_000
+        self.meta_down = False
+
+    def __call__(self, url, timeout=10):
+        if url == weather_cache.MODEL_META_URL:
+            self.meta_calls += 1
+            if self.meta_down:
+                raise OSError("meta unavailable")
+            return {"last_run_availability_time": self.model_run}
+        self.forecast_calls.append(url)
+        query = parse_qs(urlparse(url).query)
+        lats = query["latitude"][0].split(",")
+        responses = [fake_response(50 + 20 * i) for i in range(len(lats))]
+        return responses if len(responses) > 1 else responses[0]
+
+
+def test_one_request_for_all_locations():
+    api = FakeAPI()
+    forecasts = fetch_forecasts(LOCATIONS, open_json=api)
+    assert len(api.forecast_calls) == 1
+    query = parse_qs(urlparse(api.forecast_calls[0]).query)
+    assert query["latitude"] == ["35.9523,25.7617"] and query["longitude"] == ["-86.6694,-80.1918"]
+    assert "precipitation_probability" in query["hourly"][0].split(",")
+    assert [f["current"]["temperature_2m"] for f in forecasts.values()] == [50, 70]
+
+    # A single location comes back as an object rather than a list
+    single = fetch_forecasts({"miami_fl": LOCATIONS["miami_fl"]}, open_json=api)
+    assert list(single) == ["miami_fl"] and single["miami_fl"]["current"]["temperature_2m"] == 50
+
+
+def test_hourly_queries(tmp_path):
+    api = FakeAPI()
+    forecast, fetched, _ = refresh(LOCATIONS, path=tmp_path / "hourly.npz", open_json=api)
+    assert fetched and forecast.series_by_variable["temperature_2m"].shape == (2, 48)
+
+    loaded = HourlyForecast.load(tmp_path / "hourly.npz")
+    assert loaded.location_ids == ["nolensville_tn", "miami_fl"]
+    assert loaded.series("miami_fl", "temperature_2m")[10] == 75.0
+    assert np.isnan(loaded.series("miami_fl", "uv_index")).all()
+
+    at = loaded.at("nolensville_tn", datetime(2026, 3, 2, 6, 45))
+    assert at["temperature_2m"] == 53.0 and at["uv_index"] is None
+    assert loaded.at("nolensville_tn", datetime(2026, 3, 9, 12)) is None
+    current = loaded.current("nolensville_tn", datetime(2026, 3, 1, 15, 10))
+    assert current["temperature_2m"] == 57.5 and current["weather_code"] == 61
+
+    window = loaded.window("miami_fl", datetime(2026, 3, 1, 6), datetime(2026, 3, 1, 9))
+    assert [str(t)[11:16] for t in window["time"]] == ["06:00", "07:00", "08:00"]
+    assert loaded.rain_hours("nolensville_tn", START) == ["14:00", "15:00", "16:00"]
+
+    # Windy early, rainy mid-afternoon: mid-morning tee times win
+    best = loaded.best_hours("nolensville_tn", START, first_hour=7, last_hour=17)
+    assert best == [("09:00", 100), ("10:00", 100), ("11:00", 100)]
+
+
+def test_conditional_refresh(tmp_path):
+    api = FakeAPI()
+    path = tmp_path / "hourly.npz"
+    refresh(LOCATIONS, path=path, open_json=api)
+    assert len(api.forecast_calls) == 1
+
+    # Checked recently: no network at all
+    _, fetched, reason = refresh(LOCATIONS, path=path, open_json=api)
+    assert not fetched and reason == "checked recently" and api.meta_calls == 1
+
+    # Later, same model run: only the run metadata is read
+    cached = HourlyForecast.load(path)
+    cached.meta["checked_at"] -= weather_cache.MIN_CHECK_INTERVAL + 1
+    cached.save(path)
+    _, fetched, reason = refresh(LOCATIONS, path=path, open_json=api)
+    assert not fetched and reason == "model run unchanged" and len(api.forecast_calls) == 1
+
+    # A new run is out
+    api.model_run += 6 * 3600
+    cached = HourlyForecast.load(path)
+    cached.meta["checked_at"] -= weather_cache.MIN_CHECK_INTERVAL + 1
+    cached.save(path)
+    _, fetched, reason = refresh(LOCATIONS, path=path, open_json=api)
+    assert fetched and reason == "new model run" and len(api.forecast_calls) == 2
+    assert HourlyForecast.load(path).meta["model_run"] == api.model_run
+
+    # Run metadata down: fall back to the cache's age
+    api.meta_down = True
+    cached = HourlyForecast.load(path)
+    cached.meta["checked_at"] = cached.meta["fetched_at"] = time.time() - weather_cache.MAX_CACHE_AGE - 1
+    cached.save(path)
+    _, fetched, reason = refresh(LOCATIONS, path=path, open_json=api)
+    assert fetched and reason == "model run unknown, cache stale"
+
+    # Locations edited: refetch immediately
+    moved = {**LOCATIONS, "orlando_fl": {"name": "Orlando, FL", "lat": 28.5383, "lon": -81.3792}}
+    forecast, fetched, reason = refresh(moved, path=path, open_json=api)
+    assert fetched and reason == "locations changed" and len(forecast.location_ids) == 3
+
+
+if __name__ == "__main__":
+    test_one_request_for_all_locations()
+    for test in [test_hourly_queries, test_conditional_refresh]:
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ Weather cache tests passed")
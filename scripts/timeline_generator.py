@@ -16,15 +16,15 @@ Predictions at: 1m, 3m, 6m, 1y, 2y, 5y, 10y
 """
 
 import json
-import urllib.request
 from pathlib import Path
 from datetime import datetime
 
+from local_llm import get_client
+
 WORKSPACE = Path.home() / "clawd"
 GOD_MODE_DATA = WORKSPACE / "god_mode" / "insights.json"
 REVENUE_DATA = WORKSPACE / "revenue" / "opportunities.json"
 OUTPUT_FILE = WORKSPACE / "multiverse" / "timelines.json"
-OLLAMA_URL = "http://localhost:11434/api/generate"
 
 OUTPUT_FILE.parent.mkdir(exist_ok=True)
 
@@ -57,22 +57,14 @@ def load_data():
 def call_local_ai(prompt, temperature=0.6):
     """Call local AI for timeline generation"""
     try:
-        data = json.dumps({
-            "model": "qwen2.5:14b",
-            "prompt": prompt,
-            "temperature": temperature,
-            "stream": False
-        }).encode('utf-8')
-        
-        req = urllib.request.Request(
-            OLLAMA_URL,
-            data=data,
-            headers={'Content-Type': 'application/json'}
+        result = get_client().generate(
+            prompt,
+            model="qwen2.5:14b",
+            temperature=temperature,
+            caller="timeline_generator",
+            timeout=180
         )
-        
-        with urllib.request.urlopen(req, timeout=180) as response:
-            result = json.loads(response.read().decode('utf-8'))
-            return result.get("response")
+        return result["response"]
     except Exception as e:
         print(f"AI error: {e}")
         return None
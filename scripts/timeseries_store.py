@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Time-Series Store - Shared observation history for the polling monitors
+
+One SQLite table keyed by (series, entity, ts) as a WITHOUT ROWID table, so
+rows are stored in key order and "latest value for an entity" is a single
+B-tree descent instead of loading and scanning a JSON file.
+
+    series   what is being watched        'flights', 'jobs', 'weather'
+    entity   the thing within the series  '2026-04-23>2026-04-26', a job URL
+    ts       unix seconds of the observation
+    value    the number worth comparing   price, score, temperature
+    data     JSON payload with the full record
+
+Retention is per series (max age in days) and enforced with a range delete.
+Change detection ("latest vs previous observation, per entity") is a query.
+
+Usage:
+    python timeseries_store.py                    # Series, row counts, retention
+    python timeseries_store.py latest <series>    # Latest observation per entity
+    python timeseries_store.py prune              # Apply retention policies
+"""
+
+import json
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+STORE_PATH = Path.home() / "clawd" / "data" / "timeseries.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS observations (
+    series TEXT NOT NULL,
+    entity TEXT NOT NULL,
+    ts REAL NOT NULL,
+    value REAL,
+    data TEXT,
+    PRIMARY KEY (series, entity, ts)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS observations_by_time ON observations (series, ts);
+CREATE TABLE IF NOT EXISTS retention (
+    series TEXT PRIMARY KEY,
+    max_age_days REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class Observation(NamedTuple):
+    entity: str
+    ts: float
+    value: Optional[float]
+    data: Optional[Dict]
+
+    @property
+    def time(self) -> datetime:
+        return datetime.fromtimestamp(self.ts)
+
+
+class Change(NamedTuple):
+    entity: str
+    current: Observation
+    previous: Observation
+
+    @property
+    def delta(self) -> float:
+        return self.current.value - self.previous.value
+
+
+def _observation(row) -> Observation:
+    entity, ts, value, data = row
+    return Observation(entity, ts, value, json.loads(data) if data else None)
+
+
+def _timestamp(ts) -> float:
+    if ts is None:
+        return time.time()
+    if isinstance(ts, datetime):
+        return ts.timestamp()
+    if isinstance(ts, str):
+        return datetime.fromisoformat(ts).timestamp()
+    return float(ts)
+
+
+class TimeSeriesStore:
+    """
+    Embedded observation store (safe to share between threads)
+
+    Args:
+        path: SQLite file; created on first use
+    """
+
+    def __init__(self, path: Path = STORE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def _query(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def record(self, series: str, entity: str, value: Optional[float] = None, data: Optional[Dict] = None,
+               ts=None) -> float:
+        """Add one observation (same series/entity/ts replaces it); returns its timestamp"""
+        return self.record_many(series, [(entity, value, data)], ts=ts)
+
+    def record_many(self, series: str, rows: Iterable[Tuple[str, Optional[float], Optional[Dict]]], ts=None) -> float:
+        """Add (entity, value, data) observations sharing one timestamp, in one transaction"""
+        ts = _timestamp(ts)
+        params = [(series, entity, ts, value, json.dumps(data) if data is not None else None)
+                  for entity, value, data in rows]
+        with self.lock, self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO observations VALUES (?, ?, ?, ?, ?)", params)
+        return ts
+
+    def set_retention(self, series: str, days: float):
+        """Keep `days` of history for a series (enforced by prune())"""
+        with self.lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO retention VALUES (?, ?)", (series, days))
+
+    def prune(self, now=None) -> Dict[str, int]:
+        """Apply every retention policy -> {series: rows deleted}"""
+        now = _timestamp(now)
+        deleted = {}
+        with self.lock, self.conn:
+            for series, days in self.conn.execute("SELECT series, max_age_days FROM retention").fetchall():
+                cursor = self.conn.execute("DELETE FROM observations WHERE series = ? AND ts < ?",
+                                           (series, now - days * 86400))
+                if cursor.rowcount:
+                    deleted[series] = cursor.rowcount
+        return deleted
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def latest(self, series: str, entity: str, before=None) -> Optional[Observation]:
+        """Newest observation of one entity (optionally strictly before a time)"""
+        rows = self._query(
+            "SELECT entity, ts, value, data FROM observations WHERE series = ? AND entity = ? AND ts < ? "
+            "ORDER BY ts DESC LIMIT 1",
+            (series, entity, _timestamp(before) if before is not None else float('inf')))
+        return _observation(rows[0]) if rows else None
+
+    def latest_all(self, series: str) -> Dict[str, Observation]:
+        """Newest observation of every entity in a series"""
+        # SQLite takes bare columns from the row that supplied MAX(ts)
+        rows = self._query(
+            "SELECT entity, MAX(ts), value, data FROM observations WHERE series = ? GROUP BY entity",
+            (series,))
+        return {row[0]: _observation(row) for row in rows}
+
+    def range(self, series: str, entity: Optional[str] = None, start=None, end=None) -> List[Observation]:
+        """Observations in [start, end), oldest first; all entities unless one is given"""
+        lo = _timestamp(start) if start is not None else float('-inf')
+        hi = _timestamp(end) if end is not None else float('inf')
+        if entity is None:
+            rows = self._query(
+                "SELECT entity, ts, value, data FROM observations WHERE series = ? AND ts >= ? AND ts < ? "
+                "ORDER BY ts, entity", (series, lo, hi))
+        else:
+            rows = self._query(
+                "SELECT entity, ts, value, data FROM observations WHERE series = ? AND entity = ? "
+                "AND ts >= ? AND ts < ? ORDER BY ts", (series, entity, lo, hi))
+        return [_observation(row) for row in rows]
+
+    def recent(self, series: str, entity: str, count: int) -> List[Observation]:
+        """Last `count` observations of one entity, oldest first"""
+        rows = self._query(
+            "SELECT entity, ts, value, data FROM observations WHERE series = ? AND entity = ? "
+            "ORDER BY ts DESC LIMIT ?", (series, entity, count))
+        return [_observation(row) for row in reversed(rows)]
+
+    def seen(self, series: str, entities: Iterable[str]) -> Set[str]:
+        """Which of these entities have any observation in the series"""
+        entities = list(dict.fromkeys(entities))
+        found = set()
+        for start in range(0, len(entities), 500):
+            chunk = entities[start:start + 500]
+            rows = self._query(
+                f"SELECT DISTINCT entity FROM observations WHERE series = ? "
+                f"AND entity IN ({','.join('?' * len(chunk))})", (series, *chunk))
+            found.update(row[0] for row in rows)
+        return found
+
+    def changes(self, series: str, min_delta: float = 0, since=None) -> List[Change]:
+        """
+        Entities whose latest value moved by at least `min_delta` since their
+        previous observation; `since` limits it to latest observations at or
+        after that time (e.g. the check that was just recorded)
+        """
+        rows = self._query(
+            """
+            WITH last AS (
+                SELECT entity, MAX(ts) AS ts FROM observations WHERE series = :series GROUP BY entity
+            ), pairs AS (
+                SELECT last.entity, last.ts AS ts,
+                       (SELECT MAX(p.ts) FROM observations p
+                        WHERE p.series = :series AND p.entity = last.entity AND p.ts < last.ts) AS prev_ts
+                FROM last WHERE last.ts >= :since
+            )
+            SELECT cur.entity, cur.ts, cur.value, cur.data, prev.entity, prev.ts, prev.value, prev.data
+            FROM pairs
+            JOIN observations cur ON cur.series = :series AND cur.entity = pairs.entity AND cur.ts = pairs.ts
+            JOIN observations prev ON prev.series = :series AND prev.entity = pairs.entity AND prev.ts = pairs.prev_ts
+            WHERE ABS(cur.value - prev.value) >= :min_delta
+            ORDER BY cur.entity
+            """,
+            {'series': series, 'min_delta': min_delta,
+             'since': _timestamp(since) if since is not None else float('-inf')})
+        return [Change(row[0], _observation(row[:4]), _observation(row[4:])) for row in rows]
+
+    def stats(self) -> Dict[str, Dict]:
+        rows = self._query(
+            "SELECT o.series, COUNT(*), COUNT(DISTINCT o.entity), MIN(o.ts), MAX(o.ts), r.max_age_days "
+            "FROM observations o LEFT JOIN retention r ON r.series = o.series GROUP BY o.series")
+        return {series: {'rows': count, 'entities': entities, 'first': first, 'last': last, 'retention_days': days}
+                for series, count, entities, first, last, days in rows}
+
+
+_store: Optional[TimeSeriesStore] = None
+
+
+def get_store() -> TimeSeriesStore:
+    """Process-wide store at STORE_PATH"""
+    global _store
+    if _store is None:
+        _store = TimeSeriesStore()
+    return _store
+
+
+if __name__ == "__main__":
+    store = get_store()
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+
+    if command == "latest" and len(sys.argv) > 2:
+        for entity, obs in sorted(store.latest_all(sys.argv[2]).items()):
+            print(f"   {entity}: {obs.value}  ({obs.time.strftime('%Y-%m-%d %H:%M')})")
+    elif command == "prune":
+        deleted = store.prune()
+        print(f"🧹 Pruned {sum(deleted.values())} observations {deleted if deleted else ''}")
+    else:
+        print(f"📈 {store.path}")
+        for series, info in store.stats().items():
+            keep = f"{info['retention_days']:g}d" if info['retention_days'] else "forever"
+            last = datetime.fromtimestamp(info['last']).strftime('%Y-%m-%d %H:%M')
+            print(f"   {series}: {info['rows']} rows, {info['entities']} entities, last {last}, keep {keep}")
@@ -5,9 +5,10 @@ Usage: python3 use_local_model.py <task_type> <prompt>
 """
 
 import sys
-import subprocess
 import json
 
+from local_llm import LLMError, get_client
+
 # Model routing configuration
 MODEL_ROUTING = {
     "code": "qwen2.5:32b-instruct-q4_K_M",  # Best for code generation
@@ -20,17 +21,20 @@ MODEL_ROUTING = {
 def run_local_model(model, prompt):
     """Run Ollama model with given prompt"""
     try:
-        result = subprocess.run(
-            ["ollama", "run", model, prompt],
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
-        return result.stdout
-    except subprocess.TimeoutExpired:
-        return "Error: Model timeout (60s exceeded)"
-    except Exception as e:
-        return f"Error: {str(e)}"
+        return get_client().generate(prompt, model=model, caller="use_local_model", timeout=60,
+                                    cache=False)["response"]
+    except LLMError as e:
+        return f"Error: {e}"
+
+def stream_local_model(model, prompt):
+    """Print the response as the model generates it"""
+    try:
+        for text in get_client().stream(prompt, model=model, caller="use_local_model", timeout=60,
+                                        cache=False):
+            print(text, end="", flush=True)
+        print()
+    except LLMError as e:
+        print(f"\nError: {e}")
 
 def main():
     if len(sys.argv) < 3:
@@ -51,8 +55,7 @@ def main():
     print(f"Prompt: {prompt}\n")
     print("=" * 60)
     
-    response = run_local_model(model, prompt)
-    print(response)
+    stream_local_model(model, prompt)
 
 if __name__ == "__main__":
     main()
@@ -16,19 +16,36 @@ Flow: Voice → Transcript → Intent → Action → Response
 
 import json
 import re
+import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, Tuple, Optional, List
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from voice.intent_matcher import IntentMatcher
+
 # Data paths
 DATA_DIR = Path("/Users/clawdbot/clawd/data")
 FITNESS_DATA = DATA_DIR / "fitness_data.json"
 SHOPPING_LIST = DATA_DIR / "shopping_list.json"
 VOICE_LOG = Path("/Users/clawdbot/clawd/logs/voice-commands.log")
 
+# Extraction patterns (compiled once, reused for every transcript)
+WEIGHT_RE = re.compile(r"(\d+)\s*(pounds|lbs|kg)", re.IGNORECASE)
+REPS_RE = re.compile(r"(\d+)\s*reps", re.IGNORECASE)
+SETS_RE = re.compile(r"(\d+)\s*sets", re.IGNORECASE)
+CALORIES_RE = re.compile(r"(\d+)\s*(calories|cals)", re.IGNORECASE)
+SHOPPING_ADD_RE = re.compile(r"add\s+(.+?)\s+to", re.IGNORECASE)
+SHOPPING_NEED_RE = re.compile(r"need\s+to\s+(?:buy|get)\s+(.+)", re.IGNORECASE)
+REMINDER_RE = re.compile(r"remind\s+me\s+to\s+(.+?)\s+(?:in|at)\s+(.+)", re.IGNORECASE)
+PLAY_RE = re.compile(r"play\s+(.+?)(?:\s+playlist|\s+music|$)", re.IGNORECASE)
+
 class VoiceRouter:
     def __init__(self):
         self.intents = self._load_intents()
+        self.matcher = IntentMatcher({
+            name: config["patterns"] for name, config in self.intents.items()
+        })
     
     def _load_intents(self) -> Dict:
         """Load intent patterns and handlers"""
@@ -152,16 +169,13 @@ class VoiceRouter:
         transcript = transcript.lower().strip()
         scores = {}
         
+        # One keyword-gated pass scores every intent at once
+        scanned = self.matcher.scan(transcript)
+        
         for intent_name, intent_config in self.intents.items():
-            score = 0
-            matches = []
-            
-            for pattern in intent_config["patterns"]:
-                if re.search(pattern, transcript, re.IGNORECASE):
-                    score += 30  # Increased from 20
-                    match = re.search(pattern, transcript, re.IGNORECASE)
-                    if match:
-                        matches.append(match.group(0))
+            hit = scanned.get(intent_name)
+            matches = hit.matches if hit else []
+            score = 30 * len(matches)  # Increased from 20
             
             # Boost score based on intent type
             if score > 0:
@@ -191,16 +205,16 @@ class VoiceRouter:
         
         if "workout" in intent:
             # Extract exercise, weight, reps
-            weight_match = re.search(r"(\d+)\s*(pounds|lbs|kg)", transcript, re.IGNORECASE)
+            weight_match = WEIGHT_RE.search(transcript)
             if weight_match:
                 data["weight"] = int(weight_match.group(1))
                 data["unit"] = weight_match.group(2)
             
-            reps_match = re.search(r"(\d+)\s*reps", transcript, re.IGNORECASE)
+            reps_match = REPS_RE.search(transcript)
             if reps_match:
                 data["reps"] = int(reps_match.group(1))
             
-            sets_match = re.search(r"(\d+)\s*sets", transcript, re.IGNORECASE)
+            sets_match = SETS_RE.search(transcript)
             if sets_match:
                 data["sets"] = int(sets_match.group(1))
             
@@ -216,30 +230,30 @@ class VoiceRouter:
             data["food_items"] = transcript  # Simple passthrough
             
             # Extract calories if mentioned
-            cal_match = re.search(r"(\d+)\s*(calories|cals)", transcript, re.IGNORECASE)
+            cal_match = CALORIES_RE.search(transcript)
             if cal_match:
                 data["calories"] = int(cal_match.group(1))
         
         elif "shopping" in intent:
             # Extract item to add
-            add_match = re.search(r"add\s+(.+?)\s+to", transcript, re.IGNORECASE)
+            add_match = SHOPPING_ADD_RE.search(transcript)
             if add_match:
                 data["item"] = add_match.group(1).strip()
             else:
-                need_match = re.search(r"need\s+to\s+(?:buy|get)\s+(.+)", transcript, re.IGNORECASE)
+                need_match = SHOPPING_NEED_RE.search(transcript)
                 if need_match:
                     data["item"] = need_match.group(1).strip()
         
         elif "reminder" in intent:
             # Extract reminder text and time
-            remind_match = re.search(r"remind\s+me\s+to\s+(.+?)\s+(?:in|at)\s+(.+)", transcript, re.IGNORECASE)
+            remind_match = REMINDER_RE.search(transcript)
             if remind_match:
                 data["reminder_text"] = remind_match.group(1).strip()
                 data["time_text"] = remind_match.group(2).strip()
         
         elif "music" in intent and "play" in intent:
             # Extract playlist/song name
-            play_match = re.search(r"play\s+(.+?)(?:\s+playlist|\s+music|$)", transcript, re.IGNORECASE)
+            play_match = PLAY_RE.search(transcript)
             if play_match:
                 data["music_name"] = play_match.group(1).strip()
         
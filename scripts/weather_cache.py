@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Hourly Weather Cache
+One batched Open-Meteo request for every location, kept on disk as NumPy
+arrays so morning briefs, golf tee-time planning, etc. can query the hourly
+forecast without refetching.
+
+Layout of data/weather_hourly.npz:
+    location_ids   (L,)      location keys, in request order
+    time           (H,)      datetime64[m], local time (America/Chicago)
+    <variable>     (L, H)    float32 per hourly variable, NaN where missing
+    meta           ()        JSON: fetched_at, checked_at, model_run, coordinates,
+                             raw current/daily blocks per location
+
+Refreshing is conditional: the forecast is only refetched when the upstream
+model has published a newer run than the one cached (or the cache is older
+than MAX_CACHE_AGE when the run metadata can't be read).
+
+Usage:
+    python weather_cache.py                      # Cache status
+    python weather_cache.py tee-times [location] # Best golf hours tomorrow
+"""
+
+import json
+import sys
+import time
+import urllib.error
+import urllib.parse
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from http_pool import get_session
+
+CACHE_FILE = Path("/Users/clawdbot/clawd/data/weather_hourly.npz")
+
+FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+# Run metadata for the global model behind the multi-day forecast (GFS, new run every 6h)
+MODEL_META_URL = "https://api.open-meteo.com/data/ncep_gfs013/static/meta.json"
+TIMEZONE = "America/Chicago"
+FORECAST_DAYS = 6
+MIN_CHECK_INTERVAL = 15 * 60    # Don't even ask about model runs more often than this
+MAX_CACHE_AGE = 3 * 3600        # Refetch regardless when run metadata is unavailable
+
+CURRENT_VARIABLES = [
+    "temperature_2m", "relative_humidity_2m", "apparent_temperature",
+    "precipitation", "weather_code", "wind_speed_10m", "wind_direction_10m",
+]
+DAILY_VARIABLES = [
+    "weather_code", "temperature_2m_max", "temperature_2m_min",
+    "precipitation_probability_max", "uv_index_max", "wind_speed_10m_max",
+]
+HOURLY_VARIABLES = [
+    "temperature_2m", "relative_humidity_2m", "apparent_temperature",
+    "precipitation_probability", "precipitation", "weather_code",
+    "wind_speed_10m", "wind_direction_10m", "wind_gusts_10m", "uv_index",
+]
+
+
+def _open_json(url: str, timeout: int = 10):
+    # Shared pooled session; its errors are OSError/ValueError subclasses like urllib's
+    response = get_session().get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+
+def forecast_url(locations: Dict[str, Dict]) -> str:
+    """Single request URL covering every location (comma-separated coordinates)"""
+    params = {
+        "latitude": ",".join(str(loc["lat"]) for loc in locations.values()),
+        "longitude": ",".join(str(loc["lon"]) for loc in locations.values()),
+        "current": ",".join(CURRENT_VARIABLES),
+        "hourly": ",".join(HOURLY_VARIABLES),
+        "daily": ",".join(DAILY_VARIABLES),
+        "temperature_unit": "fahrenheit",
+        "wind_speed_unit": "mph",
+        "precipitation_unit": "inch",
+        "timezone": TIMEZONE,
+        "forecast_days": FORECAST_DAYS,
+    }
+    return f"{FORECAST_URL}?{urllib.parse.urlencode(params, safe=',')}"
+
+
+def fetch_forecasts(locations: Dict[str, Dict], open_json: Callable = _open_json) -> Dict[str, Dict]:
+    """location_id -> raw Open-Meteo response, from one request"""
+    data = open_json(forecast_url(locations))
+    if isinstance(data, dict):
+        data = [data]   # A single coordinate pair comes back as an object, not a list
+    if len(data) != len(locations):
+        raise ValueError(f"Expected {len(locations)} forecasts, got {len(data)}")
+    return dict(zip(locations, data))
+
+
+def fetch_model_run(open_json: Callable = _open_json) -> Optional[int]:
+    """Unix time the newest upstream model run became available, None if unknown"""
+    try:
+        meta = open_json(MODEL_META_URL, timeout=5)
+        return int(meta["last_run_availability_time"])
+    except (urllib.error.URLError, OSError, KeyError, TypeError, ValueError):
+        return None
+
+
+class HourlyForecast:
+    """Cached hourly forecast for several locations"""
+
+    def __init__(self, location_ids: List[str], times: np.ndarray, series: Dict[str, np.ndarray], meta: Dict):
+        self.location_ids = list(location_ids)
+        self.times = times
+        self.series_by_variable = series
+        self.meta = meta
+
+    @classmethod
+    def from_responses(cls, responses: Dict[str, Dict], model_run: Optional[int] = None,
+                       coordinates: Optional[Dict[str, Dict]] = None) -> "HourlyForecast":
+        ids = list(responses)
+        first = responses[ids[0]]["hourly"]
+        times = np.array(first["time"], dtype="datetime64[m]")
+        series = {}
+        for variable in HOURLY_VARIABLES:
+            rows = []
+            for location_id in ids:
+                values = responses[location_id].get("hourly", {}).get(variable) or [None] * len(times)
+                rows.append([np.nan if v is None else v for v in values[:len(times)]])
+            series[variable] = np.array(rows, dtype=np.float32)
+        now = time.time()
+        meta = {
+            "fetched_at": now,
+            "checked_at": now,
+            "model_run": model_run,
+            "coordinates": coordinates or {},
+            "current": {i: responses[i].get("current", {}) for i in ids},
+            "daily": {i: responses[i].get("daily", {}) for i in ids},
+        }
+        return cls(ids, times, series, meta)
+
+    @classmethod
+    def load(cls, path: Path = CACHE_FILE) -> Optional["HourlyForecast"]:
+        try:
+            with np.load(path) as data:
+                meta = json.loads(str(data["meta"]))
+                series = {v: data[v] for v in HOURLY_VARIABLES if v in data.files}
+                return cls(data["location_ids"].tolist(), data["time"], series, meta)
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def save(self, path: Path = CACHE_FILE):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.stem + ".tmp.npz")
+        np.savez_compressed(tmp, location_ids=np.array(self.location_ids), time=self.times,
+                            meta=np.array(json.dumps(self.meta)), **self.series_by_variable)
+        tmp.replace(path)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _row(self, location_id: str) -> int:
+        try:
+            return self.location_ids.index(location_id)
+        except ValueError:
+            raise KeyError(f"Location not cached: {location_id}")
+
+    def series(self, location_id: str, variable: str) -> np.ndarray:
+        return self.series_by_variable[variable][self._row(location_id)]
+
+    def window(self, location_id: str, start: datetime, end: datetime) -> Dict[str, np.ndarray]:
+        """{'time': ..., <variable>: ...} for hours in [start, end)"""
+        mask = (self.times >= np.datetime64(start, "m")) & (self.times < np.datetime64(end, "m"))
+        row = self._row(location_id)
+        result = {"time": self.times[mask]}
+        for variable, values in self.series_by_variable.items():
+            result[variable] = values[row, mask]
+        return result
+
+    def at(self, location_id: str, when: datetime) -> Optional[Dict[str, float]]:
+        """Values for the hour containing `when`, None outside the forecast"""
+        hour = np.datetime64(when, "h").astype("datetime64[m]")
+        index = int(np.searchsorted(self.times, hour))
+        if index >= len(self.times) or self.times[index] != hour:
+            return None
+        row = self._row(location_id)
+        return {v: (None if np.isnan(values[row, index]) else float(values[row, index]))
+                for v, values in self.series_by_variable.items()}
+
+    def current(self, location_id: str, now: Optional[datetime] = None) -> Dict:
+        """Current-conditions block in the API's shape, read off the hourly forecast"""
+        values = self.at(location_id, now or datetime.now())
+        if values is None or values.get("temperature_2m") is None:
+            return self.meta["current"].get(location_id, {})
+        current = {v: values.get(v) for v in CURRENT_VARIABLES}
+        if current.get("weather_code") is not None:
+            current["weather_code"] = int(current["weather_code"])
+        return current
+
+    def rain_hours(self, location_id: str, day: date, threshold: float = 50) -> List[str]:
+        """Hours on `day` with precipitation probability >= threshold: ['14:00', '15:00']"""
+        start = datetime.combine(day, datetime.min.time())
+        hours = self.window(location_id, start, start + timedelta(days=1))
+        wet = hours["precipitation_probability"] >= threshold
+        return [str(t)[11:16] for t in hours["time"][wet]]
+
+    def best_hours(self, location_id: str, day: date, first_hour: int = 7, last_hour: int = 17,
+                   count: int = 3) -> List[Tuple[str, int]]:
+        """Best golf start times on `day`: [('09:00', 92), ...], highest score first"""
+        start = datetime.combine(day, datetime.min.time()) + timedelta(hours=first_hour)
+        hours = self.window(location_id, start, start + timedelta(hours=last_hour - first_hour + 1))
+        if len(hours["time"]) == 0:
+            return []
+        temp = hours["apparent_temperature"]
+        rain = np.nan_to_num(hours["precipitation_probability"])
+        wind = np.nan_to_num(hours["wind_speed_10m"])
+        score = np.full(len(temp), 100.0)
+        score -= np.where(temp < 40, 35, np.where(temp < 50, 15, 0))
+        score -= np.where(temp > 95, 30, np.where(temp > 88, 15, 0))
+        score -= np.where(rain > 60, 50, np.where(rain > 30, 25, 0))
+        score -= np.where(wind > 20, 20, np.where(wind > 12, 10, 0))
+        order = np.argsort(-score, kind="stable")[:count]
+        return [(str(hours["time"][i])[11:16], int(score[i])) for i in order]
+
+    # ------------------------------------------------------------------
+    # Freshness
+    # ------------------------------------------------------------------
+
+    def covers(self, locations: Dict[str, Dict]) -> bool:
+        coordinates = {k: {"lat": v["lat"], "lon": v["lon"]} for k, v in locations.items()}
+        return self.location_ids == list(locations) and self.meta.get("coordinates") == coordinates
+
+    def needs_refresh(self, locations: Dict[str, Dict], now: Optional[float] = None,
+                      open_json: Callable = _open_json) -> Tuple[bool, str, Optional[int]]:
+        """
+        (refresh?, reason, newest model run); touches the network only for
+        the small run-metadata file, and not at all if checked recently
+        """
+        now = now or time.time()
+        if not self.covers(locations):
+            return True, "locations changed", None
+        if now - self.meta.get("checked_at", 0) < MIN_CHECK_INTERVAL:
+            return False, "checked recently", self.meta.get("model_run")
+        model_run = fetch_model_run(open_json)
+        self.meta["checked_at"] = now
+        if model_run is None:
+            if now - self.meta.get("fetched_at", 0) > MAX_CACHE_AGE:
+                return True, "model run unknown, cache stale", None
+            return False, "model run unknown, cache fresh", None
+        if self.meta.get("model_run") is None or model_run > self.meta["model_run"]:
+            return True, "new model run", model_run
+        return False, "model run unchanged", model_run
+
+
+def refresh(locations: Dict[str, Dict], path: Path = CACHE_FILE, force: bool = False,
+            open_json: Callable = _open_json) -> Tuple[HourlyForecast, bool, str]:
+    """
+    Load the cache and refetch only if the forecast changed upstream
+
+    Returns (forecast, fetched, reason).
+    """
+    cached = None if force else HourlyForecast.load(path)
+    model_run = None
+    if cached is not None:
+        stale, reason, model_run = cached.needs_refresh(locations, open_json=open_json)
+        if not stale:
+            if reason != "checked recently":
+                cached.save(path)   # Persist checked_at
+            return cached, False, reason
+    else:
+        reason = "forced" if force else "no cache"
+
+    if model_run is None:
+        model_run = fetch_model_run(open_json)
+    responses = fetch_forecasts(locations, open_json)
+    coordinates = {k: {"lat": v["lat"], "lon": v["lon"]} for k, v in locations.items()}
+    forecast = HourlyForecast.from_responses(responses, model_run=model_run, coordinates=coordinates)
+    forecast.save(path)
+    return forecast, True, reason
+
+
+if __name__ == "__main__":
+    forecast = HourlyForecast.load()
+    if forecast is None:
+        print(f"❌ No hourly cache at {CACHE_FILE} - run weather_daemon.py first")
+        sys.exit(1)
+
+    if len(sys.argv) > 1 and sys.argv[1] == "tee-times":
+        location_id = sys.argv[2] if len(sys.argv) > 2 else forecast.location_ids[0]
+        tomorrow = date.today() + timedelta(days=1)
+        print(f"⛳ Best tee times tomorrow at {location_id}:")
+        for hour, score in forecast.best_hours(location_id, tomorrow):
+            print(f"   {hour}  {score}/100")
+    else:
+        fetched = datetime.fromtimestamp(forecast.meta["fetched_at"]).strftime("%Y-%m-%d %H:%M")
+        print(f"🌤️  {len(forecast.location_ids)} locations x {len(forecast.times)} hours, fetched {fetched}")
+        print(f"   {str(forecast.times[0])} -> {str(forecast.times[-1])}")
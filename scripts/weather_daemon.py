@@ -2,6 +2,10 @@
 """
 Weather Daemon - Fetches weather data for multiple locations
 Uses Open-Meteo API (free, no API key required)
+
+All locations are fetched in one request; the hourly forecast is cached in
+data/weather_hourly.npz (see weather_cache.py) and only refetched when a new
+model run is out. Pass --force to refetch regardless.
 """
 
 import json
@@ -9,9 +13,11 @@ import logging
 import sys
 from datetime import datetime
 from pathlib import Path
-import urllib.request
 import urllib.error
 
+import weather_cache
+from timeseries_store import get_store
+
 # Configuration
 LOCATIONS = {
     "nolensville_tn": {
@@ -35,6 +41,9 @@ LOCATIONS = {
 }
 
 DATA_FILE = Path("/Users/clawdbot/clawd/data/weather.json")
+HOURLY_CACHE_FILE = weather_cache.CACHE_FILE
+OBSERVATION_SERIES = "weather"     # Current conditions per run, in the shared time-series store
+OBSERVATION_RETENTION_DAYS = 90
 LOG_FILE = Path("/Users/clawdbot/clawd/logs/weather-daemon.log")
 
 # Setup logging
@@ -49,31 +58,25 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def fetch_weather(lat, lon):
-    """Fetch weather data from Open-Meteo API"""
-    # API endpoint with all required parameters
-    url = (
-        f"https://api.open-meteo.com/v1/forecast?"
-        f"latitude={lat}&longitude={lon}"
-        f"&current=temperature_2m,relative_humidity_2m,apparent_temperature,"
-        f"precipitation,weather_code,wind_speed_10m,wind_direction_10m"
-        f"&daily=weather_code,temperature_2m_max,temperature_2m_min,"
-        f"precipitation_probability_max,uv_index_max,wind_speed_10m_max"
-        f"&temperature_unit=fahrenheit&wind_speed_unit=mph"
-        f"&precipitation_unit=inch&timezone=America%2FChicago"
-        f"&forecast_days=6"
-    )
-    
+def fetch_weather(force=False):
+    """
+    Hourly forecast for every location (one batched Open-Meteo request),
+    refetched only when the upstream model run changed since the cached one
+    """
     try:
-        with urllib.request.urlopen(url, timeout=10) as response:
-            data = json.loads(response.read().decode())
-            return data
-    except urllib.error.URLError as e:
+        forecast, fetched, reason = weather_cache.refresh(LOCATIONS, path=HOURLY_CACHE_FILE, force=force)
+    except (urllib.error.URLError, OSError) as e:
         logger.error(f"Failed to fetch weather data: {e}")
-        return None
-    except json.JSONDecodeError as e:
+        return None, False
+    except (json.JSONDecodeError, ValueError, KeyError) as e:
         logger.error(f"Failed to parse weather data: {e}")
-        return None
+        return None, False
+
+    if fetched:
+        logger.info(f"Fetched forecast for {len(LOCATIONS)} locations in one request ({reason})")
+    else:
+        logger.info(f"Using cached forecast ({reason})")
+    return forecast, fetched
 
 
 def interpret_weather_code(code):
@@ -255,16 +258,19 @@ def analyze_conditions(location_name, current, daily):
     return insights
 
 
-def process_location(location_id, location_data):
-    """Fetch and process weather for a single location"""
-    logger.info(f"Fetching weather for {location_data['name']}")
-    
-    raw_data = fetch_weather(location_data['lat'], location_data['lon'])
-    if not raw_data:
+def process_location(location_id, location_data, forecast, fetched=True):
+    """Build the snapshot for a single location from the cached forecast"""
+    # A fresh fetch has the API's current block; otherwise read this hour off the hourly series
+    current = forecast.meta['current'].get(location_id, {}) if fetched else forecast.current(location_id)
+    daily = dict(forecast.meta['daily'].get(location_id, {}))
+    if not current or not daily:
         return None
     
-    current = raw_data.get('current', {})
-    daily = raw_data.get('daily', {})
+    # A cached forecast may be from yesterday; start the daily series at today
+    today = datetime.now().strftime('%Y-%m-%d')
+    if today in daily.get('time', []):
+        offset = daily['time'].index(today)
+        daily = {key: values[offset:] for key, values in daily.items()}
     
     # Process current conditions
     current_processed = {
@@ -322,10 +328,13 @@ def main():
         "locations": {}
     }
     
-    # Fetch weather for all locations
+    forecast, fetched = fetch_weather(force='--force' in sys.argv)
+    if forecast is None:
+        return 1
+    
     for location_id, location_info in LOCATIONS.items():
         try:
-            processed = process_location(location_id, location_info)
+            processed = process_location(location_id, location_info, forecast, fetched)
             if processed:
                 weather_data["locations"][location_id] = processed
                 logger.info(f"✓ {location_info['name']}: {processed['current']['temperature']}°F, {processed['current']['conditions']}")
@@ -344,6 +353,18 @@ def main():
         logger.error(f"Failed to save weather data: {e}")
         return 1
     
+    # Keep a history of observed conditions (weather.json only holds the latest snapshot)
+    try:
+        store = get_store()
+        store.set_retention(OBSERVATION_SERIES, OBSERVATION_RETENTION_DAYS)
+        store.record_many(OBSERVATION_SERIES, [
+            (location_id, loc['current']['temperature'], loc['current'])
+            for location_id, loc in weather_data["locations"].items()
+        ])
+        store.prune()
+    except Exception as e:
+        logger.error(f"Failed to record weather history: {e}")
+    
     logger.info("Weather daemon completed successfully")
     return 0
 
@@ -36,35 +36,81 @@ MEMORY_FILES = {
 }
 SEARCH_LOG = WORKSPACE / "memory" / "auto-context-log.json"
 
-# Performance: Cache file contents (invalidate every 5 minutes)
-_file_cache = {}
-_cache_timestamp = {}
-CACHE_TTL = 300  # 5 minutes in seconds
+# Performance: Section index per file, rebuilt only when the file's mtime/size changes
+_section_index = {}
+PRIORITY_MARKERS = ['priority', 'urgent', 'important', '🔴']
+TOKEN_PATTERN = re.compile(r'\b\w+\b')
+HEADER_PATTERN = re.compile(r'^#{1,3}\s+.+$')
 
 
-def _get_file_content(file_path: Path) -> Optional[str]:
-    """Get file content with caching for performance."""
-    if not file_path.exists():
-        return None
-    
-    now = datetime.now().timestamp()
+class _SectionIndex:
+    """
+    Pre-split sections of one memory file plus an inverted index over them.
+
+    Everything that doesn't depend on the query (lowercased text, recency and
+    priority markers, display snippet) is computed once at build time.
+    """
+
+    def __init__(self, content: str, signature: tuple):
+        self.signature = signature
+        self.sections = _split_into_sections(content)
+        self.lowered = [section.lower() for section in self.sections]
+        self.static_scores = [
+            (2 if '2026' in section else 0)
+            + (3 if any(marker in lowered for marker in PRIORITY_MARKERS) else 0)
+            for section, lowered in zip(self.sections, self.lowered)
+        ]
+        self.snippets = [_truncate_snippet(section) for section in self.sections]
+
+        self.postings = defaultdict(set)
+        for section_id, lowered in enumerate(self.lowered):
+            for token in set(TOKEN_PATTERN.findall(lowered)):
+                self.postings[token].add(section_id)
+        self._expansions = {}
+
+    def sections_with(self, keyword: str) -> set:
+        """
+        Section ids whose text contains keyword as a substring.
+
+        Keywords are \\w+ runs, so a substring hit always lies inside a single
+        indexed token; expanding the keyword over the vocabulary once gives
+        the same matches as `keyword in section_lower` without rescanning text.
+        """
+        if keyword not in self._expansions:
+            if len(self._expansions) > 4096:
+                self._expansions.clear()
+            hits = set()
+            for token, section_ids in self.postings.items():
+                if keyword in token:
+                    hits |= section_ids
+            self._expansions[keyword] = hits
+        return self._expansions[keyword]
+
+
+def _get_section_index(file_path: Path) -> Optional[_SectionIndex]:
+    """Get the section index for a file, rebuilding it only when the file changed."""
     cache_key = str(file_path)
-    
-    # Check cache validity
-    if cache_key in _file_cache:
-        if now - _cache_timestamp.get(cache_key, 0) < CACHE_TTL:
-            return _file_cache[cache_key]
-    
-    # Read and cache
+    try:
+        stat = file_path.stat()
+    except OSError:
+        _section_index.pop(cache_key, None)
+        return None
+
+    signature = (stat.st_mtime_ns, stat.st_size)
+    index = _section_index.get(cache_key)
+    if index is not None and index.signature == signature:
+        return index
+
     try:
         content = file_path.read_text()
-        _file_cache[cache_key] = content
-        _cache_timestamp[cache_key] = now
-        return content
     except Exception as e:
         print(f"Error reading {file_path}: {e}")
         return None
 
+    index = _SectionIndex(content, signature)
+    _section_index[cache_key] = index
+    return index
+
 
 def search_memory(query: str, max_results: int = 5) -> List[Dict[str, str]]:
     """
@@ -82,24 +128,31 @@ def search_memory(query: str, max_results: int = 5) -> List[Dict[str, str]]:
     
     # Extract keywords (simple but fast)
     keywords = set([
-        word for word in re.findall(r'\b\w+\b', query_lower)
+        word for word in TOKEN_PATTERN.findall(query_lower)
         if len(word) > 3  # Skip short words
     ])
     
     for file_name, file_path in MEMORY_FILES.items():
-        content = _get_file_content(file_path)
-        if not content:
+        index = _get_section_index(file_path)
+        if not index or not index.sections:
             continue
         
-        # Split into sections (by headers or paragraphs)
-        sections = _split_into_sections(content)
+        # Only sections containing a keyword (or the whole phrase) are scored
+        if keywords:
+            candidates = set()
+            for keyword in keywords:
+                candidates |= index.sections_with(keyword)
+        elif query_lower:
+            candidates = {i for i, lowered in enumerate(index.lowered) if query_lower in lowered}
+        else:
+            candidates = set()
         
-        for section in sections:
-            score = _calculate_relevance(section, keywords, query_lower)
+        for section_id in sorted(candidates):
+            score = _calculate_relevance(index, section_id, keywords, query_lower)
             if score > 0:
                 results.append({
                     'file': file_name,
-                    'snippet': _truncate_snippet(section),
+                    'snippet': index.snippets[section_id],
                     'relevance_score': score,
                     'file_path': str(file_path)
                 })
@@ -115,11 +168,10 @@ def _split_into_sections(content: str) -> List[str]:
     sections = []
     
     # Try splitting by headers first
-    header_pattern = r'^#{1,3}\s+.+$'
     current_section = []
     
     for line in content.split('\n'):
-        if re.match(header_pattern, line):
+        if HEADER_PATTERN.match(line):
             if current_section:
                 sections.append('\n'.join(current_section))
             current_section = [line]
@@ -136,33 +188,28 @@ def _split_into_sections(content: str) -> List[str]:
     return sections
 
 
-def _calculate_relevance(section: str, keywords: set, query: str) -> float:
+def _calculate_relevance(index: _SectionIndex, section_id: int, keywords: set, query: str) -> float:
     """
-    Calculate relevance score for a section.
+    Calculate relevance score for an indexed section.
     Simple but fast scoring:
     - Exact phrase match: +10
     - Keyword match: +1 per keyword
-    - Recent date mention: +2
+    - Recent date mention: +2 (precomputed)
+    - Priority markers: +3 (precomputed)
     """
-    section_lower = section.lower()
     score = 0.0
     
     # Exact phrase match
-    if query in section_lower:
+    if query in index.lowered[section_id]:
         score += 10
     
     # Keyword matches
     for keyword in keywords:
-        if keyword in section_lower:
+        if section_id in index.sections_with(keyword):
             score += 1
     
-    # Recency bonus (mentions of 2026)
-    if '2026' in section:
-        score += 2
-    
-    # Priority markers
-    if any(marker in section_lower for marker in ['priority', 'urgent', 'important', '🔴']):
-        score += 3
+    # Recency bonus (mentions of 2026) and priority markers
+    score += index.static_scores[section_id]
     
     return score
 
@@ -196,7 +243,7 @@ def inject_context(user_message: str, include_files: List[str] = None) -> Dict[s
         Dict with 'snippets', 'summary', 'search_time_ms', 'found_relevant'
     """
     import time
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     # Search memory
     results = search_memory(user_message)
@@ -210,7 +257,7 @@ def inject_context(user_message: str, include_files: List[str] = None) -> Dict[s
     summary = _generate_summary(by_file, user_message)
     
     # Calculate search time
-    search_time_ms = (time.time() - start_time) * 1000
+    search_time_ms = (time.perf_counter() - start_time) * 1000
     
     # Log the search
     _log_search(user_message, results, search_time_ms)
@@ -284,11 +331,14 @@ def get_search_stats() -> Dict[str, any]:
             return {'total_searches': 0}
         
         avg_time = sum(s['search_time_ms'] for s in searches) / len(searches)
+        times = sorted(s['search_time_ms'] for s in searches)
+        p95_time = times[min(len(times) - 1, int(len(times) * 0.95))]
         hit_rate = sum(1 for s in searches if s['results_found'] > 0) / len(searches) * 100
         
         return {
             'total_searches': len(searches),
             'avg_search_time_ms': round(avg_time, 2),
+            'p95_search_time_ms': round(p95_time, 2),
             'hit_rate_percent': round(hit_rate, 1),
             'last_search': searches[-1]['timestamp']
         }
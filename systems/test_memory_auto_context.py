@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Tests for the memory auto-context section index
+Results are checked against the linear scan it replaced
+"""
+
+import importlib.util
+import os
+import random
+import tempfile
+from pathlib import Path
+
+spec = importlib.util.spec_from_file_location(
+    "memory_auto_context", Path(__file__).parent / "memory-auto-context.py")
+mac = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(mac)
+
+JOURNAL = """# Jarvis Journal
+
+## Golf
+Ross wants to break 80 this season. Handicap is 12.4 as of Feb 2026.
+
+## Preferences
+Prefers short answers in the morning. Coffee before calls.
+
+### Urgent
+🔴 Renew the domain before March.
+
+## Revenue
+Coaching revenue goal: $10k/month. Golf sponsorship ideas parked.
+"""
+TASKS = """Call the accountant about Q1 taxes
+
+Book tee time for Saturday golf
+
+Important: finish the pitch deck for the podcast sponsor
+"""
+WORDS = ["golf", "handicap", "revenue", "coaching", "podcast", "sponsor", "coffee", "taxes",
+         "deck", "morning", "domain", "season", "calls", "ideas", "2026", "urgent"]
+
+
+def legacy_search(query, files):
+    """The pre-index linear scan, restricted to sections with a keyword/phrase hit"""
+    query_lower = query.lower()
+    keywords = {w for w in mac.TOKEN_PATTERN.findall(query_lower) if len(w) > 3}
+    results = []
+    for file_name, file_path in files.items():
+        for section in mac._split_into_sections(file_path.read_text()):
+            lowered = section.lower()
+            hits = sum(1 for k in keywords if k in lowered)
+            phrase = query_lower in lowered
+            if not (hits if keywords else phrase):
+                continue
+            score = (10 if phrase else 0) + hits + (2 if '2026' in section else 0) \
+                + (3 if any(m in lowered for m in mac.PRIORITY_MARKERS) else 0)
+            results.append((file_name, mac._truncate_snippet(section), float(score)))
+    results.sort(key=lambda r: r[2], reverse=True)
+    return results
+
+
+def use_files(tmp_path):
+    files = {'journal': tmp_path / "journal.md", 'tasks': tmp_path / "TASK_QUEUE.md"}
+    files['journal'].write_text(JOURNAL)
+    files['tasks'].write_text(TASKS)
+    original = mac.MEMORY_FILES
+    mac.MEMORY_FILES = files
+    mac._section_index.clear()
+    return files, original
+
+
+def search(query):
+    return [(r['file'], r['snippet'], r['relevance_score']) for r in mac.search_memory(query, max_results=100)]
+
+
+def test_index_build():
+    index = mac._SectionIndex(JOURNAL, (0, 0))
+    assert len(index.sections) == 5
+    assert index.sections[1].startswith("## Golf")
+    assert index.static_scores[1] == 2 and index.static_scores[3] == 3 and index.static_scores[2] == 0
+    assert index.postings["handicap"] == {1}
+    assert index.sections_with("spons") == {4}          # Substring of 'sponsorship'
+    assert index.sections_with("golf") == {1, 4}
+
+    # Header-less files fall back to paragraphs
+    assert len(mac._SectionIndex(TASKS, (0, 0)).sections) == 3
+
+
+def test_matches_linear_scan(tmp_path):
+    files, original = use_files(tmp_path)
+    try:
+        rng = random.Random(7)
+        queries = ["What's my golf handicap?", "golf", "Revenue ideas for coaching", "podcast sponsor deck",
+                   "is it urgent", "zzz nothing", "tee time", "Call the accountant"]
+        queries += [" ".join(rng.sample(WORDS, rng.randint(1, 4))) for _ in range(50)]
+        for query in queries:
+            assert search(query) == legacy_search(query, files), query
+    finally:
+        mac.MEMORY_FILES = original
+
+
+def test_rebuilds_only_on_change(tmp_path):
+    files, original = use_files(tmp_path)
+    try:
+        first = mac._get_section_index(files['journal'])
+        assert mac._get_section_index(files['journal']) is first
+        assert not [file for file, _, _ in search("podcast") if file == 'journal']
+
+        # Appended content: new size, new index
+        with open(files['journal'], "a") as f:
+            f.write("\n## Podcast\nRecord episode 12 with the sponsor.\n")
+        second = mac._get_section_index(files['journal'])
+        assert second is not first and len(second.sections) == len(first.sections) + 1
+        assert ('journal', "## Podcast\nRecord episode 12 with the sponsor.\n", 2.0) in search("podcast sponsor")
+
+        # Same size, new mtime: still rebuilt
+        files['journal'].write_text(files['journal'].read_text().replace("episode 12", "episode 13"))
+        st = files['journal'].stat()
+        os.utime(files['journal'], ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        third = mac._get_section_index(files['journal'])
+        assert third is not second and "episode 13" in third.sections[-1]
+
+        # Deleted file drops out of the cache and the results
+        files['journal'].unlink()
+        assert mac._get_section_index(files['journal']) is None
+        assert str(files['journal']) not in mac._section_index
+        assert {file for file, _, _ in search("golf")} == {'tasks'}
+    finally:
+        mac.MEMORY_FILES = original
+
+
+if __name__ == "__main__":
+    test_index_build()
+    for test in [test_matches_linear_scan, test_rebuilds_only_on_change]:
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ Memory auto-context tests passed")
@@ -5,12 +5,15 @@ Natural language parsing, routing, and response generation.
 """
 
 from .command_parser import VoiceCommandParser, ParsedCommand
+from .intent_matcher import IntentMatcher, IntentMatch
 from .mode_router import ModeRouter
 from .response_generator import ResponseGenerator
 
 __all__ = [
     'VoiceCommandParser',
     'ParsedCommand',
+    'IntentMatcher',
+    'IntentMatch',
     'ModeRouter',
     'ResponseGenerator'
 ]
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Intent Matching Benchmark
+Compares per-pattern re.search loops against the compiled IntentMatcher
+
+Usage:
+    python3 voice/benchmark_intents.py                 # default corpus
+    python3 voice/benchmark_intents.py 20000 40        # transcripts, catalog multiplier
+"""
+
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from voice.command_parser import VoiceCommandParser
+from voice.intent_matcher import IntentMatcher
+
+FILLER = [
+    "okay", "so", "um", "today", "right now", "please", "quickly", "for me",
+    "after the gym", "before lunch", "this week", "again", "real quick",
+]
+
+
+def build_corpus(size: int, seed: int = 7) -> list:
+    """Synthetic transcripts: supported examples padded with filler, plus misses"""
+    rng = random.Random(seed)
+    examples = [cmd["example"].lower() for cmd in VoiceCommandParser().get_supported_commands()]
+    examples += [
+        "log bench press 185 pounds 8 reps",
+        "add eggs to shopping list",
+        "remind me to call mom at 5pm",
+        "play focus playlist",
+        "the weather is nice and nothing here matches anything",
+    ]
+
+    corpus = []
+    for _ in range(size):
+        words = rng.choice(examples).split()
+        for _ in range(rng.randint(0, 6)):
+            words.insert(rng.randint(0, len(words)), rng.choice(FILLER))
+        corpus.append(" ".join(words))
+    return corpus
+
+
+def build_catalog(multiplier: int) -> dict:
+    """Grow the real catalog with namespaced copies to simulate a larger intent set"""
+    base = VoiceCommandParser().patterns
+    catalog = dict(base)
+    for n in range(1, multiplier):
+        for intent, patterns in base.items():
+            catalog[f"{intent}_v{n}"] = [f"variant{n} {p}" for p in patterns]
+    return catalog
+
+
+def legacy_best(catalog: dict, text: str):
+    for intent, patterns in catalog.items():
+        for pattern in patterns:
+            match = re.search(pattern, text, re.IGNORECASE)
+            if match:
+                return intent, match.groups()
+    return None
+
+
+def legacy_scores(catalog: dict, text: str) -> dict:
+    scores = {}
+    for intent, patterns in catalog.items():
+        score = 0
+        for pattern in patterns:
+            if re.search(pattern, text, re.IGNORECASE):
+                score += 30
+                re.search(pattern, text, re.IGNORECASE)
+        scores[intent] = score
+    return scores
+
+
+def timed(label: str, fn, corpus: list) -> float:
+    latencies = []
+    for text in corpus:
+        start = time.perf_counter()
+        fn(text)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    total = sum(latencies)
+    p50 = latencies[len(latencies) // 2] * 1e6
+    p99 = latencies[int(len(latencies) * 0.99)] * 1e6
+    print(f"  {label:<28} total {total * 1000:8.1f}ms   p50 {p50:7.1f}µs   p99 {p99:7.1f}µs")
+    return total
+
+
+def run(size: int = 5000, multiplier: int = 1):
+    corpus = build_corpus(size)
+    catalog = build_catalog(multiplier)
+    pattern_count = sum(len(p) for p in catalog.values())
+
+    start = time.perf_counter()
+    matcher = IntentMatcher(catalog)
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    print(f"🎙️  Intent benchmark: {size} transcripts, {len(catalog)} intents, {pattern_count} patterns")
+    print(f"  compile                      {compile_ms:.1f}ms")
+
+    # Sanity check: both approaches pick the same intent
+    for text in corpus[:500]:
+        legacy = legacy_best(catalog, text)
+        best = matcher.best(text)
+        assert (legacy is None) == (best is None), text
+        if best:
+            assert legacy == (best.intent, best.first.groups()), text
+
+    print("\nFirst-match (VoiceCommandParser.parse):")
+    old = timed("per-pattern re.search", lambda t: legacy_best(catalog, t), corpus)
+    new = timed("IntentMatcher.best", matcher.best, corpus)
+    print(f"  speedup {old / new:.1f}x")
+
+    print("\nScore all intents (VoiceRouter.detect_intent):")
+    old = timed("per-pattern re.search x2", lambda t: legacy_scores(catalog, t), corpus)
+    new = timed("IntentMatcher.scan", matcher.scan, corpus)
+    print(f"  speedup {old / new:.1f}x")
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    multiplier = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    run(size, multiplier)
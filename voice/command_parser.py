@@ -8,6 +8,13 @@ import re
 from typing import Optional, Dict, Any, List
 from dataclasses import dataclass
 
+try:
+    from .intent_matcher import IntentMatcher
+except ImportError:  # Run as a script (python command_parser.py ...)
+    from intent_matcher import IntentMatcher
+
+WAKE_WORD = re.compile(r'^(?:hey |hi )?jarvis,? ')
+
 @dataclass
 class ParsedCommand:
     """Structured command representation"""
@@ -116,6 +123,9 @@ class VoiceCommandParser:
             "get_advice": "guidance",
             "check_accountability": "guidance"
         }
+        
+        # All intents precompiled into one keyword-gated matcher
+        self.matcher = IntentMatcher(self.patterns)
     
     def parse(self, text: str) -> Optional[ParsedCommand]:
         """
@@ -131,23 +141,21 @@ class VoiceCommandParser:
         text = text.lower().strip()
         
         # Remove wake word
-        text = re.sub(r'^(?:hey |hi )?jarvis,? ', '', text)
+        text = WAKE_WORD.sub('', text)
         
-        # Try to match against patterns
-        for intent, patterns in self.patterns.items():
-            for pattern in patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    # Extract parameters
-                    params = self._extract_parameters(intent, match, text)
-                    
-                    return ParsedCommand(
-                        category=self.intent_categories.get(intent, "unknown"),
-                        intent=intent,
-                        parameters=params,
-                        confidence=0.9,  # High confidence on regex match
-                        raw_input=text
-                    )
+        # Only patterns whose keywords appear are tried; earliest intent in the catalog wins
+        best = self.matcher.best(text)
+        if best:
+            # Extract parameters
+            params = self._extract_parameters(best.intent, best.first, text)
+            
+            return ParsedCommand(
+                category=self.intent_categories.get(best.intent, "unknown"),
+                intent=best.intent,
+                parameters=params,
+                confidence=0.9,  # High confidence on regex match
+                raw_input=text
+            )
         
         # Fallback: fuzzy matching
         fuzzy_result = self._fuzzy_match(text)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Intent Matcher - Precompiled, keyword-gated matching for voice intents
+Scores every intent of a catalog against a transcript in one pass
+
+Every pattern is compiled once up front. For each pattern we also pull out the
+longest literal run the pattern cannot match without (e.g. "mrr status" or
+"log win "), and index patterns by that keyword. A transcript is folded once,
+the keyword index tells us which patterns can possibly match, and only those
+candidates run their regex. Results are identical to calling re.search for
+every pattern in catalog order, but the cost tracks the handful of plausible
+intents instead of the size of the catalog (and never thrashes the re cache).
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+    from re import _constants as sre_constants
+except ImportError:
+    import sre_parse
+    import sre_constants
+
+
+def required_literal(pattern: str, flags: int = 0) -> str:
+    """
+    Longest literal substring every match of pattern must contain
+
+    Only mandatory, non-repeated literals in the top-level sequence (and inside
+    plain groups) count, so the result is always a safe prefilter. Returns ""
+    when the pattern has no usable literal (e.g. r"(\\d+)\\s*(reps|sets)").
+    """
+    runs = [""]
+
+    def walk(items):
+        for op, av in items:
+            if op is sre_constants.LITERAL:
+                runs[-1] += chr(av)
+            elif op is sre_constants.SUBPATTERN:
+                walk(av[-1])
+            elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT) and av[0] >= 1:
+                runs.append("")
+                walk(av[2])
+                runs.append("")
+            else:
+                runs.append("")
+
+    walk(sre_parse.parse(pattern, flags))
+    literal = max(runs, key=len)
+    # Case folding is only a safe comparison for plain ASCII keywords
+    return literal.casefold() if literal.isascii() else ""
+
+
+@dataclass
+class IntentMatch:
+    """All pattern hits for one intent (re.Match objects, in pattern order)"""
+    intent: str
+    hits: List[re.Match] = field(default_factory=list)
+
+    @property
+    def first(self) -> re.Match:
+        """Hit from the earliest-listed pattern of the intent"""
+        return self.hits[0]
+
+    @property
+    def matches(self) -> List[str]:
+        return [hit.group(0) for hit in self.hits]
+
+
+class IntentMatcher:
+    """
+    Precompiled matcher over an ordered intent catalog
+
+    Args:
+        catalog: intent -> list of regex patterns (order is priority order)
+        flags: regex flags applied to every pattern
+    """
+
+    def __init__(self, catalog: Dict[str, List[str]], flags: int = re.IGNORECASE):
+        self.intents: List[str] = list(catalog.keys())
+        self._compiled: List[re.Pattern] = []
+        self._owners: List[str] = []
+        self._always: List[int] = []  # Patterns without a usable keyword
+        self._by_keyword: Dict[str, List[int]] = {}
+
+        for intent, patterns in catalog.items():
+            for pattern in patterns:
+                index = len(self._compiled)
+                self._compiled.append(re.compile(pattern, flags))
+                self._owners.append(intent)
+
+                keyword = required_literal(pattern, flags)
+                if keyword.strip():
+                    self._by_keyword.setdefault(keyword, []).append(index)
+                else:
+                    self._always.append(index)
+
+        self.pattern_count = len(self._compiled)
+
+    def candidates(self, text: str) -> List[int]:
+        """Pattern indices (in priority order) whose keyword appears in text"""
+        folded = text.casefold()
+        found = list(self._always)
+        for keyword, indices in self._by_keyword.items():
+            if keyword in folded:
+                found.extend(indices)
+        found.sort()
+        return found
+
+    def scan(self, text: str) -> Dict[str, IntentMatch]:
+        """
+        Match every pattern against text
+
+        Returns:
+            intent -> IntentMatch for intents with at least one hit, in catalog order
+        """
+        results: Dict[str, IntentMatch] = {}
+        for index in self.candidates(text):
+            match = self._compiled[index].search(text)
+            if match:
+                intent = self._owners[index]
+                results.setdefault(intent, IntentMatch(intent)).hits.append(match)
+        return results
+
+    def best(self, text: str) -> Optional[IntentMatch]:
+        """Highest-priority intent (earliest in catalog) with any hit"""
+        for index in self.candidates(text):
+            match = self._compiled[index].search(text)
+            if match:
+                return IntentMatch(self._owners[index], [match])
+        return None
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for the compiled intent matcher
+Checks it agrees with plain per-pattern re.search on both voice catalogs
+"""
+
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from voice.command_parser import VoiceCommandParser
+from voice.intent_matcher import IntentMatcher, required_literal
+from voice.benchmark_intents import build_corpus
+from voice_command_router import VoiceRouter
+
+
+def naive_scan(catalog, text):
+    results = {}
+    for intent, patterns in catalog.items():
+        for pattern in patterns:
+            match = re.search(pattern, text, re.IGNORECASE)
+            if match:
+                results.setdefault(intent, []).append((match.group(0), match.groups()))
+    return results
+
+
+def test_required_literal():
+    assert required_literal(r"mrr status") == "mrr status"
+    assert required_literal(r"log win (.+)") == "log win "
+    assert required_literal(r"(?:show|tell) (?:me )?(?:my|the) mrr") == " mrr"
+    assert required_literal(r"(\d+)\s*(pounds|lbs|kg)") == ""
+    assert required_literal(r"find (?:me )?(\d+) leads?") == "find "
+
+
+def test_parser_matches_naive_search():
+    parser = VoiceCommandParser()
+    for text in build_corpus(1000):
+        expected = naive_scan(parser.patterns, text)
+        best = parser.matcher.best(text)
+        if not expected:
+            assert best is None, text
+            continue
+        intent = next(iter(expected))
+        assert best.intent == intent, text
+        assert (best.first.group(0), best.first.groups()) == expected[intent][0]
+
+
+def test_router_scan_matches_naive_search():
+    router = VoiceRouter()
+    catalog = {name: config["patterns"] for name, config in router.intents.items()}
+    corpus = build_corpus(500) + [
+        "log bench press 185 pounds 8 reps",
+        "i just ate chicken breast 300 calories",
+        "add milk to shopping list",
+        "what's on my calendar tomorrow?",
+        "remind me to call mom at 5pm",
+    ]
+    for text in corpus:
+        text = text.lower()
+        scanned = router.matcher.scan(text)
+        expected = naive_scan(catalog, text)
+        assert list(scanned) == list(expected), text
+        for intent, hits in expected.items():
+            assert [(m.group(0), m.groups()) for m in scanned[intent].hits] == hits
+
+
+def test_parse_extracts_parameters():
+    parser = VoiceCommandParser()
+    assert parser.parse("Jarvis find 10 leads").parameters == {"leads": 10}
+    assert parser.parse("Jarvis sales mode").parameters == {"leads": 5}
+    result = parser.parse("hey jarvis log workout shoulder press 180")
+    assert result.intent == "log_workout"
+    assert result.parameters["description"] == "shoulder press 180"
+
+
+def test_detect_intent_scores():
+    router = VoiceRouter()
+    intent, confidence, data = router.detect_intent("Log bench press 185 pounds 8 reps")
+    assert intent == "fitness_log_workout"
+    assert confidence == 100
+    assert data["weight"] == 185 and data["reps"] == 8
+
+
+def test_large_catalog_stays_consistent():
+    base = VoiceCommandParser().patterns
+    catalog = dict(base)
+    for n in range(1, 10):
+        for intent, patterns in base.items():
+            catalog[f"{intent}_v{n}"] = [f"variant{n} {p}" for p in patterns]
+    matcher = IntentMatcher(catalog)
+    for text in ["variant7 log win first customer", "what's my mrr", "nothing here"]:
+        expected = naive_scan(catalog, text)
+        assert list(matcher.scan(text)) == list(expected)